@@ -0,0 +1,46 @@
+"""
+Benchmarks for batch resume x job scoring
+"""
+
+from typing import Any, Callable, Dict
+
+from batch_matching import BatchMatcher
+from skill_canonicalizer import SkillCanonicalizer
+from synthetic_corpus import generate_jobs
+
+JOB_COUNT = 100_000
+RESUME_COUNT = 200
+RESUME_SKILLS = 15
+
+
+def build_matcher(resume_count: int = RESUME_COUNT, job_count: int = JOB_COUNT) -> BatchMatcher:
+    """Jobs and resumes drawn from the same Zipf skill distribution"""
+    matcher = BatchMatcher(canonicalizer=SkillCanonicalizer())
+    matcher.add_jobs((job['id'], job['skills']) for job in generate_jobs(job_count))
+    resumes = generate_jobs(resume_count, skills_per_job=RESUME_SKILLS, seed=5)
+    matcher.add_resumes((f'resume-{i:06d}', resume['skills']) for i, resume in enumerate(resumes))
+    return matcher
+
+
+def collect() -> Dict[str, Callable[[], Any]]:
+    matcher = build_matcher()
+    return {
+        f'batch_matching.{metric}.200x100k': (lambda metric=metric: matcher.score_all(metric, k=10))
+        for metric in ('overlap', 'jaccard', 'cosine')
+    }
+
+
+if __name__ == '__main__':
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--resumes', type=int, default=1000)
+    parser.add_argument('--jobs', type=int, default=JOB_COUNT)
+    args = parser.parse_args()
+
+    matcher = build_matcher(args.resumes, args.jobs)
+    for metric in ('overlap', 'jaccard', 'cosine'):
+        start = time.perf_counter()
+        matcher.score_all(metric, k=10)
+        print(f"{metric:8s} {args.resumes} x {args.jobs}: {time.perf_counter() - start:.2f}s")
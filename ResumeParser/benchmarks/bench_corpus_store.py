@@ -0,0 +1,46 @@
+"""
+Benchmarks for filtering and grouping a corpus: columnar store vs. model_dump() dicts
+"""
+
+import random
+from collections import Counter
+from typing import Any, Callable, Dict
+
+from corpus_store import CorpusStore
+from synthetic_corpus import CorpusConfig, generate_resume
+
+CORPUS_SIZE = 5000
+
+
+def _scan_filter(dumps, skill, company):
+    return [
+        i for i, resume in enumerate(dumps)
+        if company in {exp['company'] for exp in resume['experience']}
+        and (skill in {s['name'] for s in resume['skills']}
+             or any(skill in exp['skills_used'] for exp in resume['experience']))
+    ]
+
+
+def _scan_group(dumps):
+    counts = Counter()
+    for resume in dumps:
+        counts.update({s['name'] for s in resume['skills']} |
+                      {name for exp in resume['experience'] for name in exp['skills_used']})
+    return counts.most_common(10)
+
+
+def collect() -> Dict[str, Callable[[], Any]]:
+    rng = random.Random(0)
+    config = CorpusConfig()
+    resumes = [(f'resume-{i}', generate_resume(rng, config, i)) for i in range(CORPUS_SIZE)]
+    dumps = [resume.model_dump() for _, resume in resumes]
+    store = CorpusStore.from_resumes(resumes)
+    store.filter(skill='Python')  # warm the column caches
+
+    return {
+        'corpus.filter.store': lambda: store.filter(skill='Python', company='Acme Corp'),
+        'corpus.filter.dicts': lambda: _scan_filter(dumps, 'Python', 'Acme Corp'),
+        'corpus.group_skills.store': lambda: store.group_count('skill', top=10),
+        'corpus.group_skills.dicts': lambda: _scan_group(dumps),
+        'corpus.get.store': lambda: store.get(CORPUS_SIZE // 2),
+    }
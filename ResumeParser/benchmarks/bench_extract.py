@@ -0,0 +1,28 @@
+"""
+Benchmarks for text extraction from PDF, DOCX and TXT files
+"""
+
+import os
+import tempfile
+from typing import Any, Callable, Dict
+
+from fixtures import write_documents
+from resume_parser import ResumeParser
+
+SIZES = {'small': 5, 'large': 60}
+
+# Kept at module level so the files outlive collect()
+_tmpdir = tempfile.TemporaryDirectory()
+
+
+def collect() -> Dict[str, Callable[[], Any]]:
+    parser = ResumeParser("Anthropic", "benchmark")
+    benchmarks = {}
+    for size, roles in SIZES.items():
+        directory = os.path.join(_tmpdir.name, size)
+        os.makedirs(directory, exist_ok=True)
+        paths = write_documents(directory, roles=roles)
+        benchmarks[f'extract.pdf.{size}'] = lambda p=paths['pdf']: parser._extract_from_pdf(p)
+        benchmarks[f'extract.docx.{size}'] = lambda p=paths['docx']: parser._extract_from_docx(p)
+        benchmarks[f'extract.txt.{size}'] = lambda p=paths['txt']: parser._extract_from_txt(p)
+    return benchmarks
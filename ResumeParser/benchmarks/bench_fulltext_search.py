@@ -0,0 +1,149 @@
+"""
+Latency of full-text candidate search against a live Neo4j database.
+
+Unlike the rest of the suite this needs a server, so it is not part of
+benchmarks/run.py. It loads synthetic resumes (summary, experience
+descriptions, projects and skills) into a scratch database in UNWIND
+batches, creates the full-text indexes, then times search_resumes for
+keyword queries: first pages, deep pages and skill-filtered searches, next
+to the CONTAINS scan the indexes replace.
+
+    python benchmarks/bench_fulltext_search.py --uri bolt://localhost:7687 --password secret --resumes 100000
+    python benchmarks/bench_fulltext_search.py --password secret --skip-load    # reuse loaded data
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from typing import Callable, Dict, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from load_driver import percentiles
+from query_registry import define
+from resume_search import SearchFilters, ensure_indexes, search_resumes
+from synthetic_corpus import CorpusConfig, generate_resume, skill_vocabulary
+
+LOAD_BATCH = define('bench.load_resumes', """
+    UNWIND $resumes AS row
+    CREATE (r:Resume {id: row.id, name: row.name, summary: row.summary, ingested_at: datetime()})
+    WITH r, row
+    CALL {
+        WITH r, row
+        UNWIND row.experience AS exp
+        MERGE (c:Company {name: exp.company})
+        CREATE (r)-[:HAS_EXPERIENCE {position: exp.position, description: exp.description}]->(c)
+    }
+    CALL {
+        WITH r, row
+        UNWIND row.projects AS project
+        CREATE (r)-[:HAS_PROJECT]->(:Project {name: project.name, description: project.description})
+    }
+    CALL {
+        WITH r, row
+        UNWIND row.skills AS skill
+        MERGE (s:Skill {name: skill})
+        MERGE (r)-[:HAS_SKILL]->(s)
+    }
+""")
+
+SKILL_INDEX = define('bench.skill_name_index', "CREATE INDEX skill_name IF NOT EXISTS FOR (s:Skill) ON (s.name)")
+AWAIT_INDEXES = define('bench.await_indexes', "CALL db.awaitIndexes(3600)")
+
+# What search replaces: a scan of every text property with CONTAINS
+CONTAINS_SCAN = define('bench.contains_scan', """
+    MATCH (r:Resume)
+    WHERE toLower(r.summary) CONTAINS $term
+       OR EXISTS { MATCH (r)-[e:HAS_EXPERIENCE]->() WHERE toLower(e.description) CONTAINS $term }
+       OR EXISTS { MATCH (r)-[:HAS_PROJECT]->(p) WHERE toLower(p.description) CONTAINS $term }
+    RETURN count(r) AS matches
+""")
+
+QUERIES = ['kubernetes migration', 'python services millions requests', 'design reviews platform',
+           'on-call incidents', 'deep learning open source', 'legacy systems costs', 'elasticsearch',
+           'mentored engineers go', 'scala sql infrastructure', 'react frontend']
+
+
+def load(driver, count: int, batch_size: int = 2000) -> float:
+    """Create count synthetic resumes; returns seconds taken"""
+    config = CorpusConfig(count=count)
+    vocabulary = skill_vocabulary(config.vocabulary_size)
+    rng = random.Random(0)
+    started = time.perf_counter()
+    with driver.session() as session:
+        session.run(SKILL_INDEX).consume()
+        for offset in range(0, count, batch_size):
+            rows = []
+            for i in range(offset, min(count, offset + batch_size)):
+                resume = generate_resume(rng, config, i, vocabulary)
+                rows.append({
+                    'id': f'bench-{i:07d}',
+                    'name': resume.personal_info.get('name', ''),
+                    'summary': resume.summary or '',
+                    'experience': [{'company': exp.company, 'position': exp.position, 'description': exp.description}
+                                   for exp in resume.experience],
+                    'projects': [{'name': p.name, 'description': p.description} for p in resume.projects],
+                    'skills': sorted({skill.name for skill in resume.skills}),
+                })
+            session.run(LOAD_BATCH, resumes=rows).consume()
+            print(f"\rloaded {min(count, offset + batch_size)}/{count}", end='', flush=True)
+    print()
+    return time.perf_counter() - started
+
+
+def timed(func: Callable[[], object], runs: int) -> Dict[str, float]:
+    latencies: List[float] = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        latencies.append(time.perf_counter() - start)
+    return percentiles(latencies)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--uri', default='bolt://localhost:7687')
+    parser.add_argument('--user', default='neo4j')
+    parser.add_argument('--password', default='password')
+    parser.add_argument('--resumes', type=int, default=100_000)
+    parser.add_argument('--runs', type=int, default=5, help='timed runs per query and scenario')
+    parser.add_argument('--skip-load', action='store_true', help='search data loaded by an earlier run')
+    args = parser.parse_args(argv)
+
+    from neo4j import GraphDatabase
+    driver = GraphDatabase.driver(args.uri, auth=(args.user, args.password))
+    try:
+        if not args.skip_load:
+            seconds = load(driver, args.resumes)
+            print(f"Loaded {args.resumes} resumes in {seconds:.1f}s")
+        started = time.perf_counter()
+        ensure_indexes(driver)
+        with driver.session() as session:
+            session.run(AWAIT_INDEXES).consume()
+        print(f"Full-text indexes online in {time.perf_counter() - started:.1f}s")
+
+        scenarios = {
+            'page 1': lambda q: search_resumes(driver, q, page=1),
+            'page 10': lambda q: search_resumes(driver, q, page=10),
+            'skill filter': lambda q: search_resumes(driver, q, SearchFilters(skills=['Python'])),
+        }
+        # Warm the page cache and plan cache before timing
+        for query in QUERIES:
+            search_resumes(driver, query)
+
+        for name, scenario in scenarios.items():
+            summary = timed(lambda: [scenario(query) for query in QUERIES], args.runs)
+            print(f"search {name:14s} " + ' '.join(f"{key}={value / len(QUERIES) * 1e3:.1f}ms"
+                                                  for key, value in summary.items()))
+        with driver.session() as session:
+            scan = timed(lambda: session.run(CONTAINS_SCAN, term='kubernetes').consume(), max(1, args.runs // 2))
+        print("contains scan       " + ' '.join(f"{key}={value * 1e3:.1f}ms" for key, value in scan.items()))
+    finally:
+        driver.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
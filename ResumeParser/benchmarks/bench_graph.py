@@ -0,0 +1,27 @@
+"""
+Benchmarks for Cypher statement generation in Neo4jManager
+"""
+
+from typing import Any, Callable, Dict
+
+from fakes import RecordingDriver
+from fixtures import resume_payload
+from metrics import MetricsRegistry
+from neo4j_manager import Neo4jManager
+from resume_schema import ResumeData
+
+
+def collect() -> Dict[str, Callable[[], Any]]:
+    driver = RecordingDriver()
+    manager = Neo4jManager("bolt://unused", "neo4j", "unused", metrics=MetricsRegistry(), driver=driver)
+    benchmarks = {}
+    for size, (roles, skills) in {'small': (2, 8), 'large': (60, 300)}.items():
+        resume = ResumeData(**resume_payload(roles=roles, skills=skills))
+
+        def ingest(resume=resume):
+            driver.reset()
+            manager.create_resume_node(resume, 'benchmark-resume')
+            return len(driver.statements)
+
+        benchmarks[f'graph.create_resume_node.{size}'] = ingest
+    return benchmarks
@@ -0,0 +1,77 @@
+"""
+Cold-start import budget for the modules CLI tools and workers load first.
+
+    python benchmarks/bench_import_time.py     # exit 1 if a budget is exceeded
+
+Each module is imported in a fresh interpreter under `-X importtime` and
+its cumulative import time is checked against a budget, together with a
+list of heavy optional packages that must not load until a provider or
+file format actually needs them. Run through benchmarks/run.py, the cold
+imports are also timed so --compare catches regressions below the budget.
+"""
+
+import os
+import subprocess
+import sys
+from typing import Any, Callable, Dict, List, Tuple
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+
+# Cumulative import time per module in milliseconds, with headroom for slower machines
+BUDGETS_MS = {
+    'resume_parser': 500,
+    'neo4j_manager': 500,
+    'fakes': 500,
+    'service': 600,
+}
+
+# Loaded on first use by a provider, extractor or real database connection only
+LAZY_MODULES = ('openai', 'google.generativeai', 'PyPDF2', 'docx', 'requests', 'neo4j')
+
+
+def _run(module: str, *flags: str) -> subprocess.CompletedProcess:
+    code = (f"import sys, {module}; "
+            f"print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))")
+    env = dict(os.environ, PYTHONPATH=SRC_DIR)
+    return subprocess.run([sys.executable, *flags, '-c', code], capture_output=True, text=True,
+                          check=True, env=env, cwd=SRC_DIR)
+
+
+def import_time(module: str, runs: int = 3) -> Tuple[float, List[str]]:
+    """Best cumulative import time of module in ms over runs, and the lazy modules it loaded"""
+    best = float('inf')
+    loaded: List[str] = []
+    for _ in range(runs):
+        result = _run(module, '-X', 'importtime')
+        for line in result.stderr.splitlines():
+            # import time: self [us] | cumulative | imported package
+            parts = [part.strip() for part in line.split('|')]
+            if len(parts) == 3 and parts[2] == module:
+                best = min(best, int(parts[1]) / 1000)
+        loaded = [name for name in result.stdout.strip().split(',') if name]
+    return best, loaded
+
+
+def check_budgets(budgets: Dict[str, float] = BUDGETS_MS) -> List[str]:
+    """Descriptions of every exceeded budget or eagerly loaded module"""
+    failures = []
+    for module, budget in budgets.items():
+        elapsed, loaded = import_time(module)
+        status = 'ok' if elapsed <= budget and not loaded else 'FAIL'
+        print(f"{module:20s} {elapsed:8.1f} ms  budget {budget:6.0f} ms  {status}")
+        if elapsed > budget:
+            failures.append(f"{module} imports in {elapsed:.0f} ms, over its {budget} ms budget")
+        if loaded:
+            failures.append(f"{module} loads {', '.join(loaded)} at import time")
+    return failures
+
+
+def collect() -> Dict[str, Callable[[], Any]]:
+    return {f'import.{module}.cold': lambda m=module: _run(m) for module in BUDGETS_MS}
+
+
+if __name__ == '__main__':
+    problems = check_budgets()
+    for problem in problems:
+        print(problem)
+    sys.exit(1 if problems else 0)
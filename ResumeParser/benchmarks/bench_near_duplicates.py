@@ -0,0 +1,42 @@
+"""
+Benchmarks for near-duplicate lookups before the LLM call
+"""
+
+import itertools
+import os
+import random
+import tempfile
+from typing import Any, Callable, Dict
+
+from near_duplicates import NearDuplicateIndex
+from synthetic_corpus import CorpusConfig, generate_resume, skill_vocabulary
+from text_index import resume_text
+
+DOCUMENT_COUNT = 10_000
+QUERY_COUNT = 200
+
+
+def build_index(directory: str, count: int = DOCUMENT_COUNT):
+    """Index of synthetic resume text, and held-out texts that match nothing"""
+    config = CorpusConfig(count=count, vocabulary_size=2000)
+    vocabulary = skill_vocabulary(config.vocabulary_size)
+    rng = random.Random(0)
+    texts = [resume_text(generate_resume(rng, config, i, vocabulary)) for i in range(count + QUERY_COUNT)]
+    index = NearDuplicateIndex(os.path.join(directory, 'near-duplicates.db'))
+    for i, text in enumerate(texts[:count]):
+        index.add(text, f'resume-{i:06d}')
+    return index, texts[:QUERY_COUNT], texts[count:]
+
+
+def collect() -> Dict[str, Callable[[], Any]]:
+    # Kept alive for the lifetime of the benchmark process
+    directory = tempfile.mkdtemp(prefix='bench_near_duplicates_')
+    index, indexed, unseen = build_index(directory)
+    duplicates = itertools.cycle([text.upper() + ' updated' for text in indexed])
+    misses = itertools.cycle(unseen)
+
+    return {
+        'near_duplicates.signature': lambda: index.signature(next(misses)),
+        'near_duplicates.find_hit.10k': lambda: index.find(next(duplicates)),
+        'near_duplicates.find_miss.10k': lambda: index.find(next(misses)),
+    }
@@ -0,0 +1,58 @@
+"""
+Benchmarks for decoding LLM responses and validating ResumeData
+"""
+
+import json
+from typing import Any, Callable, Dict
+
+from fixtures import llm_responses, resume_payload
+from metrics import MetricsRegistry
+from resume_parser import ResumeParser
+from resume_schema import ResumeData, RESUME_ADAPTER
+
+
+def _expect_failure(func, *args):
+    try:
+        func(*args)
+    except Exception:
+        return None
+    raise AssertionError('malformed payload was accepted')
+
+
+def collect() -> Dict[str, Callable[[], Any]]:
+    # A private registry keeps benchmark samples out of the process-wide metrics
+    parser = ResumeParser("Anthropic", "benchmark", metrics=MetricsRegistry())
+    recovering_parser = ResumeParser("Anthropic", "benchmark", metrics=MetricsRegistry(), partial_recovery=True)
+    responses = llm_responses()
+    benchmarks = {}
+    for scenario in ('small', 'large', 'fenced'):
+        benchmarks[f'parse_llm_response.{scenario}'] = (
+            lambda r=responses[scenario]: parser._parse_llm_response(r)
+        )
+    for scenario in ('truncated', 'trailing_comma', 'invalid_schema'):
+        benchmarks[f'parse_llm_response.{scenario}'] = (
+            lambda r=responses[scenario]: _expect_failure(parser._parse_llm_response, r)
+        )
+        benchmarks[f'parse_llm_response.recover.{scenario}'] = (
+            lambda r=responses[scenario]: recovering_parser._parse_llm_response(r)
+        )
+
+    # Decode strategies side by side: keyword expansion (the original), the cached
+    # adapter on a decoded dict (current), and single-pass validation in pydantic-core
+    for scenario in ('small', 'large'):
+        raw = responses[scenario]
+        raw_bytes = raw.encode()
+        benchmarks[f'decode.loads_then_model.{scenario}'] = lambda r=raw: ResumeData(**json.loads(r))
+        benchmarks[f'decode.loads_then_adapter.{scenario}'] = lambda r=raw: RESUME_ADAPTER.validate_python(json.loads(r))
+        benchmarks[f'decode.validate_json.{scenario}'] = lambda r=raw: RESUME_ADAPTER.validate_json(r)
+        benchmarks[f'decode.validate_json_bytes.{scenario}'] = lambda r=raw_bytes: RESUME_ADAPTER.validate_json(r)
+
+    for size, (roles, skills) in {'small': (2, 8), 'large': (60, 300)}.items():
+        payload = resume_payload(roles=roles, skills=skills)
+        model = ResumeData(**payload)
+        benchmarks[f'resume_data.validate.{size}'] = lambda p=payload: ResumeData(**p)
+        benchmarks[f'resume_data.dump.{size}'] = lambda m=model: m.model_dump()
+        benchmarks[f'resume_data.json_roundtrip.{size}'] = (
+            lambda m=model: ResumeData(**json.loads(m.model_dump_json()))
+        )
+    return benchmarks
@@ -0,0 +1,58 @@
+"""
+Benchmarks for in-process job matching with the inverted skill index
+"""
+
+import itertools
+import random
+from typing import Any, Callable, Dict
+
+from metrics import MetricsRegistry
+from skill_canonicalizer import SkillCanonicalizer
+from skill_index import SkillIndex
+from synthetic_corpus import generate_jobs
+
+JOB_COUNT = 100_000
+QUERY_COUNT = 200
+RESUME_SKILLS = 20
+
+
+def build_index(job_count: int = JOB_COUNT):
+    """Index and resume-like queries drawn from the same skill distribution"""
+    jobs = generate_jobs(job_count)
+    index = SkillIndex.from_jobs(((job['id'], job['skills'], job) for job in jobs),
+                                 canonicalizer=SkillCanonicalizer(), metrics=MetricsRegistry())
+    rng = random.Random(1)
+    pool = [skill for job in jobs[:5000] for skill in job['skills']]
+    queries = [list({rng.choice(pool) for _ in range(RESUME_SKILLS)}) for _ in range(QUERY_COUNT)]
+    return index, queries
+
+
+def collect() -> Dict[str, Callable[[], Any]]:
+    index, queries = build_index()
+    for query in queries:
+        index.search(query)  # warm the masks of common skills
+    cycle = itertools.cycle(queries)
+    added = itertools.count()
+
+    return {
+        'skill_index.search.100k': lambda: index.search(next(cycle), 20),
+        'skill_index.match.100k': lambda: index.match(next(cycle), 20),
+        'skill_index.add_job.100k': lambda: index.add_job(f'bench-{next(added)}', next(cycle)[:10]),
+    }
+
+
+if __name__ == '__main__':
+    import time
+    from load_driver import percentiles
+
+    index, queries = build_index()
+    for query in queries:
+        index.search(query)
+    latencies = []
+    for query in queries * 5:
+        start = time.perf_counter()
+        index.search(query, 20)
+        latencies.append(time.perf_counter() - start)
+    summary = percentiles(latencies)
+    print(f"{len(index)} jobs, {index.nbytes() / 1e6:.1f} MB of postings")
+    print(' '.join(f"{key}={value * 1e6:.0f}us" for key, value in summary.items()))
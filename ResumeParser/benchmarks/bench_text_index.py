@@ -0,0 +1,65 @@
+"""
+Benchmarks for approximate nearest-neighbour search over resume text
+"""
+
+import itertools
+import random
+import tempfile
+from typing import Any, Callable, Dict
+
+from synthetic_corpus import CorpusConfig, generate_resume, skill_vocabulary
+from text_index import TextIndex, resume_text
+
+DOCUMENT_COUNT = 10_000
+QUERY_COUNT = 200
+
+
+def build_index(directory: str, count: int = DOCUMENT_COUNT):
+    """Index of synthetic resume text and embedded queries from held-out resumes"""
+    config = CorpusConfig(count=count, vocabulary_size=2000)
+    vocabulary = skill_vocabulary(config.vocabulary_size)
+    rng = random.Random(0)
+    texts = [resume_text(generate_resume(rng, config, i, vocabulary)) for i in range(count + QUERY_COUNT)]
+    index = TextIndex(directory)
+    index.add_many((f'resume-{i:06d}', text) for i, text in enumerate(texts[:count]))
+    return index, texts[count:]
+
+
+def collect() -> Dict[str, Callable[[], Any]]:
+    # Kept alive for the lifetime of the benchmark process
+    directory = tempfile.mkdtemp(prefix='bench_text_index_')
+    index, queries = build_index(directory)
+    vectors = itertools.cycle([index.embed(text) for text in queries])
+    texts = itertools.cycle(queries)
+    added = itertools.count()
+
+    return {
+        'text_index.embed': lambda: index.embed(next(texts)),
+        'text_index.search_vector.10k': lambda: index.search_vector(next(vectors), 10),
+        'text_index.add.10k': lambda: index.add(f'bench-{next(added)}', next(texts)),
+    }
+
+
+if __name__ == '__main__':
+    import argparse
+    import shutil
+    import time
+    from load_driver import percentiles
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--documents', type=int, default=100_000)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix='bench_text_index_')
+    try:
+        index, queries = build_index(directory, args.documents)
+        latencies = []
+        for text in queries * 3:
+            start = time.perf_counter()
+            index.search(text, 10)
+            latencies.append(time.perf_counter() - start)
+        summary = percentiles(latencies)
+        print(f"{len(index)} documents, {index.nbytes() / 1e6:.1f} MB")
+        print(' '.join(f"{key}={value * 1e3:.2f}ms" for key, value in summary.items()))
+    finally:
+        shutil.rmtree(directory)
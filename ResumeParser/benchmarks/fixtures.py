@@ -0,0 +1,102 @@
+"""
+Deterministic inputs for the benchmark suite
+"""
+
+import json
+import os
+from typing import Any, Dict, List
+
+from synthetic_corpus import write_docx, write_pdf, write_txt
+
+
+def resume_lines(roles: int = 12) -> List[str]:
+    """Plain-text resume with the given number of work history entries"""
+    lines = [
+        'Jane Example',
+        'Senior Software Engineer',
+        'jane.example@email.com | (555) 010-0199 | Springfield, USA',
+        '',
+        'SUMMARY',
+        'Engineer with a decade of experience building data platforms and web services.',
+        '',
+        'EXPERIENCE',
+    ]
+    for i in range(roles):
+        lines += [
+            f'Software Engineer {i + 1}',
+            f'Company {i % 7} Inc., {2010 + i}-01 to {2011 + i}-01',
+            'Built and operated distributed services in Python, Go and PostgreSQL.',
+            'Led migrations to Kubernetes, reduced latency and mentored junior engineers.',
+            '',
+        ]
+    lines += [
+        'EDUCATION',
+        'Bachelor of Science in Computer Science, State University, 2006-2010',
+        '',
+        'SKILLS',
+        'Python, Go, SQL, PostgreSQL, Kubernetes, Docker, AWS, React, TypeScript',
+    ]
+    return lines
+
+
+def write_documents(directory: str, roles: int = 12) -> Dict[str, str]:
+    """Write the same resume as TXT, DOCX and PDF and return the paths by format"""
+    lines = resume_lines(roles)
+    return {
+        'txt': write_txt(os.path.join(directory, 'resume.txt'), lines),
+        'docx': write_docx(os.path.join(directory, 'resume.docx'), lines),
+        'pdf': write_pdf(os.path.join(directory, 'resume.pdf'), lines),
+    }
+
+
+def resume_payload(roles: int = 10, skills: int = 40) -> Dict[str, Any]:
+    """LLM-style resume JSON with the given number of roles and skills"""
+    return {
+        'personal_info': {'name': 'Jane Example', 'email': 'jane.example@email.com', 'phone': '(555) 010-0199'},
+        'summary': 'Engineer with a decade of experience building data platforms and web services.',
+        'education': [{
+            'institute': 'State University',
+            'degree': "Bachelor's",
+            'major': ['Computer Science'],
+            'dates': {'from_date': '2006-09', 'to_date': '2010-05'},
+            'courses': ['Algorithms', 'Databases', 'Operating Systems'],
+            'gpa': '3.8',
+        }],
+        'experience': [{
+            'position': f'Software Engineer {i + 1}',
+            'company': f'Company {i % 7} Inc.',
+            'dates': {'from_date': f'{2010 + i}-01', 'to_date': f'{2011 + i}-01'},
+            'description': 'Built and operated distributed services. ' * 5,
+            'skills_used': [f'Skill {(i * 3 + k) % skills}' for k in range(5)],
+            'location': 'Springfield, USA',
+        } for i in range(roles)],
+        'skills': [
+            {'name': f'Skill {k}', 'category': 'Technical', 'proficiency': 'Advanced'}
+            for k in range(skills)
+        ],
+        'projects': [{
+            'name': f'Project {k}',
+            'description': 'Open source tooling for data pipelines.',
+            'technologies': ['Python', 'SQL'],
+            'dates': {'from_date': '2019-01', 'to_date': '2019-06'},
+        } for k in range(3)],
+        'certifications': [{'name': 'Cloud Architect', 'issuer': 'Cloud Vendor', 'date': '2020-01'}],
+        'languages': ['English', None, 'Spanish', ''],
+        'achievements': ['Speaker at PyCon', None],
+    }
+
+
+def llm_responses() -> Dict[str, str]:
+    """Well-formed and malformed LLM responses keyed by scenario"""
+    small = json.dumps(resume_payload(roles=2, skills=8))
+    large = json.dumps(resume_payload(roles=60, skills=300))
+    missing_field = resume_payload(roles=2, skills=8)
+    del missing_field['experience'][0]['company']
+    return {
+        'small': small,
+        'large': large,
+        'fenced': '```json\n' + small + '\n```',
+        'truncated': large[: len(large) // 2],
+        'trailing_comma': small[:-1] + ',}',
+        'invalid_schema': json.dumps(missing_field),
+    }
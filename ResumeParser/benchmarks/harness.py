@@ -0,0 +1,113 @@
+"""
+Timing, storage and comparison helpers for the benchmark suite
+"""
+
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+
+def _calibrate(func: Callable[[], Any], min_time: float) -> int:
+    """Find a loop count whose total run time is at least min_time"""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or number >= 1_000_000:
+            return number
+        number *= 10 if elapsed < min_time / 10 else 2
+
+
+def measure(name: str, func: Callable[[], Any], repeat: int = 5, min_time: float = 0.05) -> Dict[str, Any]:
+    """Time func and return per-call statistics in seconds"""
+    number = _calibrate(func, min_time)
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append((time.perf_counter() - start) / number)
+    return {
+        'name': name,
+        'loops': number,
+        'repeat': repeat,
+        'min': min(timings),
+        'median': statistics.median(timings),
+        'mean': statistics.fmean(timings),
+        'stdev': statistics.stdev(timings) if len(timings) > 1 else 0.0,
+    }
+
+
+def git_commit() -> Optional[str]:
+    """Return the current commit hash, or None outside a git checkout"""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def build_report(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    return {
+        'commit': git_commit(),
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'benchmarks': {result['name']: result for result in results},
+    }
+
+
+def save_report(report: Dict[str, Any], path: Optional[str] = None) -> str:
+    """Write a report as JSON, by default to results/<commit>.json"""
+    if path is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        path = os.path.join(RESULTS_DIR, f"{report['commit'] or 'local'}.json")
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    return path
+
+
+def load_report(path_or_commit: str) -> Dict[str, Any]:
+    """Load a report from a file path or from the results of a commit"""
+    path = path_or_commit
+    if not os.path.exists(path):
+        path = os.path.join(RESULTS_DIR, f'{path_or_commit}.json')
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float = 0.2) -> List[Dict[str, Any]]:
+    """Compare median timings and flag benchmarks slower than baseline by more than threshold"""
+    rows = []
+    for name, result in current['benchmarks'].items():
+        before = baseline['benchmarks'].get(name)
+        if not before or not before['median']:
+            continue
+        ratio = result['median'] / before['median']
+        rows.append({
+            'name': name,
+            'baseline': before['median'],
+            'current': result['median'],
+            'ratio': ratio,
+            'regression': ratio > 1 + threshold,
+        })
+    return rows
+
+
+def format_seconds(value: float) -> str:
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+        if value >= scale:
+            return f'{value / scale:.2f}{unit}'
+    return f'{value / 1e-9:.0f}ns'
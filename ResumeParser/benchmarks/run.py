@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Run the benchmark suite and store the results as JSON.
+
+    python benchmarks/run.py                       # writes results/<commit>.json
+    python benchmarks/run.py --filter extract      # only matching benchmarks
+    python benchmarks/run.py --compare <commit>    # fail on regressions vs. a stored run
+
+No external services are needed: the LLM is never called and graph writes
+go to a recording fake driver.
+"""
+
+import argparse
+import importlib
+import os
+import sys
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(BENCH_DIR), 'src'))
+sys.path.insert(0, BENCH_DIR)
+
+from harness import build_report, compare, format_seconds, load_report, measure, save_report
+
+MODULES = ['bench_extract', 'bench_parse', 'bench_graph', 'bench_corpus_store', 'bench_skill_index', 'bench_batch_matching', 'bench_text_index', 'bench_near_duplicates', 'bench_import_time']
+
+
+def collect_benchmarks(pattern: str = ''):
+    benchmarks = {}
+    for module_name in MODULES:
+        module = importlib.import_module(module_name)
+        for name, func in module.collect().items():
+            if pattern in name:
+                benchmarks[name] = func
+    return benchmarks
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--filter', default='', help='only run benchmarks whose name contains this string')
+    parser.add_argument('--repeat', type=int, default=5, help='timed samples per benchmark')
+    parser.add_argument('--min-time', type=float, default=0.05, help='minimum seconds per sample')
+    parser.add_argument('--output', help='result file (default: results/<commit>.json)')
+    parser.add_argument('--compare', help='baseline result file or commit to compare against')
+    parser.add_argument('--threshold', type=float, default=0.2, help='allowed slowdown before failing (0.2 = 20%%)')
+    args = parser.parse_args(argv)
+
+    results = []
+    for name, func in sorted(collect_benchmarks(args.filter).items()):
+        result = measure(name, func, repeat=args.repeat, min_time=args.min_time)
+        results.append(result)
+        print(f"{name:45s} median {format_seconds(result['median']):>10s}  "
+              f"min {format_seconds(result['min']):>10s}  loops {result['loops']}")
+
+    report = build_report(results)
+    path = save_report(report, args.output)
+    print(f'\nResults written to {path}')
+
+    if args.compare:
+        rows = compare(load_report(args.compare), report, args.threshold)
+        regressions = [row for row in rows if row['regression']]
+        for row in rows:
+            flag = 'REGRESSION' if row['regression'] else ''
+            print(f"{row['name']:45s} {row['ratio']:6.2f}x {flag}")
+        if regressions:
+            print(f'\n{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}')
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -6,6 +6,7 @@ Main entry point for Resume Parser & Knowledge Graph Builder
 import sys
 import os
 import subprocess
+import importlib.util
 
 # Add src directory to Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
@@ -13,8 +14,11 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 def main():
     """Main entry point"""
     try:
-        # Check if streamlit is installed
-        subprocess.run([sys.executable, "-c", "import streamlit"], check=True)
+        # Check if streamlit is installed, without importing it or starting another interpreter
+        if importlib.util.find_spec("streamlit") is None:
+            print("❌ Error: Streamlit is not installed.")
+            print("💡 Please run: pip install -r requirements.txt")
+            sys.exit(1)
         
         # Run the app
         print("🚀 Starting Resume Parser & Knowledge Graph Builder...")
@@ -27,10 +31,6 @@ def main():
             "--server.address", "localhost"
         ])
         
-    except subprocess.CalledProcessError:
-        print("❌ Error: Streamlit is not installed.")
-        print("💡 Please run: pip install -r requirements.txt")
-        sys.exit(1)
     except KeyboardInterrupt:
         print("\n👋 Application stopped by user.")
         sys.exit(0)
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Add native dates and per-skill tenure to resumes ingested before ingest wrote them.
+
+Sets start_date, end_date and current on HAS_EXPERIENCE and HAS_EDUCATION
+relationships from their string dates, and tenure_months on HAS_SKILL from
+each resume's stored profile, then creates the range indexes. It is safe to
+run again: relationships that already have dates are left alone.
+
+Tenure of resumes with an ongoing role is then brought up to the current
+month; run with --ongoing-only monthly to do only that.
+
+    python scripts/backfill_temporal.py --uri bolt://localhost:7687 --password secret
+    python scripts/backfill_temporal.py --password secret --ongoing-only
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from neo4j import GraphDatabase
+
+import temporal
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--uri', default='bolt://localhost:7687')
+    parser.add_argument('--user', default='neo4j')
+    parser.add_argument('--password', default='password')
+    parser.add_argument('--batch-size', type=int, default=1000, help='rows written per transaction')
+    parser.add_argument('--ongoing-only', action='store_true',
+                        help='only refresh tenure of resumes with an ongoing role')
+    args = parser.parse_args(argv)
+
+    driver = GraphDatabase.driver(args.uri, auth=(args.user, args.password))
+    try:
+        started = time.perf_counter()
+        if args.ongoing_only:
+            refreshed = temporal.refresh_ongoing_tenure(driver, batch_size=args.batch_size)
+            print(f"✅ Refreshed tenure for {refreshed} resumes with an ongoing role "
+                  f"in {time.perf_counter() - started:.1f}s")
+            return 0
+        report = temporal.backfill(driver, batch_size=args.batch_size)
+        temporal.ensure_indexes(driver)
+        print(f"✅ Dated {report['relationships']} relationships, set tenure for {report['resumes']} resumes "
+              f"and refreshed {report['ongoing']} with an ongoing role in {time.perf_counter() - started:.1f}s")
+    finally:
+        driver.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
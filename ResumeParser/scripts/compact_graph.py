@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Collapse the parallel edges older ingests created between shared nodes.
+
+Ingest now merges these edges and counts occurrences on them; run this
+once to bring edges stored before that into the same shape. It is safe to
+run again: already compacted edges are left alone.
+
+    python scripts/compact_graph.py --uri bolt://localhost:7687 --password secret
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from neo4j import GraphDatabase
+
+import graph_compaction
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--uri', default='bolt://localhost:7687')
+    parser.add_argument('--user', default='neo4j')
+    parser.add_argument('--password', default='password')
+    parser.add_argument('--batch-size', type=int, default=500, help='start nodes compacted per transaction')
+    args = parser.parse_args(argv)
+
+    driver = GraphDatabase.driver(args.uri, auth=(args.user, args.password))
+    try:
+        started = time.perf_counter()
+        report = graph_compaction.compact(driver, batch_size=args.batch_size)
+        for row in report['relationships']:
+            print(f"{row['relationship']:45s} {row['edges_before']:10d} -> {row['edges_after']:10d} edges")
+        print(f"✅ Deleted {report['edges_deleted']} parallel edges, about "
+              f"{report['bytes_reclaimed'] / 1024 / 1024:.1f} MiB of relationship records, "
+              f"in {time.perf_counter() - started:.1f}s")
+    finally:
+        driver.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Export the resume graph as partitioned Parquet tables for offline analytics.
+
+Writes one directory per table (resumes, skills, companies, institutes,
+resume_skills, resume_education, resume_experience) plus manifest.json.
+Install pyarrow for streaming Arrow writes; otherwise pandas writes one
+file per batch, and --format csv works without any Parquet engine.
+
+    python scripts/export_graph.py --uri bolt://localhost:7687 --password secret --out export/
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from neo4j import GraphDatabase
+
+import graph_export
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--uri', default='bolt://localhost:7687')
+    parser.add_argument('--user', default='neo4j')
+    parser.add_argument('--password', default='password')
+    parser.add_argument('--out', default='graph-export')
+    parser.add_argument('--format', choices=graph_export.FORMATS, default=graph_export.PARQUET)
+    parser.add_argument('--tables', nargs='+', choices=sorted(graph_export.TABLES), help='default: all tables')
+    parser.add_argument('--fetch-size', type=int, default=10_000, help='records per driver fetch')
+    parser.add_argument('--batch-rows', type=int, default=50_000, help='rows per record batch')
+    parser.add_argument('--rows-per-file', type=int, default=1_000_000)
+    parser.add_argument('--workers', type=int, default=4, help='tables exported concurrently')
+    args = parser.parse_args(argv)
+
+    driver = GraphDatabase.driver(args.uri, auth=(args.user, args.password))
+    try:
+        started = time.perf_counter()
+        manifest = graph_export.export_graph(
+            driver, args.out, tables=args.tables, fmt=args.format, fetch_size=args.fetch_size,
+            batch_rows=args.batch_rows, rows_per_file=args.rows_per_file, workers=args.workers)
+        for table, entry in manifest['tables'].items():
+            print(f"{table:20s} {entry['rows']:12d} rows  {len(entry['files']):4d} files  {entry['seconds']:8.1f}s")
+        total = sum(entry['rows'] for entry in manifest['tables'].values())
+        print(f"✅ Exported {total} rows to {args.out} in {time.perf_counter() - started:.1f}s")
+    finally:
+        driver.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Generate a synthetic resume corpus with ground-truth JSON.
+
+    python scripts/generate_corpus.py corpus/ --count 1000 --max-roles 8 --overlap 0.7
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from synthetic_corpus import CorpusConfig, FORMATS, generate_corpus
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('output_dir')
+    parser.add_argument('--count', type=int, default=100, help='number of resumes')
+    parser.add_argument('--min-roles', type=int, default=1)
+    parser.add_argument('--max-roles', type=int, default=5)
+    parser.add_argument('--skills', type=int, default=12, help='skills per resume')
+    parser.add_argument('--vocabulary', type=int, default=CorpusConfig.vocabulary_size, help='distinct skills overall')
+    parser.add_argument('--overlap', type=float, default=0.5, help='share of skills drawn from a common core (0-1)')
+    parser.add_argument('--core-size', type=int, default=15, help='size of the common skill core')
+    parser.add_argument('--sentences', type=int, default=3, help='sentences per role description')
+    parser.add_argument('--formats', default=','.join(FORMATS), help='comma-separated subset of txt,docx,pdf')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    config = CorpusConfig(
+        count=args.count,
+        min_roles=args.min_roles,
+        max_roles=args.max_roles,
+        skills_per_resume=args.skills,
+        vocabulary_size=args.vocabulary,
+        overlap=args.overlap,
+        core_size=args.core_size,
+        description_sentences=args.sentences,
+        formats=tuple(fmt.strip() for fmt in args.formats.split(',') if fmt.strip()),
+        seed=args.seed,
+    )
+    manifest = generate_corpus(args.output_dir, config)
+    print(f'✅ Wrote {len(manifest)} resumes to {args.output_dir}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Merge Skill nodes that differ only in spelling into their canonical node.
+
+Relationships are moved onto the canonical Skill and each old spelling is
+kept as a SkillAlias with an ALIAS_OF edge. Run with --dry-run first to
+see the planned merges.
+
+    python scripts/merge_duplicate_skills.py --uri bolt://localhost:7687 --password secret --dry-run
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from neo4j_manager import Neo4jManager
+from skill_canonicalizer import default_canonicalizer
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--uri', default='bolt://localhost:7687')
+    parser.add_argument('--user', default='neo4j')
+    parser.add_argument('--password', default='password')
+    parser.add_argument('--aliases', help='JSON file of {"Canonical": ["alias", ...]} added to the built-in map')
+    parser.add_argument('--batch-size', type=int, default=500)
+    parser.add_argument('--dry-run', action='store_true', help='only print the planned merges')
+    args = parser.parse_args(argv)
+
+    if args.aliases:
+        default_canonicalizer.load_aliases(args.aliases)
+
+    manager = Neo4jManager(args.uri, args.user, args.password)
+    try:
+        summary = manager.merge_duplicate_skills(batch_size=args.batch_size, dry_run=args.dry_run)
+    finally:
+        manager.close()
+
+    for merge in summary['planned']:
+        print(f"{merge['duplicate']} -> {merge['canonical']}")
+    if args.dry_run:
+        print(f"🔍 {len(summary['planned'])} merges planned")
+    else:
+        print(f"✅ Merged {summary['merged']} skills, moved {summary['relationships_moved']} relationships")
+        if summary['merged']:
+            print("ℹ️  Run scripts/rebuild_skill_demand.py to recount skill demand under the merged names")
+        if summary['skipped']:
+            print(f"⚠️  Kept {len(summary['skipped'])} skills with unknown relationships: {', '.join(summary['skipped'])}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
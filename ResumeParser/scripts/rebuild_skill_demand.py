@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Recompute the materialized skill supply and demand counters from the graph.
+
+Ingest keeps the counters current; run this once to backfill data loaded
+before they existed, and after merging duplicate skills. Until the first
+run, top_skills() aggregates from the graph instead of reading them.
+
+    python scripts/rebuild_skill_demand.py --uri bolt://localhost:7687 --password secret
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from neo4j import GraphDatabase
+
+import skill_demand
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--uri', default='bolt://localhost:7687')
+    parser.add_argument('--user', default='neo4j')
+    parser.add_argument('--password', default='password')
+    parser.add_argument('--batch-size', type=int, default=1000, help='counter rows written per transaction')
+    parser.add_argument('--top', type=int, default=10, help='print this many top skills afterwards')
+    args = parser.parse_args(argv)
+
+    driver = GraphDatabase.driver(args.uri, auth=(args.user, args.password))
+    try:
+        started = time.perf_counter()
+        skill_demand.rebuild(driver, batch_size=args.batch_size)
+        print(f'✅ Rebuilt skill demand counters in {time.perf_counter() - started:.1f}s')
+        for row in skill_demand.top_skills(driver, args.top):
+            print(f"{row['skill']:30s} demand {row['demand']:6d}  supply {row['supply']:6d}")
+    finally:
+        driver.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Score every resume against every job and write the top matches as JSON lines.
+
+Resumes come from a synthetic corpus (ground-truth JSON listed in its
+manifest) or from Neo4j; jobs come from Neo4j or, with --jobs N, from the
+synthetic job generator. Each output line holds one resume and its top k
+jobs, followed by one line per job with its top candidates.
+
+    python scripts/recommend_jobs.py --neo4j-uri bolt://localhost:7687 --neo4j-password secret --output recs.jsonl
+    python scripts/recommend_jobs.py --corpus corpus/ --jobs 100000 --metric jaccard --k 20
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from batch_matching import METRICS, BatchMatcher
+from load_driver import load_ground_truth
+from resume_schema import ResumeData
+from skill_canonicalizer import default_canonicalizer
+from synthetic_corpus import generate_jobs
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--corpus', help='read resumes from this synthetic corpus instead of Neo4j')
+    parser.add_argument('--jobs', type=int, help='score against this many synthetic jobs instead of Neo4j jobs')
+    parser.add_argument('--neo4j-uri', help='read resumes and/or jobs from this Neo4j')
+    parser.add_argument('--neo4j-user', default='neo4j')
+    parser.add_argument('--neo4j-password', default='')
+    parser.add_argument('--aliases', help='JSON file of {"Canonical": ["alias", ...]} added to the built-in map')
+    parser.add_argument('--metric', choices=METRICS, default='cosine')
+    parser.add_argument('--k', type=int, default=10, help='jobs per resume')
+    parser.add_argument('--job-k', type=int, help='candidates per job (default: --k)')
+    parser.add_argument('--no-idf', action='store_true', help='weight every skill equally')
+    parser.add_argument('--output', help='JSON lines file (default: stdout)')
+    args = parser.parse_args(argv)
+
+    if not args.neo4j_uri and not (args.corpus and args.jobs):
+        parser.error('--neo4j-uri is required unless both --corpus and --jobs are given')
+    if args.aliases:
+        default_canonicalizer.load_aliases(args.aliases)
+
+    matcher = BatchMatcher(idf=not args.no_idf)
+    started = time.perf_counter()
+    if args.corpus:
+        for email, ground_truth in load_ground_truth(args.corpus).items():
+            matcher.add_resume(email, ResumeData.model_validate_json(ground_truth))
+    if args.jobs:
+        matcher.add_jobs((job['id'], job['skills']) for job in generate_jobs(args.jobs))
+    if args.neo4j_uri:
+        from neo4j import GraphDatabase
+        driver = GraphDatabase.driver(args.neo4j_uri, auth=(args.neo4j_user, args.neo4j_password))
+        try:
+            matcher.load_graph(driver, resumes=not args.corpus, jobs=not args.jobs)
+        finally:
+            driver.close()
+    loaded = time.perf_counter()
+
+    result = matcher.score_all(args.metric, k=args.k, job_k=args.job_k)
+    scored = time.perf_counter()
+
+    out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    try:
+        for resume_id, jobs in result.iter_recommendations():
+            out.write(json.dumps({'resume_id': resume_id, 'jobs': [
+                {'job_id': job_id, 'score': round(score, 6)} for job_id, score in jobs]}) + '\n')
+        for job_id, resumes in result.iter_candidates():
+            out.write(json.dumps({'job_id': job_id, 'resumes': [
+                {'resume_id': resume_id, 'score': round(score, 6)} for resume_id, score in resumes]}) + '\n')
+    finally:
+        if args.output:
+            out.close()
+
+    print(f'✅ Scored {len(result.resume_ids)} resumes x {len(result.job_ids)} jobs ({args.metric}) '
+          f'in {scored - loaded:.1f}s after {loaded - started:.1f}s loading', file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
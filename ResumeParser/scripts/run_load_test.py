@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Drive a synthetic corpus through parse-and-ingest at a target rate.
+
+By default the LLM is replaced by the local Fake provider, which replays
+the corpus ground truth after --llm-latency seconds, and graph writes go
+to a recording driver. Pass --provider/--api-key and --neo4j-uri to load
+the real services instead.
+
+    python scripts/run_load_test.py corpus/ --rate 20 --concurrency 8 --llm-latency 0.5
+"""
+
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from fakes import GroundTruthParser, RecordingDriver
+from load_driver import build_work, load_ground_truth, run_load_test
+from metrics import registry
+from neo4j_manager import Neo4jManager
+from resume_parser import ResumeParser
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('corpus_dir')
+    parser.add_argument('--count', type=int, help='documents to submit (cycles the corpus; default: corpus size)')
+    parser.add_argument('--rate', type=float, help='target submissions per second (default: as fast as possible)')
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--formats', help='comma-separated formats to use (default: all in the corpus)')
+    parser.add_argument('--provider', default='Fake', help='Fake, OpenAI, Anthropic or Google')
+    parser.add_argument('--api-key', default='')
+    parser.add_argument('--llm-latency', type=float, default=0.0, help='simulated LLM latency for the Fake provider')
+    parser.add_argument('--llm-jitter', type=float, default=0.0)
+    parser.add_argument('--failure-rate', type=float, default=0.0, help='injected LLM failure rate for the Fake provider')
+    parser.add_argument('--neo4j-uri', help='write to this Neo4j instead of a recording driver')
+    parser.add_argument('--neo4j-user', default='neo4j')
+    parser.add_argument('--neo4j-password', default='')
+    parser.add_argument('--output', help='write the JSON report here')
+    args = parser.parse_args(argv)
+
+    if args.provider == 'Fake':
+        resume_parser = GroundTruthParser(load_ground_truth(args.corpus_dir), latency=args.llm_latency,
+                                          jitter=args.llm_jitter, failure_rate=args.failure_rate, seed=0)
+    else:
+        resume_parser = ResumeParser(args.provider, args.api_key)
+
+    if args.neo4j_uri:
+        manager = Neo4jManager(args.neo4j_uri, args.neo4j_user, args.neo4j_password)
+    else:
+        manager = Neo4jManager('bolt://unused', 'neo4j', '', driver=RecordingDriver())
+
+    formats = args.formats.split(',') if args.formats else None
+    work = build_work(args.corpus_dir, args.count, formats)
+    print(f'🚀 Submitting {len(work)} documents'
+          f"{f' at {args.rate}/s' if args.rate else ''} with concurrency {args.concurrency}...")
+    try:
+        report = run_load_test(work, resume_parser, manager, rate=args.rate, concurrency=args.concurrency)
+    finally:
+        manager.close()
+    report['stages'] = {
+        '|'.join(f'{k}={v}' for k, v in sample['labels'].items()): {
+            'count': sample['count'], 'p50': sample['p50'], 'p95': sample['p95'], 'p99': sample['p99'],
+        }
+        for sample in registry.snapshot()['metrics'].get('resume_stage_seconds', {}).get('samples', [])
+    }
+
+    latency = report['latency_seconds']
+    print(f"Completed {report['completed']}/{report['submitted']} in {report['elapsed_seconds']:.2f}s "
+          f"({report['throughput']:.1f} resumes/s), error rate {report['error_rate']:.1%}")
+    if latency:
+        print(f"Latency p50 {latency['p50']:.3f}s  p95 {latency['p95']:.3f}s  "
+              f"p99 {latency['p99']:.3f}s  max {latency['max']:.3f}s")
+    for error, count in sorted(report['errors'].items()):
+        print(f'  {error}: {count}')
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f'Report written to {args.output}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
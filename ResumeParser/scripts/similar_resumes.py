@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Build the on-disk text indexes and find resumes similar to a job.
+
+Indexing reads resumes from a synthetic corpus, a corpus store file or
+Neo4j and appends them to the index directory; re-indexing an id replaces
+it. Queries print the top k resumes for a job's text.
+
+    python scripts/similar_resumes.py index text_index/resumes --corpus corpus/
+    python scripts/similar_resumes.py index text_index/resumes --neo4j-uri bolt://localhost:7687 --neo4j-password secret
+    python scripts/similar_resumes.py query text_index/resumes --title "Data Engineer" --description "Spark pipelines..."
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from corpus_store import CorpusStore
+from load_driver import load_ground_truth
+from resume_schema import ResumeData
+from text_index import TextIndex, graph_documents, job_text, resume_text
+
+
+def index_documents(args) -> int:
+    index = TextIndex(args.directory)
+    started = time.perf_counter()
+    if args.corpus:
+        documents = ((email, resume_text(ResumeData.model_validate_json(ground_truth)))
+                     for email, ground_truth in load_ground_truth(args.corpus).items())
+        added = index.add_many(documents)
+    elif args.store:
+        store = CorpusStore.load(args.store)
+        added = index.add_many((resume_id, resume_text(store.get(row)))
+                               for row, resume_id in enumerate(store.resume_ids()))
+    else:
+        from neo4j import GraphDatabase
+        driver = GraphDatabase.driver(args.neo4j_uri, auth=(args.neo4j_user, args.neo4j_password))
+        try:
+            added = index.add_many(graph_documents(driver, args.kind))
+        finally:
+            driver.close()
+    if args.retrain:
+        index.train()
+    index.flush()
+    print(f'✅ Indexed {added} documents in {time.perf_counter() - started:.1f}s '
+          f'({len(index)} in {args.directory})')
+    return 0
+
+
+def query(args) -> int:
+    index = TextIndex(args.directory, nprobe=args.nprobe)
+    text = job_text({'title': args.title, 'description': args.description, 'skills': args.skills})
+    started = time.perf_counter()
+    hits = index.search(text, args.k)
+    elapsed = time.perf_counter() - started
+    for doc_id, score in hits:
+        print(f'{score:.3f}  {doc_id}')
+    print(f'🔍 {len(hits)} results from {len(index)} documents in {elapsed * 1000:.1f}ms', file=sys.stderr)
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    build = commands.add_parser('index', help='add documents to an index directory')
+    build.add_argument('directory')
+    source = build.add_mutually_exclusive_group(required=True)
+    source.add_argument('--corpus', help='synthetic corpus directory with ground-truth JSON')
+    source.add_argument('--store', help='corpus store file')
+    source.add_argument('--neo4j-uri')
+    build.add_argument('--neo4j-user', default='neo4j')
+    build.add_argument('--neo4j-password', default='')
+    build.add_argument('--kind', choices=('resumes', 'jobs'), default='resumes', help='graph documents to index')
+    build.add_argument('--retrain', action='store_true', help='re-cluster the IVF lists after adding')
+    build.set_defaults(func=index_documents)
+
+    search = commands.add_parser('query', help='top k documents for a job')
+    search.add_argument('directory')
+    search.add_argument('--title', default='')
+    search.add_argument('--description', default='')
+    search.add_argument('--skills', nargs='*', default=[])
+    search.add_argument('--k', type=int, default=10)
+    search.add_argument('--nprobe', type=int, default=16)
+    search.set_defaults(func=query)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
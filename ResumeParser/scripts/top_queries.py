@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Rank the Cypher queries recorded in a slow-query/PROFILE log.
+
+The log is written by Neo4jManager when NEO4J_SLOW_QUERY_MS or
+NEO4J_PROFILE_SAMPLE is set (see src/query_registry.py). Each row is one
+registered query name with its logged executions, total and worst latency,
+and, for PROFILE samples, the mean db hits and most common plan operators.
+
+    NEO4J_PROFILE_SAMPLE=0.05 NEO4J_SLOW_QUERY_MS=200 streamlit run src/app.py
+    python scripts/top_queries.py neo4j-queries.jsonl --top 10 --by db_hits
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from query_registry import DEFAULT_LOG, read_log, summarize_log
+
+SORT_KEYS = {
+    'total': lambda row: row['total_seconds'],
+    'max': lambda row: row['max_seconds'],
+    'db_hits': lambda row: row['mean_db_hits'] or 0,
+    'count': lambda row: row['count'],
+}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('log', nargs='?', default=os.environ.get('NEO4J_QUERY_LOG') or DEFAULT_LOG)
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--by', choices=sorted(SORT_KEYS), default='total')
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.log):
+        print(f"❌ No query log at {args.log}")
+        return 1
+
+    rows = sorted(summarize_log(read_log(args.log)), key=SORT_KEYS[args.by], reverse=True)[:args.top]
+    print(f"{'query':36s} {'count':>6s} {'slow':>5s} {'total s':>9s} {'max ms':>9s} {'db hits':>10s}  operators")
+    for row in rows:
+        db_hits = f"{row['mean_db_hits']:10.0f}" if row['mean_db_hits'] is not None else f"{'-':>10s}"
+        print(f"{row['query']:36s} {row['count']:6d} {row['slow']:5d} {row['total_seconds']:9.3f} "
+              f"{row['max_seconds'] * 1000:9.1f} {db_hits}  {', '.join(row['operators'])}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,30 +1,116 @@
 import streamlit as st
-import os
-import tempfile
+import time
 import uuid
-from datetime import datetime
 try:
     from .resume_parser import ResumeParser
     from .neo4j_manager import Neo4jManager
     from .resume_schema import ResumeData
+    from .metrics import registry as metrics_registry, STAGE_SECONDS, counted_cache
+    from .invalidation import RESUMES, default_generations
+    from .ingest_pool import IngestPool
+    from .write_queue import WriteBehindQueue, WriteFlusher
+    from .resume_search import SearchFilters
+    from .llm_usage import UsageLedger
+    from .near_duplicates import NearDuplicateIndex
+    from .session_store import ResumeSessionStore, SpillCache
 except ImportError:
     from resume_parser import ResumeParser
     from neo4j_manager import Neo4jManager
     from resume_schema import ResumeData
+    from metrics import registry as metrics_registry, STAGE_SECONDS, counted_cache
+    from invalidation import RESUMES, default_generations
+    from ingest_pool import IngestPool
+    from write_queue import WriteBehindQueue, WriteFlusher
+    from resume_search import SearchFilters
+    from llm_usage import UsageLedger
+    from near_duplicates import NearDuplicateIndex
+    from session_store import ResumeSessionStore, SpillCache
 import json
 
-# Page configuration
-st.set_page_config(
-    page_title="Resume Parser & Knowledge Graph Builder",
-    page_icon="📄",
-    layout="wide"
-)
+def configure_page():
+    """Page configuration when this module runs on its own; importers configure their own page"""
+    st.set_page_config(
+        page_title="Resume Parser & Knowledge Graph Builder",
+        page_icon="📄",
+        layout="wide"
+    )
+
+@st.cache_resource(show_spinner=False)
+def get_spill_cache() -> SpillCache:
+    """Parsed resumes evicted from session memory, shared by all sessions"""
+    return SpillCache()
 
 # Initialize session state
 if 'parsed_resumes' not in st.session_state:
-    st.session_state.parsed_resumes = []
+    # Summaries of every parse, full records only for the most recently viewed
+    st.session_state.parsed_resumes = ResumeSessionStore(get_spill_cache())
 if 'neo4j_connected' not in st.session_state:
     st.session_state.neo4j_connected = False
+if 'ingest_jobs' not in st.session_state:
+    # Background job ids submitted by this session, in upload order
+    st.session_state.ingest_jobs = []
+    st.session_state.ingest_done = []
+    st.session_state.session_id = str(uuid.uuid4())
+
+# Cached query results also expire after this many seconds, for ingests made by other processes
+QUERY_TTL = 300
+
+# Seconds between reruns while this session has jobs in flight
+POLL_INTERVAL = 1.0
+
+# Parsed resumes listed per page, and finished upload rows kept in the progress table
+RESUMES_PER_PAGE = 10
+MAX_PROGRESS_ROWS = 200
+
+@st.cache_resource(show_spinner=False)
+def get_neo4j_manager(uri, user, password) -> Neo4jManager:
+    """One connected driver per set of credentials for the whole server process"""
+    manager = Neo4jManager(uri, user, password)
+    # Failures raise and are not cached, so the next attempt reconnects
+    manager.driver.verify_connectivity()
+    manager.ensure_indexes()
+    return manager
+
+@st.cache_resource(show_spinner=False)
+def get_resume_parser(llm_provider, api_key) -> ResumeParser:
+    """LLM client reused across reruns and sessions"""
+    return ResumeParser(llm_provider, api_key, ledger=get_usage_ledger())
+
+@st.cache_resource(show_spinner=False)
+def get_usage_ledger() -> UsageLedger:
+    """Tokens, latency and cost of every LLM call, shared by all sessions"""
+    return UsageLedger()
+
+@st.cache_resource(show_spinner=False)
+def get_write_queue() -> WriteBehindQueue:
+    """Durable queue of parsed resumes waiting for their graph write, shared by all sessions"""
+    return WriteBehindQueue()
+
+@st.cache_resource(show_spinner=False)
+def get_write_flusher(uri, user, password) -> WriteFlusher:
+    """Background writer draining queued resumes into one database, including those left by a restart"""
+    return WriteFlusher(get_write_queue(), get_neo4j_manager(uri, user, password), target=uri).start()
+
+@st.cache_resource(show_spinner=False)
+def get_ingest_pool() -> IngestPool:
+    """Worker pool shared by all sessions, so concurrency is bounded per server process"""
+    return IngestPool(write_queue=get_write_queue(), duplicates=get_near_duplicate_index())
+
+@st.cache_resource(show_spinner=False)
+def get_near_duplicate_index() -> NearDuplicateIndex:
+    """MinHash index of every parsed upload, checked before each LLM call"""
+    return NearDuplicateIndex()
+
+@counted_cache('all_resumes', st.cache_data(ttl=QUERY_TTL, show_spinner=False))
+def get_all_resumes(uri, user, _password, generation):
+    """Resumes in the graph; generation changes whenever this process ingests a resume"""
+    return get_neo4j_manager(uri, user, _password).get_all_resumes()
+
+@counted_cache('search_candidates', st.cache_data(ttl=QUERY_TTL, show_spinner=False))
+def search_candidates(uri, user, _password, query, skills, page, generation):
+    """One page of full-text search results; generation changes whenever this process ingests a resume"""
+    filters = SearchFilters(skills=list(skills))
+    return get_neo4j_manager(uri, user, _password).search_resumes(query, filters, page=page)
 
 def main():
     st.title("📄 Resume Parser & Knowledge Graph Builder")
@@ -71,8 +157,8 @@ def main():
         # Test Neo4j Connection
         if st.button("Test Neo4j Connection"):
             try:
-                neo4j_manager = Neo4jManager(neo4j_uri, neo4j_user, neo4j_password)
-                neo4j_manager.close()
+                get_neo4j_manager(neo4j_uri, neo4j_user, neo4j_password)
+                get_write_flusher(neo4j_uri, neo4j_user, neo4j_password)
                 st.success("✅ Neo4j connection successful!")
                 st.session_state.neo4j_connected = True
             except Exception as e:
@@ -93,17 +179,18 @@ def main():
                 """)
         
         # File Upload
-        st.subheader("📁 Upload Resume")
-        uploaded_file = st.file_uploader(
-            "Choose a resume file",
+        st.subheader("📁 Upload Resumes")
+        uploaded_files = st.file_uploader(
+            "Choose resume files",
             type=['pdf', 'docx', 'txt'],
+            accept_multiple_files=True,
             help="Supported formats: PDF, DOCX, TXT"
         )
         
         # Parse Resume Button
-        if st.button("🚀 Parse Resume", disabled=not (uploaded_file and api_key)):
-            if uploaded_file and api_key:
-                parse_resume(uploaded_file, llm_provider, api_key, neo4j_uri, neo4j_user, neo4j_password)
+        if st.button("🚀 Parse Resumes", disabled=not (uploaded_files and api_key)):
+            if uploaded_files and api_key:
+                submit_resumes(uploaded_files, llm_provider, api_key, neo4j_uri, neo4j_user, neo4j_password)
             else:
                 st.error("Please upload a file and enter an API key")
     
@@ -111,23 +198,17 @@ def main():
     col1, col2 = st.columns([2, 1])
     
     with col1:
-        st.header("📊 Parsed Resumes")
+        in_flight = display_ingest_progress()
         
-        if st.session_state.parsed_resumes:
-            for i, resume_data in enumerate(st.session_state.parsed_resumes):
-                with st.expander(f"Resume {i+1}: {resume_data.get('name', 'Unknown')}"):
-                    display_resume_data(resume_data)
-        else:
-            st.info("No resumes parsed yet. Upload a resume to get started!")
+        display_parsed_resumes()
     
     with col2:
         st.header("📈 Knowledge Graph Stats")
         
         if st.session_state.neo4j_connected:
             try:
-                neo4j_manager = Neo4jManager(neo4j_uri, neo4j_user, neo4j_password)
-                resumes = neo4j_manager.get_all_resumes()
-                neo4j_manager.close()
+                resumes = get_all_resumes(neo4j_uri, neo4j_user, neo4j_password,
+                                          default_generations.current(RESUMES))
                 
                 st.metric("Total Resumes", len(resumes))
                 
@@ -139,59 +220,184 @@ def main():
                 st.error(f"Error connecting to Neo4j: {str(e)}")
         else:
             st.info("Connect to Neo4j to see statistics")
+        
+        if st.session_state.neo4j_connected:
+            display_candidate_search(neo4j_uri, neo4j_user, neo4j_password)
+        
+        display_llm_usage()
+        display_metrics_panel()
+    
+    # Poll by rerunning the script until this session's jobs have finished
+    if in_flight:
+        time.sleep(POLL_INTERVAL)
+        st.rerun()
+
+def submit_resumes(uploaded_files, llm_provider, api_key, neo4j_uri, neo4j_user, neo4j_password):
+    """Queue uploaded files on the background pool and return immediately"""
+    try:
+        parser = get_resume_parser(llm_provider, api_key)
+    except Exception as e:
+        st.error(f"❌ Error initializing parser: {str(e)}")
+        return
+    
+    manager = None
+    if st.session_state.neo4j_connected:
+        try:
+            manager = get_neo4j_manager(neo4j_uri, neo4j_user, neo4j_password)
+            # Parsed resumes are queued durably and written by this flusher, even through outages
+            get_write_flusher(neo4j_uri, neo4j_user, neo4j_password)
+        except Exception as e:
+            st.error(f"❌ Failed to connect to Neo4j, resumes will not be added to the graph: {str(e)}")
+    
+    pool = get_ingest_pool()
+    for uploaded_file in uploaded_files:
+        job_id = pool.submit(uploaded_file.name, uploaded_file.getvalue(), parser, manager,
+                             session_id=st.session_state.session_id)
+        st.session_state.ingest_jobs.append(job_id)
+    st.toast(f"Queued {len(uploaded_files)} resume(s)")
+
+def display_ingest_progress() -> bool:
+    """
+    Move finished jobs into session state and show a progress table.
+    Returns True while any of this session's jobs are still running.
+    """
+    if not st.session_state.ingest_jobs and not st.session_state.ingest_done:
+        return False
+    
+    pool = get_ingest_pool()
+    for job in pool.collect(st.session_state.ingest_jobs):
+        st.session_state.ingest_jobs.remove(job.job_id)
+        st.session_state.ingest_done.append(job.row())
+        if job.resume is not None:
+            st.session_state.parsed_resumes.add(job.resume)
+    del st.session_state.ingest_done[:-MAX_PROGRESS_ROWS]
+    
+    running = pool.jobs(st.session_state.ingest_jobs)
+    # Jobs the pool no longer knows about (e.g. after a server restart) are not waited on
+    st.session_state.ingest_jobs = [job.job_id for job in running]
+    
+    st.header("⏳ Upload Progress")
+    rows = st.session_state.ingest_done + [job.row() for job in running]
+    st.dataframe(rows, hide_index=True, use_container_width=True)
+    if running:
+        st.caption(f"{len(running)} of this session's resumes in progress, "
+                   f"{pool.pending()} queued or running on the server "
+                   f"({pool.max_workers} at a time)")
+    write_queue = get_write_queue()
+    waiting = write_queue.depth()
+    if waiting:
+        st.caption(f"{waiting} parsed resume(s) waiting to be written to Neo4j, "
+                   f"oldest {write_queue.lag():.0f}s ago")
+    elif st.button("Clear finished uploads"):
+        st.session_state.ingest_done = []
+        st.rerun()
+    return bool(running)
 
-def parse_resume(uploaded_file, llm_provider, api_key, neo4j_uri, neo4j_user, neo4j_password):
-    """Parse a resume and add it to the knowledge graph"""
+def display_parsed_resumes():
+    """
+    One page of this session's parsed resumes. A resume's details are only
+    loaded and rendered while its checkbox is ticked, so a rerun costs the
+    same however many resumes the session has parsed.
+    """
+    st.header("📊 Parsed Resumes")
+    store = st.session_state.parsed_resumes
+    if not len(store):
+        st.info("No resumes parsed yet. Upload a resume to get started!")
+        return
     
-    # Create temporary file
-    with tempfile.NamedTemporaryFile(delete=False, suffix=f".{uploaded_file.name.split('.')[-1]}") as tmp_file:
-        tmp_file.write(uploaded_file.getvalue())
-        tmp_file_path = tmp_file.name
+    pages = store.pages(RESUMES_PER_PAGE)
+    page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1, step=1,
+                           key="parsed_resumes_page") if pages > 1 else 1
+    first = (int(page) - 1) * RESUMES_PER_PAGE
+    for i, summary in enumerate(store.page(int(page), RESUMES_PER_PAGE)):
+        label = f"Resume {len(store) - first - i}: {summary['name']}"
+        if not st.checkbox(label, key=f"open-{summary['id']}"):
+            continue
+        resume_data = store.get(summary['id'])
+        with st.container():
+            if resume_data is None:
+                st.info("This parse is no longer cached; find the resume in the graph instead.")
+            else:
+                display_resume_data(resume_data)
+
+def display_candidate_search(neo4j_uri, neo4j_user, neo4j_password):
+    """Keyword search over summaries, experience and project descriptions"""
+    st.header("🔎 Candidate Search")
+    query = st.text_input("Keywords", placeholder="kubernetes migration fintech")
+    skills = st.text_input("Required skills (comma separated)")
+    page = st.number_input("Page", min_value=1, value=1, step=1)
+    if not query.strip():
+        return
     
+    required = tuple(skill.strip() for skill in skills.split(',') if skill.strip())
     try:
-        # Initialize parser
-        parser = ResumeParser(llm_provider, api_key)
-        
-        # Extract text
-        with st.spinner("Extracting text from resume..."):
-            raw_text = parser.extract_text_from_file(tmp_file_path)
-        
-        # Parse with LLM
-        with st.spinner(f"Parsing resume with {llm_provider}..."):
-            parsed_data = parser.parse_resume_with_llm(raw_text)
-        
-        # Convert to dictionary for display
-        resume_dict = parsed_data.model_dump()
-        resume_dict['id'] = str(uuid.uuid4())
-        resume_dict['name'] = parsed_data.personal_info.get('name', 'Unknown')
-        resume_dict['parsed_at'] = datetime.now().isoformat()
-        
-        # Add to session state
-        st.session_state.parsed_resumes.append(resume_dict)
-        
-        # Add to Neo4j if connected
-        if st.session_state.neo4j_connected:
-            try:
-                with st.spinner("Adding to Neo4j knowledge graph..."):
-                    neo4j_manager = Neo4jManager(neo4j_uri, neo4j_user, neo4j_password)
-                    neo4j_manager.create_resume_node(parsed_data, resume_dict['id'])
-                    neo4j_manager.close()
-                
-                st.success("✅ Resume parsed and added to knowledge graph!")
-            except Exception as e:
-                st.error(f"❌ Failed to add to Neo4j: {str(e)}")
-                st.success("✅ Resume parsed successfully!")
-        else:
-            st.success("✅ Resume parsed successfully!")
-        
-        # Display parsed data
-        st.json(resume_dict)
-        
+        found = search_candidates(neo4j_uri, neo4j_user, neo4j_password, query, required, int(page),
+                                  default_generations.current(RESUMES))
     except Exception as e:
-        st.error(f"❌ Error parsing resume: {str(e)}")
-    finally:
-        # Clean up temporary file
-        os.unlink(tmp_file_path)
+        st.error(f"Search failed: {str(e)}")
+        return
+    
+    if not found['results']:
+        st.info("No matching resumes")
+    for result in found['results']:
+        st.markdown(f"**{result['name'] or result['resume_id']}** · score {result['score']:.2f}")
+        for hit in result['highlights']:
+            st.caption(f"{hit['field']}: {hit['snippet']}")
+    if found['has_more']:
+        st.caption("More results on the next page")
+
+def display_llm_usage():
+    """Display LLM cost and latency per model and per parsed resume"""
+    st.header("💰 LLM Usage")
+    ledger = get_usage_ledger()
+    totals = ledger.totals()
+    if not totals:
+        st.info("No LLM calls recorded yet")
+        return
+    st.metric("Total cost", f"${sum(row['cost'] for row in totals):.4f}")
+    st.dataframe([dict(row, cost=round(row['cost'], 4), mean_seconds=round(row['mean_seconds'], 2))
+                  for row in totals], hide_index=True, use_container_width=True)
+    st.subheader("Per resume")
+    st.dataframe([{'resume': row['source'] or row['document'], 'model': row['model'], 'calls': row['calls'],
+                   'cost': round(row['cost'], 4), 'seconds': round(row['seconds'], 2),
+                   'tokens in': row['tokens_in'], 'tokens out': row['tokens_out']}
+                  for row in ledger.per_resume(limit=20)], hide_index=True, use_container_width=True)
+
+def display_metrics_panel():
+    """Display live pipeline metrics recorded in this process"""
+    st.header("⏱️ Pipeline Metrics")
+    snapshot = metrics_registry.snapshot()['metrics']
+    
+    stage_latency = snapshot.get(STAGE_SECONDS)
+    if not stage_latency:
+        st.info("No metrics recorded yet. Parse a resume to populate them.")
+        return
+    
+    rows = []
+    for sample in stage_latency['samples']:
+        labels = sample['labels']
+        rows.append({
+            'stage': labels.get('stage', ''),
+            'detail': ', '.join(f"{k}={v}" for k, v in labels.items() if k != 'stage'),
+            'count': sample['count'],
+            'p50 (s)': round(sample['p50'], 4),
+            'p95 (s)': round(sample['p95'], 4),
+            'mean (s)': round(sample['sum'] / sample['count'], 4),
+        })
+    st.dataframe(sorted(rows, key=lambda row: row['stage']), hide_index=True, use_container_width=True)
+    
+    for name, metric in sorted(snapshot.items()):
+        if metric['type'] != 'counter':
+            continue
+        for sample in metric['samples']:
+            label = ', '.join(f"{k}={v}" for k, v in sample['labels'].items())
+            st.write(f"**{name}**{f' ({label})' if label else ''}: {sample['value']:g}")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button("Prometheus", metrics_registry.to_prometheus(), file_name="metrics.prom")
+    with col2:
+        st.download_button("JSON", metrics_registry.to_json(indent=2), file_name="metrics.json")
 
 def display_resume_data(resume_data):
     """Display parsed resume data in a formatted way"""
@@ -270,4 +476,5 @@ def display_resume_data(resume_data):
                 st.write("---")
 
 if __name__ == "__main__":
+    configure_page()
     main()
@@ -0,0 +1,338 @@
+"""
+Batch resume x job scoring over sparse skill-incidence matrices.
+
+Resumes and jobs become CSR matrices over one canonical skill vocabulary,
+optionally weighted by IDF (computed over jobs) and by the resume's skill
+proficiency. All pairs are scored one chunk of resumes at a time: skills
+that most jobs require go through a dense matrix product, rare skills
+through a sparse expansion of their posting lists, and only the top k per
+resume and a running top k per job are kept. Recommending jobs for every
+candidate is then a few seconds of numpy instead of a query per pair.
+
+scipy is not a dependency, so SparseMatrix implements only what scoring needs.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+try:
+    from .candidate_profiles import PROFICIENCY_WEIGHTS, resume_skill_levels
+    from .resume_schema import ResumeData
+    from .skill_canonicalizer import default_canonicalizer
+    from .skill_index import JOB_SKILLS_QUERY
+    from .query_registry import define
+except ImportError:
+    from candidate_profiles import PROFICIENCY_WEIGHTS, resume_skill_levels
+    from resume_schema import ResumeData
+    from skill_canonicalizer import default_canonicalizer
+    from skill_index import JOB_SKILLS_QUERY
+    from query_registry import define
+
+METRICS = ('overlap', 'jaccard', 'cosine')
+
+# Proficiency lives on the shared Skill node, so graph resumes are unweighted
+RESUME_SKILLS_QUERY = define('matching.resume_skills', """
+    MATCH (r:Resume)
+    OPTIONAL MATCH (r)-[:HAS_SKILL]->(s:Skill)
+    RETURN r.id AS resume_id, collect(s.name) AS skills
+""")
+
+# Skills required by at least 1/DENSE_RATIO of all jobs are scored with a dense product
+DENSE_RATIO = 16
+
+# Column groups per row, and their minimum width, when looking for top-k
+# candidates in a dense block
+CANDIDATE_GROUPS = 256
+CANDIDATE_WIDTH = 32
+
+
+class SparseMatrix:
+    """Compressed sparse row matrix of float32 weights"""
+
+    def __init__(self, indptr: np.ndarray, indices: np.ndarray, data: np.ndarray, n_cols: int):
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self.n_cols = n_cols
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Mapping[int, float]], n_cols: int) -> 'SparseMatrix':
+        indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum([len(row) for row in rows], out=indptr[1:])
+        indices = np.fromiter((col for row in rows for col in sorted(row)), dtype=np.int64, count=indptr[-1])
+        data = np.fromiter((row[col] for row in rows for col in sorted(row)), dtype=np.float32, count=indptr[-1])
+        return cls(indptr, indices, data, n_cols)
+
+    @property
+    def n_rows(self) -> int:
+        return len(self.indptr) - 1
+
+    @property
+    def nnz(self) -> int:
+        return int(self.indptr[-1])
+
+    def row_ids(self) -> np.ndarray:
+        """Row number of every stored entry"""
+        return np.repeat(np.arange(self.n_rows), np.diff(self.indptr))
+
+    def transpose(self) -> 'SparseMatrix':
+        order = np.argsort(self.indices, kind='stable')
+        indptr = np.zeros(self.n_cols + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.indices, minlength=self.n_cols), out=indptr[1:])
+        return SparseMatrix(indptr, self.row_ids()[order], self.data[order], self.n_rows)
+
+    def map_data(self, data: np.ndarray) -> 'SparseMatrix':
+        """Same sparsity pattern with new values"""
+        return SparseMatrix(self.indptr, self.indices, data.astype(np.float32), self.n_cols)
+
+    def row_sums(self) -> np.ndarray:
+        return np.bincount(self.row_ids(), weights=self.data, minlength=self.n_rows)
+
+    def row_norms(self) -> np.ndarray:
+        return np.sqrt(np.bincount(self.row_ids(), weights=self.data.astype(np.float64) ** 2, minlength=self.n_rows))
+
+    def column_counts(self) -> np.ndarray:
+        return np.bincount(self.indices, minlength=self.n_cols)
+
+    def dense_columns(self, columns: np.ndarray, start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+        """Rows start:stop restricted to the given columns, as a dense array"""
+        stop = self.n_rows if stop is None else stop
+        position = np.full(self.n_cols, -1, dtype=np.int64)
+        position[columns] = np.arange(len(columns))
+        lo, hi = self.indptr[start], self.indptr[stop]
+        rows = np.repeat(np.arange(stop - start), np.diff(self.indptr[start:stop + 1]))
+        cols = position[self.indices[lo:hi]]
+        keep = cols >= 0
+        out = np.zeros((stop - start, len(columns)), dtype=np.float32)
+        out[rows[keep], cols[keep]] = self.data[lo:hi][keep]
+        return out
+
+
+class TopK(NamedTuple):
+    """Best matches per row; indices are -1 and scores 0 where fewer than k matched"""
+    indices: np.ndarray
+    scores: np.ndarray
+
+
+@dataclass
+class MatchResult:
+    resume_ids: List[str]
+    job_ids: List[str]
+    metric: str
+    by_resume: TopK
+    by_job: TopK
+
+    @staticmethod
+    def _pairs(top: TopK, row: int, ids: List[str]) -> List[Tuple[str, float]]:
+        return [(ids[i], float(s)) for i, s in zip(top.indices[row], top.scores[row]) if i >= 0]
+
+    def jobs_for(self, resume_id: str) -> List[Tuple[str, float]]:
+        return self._pairs(self.by_resume, self.resume_ids.index(resume_id), self.job_ids)
+
+    def resumes_for(self, job_id: str) -> List[Tuple[str, float]]:
+        return self._pairs(self.by_job, self.job_ids.index(job_id), self.resume_ids)
+
+    def iter_recommendations(self) -> Iterable[Tuple[str, List[Tuple[str, float]]]]:
+        for row, resume_id in enumerate(self.resume_ids):
+            yield resume_id, self._pairs(self.by_resume, row, self.job_ids)
+
+    def iter_candidates(self) -> Iterable[Tuple[str, List[Tuple[str, float]]]]:
+        for row, job_id in enumerate(self.job_ids):
+            yield job_id, self._pairs(self.by_job, row, self.resume_ids)
+
+
+def _row_candidates(block: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (row, column) of every positive entry that may be in the top k of its row.
+
+    Each row is cut into groups of columns; the k-th largest group maximum
+    is a lower bound on the row's k-th largest value, so one comparison
+    pass keeps the top k plus a few extra entries, without a partial sort
+    over every column.
+    """
+    n_rows, n_cols = block.shape
+    groups = min(n_cols, max(k, min(CANDIDATE_GROUPS, n_cols // CANDIDATE_WIDTH)))
+    width = n_cols // groups
+    maxima = block[:, :groups * width].reshape(n_rows, groups, width).max(axis=2)
+    if groups * width < n_cols:
+        maxima = np.concatenate([maxima, block[:, groups * width:].max(axis=1, keepdims=True)], axis=1)
+    if maxima.shape[1] > k:
+        threshold = np.partition(maxima, maxima.shape[1] - k, axis=1)[:, maxima.shape[1] - k]
+    else:
+        threshold = maxima.min(axis=1)
+    threshold = np.maximum(threshold, np.finfo(np.float32).tiny)
+    return np.nonzero(block >= threshold[:, None])
+
+
+def _best_k(rows: np.ndarray, cols: np.ndarray, scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Keep the k best (row, column, score) entries of every row, best first, ties by column"""
+    order = np.lexsort((cols, -scores, rows))
+    rows, cols, scores = rows[order], cols[order], scores[order]
+    rank = np.arange(len(rows)) - np.searchsorted(rows, rows)
+    keep = rank < k
+    return rows[keep], cols[keep], scores[keep]
+
+
+def _empty_top(n_rows: int, k: int) -> TopK:
+    return TopK(np.full((n_rows, k), -1, dtype=np.int64), np.zeros((n_rows, k), dtype=np.float32))
+
+
+def _fill_top(top: TopK, rows: np.ndarray, cols: np.ndarray, scores: np.ndarray, offset: int = 0) -> None:
+    """Write _best_k output into a TopK, rows relative to offset"""
+    rank = np.arange(len(rows)) - np.searchsorted(rows, rows)
+    top.indices[rows + offset, rank] = cols
+    top.scores[rows + offset, rank] = scores
+
+
+class BatchMatcher:
+    """Collects resumes and jobs and scores every pair in chunks"""
+
+    def __init__(self, canonicalizer=None, idf: bool = True, proficiency: bool = True):
+        self.canonicalizer = canonicalizer or default_canonicalizer
+        self.idf = idf
+        self.proficiency = proficiency
+        self.skill_ids: Dict[str, int] = {}
+        self.resume_ids: List[str] = []
+        self.job_ids: List[str] = []
+        self._resume_rows: List[Dict[int, float]] = []
+        self._job_rows: List[Dict[int, float]] = []
+
+    def _column(self, name: str) -> int:
+        canonical = self.canonicalizer.canonical_name(name)
+        return self.skill_ids.setdefault(canonical, len(self.skill_ids))
+
+    def add_resume(self, resume_id: str, skills: Union[ResumeData, Mapping[str, Optional[str]], Sequence[str]]) -> None:
+        """Add a resume as ResumeData, a skill -> proficiency mapping or a list of skills"""
+        if isinstance(skills, ResumeData):
+            skills = resume_skill_levels(skills)
+        elif not isinstance(skills, Mapping):
+            skills = dict.fromkeys(skills)
+        row: Dict[int, float] = {}
+        for name, level in skills.items():
+            if not name or not name.strip():
+                continue
+            weight = PROFICIENCY_WEIGHTS.get((level or '').strip().lower(), 1.0) if self.proficiency else 1.0
+            column = self._column(name)
+            row[column] = max(weight, row.get(column, 0.0))
+        self.resume_ids.append(resume_id)
+        self._resume_rows.append(row)
+
+    def add_resumes(self, resumes: Iterable[Tuple[str, Union[ResumeData, Mapping[str, Optional[str]], Sequence[str]]]]) -> None:
+        for resume_id, skills in resumes:
+            self.add_resume(resume_id, skills)
+
+    def add_job(self, job_id: str, skills: Sequence[str]) -> None:
+        self.job_ids.append(job_id)
+        self._job_rows.append({self._column(name): 1.0 for name in skills if name and name.strip()})
+
+    def add_jobs(self, jobs: Iterable[Tuple[str, Sequence[str]]]) -> None:
+        for job_id, skills in jobs:
+            self.add_job(job_id, skills)
+
+    def load_graph(self, driver, resumes: bool = True, jobs: bool = True) -> None:
+        """Add every Resume and/or Job in the graph with its skills"""
+        with driver.session() as session:
+            if resumes:
+                self.add_resumes((record['resume_id'], record['skills'])
+                                 for record in session.run(RESUME_SKILLS_QUERY))
+            if jobs:
+                self.add_jobs((record['job_id'], record['skills'])
+                              for record in session.run(JOB_SKILLS_QUERY))
+
+    def matrices(self) -> Tuple[SparseMatrix, SparseMatrix, np.ndarray]:
+        """(resume matrix, binary job matrix, per-skill weights)"""
+        n_skills = len(self.skill_ids)
+        resumes = SparseMatrix.from_rows(self._resume_rows, n_skills)
+        jobs = SparseMatrix.from_rows(self._job_rows, n_skills)
+        if self.idf:
+            # Smoothed IDF over jobs: skills few jobs ask for carry more signal
+            df = jobs.column_counts()
+            weights = np.log((1 + jobs.n_rows) / (1 + df)) + 1
+        else:
+            weights = np.ones(n_skills)
+        return resumes, jobs, weights.astype(np.float32)
+
+    def score_all(self, metric: str = 'cosine', k: int = 10, job_k: Optional[int] = None,
+                  block_cells: int = 8_000_000) -> MatchResult:
+        """Top k jobs for every resume and top job_k (default k) resumes for every job"""
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric {metric!r}, expected one of {', '.join(METRICS)}")
+        job_k = k if job_k is None else job_k
+        resumes, jobs, weights = self.matrices()
+        if not resumes.n_rows or not jobs.n_rows:
+            return MatchResult(self.resume_ids, self.job_ids, metric,
+                               _empty_top(resumes.n_rows, k), _empty_top(jobs.n_rows, job_k))
+
+        resumes = resumes.map_data(resumes.data * weights[resumes.indices])
+        job_weights = jobs.map_data(weights[jobs.indices])
+        if metric == 'cosine':
+            jobs = job_weights
+            norms = (resumes.row_norms(), jobs.row_norms())
+        elif metric == 'jaccard':
+            # The job side stays binary: the product then sums the resume
+            # weights of shared skills, which is also the sum of minimums
+            norms = (resumes.row_sums(), job_weights.row_sums())
+        else:
+            norms = (None, None)
+
+        # Each direction is its own chunked pass, so both only ever keep per-row candidates
+        by_resume = self._top_k_rows(resumes, jobs, k, metric, norms, block_cells)
+        by_job = self._top_k_rows(jobs, resumes, job_k, metric, norms[::-1], block_cells)
+        return MatchResult(self.resume_ids, self.job_ids, metric, by_resume, by_job)
+
+    def _top_k_rows(self, left: SparseMatrix, right: SparseMatrix, k: int, metric: str,
+                    norms: Tuple[Optional[np.ndarray], Optional[np.ndarray]], block_cells: int) -> TopK:
+        """Top k rows of right for every row of left"""
+        n_left, n_right = left.n_rows, right.n_rows
+        left_norm, right_norm = (None if n is None else n.astype(np.float32) for n in norms)
+        if metric == 'cosine':
+            left_norm = np.divide(1, left_norm, out=np.zeros_like(left_norm), where=left_norm > 0)
+            right_norm = np.divide(1, right_norm, out=np.zeros_like(right_norm), where=right_norm > 0)
+        by_skill = right.transpose()
+        common = np.flatnonzero(np.diff(by_skill.indptr) * DENSE_RATIO >= n_right)
+        rare = np.ones(by_skill.n_rows, dtype=bool)
+        rare[common] = False
+        dense_right = right.dense_columns(common).T.copy() if len(common) else None
+
+        top = _empty_top(n_left, k)
+        chunk = max(1, block_cells // n_right)
+        for start in range(0, n_left, chunk):
+            stop = min(n_left, start + chunk)
+            block = self._product(left, start, stop, by_skill, rare, common, dense_right, n_right)
+            if metric == 'cosine':
+                block *= left_norm[start:stop, None]
+                block *= right_norm[None, :]
+            elif metric == 'jaccard':
+                denominator = left_norm[start:stop, None] + right_norm[None, :] - block
+                np.divide(block, denominator, out=block, where=denominator > 0)
+            rows, cols = _row_candidates(block, k)
+            _fill_top(top, *_best_k(rows, cols, block[rows, cols], k), offset=start)
+        return top
+
+    @staticmethod
+    def _product(left: SparseMatrix, start: int, stop: int, by_skill: SparseMatrix,
+                 rare: np.ndarray, common: np.ndarray, dense_right: Optional[np.ndarray], n_right: int) -> np.ndarray:
+        """Dense block of left[start:stop] x right^T, given right transposed as by_skill"""
+        rows = stop - start
+        if dense_right is not None:
+            block = left.dense_columns(common, start, stop) @ dense_right
+        else:
+            block = np.zeros((rows, n_right), dtype=np.float32)
+
+        lo, hi = left.indptr[start], left.indptr[stop]
+        local = np.repeat(np.arange(rows), np.diff(left.indptr[start:stop + 1]))
+        skills, weights = left.indices[lo:hi], left.data[lo:hi]
+        keep = rare[skills]
+        local, skills, weights = local[keep], skills[keep], weights[keep]
+        starts = by_skill.indptr[skills]
+        lengths = by_skill.indptr[skills + 1] - starts
+        total = int(lengths.sum())
+        if total:
+            # Expand every (row, skill) entry over the rows of right that have that skill
+            offsets = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths) + np.arange(total)
+            flat = np.repeat(local, lengths) * n_right + by_skill.indices[offsets]
+            values = np.repeat(weights, lengths) * by_skill.data[offsets]
+            np.add.at(block.reshape(-1), flat, values)
+        return block
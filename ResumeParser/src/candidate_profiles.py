@@ -0,0 +1,293 @@
+"""
+Precomputed candidate profiles for per-resume job matching.
+
+A profile holds what matching needs from one resume: canonical skill
+names, a weight per skill from the stated proficiency and how long the
+skill was used across roles, and the tenure itself. Profiles are built at
+ingest, stored as JSON on the Resume node and kept in a per-process LRU
+cache that ingest refreshes, so matching one resume costs at most one
+lookup by id no matter how many resumes the graph holds. Ingests in other
+processes (the service, other Streamlit workers) cannot refresh it, so
+entries also expire after PROFILE_CACHE_TTL seconds (default 300).
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field, replace
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    from .resume_schema import ResumeData
+    from .skill_canonicalizer import default_canonicalizer
+    from .query_registry import define
+    from .metrics import record_cache_lookup
+except ImportError:
+    from resume_schema import ResumeData
+    from skill_canonicalizer import default_canonicalizer
+    from query_registry import define
+    from metrics import record_cache_lookup
+
+# Weights must not exceed 1: a resume's weight for a skill is then never
+# above the job's, so the weighted Jaccard minimum is the resume's weight
+PROFICIENCY_WEIGHTS = {'beginner': 0.5, 'intermediate': 0.75, 'advanced': 1.0, 'expert': 1.0}
+
+# Tenure beyond this adds nothing to a skill's weight
+TENURE_SATURATION_MONTHS = 60
+
+DEFAULT_CACHE_TTL = 300.0
+
+# Cache label on the exported lookup counts
+PROFILE_CACHE = 'candidate_profiles'
+
+PROFILE_QUERY = define('profile.get', """
+    MATCH (r:Resume {id: $resume_id})
+    OPTIONAL MATCH (r)-[:HAS_SKILL]->(s:Skill)
+    RETURN r.name AS name, r.profile AS profile, collect(s.name) AS skills
+""")
+
+# Every upsert and profile lookup matches a Resume by id, and the recent list orders by ingested_at
+INDEX_STATEMENTS = (
+    define('resume.constraint_id',
+           "CREATE CONSTRAINT resume_id IF NOT EXISTS FOR (r:Resume) REQUIRE r.id IS UNIQUE"),
+    define('resume.index_ingested_at',
+           "CREATE INDEX resume_ingested_at IF NOT EXISTS FOR (r:Resume) ON (r.ingested_at)"),
+)
+
+RECENT_RESUMES_QUERY = define('resume.recent', """
+    MATCH (r:Resume)
+    RETURN r.id AS id, r.name AS name
+    ORDER BY r.ingested_at DESC
+    LIMIT $limit
+""")
+
+_YEAR = re.compile(r'(19|20)\d\d')
+_MONTH_NUMBER = re.compile(r'(?:19|20)\d\d[-/.](\d{1,2})|(\d{1,2})[-/.](?:19|20)\d\d')
+_MONTH_NAMES = ('jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec')
+_ONGOING = ('present', 'current', 'now', 'ongoing', 'today')
+
+
+def resume_skill_levels(resume: ResumeData) -> Dict[str, Optional[str]]:
+    """Skill name -> proficiency for listed skills and skills used in experience"""
+    levels: Dict[str, Optional[str]] = {}
+    for exp in resume.experience:
+        for name in exp.skills_used:
+            levels.setdefault(name, None)
+    for skill in resume.skills:
+        levels[skill.name] = skill.proficiency
+    return levels
+
+
+def is_ongoing(value: Optional[str]) -> bool:
+    """True for 'Present' and the other ways of saying a range has not ended"""
+    return bool(value) and value.strip().lower().startswith(_ONGOING)
+
+
+def month_index(value: Optional[str], today: Optional[date] = None) -> Optional[int]:
+    """Months since year 0 for '2021-03', 'Mar 2021', '2021' or 'Present'; None if unparseable"""
+    if not value:
+        return None
+    text = value.strip().lower()
+    if is_ongoing(text):
+        today = today or date.today()
+        return today.year * 12 + today.month - 1
+    year = _YEAR.search(text)
+    if not year:
+        return None
+    month = 1
+    number = _MONTH_NUMBER.search(text)
+    if number:
+        month = int(number.group(1) or number.group(2))
+    else:
+        for i, name in enumerate(_MONTH_NAMES):
+            if name in text:
+                month = i + 1
+                break
+    return int(year.group(0)) * 12 + min(max(month, 1), 12) - 1
+
+
+def merged_months(spans: List[Tuple[int, int]]) -> int:
+    """Total months covered by possibly overlapping [start, end] spans, inclusive"""
+    total, current_start, current_end = 0, None, None
+    for start, end in sorted(spans):
+        if current_end is None or start > current_end + 1:
+            if current_end is not None:
+                total += current_end - current_start + 1
+            current_start, current_end = start, end
+        else:
+            current_end = max(current_end, end)
+    if current_end is not None:
+        total += current_end - current_start + 1
+    return total
+
+
+def skill_weight(proficiency: float, months: int) -> float:
+    """Listed but never used in a role counts half; full weight after the saturation point"""
+    used = min(months, TENURE_SATURATION_MONTHS) / TENURE_SATURATION_MONTHS
+    return round(proficiency * (0.5 + 0.5 * used), 4)
+
+
+@dataclass
+class CandidateProfile:
+    resume_id: str
+    name: str = ''
+    # Canonical skill name -> weight in (0, 1]
+    skills: Dict[str, float] = field(default_factory=dict)
+    # Canonical skill name -> months of experience in roles that used it
+    tenure_months: Dict[str, int] = field(default_factory=dict)
+    total_months: int = 0
+
+    def skill_names(self) -> List[str]:
+        """Skills by descending weight"""
+        return sorted(self.skills, key=lambda name: (-self.skills[name], name))
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), sort_keys=True)
+
+    @classmethod
+    def from_json(cls, value: str) -> 'CandidateProfile':
+        return cls(**json.loads(value))
+
+    def with_tenure(self, tenure_months: Dict[str, int], total_months: int) -> 'CandidateProfile':
+        """Copy with new tenure, re-weighting each skill at its unchanged proficiency"""
+        skills = {name: skill_weight(weight / skill_weight(1.0, self.tenure_months.get(name, 0)),
+                                     tenure_months.get(name, 0))
+                  for name, weight in self.skills.items()}
+        return replace(self, skills=skills, tenure_months=tenure_months, total_months=total_months)
+
+
+def build_profile(resume_id: str, resume: ResumeData, canonicalizer=None,
+                  today: Optional[date] = None) -> CandidateProfile:
+    """Profile of a parsed resume, with skills folded onto canonical names"""
+    canonicalizer = canonicalizer or default_canonicalizer
+    spans_by_skill: Dict[str, List[Tuple[int, int]]] = {}
+    all_spans = []
+    for exp in resume.experience:
+        start = month_index(exp.dates.from_date, today)
+        end = month_index(exp.dates.to_date, today) if exp.dates.to_date else start
+        if start is None or end is None or end < start:
+            continue
+        all_spans.append((start, end))
+        for name in exp.skills_used:
+            if name and name.strip():
+                spans_by_skill.setdefault(canonicalizer.canonical_name(name), []).append((start, end))
+    tenure = {name: merged_months(spans) for name, spans in spans_by_skill.items()}
+
+    skills: Dict[str, float] = {}
+    for name, level in resume_skill_levels(resume).items():
+        if not name or not name.strip():
+            continue
+        canonical = canonicalizer.canonical_name(name)
+        proficiency = PROFICIENCY_WEIGHTS.get((level or '').strip().lower(), 1.0)
+        skills[canonical] = max(skills.get(canonical, 0.0), skill_weight(proficiency, tenure.get(canonical, 0)))
+
+    return CandidateProfile(
+        resume_id=resume_id,
+        name=resume.personal_info.get('name', '') or '',
+        skills=skills,
+        tenure_months=tenure,
+        total_months=merged_months(all_spans),
+    )
+
+
+def load_profile(driver, resume_id: str, canonicalizer=None) -> Optional[CandidateProfile]:
+    """Read a stored profile, or derive a tenure-less one for resumes ingested without it"""
+    with driver.session() as session:
+        record = session.run(PROFILE_QUERY, resume_id=resume_id).single()
+    if record is None:
+        return None
+    if record['profile']:
+        return CandidateProfile.from_json(record['profile'])
+    canonicalizer = canonicalizer or default_canonicalizer
+    return CandidateProfile(
+        resume_id=resume_id,
+        name=record['name'] or '',
+        skills={canonicalizer.canonical_name(name): 0.5 for name in record['skills'] if name},
+    )
+
+
+def ensure_indexes(driver) -> None:
+    with driver.session() as session:
+        for statement in INDEX_STATEMENTS:
+            session.run(statement)
+
+
+def recent_resumes(driver, limit: int = 50) -> List[Dict[str, Any]]:
+    """Most recently ingested resumes as {'id', 'name'} dicts"""
+    with driver.session() as session:
+        return [dict(record) for record in session.run(RECENT_RESUMES_QUERY, limit=limit)]
+
+
+def rank_matches(profile: CandidateProfile, matches: List[Dict[str, Any]], limit: int) -> List[Dict[str, Any]]:
+    """
+    Order skill-overlap matches by the profile weight of the matching skills,
+    adding it as 'score'; ties keep their overlap order.
+    """
+    ranked = []
+    for match in matches:
+        score = sum(profile.skills.get(name, 0.0) for name in match['matching_skills'])
+        ranked.append(dict(match, score=round(score, 4)))
+    ranked.sort(key=lambda match: -match['score'])
+    return ranked[:limit]
+
+
+class ProfileCache:
+    """Thread-safe LRU cache of candidate profiles keyed by resume id, with entries expiring after ttl_seconds"""
+
+    def __init__(self, capacity: int = 1024, ttl_seconds: Optional[float] = None, metrics=None):
+        self.capacity = capacity
+        # Registry for the exported hit and miss counts; None is the process-wide one
+        self.metrics = metrics
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else float(
+            os.environ.get('PROFILE_CACHE_TTL', DEFAULT_CACHE_TTL))
+        self.hits = 0
+        self.misses = 0
+        # resume id -> (profile, monotonic time it was cached)
+        self._profiles: 'OrderedDict[str, Tuple[CandidateProfile, float]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._profiles)
+
+    def get(self, resume_id: str, driver=None, canonicalizer=None) -> Optional[CandidateProfile]:
+        """Cached profile, loading it from the graph through driver on a miss"""
+        with self._lock:
+            entry = self._profiles.get(resume_id)
+            if entry is not None and time.monotonic() - entry[1] < self.ttl_seconds:
+                self._profiles.move_to_end(resume_id)
+                self.hits += 1
+                record_cache_lookup(PROFILE_CACHE, True, self.metrics)
+                return entry[0]
+            # Possibly re-ingested by another process since it was cached
+            self._profiles.pop(resume_id, None)
+            self.misses += 1
+        record_cache_lookup(PROFILE_CACHE, False, self.metrics)
+        if driver is None:
+            return None
+        profile = load_profile(driver, resume_id, canonicalizer)
+        if profile is not None:
+            self.put(profile)
+        return profile
+
+    def put(self, profile: CandidateProfile) -> None:
+        with self._lock:
+            self._profiles[profile.resume_id] = (profile, time.monotonic())
+            self._profiles.move_to_end(profile.resume_id)
+            while len(self._profiles) > self.capacity:
+                self._profiles.popitem(last=False)
+
+    def invalidate(self, resume_id: str) -> None:
+        with self._lock:
+            self._profiles.pop(resume_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._profiles.clear()
+
+
+# Shared by every Neo4jManager in a process, so ingest refreshes what pages read
+default_profile_cache = ProfileCache()
@@ -0,0 +1,381 @@
+"""
+Compact columnar store for large corpora of parsed resumes.
+
+Every string is interned into a per-kind pool (skills, companies,
+institutes, ...) and referenced by an int32 id. Nested lists such as
+education or experience become child tables addressed by int64 offset
+columns, so a corpus is a handful of flat numpy arrays instead of
+millions of small Python objects. Stores persist to a single file whose
+columns are memory-mapped on load, and every resume converts back to an
+identical ResumeData.
+"""
+
+import json
+import os
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    from .resume_schema import ResumeData
+except ImportError:
+    from resume_schema import ResumeData
+
+MAGIC = b'RCSTORE1'
+NULL = -1
+
+# Pools whose values repeat across resumes and are worth deduplicating
+INTERNED_POOLS = ('skill', 'company', 'institute', 'degree', 'position', 'major', 'course',
+                  'language', 'category', 'proficiency', 'date', 'issuer', 'location')
+# Free text is stored once per occurrence without a lookup dictionary
+TEXT_POOL = 'text'
+
+# table -> (ResumeData field, scalar fields as (path, pool), nested lists as (field, pool)).
+# A pool of None stores whether an optional sub-object is present.
+TABLES = {
+    'education': ('education',
+                  [('institute', 'institute'), ('degree', 'degree'), ('dates.from_date', 'date'),
+                   ('dates.to_date', 'date'), ('gpa', TEXT_POOL)],
+                  [('major', 'major'), ('courses', 'course')]),
+    'experience': ('experience',
+                   [('position', 'position'), ('company', 'company'), ('dates.from_date', 'date'),
+                    ('dates.to_date', 'date'), ('description', TEXT_POOL), ('location', 'location')],
+                   [('skills_used', 'skill')]),
+    'skills': ('skills',
+               [('name', 'skill'), ('category', 'category'), ('proficiency', 'proficiency')],
+               []),
+    'projects': ('projects',
+                 [('name', TEXT_POOL), ('description', TEXT_POOL), ('dates', None),
+                  ('dates.from_date', 'date'), ('dates.to_date', 'date'), ('url', TEXT_POOL)],
+                 [('technologies', 'skill')]),
+    'certifications': ('certifications',
+                       [('name', TEXT_POOL), ('issuer', 'issuer'), ('date', 'date'), ('expiry', 'date')],
+                       []),
+    'languages': ('languages', [('', 'language')], []),
+    'achievements': ('achievements', [('', TEXT_POOL)], []),
+}
+RESUME_FIELDS = [('id', TEXT_POOL), ('personal_info', TEXT_POOL), ('summary', TEXT_POOL)]
+
+# Entity kinds that can be filtered and grouped, as (table, column) pairs
+ENTITY_COLUMNS = {
+    'skill': [('skills', 'name'), ('experience', 'skills_used')],
+    'company': [('experience', 'company')],
+    'position': [('experience', 'position')],
+    'institute': [('education', 'institute')],
+    'degree': [('education', 'degree')],
+    'major': [('education', 'major')],
+    'language': [('languages', '')],
+}
+
+
+class StringPool:
+    """Append-only string table mapping each string to a dense integer id"""
+
+    def __init__(self, dedupe: bool = True):
+        self.dedupe = dedupe
+        self._strings: List[str] = []
+        self._ids: Optional[Dict[str, int]] = {} if dedupe else None
+        # Set when the pool is backed by a memory-mapped blob instead of a list
+        self._blob = None
+        self._offsets = None
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1 if self._blob is not None else len(self._strings)
+
+    def intern(self, value: Optional[str]) -> int:
+        if value is None:
+            return NULL
+        if self._blob is not None:
+            raise RuntimeError('String pool is read-only; load the store with mmap=False to modify it')
+        if self._ids is not None:
+            existing = self._ids.get(value)
+            if existing is not None:
+                return existing
+            self._ids[value] = len(self._strings)
+        self._strings.append(value)
+        return len(self._strings) - 1
+
+    def __getitem__(self, index: int) -> Optional[str]:
+        if index == NULL:
+            return None
+        if self._blob is not None:
+            return bytes(self._blob[self._offsets[index]:self._offsets[index + 1]]).decode('utf-8')
+        return self._strings[index]
+
+    def lookup(self, value: str) -> int:
+        """Return the id of value, or NULL if it was never interned"""
+        if not self.dedupe:
+            raise ValueError('Free-text pools are not indexed for lookup')
+        if self._blob is not None and not self._ids:
+            self._ids = {self[i]: i for i in range(len(self))}
+        return self._ids.get(value, NULL)
+
+    def strings(self) -> List[str]:
+        return [self[i] for i in range(len(self))]
+
+    def encode(self) -> Tuple[bytes, np.ndarray]:
+        encoded = [s.encode('utf-8') for s in self.strings()]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(e) for e in encoded], out=offsets[1:])
+        return b''.join(encoded), offsets
+
+    @classmethod
+    def from_blob(cls, blob, offsets, dedupe: bool, materialize: bool) -> 'StringPool':
+        pool = cls(dedupe)
+        if materialize:
+            pool._strings = [bytes(blob[offsets[i]:offsets[i + 1]]).decode('utf-8') for i in range(len(offsets) - 1)]
+            if dedupe:
+                pool._ids = {s: i for i, s in enumerate(pool._strings)}
+        else:
+            pool._blob, pool._offsets = blob, offsets
+            pool._ids = {} if dedupe else None
+        return pool
+
+
+def _get_path(obj: Any, path: str) -> Any:
+    if not path:
+        return obj
+    for part in path.split('.'):
+        if obj is None:
+            return None
+        obj = getattr(obj, part)
+    return obj
+
+
+def _set_path(target: Dict[str, Any], path: str, value: Any) -> None:
+    parts = path.split('.')
+    for part in parts[:-1]:
+        target = target.setdefault(part, {})
+    target[parts[-1]] = value
+
+
+class CorpusStore:
+    """Columnar, string-interned store of ResumeData records"""
+
+    def __init__(self):
+        self.pools: Dict[str, StringPool] = {name: StringPool() for name in INTERNED_POOLS}
+        self.pools[TEXT_POOL] = StringPool(dedupe=False)
+        self.columns: Dict[str, Any] = {}
+        for path, _ in RESUME_FIELDS:
+            self.columns[f'resume.{path}'] = array('i')
+        for table, (_, fields, lists) in TABLES.items():
+            self.columns[f'{table}.offsets'] = array('q', [0])
+            for path, pool in fields:
+                self.columns[f'{table}.{path}'] = array('b' if pool is None else 'i')
+            for field, _ in lists:
+                self.columns[f'{table}.{field}.offsets'] = array('q', [0])
+                self.columns[f'{table}.{field}'] = array('i')
+        self.read_only = False
+        self._cache: Dict[str, np.ndarray] = {}
+        self._row_index: Optional[Dict[str, int]] = None
+
+    def __len__(self) -> int:
+        return len(self.columns['resume.id'])
+
+    @classmethod
+    def from_resumes(cls, resumes: Iterable[Tuple[str, ResumeData]]) -> 'CorpusStore':
+        store = cls()
+        for resume_id, resume in resumes:
+            store.add(resume_id, resume)
+        return store
+
+    def add(self, resume_id: str, resume: ResumeData) -> int:
+        """Append a resume and return its row index"""
+        if self.read_only:
+            raise RuntimeError('Store is memory-mapped read-only; load it with mmap=False to add resumes')
+        self._cache.clear()
+        self._row_index = None
+        text = self.pools[TEXT_POOL]
+        self.columns['resume.id'].append(text.intern(resume_id))
+        self.columns['resume.personal_info'].append(text.intern(json.dumps(resume.personal_info)))
+        self.columns['resume.summary'].append(text.intern(resume.summary))
+
+        for table, (attr, fields, lists) in TABLES.items():
+            items = getattr(resume, attr)
+            for item in items:
+                for path, pool in fields:
+                    value = _get_path(item, path)
+                    if pool is None:
+                        self.columns[f'{table}.{path}'].append(value is not None)
+                    else:
+                        self.columns[f'{table}.{path}'].append(self.pools[pool].intern(value))
+                for field, pool in lists:
+                    column = self.columns[f'{table}.{field}']
+                    column.extend(self.pools[pool].intern(value) for value in getattr(item, field))
+                    self.columns[f'{table}.{field}.offsets'].append(len(column))
+            offsets = self.columns[f'{table}.offsets']
+            offsets.append(offsets[-1] + len(items))
+        return len(self) - 1
+
+    def column(self, name: str) -> np.ndarray:
+        """Return a column as a numpy array (a view for memory-mapped stores)"""
+        data = self.columns[name]
+        if isinstance(data, np.ndarray):
+            return data
+        cached = self._cache.get(name)
+        if cached is None:
+            cached = np.array(data, dtype=np.int64 if data.typecode == 'q' else
+                              np.int8 if data.typecode == 'b' else np.int32)
+            self._cache[name] = cached
+        return cached
+
+    def _parents(self, table: str, field: str = '') -> np.ndarray:
+        """Resume row index for every value of a table column"""
+        key = f'{table}.{field}.parents'
+        cached = self._cache.get(key)
+        if cached is None:
+            offsets = self.column(f'{table}.offsets')
+            parents = np.repeat(np.arange(len(offsets) - 1, dtype=np.int64), np.diff(offsets))
+            if field and f'{table}.{field}.offsets' in self.columns:
+                # Nested list: map each value to its item, then the item to its resume
+                item_offsets = self.column(f'{table}.{field}.offsets')
+                parents = np.repeat(parents, np.diff(item_offsets))
+            cached = parents
+            self._cache[key] = cached
+        return cached
+
+    def _entity_pairs(self, kind: str) -> Tuple[np.ndarray, np.ndarray]:
+        """(resume rows, entity ids) for every occurrence of an entity kind"""
+        rows, ids = [], []
+        for table, field in ENTITY_COLUMNS[kind]:
+            rows.append(self._parents(table, field))
+            ids.append(self.column(f'{table}.{field}'))
+        return np.concatenate(rows), np.concatenate(ids)
+
+    def filter(self, **criteria: str) -> np.ndarray:
+        """
+        Row indices of resumes matching every criterion, e.g.
+        store.filter(skill='Python', company='Acme Corp').
+        """
+        result = None
+        for kind, name in criteria.items():
+            if kind not in ENTITY_COLUMNS:
+                raise ValueError(f'Unsupported filter: {kind}')
+            entity_id = self.pools[kind].lookup(name)
+            if entity_id == NULL:
+                return np.empty(0, dtype=np.int64)
+            rows, ids = self._entity_pairs(kind)
+            matches = np.unique(rows[ids == entity_id])
+            result = matches if result is None else np.intersect1d(result, matches, assume_unique=True)
+        return result if result is not None else np.arange(len(self), dtype=np.int64)
+
+    def group_count(self, by: str, rows: Optional[np.ndarray] = None, top: Optional[int] = None) -> List[Tuple[str, int]]:
+        """Number of distinct resumes per entity, optionally restricted to the given rows"""
+        pool = self.pools[by]
+        resume_rows, ids = self._entity_pairs(by)
+        keep = ids != NULL
+        if rows is not None:
+            keep &= np.isin(resume_rows, rows)
+        # Count each (resume, entity) pair once, e.g. a skill listed twice on one resume
+        pairs = np.unique(resume_rows[keep] * len(pool) + ids[keep])
+        counts = np.bincount(pairs % max(len(pool), 1), minlength=len(pool))
+        order = np.argsort(-counts, kind='stable')
+        order = order[counts[order] > 0][:top]
+        return [(pool[i], int(counts[i])) for i in order]
+
+    def resume_ids(self) -> List[str]:
+        text = self.pools[TEXT_POOL]
+        return [text[i] for i in self.column('resume.id')]
+
+    def find(self, resume_id: str) -> int:
+        """Row index of a resume id, or -1"""
+        if self._row_index is None:
+            self._row_index = {resume: row for row, resume in enumerate(self.resume_ids())}
+        return self._row_index.get(resume_id, NULL)
+
+    def get(self, row: int) -> ResumeData:
+        """Rebuild the ResumeData stored at a row"""
+        text = self.pools[TEXT_POOL]
+        data: Dict[str, Any] = {
+            'personal_info': json.loads(text[self.column('resume.personal_info')[row]]),
+            'summary': text[self.column('resume.summary')[row]],
+        }
+        for table, (attr, fields, lists) in TABLES.items():
+            offsets = self.column(f'{table}.offsets')
+            items = []
+            for item_row in range(offsets[row], offsets[row + 1]):
+                item: Any = {}
+                absent = set()
+                for path, pool in fields:
+                    value = self.column(f'{table}.{path}')[item_row]
+                    if pool is None:
+                        if not value:
+                            absent.add(path)
+                            item[path] = None
+                    elif not path:
+                        # Table of plain strings such as languages
+                        item = self.pools[pool][value]
+                    elif path.split('.')[0] not in absent:
+                        _set_path(item, path, self.pools[pool][value])
+                for field, pool in lists:
+                    list_offsets = self.column(f'{table}.{field}.offsets')
+                    values = self.column(f'{table}.{field}')[list_offsets[item_row]:list_offsets[item_row + 1]]
+                    item[field] = [self.pools[pool][v] for v in values]
+                items.append(item)
+            data[attr] = items
+        return ResumeData(**data)
+
+    def nbytes(self) -> int:
+        """Approximate size of the column data and pooled strings"""
+        total = sum(self.column(name).nbytes for name in self.columns)
+        for pool in self.pools.values():
+            total += sum(len(s.encode('utf-8')) for s in pool.strings()) if pool._blob is None else len(pool._blob)
+        return total
+
+    def save(self, path: str) -> None:
+        """Write the store to a single file with 64-byte aligned, memory-mappable columns"""
+        sections = []
+        for name in self.columns:
+            sections.append((f'col:{name}', self.column(name)))
+        for name, pool in self.pools.items():
+            blob, offsets = pool.encode()
+            sections.append((f'pool:{name}:offsets', offsets))
+            sections.append((f'pool:{name}:blob', np.frombuffer(blob, dtype=np.uint8)))
+
+        header = {'version': 1, 'rows': len(self), 'sections': {}}
+        position = 0
+        for name, data in sections:
+            header['sections'][name] = {'dtype': data.dtype.str, 'offset': position, 'length': len(data)}
+            position += (data.nbytes + 63) // 64 * 64
+        header_bytes = json.dumps(header).encode('utf-8')
+        data_start = (len(MAGIC) + 8 + len(header_bytes) + 63) // 64 * 64
+
+        with open(path, 'wb') as f:
+            f.write(MAGIC)
+            f.write(len(header_bytes).to_bytes(8, 'little'))
+            f.write(header_bytes)
+            for name, data in sections:
+                f.seek(data_start + header['sections'][name]['offset'])
+                f.write(data.tobytes())
+            f.truncate(data_start + position)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> 'CorpusStore':
+        """Open a saved store; with mmap=True columns are read-only views of the file"""
+        with open(path, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f'{path} is not a corpus store file')
+            header_length = int.from_bytes(f.read(8), 'little')
+            header = json.loads(f.read(header_length))
+        data_start = (len(MAGIC) + 8 + header_length + 63) // 64 * 64
+        file_size = os.path.getsize(path)
+        raw = np.memmap(path, dtype=np.uint8, mode='r') if file_size > data_start else np.empty(0, np.uint8)
+
+        def section(name: str) -> np.ndarray:
+            spec = header['sections'][name]
+            dtype = np.dtype(spec['dtype'])
+            start = data_start + spec['offset']
+            view = raw[start:start + spec['length'] * dtype.itemsize].view(dtype)
+            return view if mmap else np.array(view)
+
+        store = cls()
+        for name, current in list(store.columns.items()):
+            values = section(f'col:{name}')
+            store.columns[name] = values if mmap else array(current.typecode, values.tolist())
+        for name, pool in list(store.pools.items()):
+            store.pools[name] = StringPool.from_blob(
+                section(f'pool:{name}:blob'), section(f'pool:{name}:offsets'), pool.dedupe, materialize=not mmap
+            )
+        store.read_only = mmap
+        return store
@@ -0,0 +1,162 @@
+"""
+Service-free stand-ins used by benchmarks, load tests and unit tests.
+
+RecordingDriver mimics the parts of the neo4j driver API that Neo4jManager
+uses and records every Cypher statement instead of sending it anywhere.
+GroundTruthParser is a ResumeParser whose LLM call replays known answers.
+"""
+
+import random
+import re
+import time
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    from .resume_parser import ResumeParser
+except ImportError:
+    from resume_parser import ResumeParser
+
+EMAIL_PATTERN = re.compile(r'[\w.+-]+@[\w-]+\.[\w.]+')
+
+
+class RecordingResult:
+    """Empty query result with the accessors Neo4jManager relies on"""
+
+    def __init__(self, records: Optional[List[Dict[str, Any]]] = None, summary=None):
+        self._records = records or []
+        self._summary = summary
+
+    def __iter__(self):
+        return iter(self._records)
+
+    def single(self):
+        return self._records[0] if self._records else None
+
+    def data(self) -> List[Dict[str, Any]]:
+        return list(self._records)
+
+    def consume(self):
+        return self._summary
+
+
+class RecordingSession:
+    """Session that appends (query, parameters) pairs to a shared list"""
+
+    def __init__(self, statements: List[Tuple[str, Dict[str, Any]]],
+                 responses: Optional[List[Tuple[str, Any]]] = None, plan: Optional[Dict[str, Any]] = None):
+        self.statements = statements
+        self.responses = responses if responses is not None else []
+        self.plan = plan
+
+    def run(self, query, parameters=None, **kwargs) -> RecordingResult:
+        params = dict(parameters or {})
+        params.update(kwargs)
+        self.statements.append((query, params))
+        # PROFILE queries report the driver's canned plan, as the real driver's summary.profile does
+        summary = SimpleNamespace(profile=self.plan) if query.startswith('PROFILE ') else None
+        for fragment, records in self.responses:
+            if fragment in query:
+                return RecordingResult(records(params) if callable(records) else records, summary)
+        return RecordingResult(summary=summary)
+
+    def begin_transaction(self) -> 'RecordingTransaction':
+        return RecordingTransaction(self)
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+
+class RecordingTransaction:
+    """Explicit transaction whose statements are recorded when it commits"""
+
+    def __init__(self, session: RecordingSession):
+        self._session = session
+        self._pending: List[Tuple[str, Dict[str, Any]]] = []
+        self.committed = False
+        self.rolled_back = False
+
+    def run(self, query, parameters=None, **kwargs) -> RecordingResult:
+        return RecordingSession(self._pending, self._session.responses).run(query, parameters, **kwargs)
+
+    def commit(self):
+        self._session.statements.extend(self._pending)
+        self._pending = []
+        self.committed = True
+
+    def rollback(self):
+        self._pending = []
+        self.rolled_back = True
+
+    def close(self):
+        if not self.committed:
+            self.rollback()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+
+class RecordingDriver:
+    """Driver whose sessions record statements instead of executing them"""
+
+    def __init__(self):
+        self.statements: List[Tuple[str, Dict[str, Any]]] = []
+        self.responses: List[Tuple[str, Any]] = []
+        # Plan returned for PROFILE queries, in the shape of the driver's summary.profile
+        self.plan: Optional[Dict[str, Any]] = None
+
+    def respond(self, fragment: str, records) -> None:
+        """Answer queries containing fragment with records, or records(params) if callable"""
+        self.responses.append((fragment, records))
+
+    def session(self, **kwargs) -> RecordingSession:
+        return RecordingSession(self.statements, self.responses, self.plan)
+
+    def verify_connectivity(self):
+        pass
+
+    def close(self):
+        pass
+
+    def reset(self):
+        self.statements.clear()
+
+
+class GroundTruthParser(ResumeParser):
+    """
+    ResumeParser backed by the local "Fake" provider.
+
+    The LLM call looks up the first email address in the prompt and returns
+    the matching ground-truth JSON, optionally after a simulated latency and
+    with a configurable failure rate.
+    """
+
+    def __init__(self, ground_truth: Dict[str, str], latency: float = 0.0, jitter: float = 0.0,
+                 failure_rate: float = 0.0, seed: Optional[int] = None, metrics=None):
+        self.ground_truth = ground_truth
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self._rng = random.Random(seed)
+        super().__init__("Fake", "", metrics=metrics)
+
+    def _call_llm(self, prompt: str) -> str:
+        if self.latency or self.jitter:
+            time.sleep(max(0.0, self.latency + self._rng.uniform(-self.jitter, self.jitter)))
+        if self.failure_rate and self._rng.random() < self.failure_rate:
+            raise Exception("Fake API error: injected failure")
+        match = EMAIL_PATTERN.search(prompt.split("Resume Text:", 1)[-1])
+        if not match or match.group(0) not in self.ground_truth:
+            raise Exception("Fake API error: no ground truth for this resume")
+        return self.ground_truth[match.group(0)]
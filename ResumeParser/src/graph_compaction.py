@@ -0,0 +1,95 @@
+"""
+Collapse parallel relationships between shared nodes.
+
+Ingest used to CREATE a new edge between two shared nodes (Institute and
+Degree, Position and Skill, ...) for every resume that mentioned them, so
+popular nodes carry huge numbers of identical parallel edges. Ingest now
+MERGEs one edge per node pair and keeps an occurrence `count` and a
+`last_seen` timestamp on it; compact() rewrites the edges stored before
+that into the same shape. For each start node it keeps one edge per end
+node, sums the counts (an edge without one counts once), keeps the latest
+last_seen and deletes the rest, committing in batches of start nodes.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    from .query_registry import define
+except ImportError:
+    from query_registry import define
+
+# (start label, relationship type, end label) of every merged, weighted relationship
+SHARED_RELATIONSHIPS: Tuple[Tuple[str, str, str], ...] = (
+    ('Institute', 'OFFERS', 'Degree'),
+    ('Institute', 'HAS_MAJOR', 'Major'),
+    ('Institute', 'OFFERS_COURSE', 'Course'),
+    ('Company', 'HAS_POSITION', 'Position'),
+    ('Position', 'REQUIRES_SKILL', 'Skill'),
+    ('Company', 'USES_SKILL', 'Skill'),
+)
+
+# Size of one relationship record in Neo4j's standard store format. Deleted
+# parallel edges had no properties, so this is all each one occupied; the
+# store reuses the space rather than shrinking its files.
+RELATIONSHIP_RECORD_BYTES = 34
+
+# Labels and types are fixed strings from SHARED_RELATIONSHIPS, since Cypher cannot take them as parameters
+_COUNT = "MATCH (:{start})-[rel:{type}]->(:{end}) RETURN count(rel) AS edges"
+
+_COMPACT = """
+    MATCH (a:{start})
+    CALL {{
+        WITH a
+        MATCH (a)-[rel:{type}]->(b:{end})
+        WITH b, collect(rel) AS rels
+        WHERE size(rels) > 1 OR rels[0].count IS NULL
+        WITH head(rels) AS keep, tail(rels) AS extra,
+             reduce(total = 0, rel IN rels | total + coalesce(rel.count, 1)) AS total,
+             reduce(latest = null, rel IN rels |
+                    CASE WHEN latest IS NULL OR rel.last_seen > latest THEN rel.last_seen ELSE latest END) AS last_seen
+        SET keep.count = total, keep.last_seen = coalesce(last_seen, datetime())
+        FOREACH (rel IN extra | DELETE rel)
+        RETURN sum(size(extra)) AS deleted
+    }} IN TRANSACTIONS OF $batch_size ROWS
+    RETURN sum(deleted) AS deleted
+"""
+
+
+def count_query(start: str, rel_type: str, end: str) -> str:
+    return define(f'compaction.count_{rel_type.lower()}', _COUNT.format(start=start, type=rel_type, end=end))
+
+
+def compact_query(start: str, rel_type: str, end: str) -> str:
+    return define(f'compaction.compact_{rel_type.lower()}', _COMPACT.format(start=start, type=rel_type, end=end))
+
+
+def _single_value(session, query: str, key: str, **params) -> int:
+    record = session.run(query, **params).single()
+    return int(record[key] or 0) if record else 0
+
+
+def compact(driver, batch_size: int = 500,
+            relationships: Optional[Sequence[Tuple[str, str, str]]] = None) -> Dict[str, Any]:
+    """
+    Collapse parallel edges of each shared relationship type. batch_size is
+    the number of start nodes per transaction. Returns per-type edge counts
+    before and after with totals of edges deleted and bytes reclaimed.
+    """
+    rows: List[Dict[str, Any]] = []
+    with driver.session() as session:
+        # CALL { } IN TRANSACTIONS needs an auto-commit query, which session.run is
+        for start, rel_type, end in relationships or SHARED_RELATIONSHIPS:
+            before = _single_value(session, count_query(start, rel_type, end), 'edges')
+            deleted = _single_value(session, compact_query(start, rel_type, end), 'deleted', batch_size=batch_size)
+            rows.append({
+                'relationship': f'({start})-[:{rel_type}]->({end})',
+                'edges_before': before,
+                'edges_after': before - deleted,
+                'edges_deleted': deleted,
+                'bytes_reclaimed': deleted * RELATIONSHIP_RECORD_BYTES,
+            })
+    return {
+        'relationships': rows,
+        'edges_deleted': sum(row['edges_deleted'] for row in rows),
+        'bytes_reclaimed': sum(row['bytes_reclaimed'] for row in rows),
+    }
@@ -0,0 +1,215 @@
+"""
+Streaming bulk export of the resume graph to partitioned Parquet files.
+
+Each table (resumes, skills, companies, institutes and the resume
+relationships to them) is one Cypher query whose result is streamed from
+the driver with a large fetch size and cut into record batches of
+batch_rows. Batches are appended to Parquet files under
+<directory>/<table>/part-NNNNN.parquet, starting a new file every
+rows_per_file rows, so memory stays bounded by one batch per table no
+matter how large the graph is. Tables are exported concurrently, each on
+its own session, and a manifest.json lists the files and row counts.
+
+With pyarrow installed, batches go through Arrow record batches and a
+ParquetWriter. Without it, pandas writes each batch as its own part file
+(with whatever Parquet engine it finds), or as gzipped CSV with
+format='csv' when no Parquet engine is available at all.
+"""
+
+import glob
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    from .metrics import registry
+    from .query_registry import define
+except ImportError:
+    from metrics import registry
+    from query_registry import define
+
+PARQUET = 'parquet'
+CSV = 'csv'
+FORMATS = (PARQUET, CSV)
+
+ROWS_TOTAL = "graph_export_rows_total"
+
+# table -> (query, columns). Every column is exported as a nullable string;
+# temporal values are converted with toString() in the query.
+TABLES: Dict[str, Tuple[str, Tuple[str, ...]]] = {
+    'resumes': (define('export.resumes', """
+        MATCH (r:Resume)
+        RETURN r.id AS id, r.name AS name, r.email AS email, r.phone AS phone, r.summary AS summary,
+               toString(r.ingested_at) AS ingested_at
+    """), ('id', 'name', 'email', 'phone', 'summary', 'ingested_at')),
+    'skills': (define('export.skills', """
+        MATCH (s:Skill)
+        RETURN s.name AS name, s.category AS category, s.proficiency AS proficiency
+    """), ('name', 'category', 'proficiency')),
+    'companies': (define('export.companies', """
+        MATCH (c:Company)
+        RETURN c.name AS name, c.type AS type
+    """), ('name', 'type')),
+    'institutes': (define('export.institutes', """
+        MATCH (i:Institute)
+        RETURN i.name AS name, i.type AS type
+    """), ('name', 'type')),
+    'resume_skills': (define('export.resume_skills', """
+        MATCH (r:Resume)-[:HAS_SKILL]->(s:Skill)
+        RETURN r.id AS resume_id, s.name AS skill
+    """), ('resume_id', 'skill')),
+    'resume_education': (define('export.resume_education', """
+        MATCH (r:Resume)-[e:HAS_EDUCATION]->(i:Institute)
+        RETURN r.id AS resume_id, i.name AS institute, e.degree AS degree,
+               e.from_date AS from_date, e.to_date AS to_date, e.gpa AS gpa
+    """), ('resume_id', 'institute', 'degree', 'from_date', 'to_date', 'gpa')),
+    'resume_experience': (define('export.resume_experience', """
+        MATCH (r:Resume)-[e:HAS_EXPERIENCE]->(c:Company)
+        RETURN r.id AS resume_id, c.name AS company, e.position AS position,
+               e.from_date AS from_date, e.to_date AS to_date, e.location AS location,
+               e.description AS description
+    """), ('resume_id', 'company', 'position', 'from_date', 'to_date', 'location', 'description')),
+}
+
+
+def _text(value: Any) -> Optional[str]:
+    return value if value is None or isinstance(value, str) else str(value)
+
+
+class ArrowPartWriter:
+    """Appends Arrow record batches to Parquet part files of about rows_per_file rows"""
+
+    def __init__(self, directory: str, columns: Sequence[str], rows_per_file: int, compression: str = 'zstd'):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        self._pa, self._pq = pa, pq
+        self.directory = directory
+        self.schema = pa.schema([(name, pa.string()) for name in columns])
+        self.rows_per_file = rows_per_file
+        self.compression = compression
+        self.files: List[str] = []
+        self._writer = None
+        self._rows_in_file = 0
+
+    def write(self, columns: Dict[str, List[Optional[str]]], rows: int) -> None:
+        if self._writer is None or self._rows_in_file >= self.rows_per_file:
+            self._roll()
+        self._writer.write_batch(self._pa.RecordBatch.from_pydict(columns, schema=self.schema))
+        self._rows_in_file += rows
+
+    def _roll(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        path = os.path.join(self.directory, f'part-{len(self.files):05d}.parquet')
+        self._writer = self._pq.ParquetWriter(path, self.schema, compression=self.compression)
+        self.files.append(path)
+        self._rows_in_file = 0
+
+    def close(self) -> List[str]:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        return self.files
+
+
+class PandasPartWriter:
+    """Writes every batch as its own part file through a pandas DataFrame"""
+
+    def __init__(self, directory: str, columns: Sequence[str], fmt: str = PARQUET):
+        import pandas as pd
+        self._pd = pd
+        self.directory = directory
+        self.columns = list(columns)
+        self.fmt = fmt
+        self.files: List[str] = []
+
+    def write(self, columns: Dict[str, List[Optional[str]]], rows: int) -> None:
+        frame = self._pd.DataFrame(columns, columns=self.columns, dtype='string')
+        if self.fmt == CSV:
+            path = os.path.join(self.directory, f'part-{len(self.files):05d}.csv.gz')
+            frame.to_csv(path, index=False, compression='gzip')
+        else:
+            path = os.path.join(self.directory, f'part-{len(self.files):05d}.parquet')
+            frame.to_parquet(path, index=False)
+        self.files.append(path)
+
+    def close(self) -> List[str]:
+        return self.files
+
+
+def part_writer(directory: str, columns: Sequence[str], fmt: str = PARQUET, rows_per_file: int = 1_000_000):
+    """Arrow writer for Parquet when pyarrow imports, else the pandas writer"""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported export format: {fmt}. Choose one of {', '.join(FORMATS)}")
+    if fmt == PARQUET:
+        try:
+            return ArrowPartWriter(directory, columns, rows_per_file)
+        except ImportError:
+            pass
+    return PandasPartWriter(directory, columns, fmt)
+
+
+def export_table(driver, directory: str, table: str, fmt: str = PARQUET, fetch_size: int = 10_000,
+                 batch_rows: int = 50_000, rows_per_file: int = 1_000_000, metrics=None) -> Dict[str, Any]:
+    """Stream one table into <directory>/<table>/; returns its manifest entry"""
+    metrics = metrics or registry
+    query, columns = TABLES[table]
+    table_dir = os.path.join(directory, table)
+    os.makedirs(table_dir, exist_ok=True)
+    # Parts of an earlier export would otherwise be read back as part of this one
+    for stale in glob.glob(os.path.join(table_dir, 'part-*')):
+        os.unlink(stale)
+
+    writer = part_writer(table_dir, columns, fmt, rows_per_file)
+    buffers: Dict[str, List[Optional[str]]] = {name: [] for name in columns}
+    rows = pending = 0
+    started = time.perf_counter()
+    with metrics.stage("graph_export", table=table), driver.session(fetch_size=fetch_size) as session:
+        for record in session.run(query):
+            for name in columns:
+                buffers[name].append(_text(record[name]))
+            pending += 1
+            if pending == batch_rows:
+                writer.write(buffers, pending)
+                rows += pending
+                buffers, pending = {name: [] for name in columns}, 0
+        if pending:
+            writer.write(buffers, pending)
+            rows += pending
+    files = writer.close()
+    metrics.counter(ROWS_TOTAL, "Rows exported from the graph by table").inc(rows, table=table)
+    return {
+        'rows': rows,
+        'columns': list(columns),
+        'files': [os.path.relpath(path, directory) for path in files],
+        'seconds': round(time.perf_counter() - started, 3),
+    }
+
+
+def export_graph(driver, directory: str, tables: Optional[Sequence[str]] = None, fmt: str = PARQUET,
+                 fetch_size: int = 10_000, batch_rows: int = 50_000, rows_per_file: int = 1_000_000,
+                 workers: int = 4, metrics=None) -> Dict[str, Any]:
+    """
+    Export tables (all of TABLES by default) concurrently and write
+    manifest.json. PROFILE sampling would buffer whole results, so pass a
+    plain driver rather than an instrumented one.
+    """
+    tables = list(tables or TABLES)
+    unknown = [table for table in tables if table not in TABLES]
+    if unknown:
+        raise ValueError(f"Unknown export tables: {', '.join(unknown)}")
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported export format: {fmt}. Choose one of {', '.join(FORMATS)}")
+    os.makedirs(directory, exist_ok=True)
+
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(tables))), thread_name_prefix='export') as pool:
+        futures = {table: pool.submit(export_table, driver, directory, table, fmt, fetch_size, batch_rows,
+                                      rows_per_file, metrics) for table in tables}
+        results = {table: future.result() for table, future in futures.items()}
+
+    manifest = {'exported_at': time.time(), 'format': fmt, 'tables': results}
+    with open(os.path.join(directory, 'manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
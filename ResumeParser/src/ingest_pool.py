@@ -0,0 +1,269 @@
+"""
+Background resume ingestion shared by every UI session in a process.
+
+Uploaded files are submitted to one bounded thread pool, so a slow LLM
+call never blocks a Streamlit script thread and the number of parses in
+flight is capped across all sessions, not per user. Each job moves
+through queued -> extracting -> parsing -> writing -> done (or failed);
+the graph write happens in the worker as soon as a parse completes, or,
+with a write_queue, is handed to the durable write-behind queue so a slow
+or unavailable graph never holds up parsing. With a near-duplicate index,
+extracted text that nearly matches an earlier upload is flagged before the
+LLM call and, with reuse_duplicates, takes the earlier parse instead.
+Pages poll snapshots of their jobs and collect finished ones into their
+own session state.
+"""
+
+import os
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+try:
+    from .llm_usage import document_key
+    from .metrics import registry
+    from .resume_schema import ResumeData
+except ImportError:
+    from llm_usage import document_key
+    from metrics import registry
+    from resume_schema import ResumeData
+
+QUEUED = 'queued'
+EXTRACTING = 'extracting'
+PARSING = 'parsing'
+WRITING = 'writing'
+DONE = 'done'
+FAILED = 'failed'
+FINISHED = (DONE, FAILED)
+
+# Concurrent parses per process unless INGEST_WORKERS says otherwise
+DEFAULT_WORKERS = 4
+
+JOBS_TOTAL = "resume_ingest_jobs_total"
+DUPLICATES_TOTAL = "resume_near_duplicates_total"
+
+
+def extract_upload(parser, filename: str, data: bytes) -> str:
+    """Text of an uploaded document, using filename's extension to pick the extractor"""
+    suffix = os.path.splitext(filename)[1]
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp_file:
+        tmp_file.write(data)
+        tmp_file_path = tmp_file.name
+    try:
+        return parser.extract_text_from_file(tmp_file_path)
+    finally:
+        os.unlink(tmp_file_path)
+
+
+def resume_record(parsed: ResumeData, resume_id: Optional[str] = None) -> Dict[str, Any]:
+    """Display dict for a parsed resume, as kept in session state"""
+    record = parsed.model_dump()
+    record['id'] = resume_id or str(uuid.uuid4())
+    record['name'] = parsed.personal_info.get('name', 'Unknown')
+    record['parsed_at'] = datetime.now().isoformat()
+    return record
+
+
+@dataclass
+class IngestJob:
+    job_id: str
+    filename: str
+    session_id: str = ''
+    status: str = QUEUED
+    submitted_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    resume: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    # Set when the parse succeeded but the graph write did not
+    graph_error: Optional[str] = None
+    in_graph: bool = False
+    # Set when the graph write was left to the write-behind queue
+    graph_queued: bool = False
+    # Resume this upload nearly duplicates, and their estimated similarity
+    duplicate_of: Optional[str] = None
+    similarity: float = 0.0
+    # Set when the near-duplicate index could not be read or updated; the job still finishes
+    duplicate_error: Optional[str] = None
+    # Model whose parse was used, and the cost and time of all LLM attempts
+    llm_model: str = ''
+    llm_cost: float = 0.0
+    llm_seconds: float = 0.0
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED
+
+    def elapsed(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.time()) - self.started_at
+
+    def row(self) -> Dict[str, Any]:
+        """Progress table row"""
+        return {
+            'file': self.filename,
+            'status': self.status,
+            'name': (self.resume or {}).get('name', ''),
+            'in graph': 'yes' if self.in_graph else 'queued' if self.graph_queued else 'no',
+            'seconds': round(self.elapsed(), 1),
+            'duplicate of': self.duplicate_of or '',
+            'model': self.llm_model,
+            'LLM $': round(self.llm_cost, 4),
+            'LLM seconds': round(self.llm_seconds, 1),
+            'error': self.error or self.graph_error or self.duplicate_error or '',
+        }
+
+
+class IngestPool:
+    """Bounded worker pool that parses uploaded files and writes them to the graph"""
+
+    def __init__(self, max_workers: Optional[int] = None, metrics=None, retain_seconds: float = 3600,
+                 write_queue=None, duplicates=None, reuse_duplicates: Optional[bool] = None):
+        self.max_workers = max_workers or int(os.environ.get('INGEST_WORKERS', DEFAULT_WORKERS))
+        self.metrics = metrics or registry
+        # Finished jobs nobody collected (e.g. the session went away) are dropped after this long
+        self.retain_seconds = retain_seconds
+        self.write_queue = write_queue
+        # NearDuplicateIndex of parsed texts; matches skip the LLM when reuse_duplicates is set
+        self.duplicates = duplicates
+        self.reuse_duplicates = (os.environ.get('NEAR_DUPLICATE_REUSE') == '1'
+                                 if reuse_duplicates is None else reuse_duplicates)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='ingest')
+        self._jobs: Dict[str, IngestJob] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, filename: str, data: bytes, parser, manager=None, session_id: str = '') -> str:
+        """
+        Queue one file for parsing with parser and, if manager is given, for
+        writing to the graph. Returns the job id to poll.
+        """
+        job = IngestJob(job_id=str(uuid.uuid4()), filename=filename, session_id=session_id)
+        with self._lock:
+            self._prune()
+            self._jobs[job.job_id] = job
+        self._executor.submit(self._run, job.job_id, data, parser, manager)
+        return job.job_id
+
+    def jobs(self, job_ids: Iterable[str]) -> List[IngestJob]:
+        """Snapshots of the given jobs in submission order; unknown ids are skipped"""
+        with self._lock:
+            found = [replace(self._jobs[job_id]) for job_id in job_ids if job_id in self._jobs]
+        return sorted(found, key=lambda job: job.submitted_at)
+
+    def collect(self, job_ids: Iterable[str]) -> List[IngestJob]:
+        """Remove and return the finished jobs among job_ids"""
+        with self._lock:
+            done = [self._jobs.pop(job_id) for job_id in list(job_ids)
+                    if job_id in self._jobs and self._jobs[job_id].finished]
+        return sorted(done, key=lambda job: job.submitted_at)
+
+    def pending(self) -> int:
+        """Jobs queued or running across all sessions"""
+        with self._lock:
+            return sum(1 for job in self._jobs.values() if not job.finished)
+
+    def wait(self, job_ids: Iterable[str], timeout: Optional[float] = None, poll: float = 0.05) -> bool:
+        """Block until the given jobs finish; False on timeout"""
+        job_ids = list(job_ids)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not all(job.finished for job in self.jobs(job_ids)):
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(poll)
+        return True
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
+
+    def _update(self, job_id: str, **changes) -> None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                for name, value in changes.items():
+                    setattr(job, name, value)
+
+    def _find_duplicate(self, job_id: str, raw_text: str):
+        """Closest earlier upload above the index threshold, or None"""
+        if self.duplicates is None:
+            return None
+        try:
+            with self.metrics.stage("near_duplicate_lookup"):
+                match = self.duplicates.find(raw_text)
+        except Exception as e:
+            self._update(job_id, duplicate_error=f"Near-duplicate lookup failed: {e}")
+            return None
+        if match is not None:
+            self.metrics.counter(DUPLICATES_TOTAL, "Uploads matching an earlier one by action").inc(
+                action='reused' if self.reuse_duplicates and match.parse else 'flagged')
+        return match
+
+    def _reuse(self, job_id: str, filename: str, raw_text: str, match, manager) -> None:
+        """Finish a job with the parse of the resume it nearly duplicates, linking the document to it"""
+        parsed = match.resume_data()
+        changes = {'duplicate_of': match.resume_id, 'similarity': match.similarity}
+        document = document_key(raw_text)
+        try:
+            self.duplicates.add(raw_text, match.resume_id, parsed)
+        except Exception as e:
+            changes['duplicate_error'] = f"Failed to add to the near-duplicate index: {e}"
+        if manager is not None:
+            try:
+                changes['in_graph'] = manager.link_duplicate_document(
+                    document, filename, match.resume_id, match.similarity)
+            except Exception as e:
+                changes['graph_error'] = f"Failed to link duplicate in Neo4j: {e}"
+        self._update(job_id, status=DONE, resume=resume_record(parsed, match.resume_id),
+                     finished_at=time.time(), **changes)
+        self.metrics.counter(JOBS_TOTAL, "Background ingest jobs by outcome").inc(outcome=DONE)
+
+    def _prune(self) -> None:
+        cutoff = time.time() - self.retain_seconds
+        for job_id in [job_id for job_id, job in self._jobs.items()
+                       if job.finished and job.finished_at < cutoff]:
+            del self._jobs[job_id]
+
+    def _run(self, job_id: str, data: bytes, parser, manager) -> None:
+        with self._lock:
+            filename = self._jobs[job_id].filename
+        self._update(job_id, status=EXTRACTING, started_at=time.time())
+        try:
+            raw_text = extract_upload(parser, filename, data)
+            match = self._find_duplicate(job_id, raw_text)
+            if match is not None and self.reuse_duplicates and match.parse:
+                self._reuse(job_id, filename, raw_text, match, manager)
+                return
+            self._update(job_id, status=PARSING)
+            parsed, usage = parser.parse_with_usage(raw_text, source=filename)
+        except Exception as e:
+            self._update(job_id, status=FAILED, error=str(e), finished_at=time.time())
+            self.metrics.counter(JOBS_TOTAL, "Background ingest jobs by outcome").inc(outcome=FAILED)
+            return
+
+        record = resume_record(parsed)
+        changes = {'llm_model': usage.model, 'llm_cost': usage.cost, 'llm_seconds': usage.seconds}
+        if match is not None:
+            changes.update(duplicate_of=match.resume_id, similarity=match.similarity)
+        if self.duplicates is not None:
+            try:
+                self.duplicates.add(raw_text, record['id'], parsed)
+            except Exception as e:
+                changes['duplicate_error'] = f"Failed to add to the near-duplicate index: {e}"
+        if manager is not None:
+            self._update(job_id, status=WRITING, resume=record)
+            try:
+                if self.write_queue is not None:
+                    self.write_queue.put(record['id'], parsed, target=getattr(manager, 'uri', ''))
+                    changes['graph_queued'] = True
+                else:
+                    manager.create_resume_node(parsed, record['id'])
+                    changes['in_graph'] = True
+            except Exception as e:
+                changes['graph_error'] = f"Failed to add to Neo4j: {e}"
+        self._update(job_id, status=DONE, resume=record, finished_at=time.time(), **changes)
+        self.metrics.counter(JOBS_TOTAL, "Background ingest jobs by outcome").inc(outcome=DONE)
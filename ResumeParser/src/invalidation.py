@@ -0,0 +1,53 @@
+"""
+Ingest-driven cache invalidation.
+
+Every ingest bumps a generation counter for its topic ('resumes' or
+'jobs'). Cached query results take the current generations as part of
+their key, so a cache is invalidated by the next read after an ingest
+without having to know which entries depend on what. Listeners can also
+subscribe for keyed invalidation of a single resume or job.
+"""
+
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+RESUMES = 'resumes'
+JOBS = 'jobs'
+
+
+class IngestGenerations:
+    """Thread-safe per-topic counters, bumped once per ingested document or batch"""
+
+    def __init__(self):
+        self._generations: Dict[str, int] = {}
+        self._listeners: List[Callable[[str, Optional[str]], None]] = []
+        self._lock = threading.Lock()
+
+    def current(self, *topics: str) -> Tuple[int, ...]:
+        """Generations of the given topics, for use as part of a cache key"""
+        with self._lock:
+            return tuple(self._generations.get(topic, 0) for topic in topics)
+
+    def bump(self, topic: str, key: Optional[str] = None) -> int:
+        """Record an ingest of key (a resume or job id, or None for a batch) and notify listeners"""
+        with self._lock:
+            generation = self._generations.get(topic, 0) + 1
+            self._generations[topic] = generation
+            listeners = list(self._listeners)
+        for listener in listeners:
+            listener(topic, key)
+        return generation
+
+    def subscribe(self, listener: Callable[[str, Optional[str]], None]) -> None:
+        """Call listener(topic, key) after every bump"""
+        with self._lock:
+            self._listeners.append(listener)
+
+    def unsubscribe(self, listener: Callable[[str, Optional[str]], None]) -> None:
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+
+# Shared by every Neo4jManager and page in a process
+default_generations = IngestGenerations()
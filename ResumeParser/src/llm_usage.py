@@ -0,0 +1,239 @@
+"""
+Token and cost accounting for LLM calls, and the model routing policy.
+
+Each provider has model tiers, cheapest and fastest first. RoutingPolicy
+starts a resume on the first tier unless it is long or dense (many dated
+entries), in which case it starts one tier up, and ResumeParser moves to
+the next tier only when a response fails JSON decoding or validation.
+max_tokens is sized from the estimated input tokens instead of a fixed
+ceiling, since a resume's JSON is roughly as long as its text.
+
+Every call becomes a UsageRecord (provider, model, tokens, latency, cost,
+outcome) that is exported as metrics and, when the parser has a
+UsageLedger, appended to a local SQLite table that the dashboard reads for
+totals per model and cost and latency per resume. Prices are list prices
+in US dollars per million tokens; register_model() adds or reprices a model.
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+DEFAULT_PATH = 'llm-usage.db'
+
+OK = 'ok'
+INVALID = 'invalid'
+ERROR = 'error'
+
+# Dollars per parsed resume, for the per-resume cost histogram
+COST_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25)
+
+# Output budget: the JSON of a resume is about as long as its text, plus the keys
+OUTPUT_RATIO = 1.2
+OUTPUT_OVERHEAD = 512
+MIN_OUTPUT_TOKENS = 1024
+
+_YEAR = re.compile(r'\b(?:19|20)\d{2}\b')
+
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS llm_calls (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        at REAL NOT NULL,
+        document TEXT NOT NULL,
+        source TEXT NOT NULL DEFAULT '',
+        provider TEXT NOT NULL,
+        model TEXT NOT NULL,
+        attempt INTEGER NOT NULL,
+        outcome TEXT NOT NULL,
+        tokens_in INTEGER NOT NULL,
+        tokens_out INTEGER NOT NULL,
+        seconds REAL NOT NULL,
+        cost REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS llm_calls_document ON llm_calls (document, seq);
+"""
+
+
+@dataclass(frozen=True)
+class ModelSpec:
+    provider: str
+    name: str
+    # US dollars per million tokens
+    input_price: float
+    output_price: float
+    max_output_tokens: int
+
+    def cost(self, tokens_in: int, tokens_out: int) -> float:
+        return (tokens_in * self.input_price + tokens_out * self.output_price) / 1_000_000
+
+
+# Cheapest first; a failed parse escalates to the next entry
+MODEL_TIERS: Dict[str, List[ModelSpec]] = {
+    "OpenAI": [
+        ModelSpec("OpenAI", "gpt-4o-mini", 0.15, 0.60, 16384),
+        ModelSpec("OpenAI", "gpt-4o", 2.50, 10.00, 16384),
+    ],
+    "Anthropic": [
+        ModelSpec("Anthropic", "claude-3-haiku-20240307", 0.25, 1.25, 4096),
+        ModelSpec("Anthropic", "claude-3-5-sonnet-20241022", 3.00, 15.00, 8192),
+    ],
+    "Google": [
+        ModelSpec("Google", "gemini-1.5-flash", 0.075, 0.30, 8192),
+        ModelSpec("Google", "gemini-1.5-pro", 1.25, 5.00, 8192),
+    ],
+}
+
+
+def register_model(spec: ModelSpec, tier: Optional[int] = None) -> None:
+    """Add spec to its provider's tiers (at position tier, default last), replacing a model of the same name"""
+    tiers = [model for model in MODEL_TIERS.get(spec.provider, []) if model.name != spec.name]
+    tiers.insert(len(tiers) if tier is None else tier, spec)
+    MODEL_TIERS[spec.provider] = tiers
+
+
+def model_spec(provider: str, name: str) -> Optional[ModelSpec]:
+    return next((model for model in MODEL_TIERS.get(provider, []) if model.name == name), None)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count, about four characters per token for English text"""
+    return (len(text) + 3) // 4
+
+
+def output_budget(spec: ModelSpec, input_tokens: int) -> int:
+    """max_tokens for a parse of input_tokens of resume text"""
+    wanted = int(input_tokens * OUTPUT_RATIO) + OUTPUT_OVERHEAD
+    return min(spec.max_output_tokens, max(MIN_OUTPUT_TOKENS, wanted))
+
+
+def document_key(raw_text: str) -> str:
+    """Stable id of a resume text, so retries and re-parses of one document group together"""
+    return hashlib.sha256(raw_text.encode('utf-8')).hexdigest()[:16]
+
+
+@dataclass
+class RoutingPolicy:
+    # Resumes with more estimated tokens than this start on the second tier
+    long_document_tokens: int = 3000
+    # ... as do resumes mentioning more distinct years, i.e. many dated roles
+    dense_year_mentions: int = 16
+    # Try larger models after a response fails validation
+    escalate: bool = True
+
+    @classmethod
+    def from_env(cls) -> 'RoutingPolicy':
+        """Thresholds from LLM_LONG_DOCUMENT_TOKENS, LLM_DENSE_YEAR_MENTIONS and LLM_ESCALATE (0 disables)"""
+        return cls(long_document_tokens=int(os.environ.get('LLM_LONG_DOCUMENT_TOKENS', cls.long_document_tokens)),
+                   dense_year_mentions=int(os.environ.get('LLM_DENSE_YEAR_MENTIONS', cls.dense_year_mentions)),
+                   escalate=os.environ.get('LLM_ESCALATE', '1') != '0')
+
+    def is_complex(self, raw_text: str) -> bool:
+        return (estimate_tokens(raw_text) > self.long_document_tokens
+                or len(set(_YEAR.findall(raw_text))) > self.dense_year_mentions)
+
+    def route(self, provider: str, raw_text: str) -> List[ModelSpec]:
+        """Models to try in order; empty for providers without tiers"""
+        tiers = MODEL_TIERS.get(provider, [])
+        if not tiers:
+            return []
+        start = min(len(tiers) - 1, 1 if self.is_complex(raw_text) else 0)
+        return tiers[start:] if self.escalate else tiers[start:start + 1]
+
+
+@dataclass
+class UsageRecord:
+    provider: str
+    model: str
+    attempt: int
+    outcome: str
+    tokens_in: int = 0
+    tokens_out: int = 0
+    seconds: float = 0.0
+    cost: float = 0.0
+    document: str = ''
+    source: str = ''
+    at: float = field(default_factory=time.time)
+
+
+@dataclass
+class ParseUsage:
+    """The LLM calls one parse made, including failed attempts"""
+    document: str
+    calls: List[UsageRecord] = field(default_factory=list)
+
+    @property
+    def cost(self) -> float:
+        return sum(call.cost for call in self.calls)
+
+    @property
+    def seconds(self) -> float:
+        return sum(call.seconds for call in self.calls)
+
+    @property
+    def tokens_in(self) -> int:
+        return sum(call.tokens_in for call in self.calls)
+
+    @property
+    def tokens_out(self) -> int:
+        return sum(call.tokens_out for call in self.calls)
+
+    @property
+    def model(self) -> str:
+        """Model of the last call, the one whose response was used"""
+        return self.calls[-1].model if self.calls else ''
+
+
+class UsageLedger:
+    """SQLite table of every LLM call, for totals per model and cost per resume"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.environ.get('LLM_USAGE_PATH') or DEFAULT_PATH
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+
+    def record(self, call: UsageRecord) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO llm_calls (at, document, source, provider, model, attempt, outcome, "
+                "tokens_in, tokens_out, seconds, cost) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (call.at, call.document, call.source, call.provider, call.model, call.attempt, call.outcome,
+                 call.tokens_in, call.tokens_out, call.seconds, call.cost))
+
+    def totals(self, since: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Calls, tokens, cost and latency per provider and model, most expensive first"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "SELECT provider, model, count(*) AS calls, sum(outcome != 'ok') AS failed, "
+                "sum(tokens_in) AS tokens_in, sum(tokens_out) AS tokens_out, sum(cost) AS cost, "
+                "avg(seconds) AS mean_seconds FROM llm_calls WHERE at >= ? "
+                "GROUP BY provider, model ORDER BY cost DESC, provider, model", (since or 0,))
+            return _rows(cursor)
+
+    def per_resume(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """Cost, latency and attempts of the most recently parsed documents"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "SELECT document, max(source) AS source, max(at) AS at, count(*) AS calls, "
+                "sum(cost) AS cost, sum(seconds) AS seconds, sum(tokens_in) AS tokens_in, "
+                "sum(tokens_out) AS tokens_out, "
+                "(SELECT model FROM llm_calls AS last WHERE last.document = llm_calls.document "
+                " ORDER BY seq DESC LIMIT 1) AS model "
+                "FROM llm_calls GROUP BY document ORDER BY max(seq) DESC LIMIT ?", (limit,))
+            return _rows(cursor)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def _rows(cursor) -> List[Dict[str, Any]]:
+    names = [column[0] for column in cursor.description]
+    return [dict(zip(names, row)) for row in cursor.fetchall()]
@@ -0,0 +1,125 @@
+"""
+Open-loop load driver for the parse-and-ingest path.
+
+Documents from a synthetic corpus are submitted at a fixed target rate to
+a thread pool that runs extraction, LLM parsing and the Neo4j write.
+Latency is measured from each document's scheduled start, so queueing
+delay is included when the pipeline falls behind the target rate.
+"""
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence
+
+try:
+    from .synthetic_corpus import load_manifest
+except ImportError:
+    from synthetic_corpus import load_manifest
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+def percentiles(values: Sequence[float]) -> Dict[str, float]:
+    """Nearest-rank percentiles plus mean and max"""
+    if not values:
+        return {}
+    ordered = sorted(values)
+    summary = {f'p{p}': ordered[min(len(ordered) - 1, max(0, -(-p * len(ordered) // 100) - 1))]
+               for p in PERCENTILES}
+    summary['mean'] = sum(ordered) / len(ordered)
+    summary['max'] = ordered[-1]
+    return summary
+
+
+def load_ground_truth(corpus_dir: str) -> Dict[str, str]:
+    """Map each resume's email to its ground-truth JSON"""
+    ground_truth = {}
+    for entry in load_manifest(corpus_dir)['resumes']:
+        with open(os.path.join(corpus_dir, entry['ground_truth']), 'r', encoding='utf-8') as f:
+            ground_truth[entry['email']] = f.read()
+    return ground_truth
+
+
+def build_work(corpus_dir: str, count: Optional[int] = None,
+               formats: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+    """List the documents to submit, rotating over the requested formats and cycling the corpus"""
+    entries = load_manifest(corpus_dir)['resumes']
+    if not entries:
+        return []
+    count = count or len(entries)
+    work = []
+    for i in range(count):
+        entry = entries[i % len(entries)]
+        available = [fmt for fmt in (formats or entry['documents']) if fmt in entry['documents']]
+        fmt = available[i % len(available)]
+        work.append({
+            'id': f"{entry['id']}-{i}",
+            'path': os.path.join(corpus_dir, entry['documents'][fmt]),
+            'format': fmt,
+            'ground_truth': os.path.join(corpus_dir, entry['ground_truth']),
+        })
+    return work
+
+
+def run_load_test(work: List[Dict[str, Any]], parser, manager=None, rate: Optional[float] = None,
+                  concurrency: int = 4, check_accuracy: bool = True) -> Dict[str, Any]:
+    """
+    Push the work list through parser (and manager, when given).
+
+    rate is the target submissions per second; None submits everything at
+    once. Returns throughput, latency percentiles and error counts.
+    """
+    results = []
+    lock = threading.Lock()
+
+    def process(item, scheduled):
+        started = time.perf_counter()
+        outcome = {'format': item['format'], 'error': None, 'match': None}
+        try:
+            raw_text = parser.extract_text_from_file(item['path'])
+            parsed = parser.parse_resume_with_llm(raw_text)
+            if manager is not None:
+                manager.create_resume_node(parsed, item['id'])
+            if check_accuracy:
+                with open(item['ground_truth'], 'r', encoding='utf-8') as f:
+                    outcome['match'] = parsed.model_dump() == json.loads(f.read())
+        except Exception as e:
+            outcome['error'] = type(e).__name__
+        finished = time.perf_counter()
+        outcome['latency'] = finished - scheduled
+        outcome['service_time'] = finished - started
+        with lock:
+            results.append(outcome)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for i, item in enumerate(work):
+            scheduled = start + (i / rate if rate else 0.0)
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            pool.submit(process, item, scheduled)
+    elapsed = time.perf_counter() - start
+
+    errors: Dict[str, int] = {}
+    for outcome in results:
+        if outcome['error']:
+            errors[outcome['error']] = errors.get(outcome['error'], 0) + 1
+    succeeded = [outcome for outcome in results if not outcome['error']]
+    checked = [outcome for outcome in succeeded if outcome['match'] is not None]
+    return {
+        'submitted': len(work),
+        'completed': len(succeeded),
+        'failed': len(results) - len(succeeded),
+        'error_rate': (len(results) - len(succeeded)) / len(results) if results else 0.0,
+        'errors': errors,
+        'elapsed_seconds': elapsed,
+        'target_rate': rate,
+        'throughput': len(succeeded) / elapsed if elapsed else 0.0,
+        'latency_seconds': percentiles([o['latency'] for o in succeeded]),
+        'service_time_seconds': percentiles([o['service_time'] for o in succeeded]),
+        'ground_truth_match_rate': sum(o['match'] for o in checked) / len(checked) if checked else None,
+    }
@@ -0,0 +1,279 @@
+"""
+In-process metrics for the resume parsing and ingest pipeline.
+
+Records per-stage latency histograms, counters and errors by type, and
+exports them as Prometheus text exposition or JSON snapshots.
+"""
+
+import functools
+import json
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+# Latency buckets in seconds, from fast local stages up to slow LLM calls
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Buckets for small integer distributions such as statements per resume
+COUNT_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+STAGE_SECONDS = "resume_stage_seconds"
+ERRORS_TOTAL = "resume_errors_total"
+LLM_RETRIES_TOTAL = "resume_llm_retries_total"
+CACHE_LOOKUPS_TOTAL = "cache_lookups_total"
+HIT, MISS = "hit", "miss"
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(key) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    escaped = [
+        '%s="%s"' % (k, v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for k, v in pairs
+    ]
+    return "{" + ",".join(escaped) + "}"
+
+
+class Counter:
+    """Monotonic counter with optional labels"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, description: str = ""):
+        self.name = name
+        self.description = description
+        self._values: Dict[LabelKey, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(_label_key(labels), 0)
+
+    def total(self) -> float:
+        return sum(self._values.values())
+
+    def samples(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [{"labels": dict(key), "value": value} for key, value in self._values.items()]
+
+    def prometheus_lines(self) -> List[str]:
+        with self._lock:
+            return [f"{self.name}{_format_labels(key)} {value}" for key, value in self._values.items()]
+
+
+class Gauge(Counter):
+    """Current value that can go up or down, with optional labels"""
+
+    kind = "gauge"
+
+    def set(self, value: float, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram:
+    """Fixed-bucket histogram with optional labels"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, description: str = "", buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.description = description
+        self.buckets = tuple(sorted(buckets))
+        # label key -> [bucket counts..., +Inf count], sum, count
+        self._series: Dict[LabelKey, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels) -> None:
+        key = _label_key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = {"counts": [0] * (len(self.buckets) + 1), "sum": 0.0, "count": 0}
+                self._series[key] = series
+            series["counts"][index] += 1
+            series["sum"] += value
+            series["count"] += 1
+
+    def count(self, **labels) -> int:
+        series = self._series.get(_label_key(labels))
+        return series["count"] if series else 0
+
+    def quantile(self, q: float, **labels) -> Optional[float]:
+        """Estimate a quantile by linear interpolation inside the matching bucket"""
+        series = self._series.get(_label_key(labels))
+        if not series or not series["count"]:
+            return None
+        return self._quantile(series, q)
+
+    def _quantile(self, series: Dict[str, Any], q: float) -> float:
+        rank = q * series["count"]
+        seen = 0
+        for i, bucket_count in enumerate(series["counts"]):
+            if bucket_count and seen + bucket_count >= rank:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                if i == len(self.buckets):
+                    return lower
+                upper = self.buckets[i]
+                return lower + (upper - lower) * ((rank - seen) / bucket_count)
+            seen += bucket_count
+        return self.buckets[-1]
+
+    def samples(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            result = []
+            for key, series in self._series.items():
+                result.append({
+                    "labels": dict(key),
+                    "count": series["count"],
+                    "sum": series["sum"],
+                    "buckets": dict(zip([str(b) for b in self.buckets] + ["+Inf"], series["counts"])),
+                    "p50": self._quantile(series, 0.5),
+                    "p95": self._quantile(series, 0.95),
+                    "p99": self._quantile(series, 0.99),
+                })
+            return result
+
+    def prometheus_lines(self) -> List[str]:
+        lines = []
+        with self._lock:
+            for key, series in self._series.items():
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets, series["counts"]):
+                    cumulative += bucket_count
+                    lines.append(f"{self.name}_bucket{_format_labels(key, ('le', repr(float(bound))))} {cumulative}")
+                lines.append(f"{self.name}_bucket{_format_labels(key, ('le', '+Inf'))} {series['count']}")
+                lines.append(f"{self.name}_sum{_format_labels(key)} {series['sum']}")
+                lines.append(f"{self.name}_count{_format_labels(key)} {series['count']}")
+        return lines
+
+
+class MetricsRegistry:
+    """Collection of named counters, gauges and histograms"""
+
+    def __init__(self):
+        self._metrics: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, description: str = "") -> Counter:
+        return self._get_or_create(name, Counter, description)
+
+    def gauge(self, name: str, description: str = "") -> Gauge:
+        return self._get_or_create(name, Gauge, description)
+
+    def histogram(self, name: str, description: str = "", buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(name, Histogram, description, buckets)
+
+    def _get_or_create(self, name: str, cls, description: str, *args):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = cls(name, description, *args)
+                self._metrics[name] = metric
+            elif type(metric) is not cls:
+                raise ValueError(f"Metric {name} is already registered as a {metric.kind}")
+            return metric
+
+    @contextmanager
+    def stage(self, stage: str, **labels) -> Iterator[None]:
+        """Time a pipeline stage and count its failures by exception type"""
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception as e:
+            self.counter(ERRORS_TOTAL, "Pipeline errors by stage and exception type").inc(
+                stage=stage, type=type(e).__name__
+            )
+            raise
+        finally:
+            self.histogram(STAGE_SECONDS, "Latency of each pipeline stage in seconds").observe(
+                time.perf_counter() - start, stage=stage, **labels
+            )
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return all metrics as a JSON-serialisable dictionary"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {
+            "timestamp": time.time(),
+            "metrics": {
+                m.name: {"type": m.kind, "description": m.description, "samples": m.samples()}
+                for m in metrics
+            },
+        }
+
+    def to_json(self, indent: Optional[int] = None) -> str:
+        return json.dumps(self.snapshot(), indent=indent)
+
+    def to_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format"""
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        lines = []
+        for metric in metrics:
+            if metric.description:
+                lines.append(f"# HELP {metric.name} {metric.description}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.prometheus_lines())
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        with self._lock:
+            self._metrics.clear()
+
+
+# Process-wide registry shared by the parser, the graph manager and the apps
+registry = MetricsRegistry()
+
+
+def record_cache_lookup(cache: str, hit: bool, metrics: Optional[MetricsRegistry] = None) -> None:
+    """Count one lookup in the named cache as a hit or a miss"""
+    (metrics or registry).counter(CACHE_LOOKUPS_TOTAL, "Cache lookups by cache and result").inc(
+        cache=cache, result=HIT if hit else MISS)
+
+
+def counted_cache(cache: str, memoise: Callable[[Callable], Callable],
+                  metrics: Optional[MetricsRegistry] = None) -> Callable[[Callable], Callable]:
+    """
+    Wrap a memoising decorator, e.g. st.cache_data(...), so each call counts
+    as a hit or a miss; a call is a miss when the function body runs.
+    """
+    def decorate(fn: Callable) -> Callable:
+        state = threading.local()
+
+        @functools.wraps(fn)
+        def compute(*args, **kwargs):
+            state.missed = True
+            return fn(*args, **kwargs)
+
+        memoised = memoise(compute)
+
+        @functools.wraps(fn)
+        def lookup(*args, **kwargs):
+            # Saved and restored so a counted cache called from another one is counted on its own
+            outer, state.missed = getattr(state, 'missed', False), False
+            try:
+                return memoised(*args, **kwargs)
+            finally:
+                record_cache_lookup(cache, not state.missed, metrics)
+                state.missed = outer
+
+        if hasattr(memoised, 'clear'):
+            lookup.clear = memoised.clear
+        return lookup
+    return decorate
@@ -0,0 +1,191 @@
+"""
+Near-duplicate detection of resume text before it is sent to the LLM.
+
+The same candidate's resume arrives many times with small edits: a
+re-export, a new phone number, a reordered section. Extracted text is
+normalized (case, punctuation, whitespace) and cut into overlapping word
+shingles. MinHash turns the shingle set into a fixed-size signature whose
+slots agree with probability equal to the Jaccard similarity of two sets.
+Signatures are split into LSH bands, so a lookup only compares against
+documents sharing at least one whole band, and candidates are kept when
+their estimated similarity reaches the threshold.
+
+The index lives in one SQLite file (signatures, band buckets and,
+optionally, the earlier parse), so it survives restarts and a lookup is a
+handful of indexed reads.
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import unicodedata
+import zlib
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+try:
+    from .llm_usage import document_key
+    from .resume_schema import ResumeData
+except ImportError:
+    from llm_usage import document_key
+    from resume_schema import ResumeData
+
+DEFAULT_PATH = 'near-duplicates.db'
+DEFAULT_THRESHOLD = 0.9
+NUM_PERM = 128
+SHINGLE_SIZE = 3
+SEED = 1
+
+# Bands are chosen so a pair right at the threshold is a candidate this often
+MIN_RECALL = 0.95
+
+# Prime just above 2**32: (a * h + b) mod p is a universal hash of 32-bit shingle hashes
+_PRIME = np.uint64((1 << 32) + 15)
+_TOKEN = re.compile(r'[a-z0-9+#]+')
+
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+    CREATE TABLE IF NOT EXISTS documents (
+        document TEXT PRIMARY KEY,
+        resume_id TEXT NOT NULL,
+        signature BLOB NOT NULL,
+        parse TEXT
+    );
+    CREATE TABLE IF NOT EXISTS bands (
+        band INTEGER NOT NULL,
+        bucket BLOB NOT NULL,
+        document TEXT NOT NULL,
+        PRIMARY KEY (band, bucket, document)
+    ) WITHOUT ROWID;
+"""
+
+
+def normalize(text: str) -> List[str]:
+    """Lower-cased word tokens of text, without punctuation or layout"""
+    return _TOKEN.findall(unicodedata.normalize('NFKC', text).lower())
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> np.ndarray:
+    """Distinct crc32 hashes of the word size-grams of text"""
+    words = normalize(text)
+    if not words:
+        return np.empty(0, dtype=np.uint64)
+    grams = {' '.join(words[i:i + size]) for i in range(max(1, len(words) - size + 1))}
+    # crc32 rather than hash(): string hashes are salted per process, and signatures persist
+    return np.fromiter((zlib.crc32(gram.encode('utf-8')) for gram in grams), dtype=np.uint64, count=len(grams))
+
+
+def lsh_bands(num_perm: int, threshold: float) -> Tuple[int, int]:
+    """(bands, rows): the most rows per band that still make a pair at threshold a candidate MIN_RECALL of the time"""
+    for rows in sorted((r for r in range(1, num_perm + 1) if num_perm % r == 0), reverse=True):
+        bands = num_perm // rows
+        if 1 - (1 - threshold ** rows) ** bands >= MIN_RECALL:
+            return bands, rows
+    return num_perm, 1
+
+
+@dataclass
+class DuplicateMatch:
+    document: str
+    resume_id: str
+    # Estimated Jaccard similarity of the shingle sets
+    similarity: float
+    # ResumeData JSON of the earlier parse, when it was stored
+    parse: Optional[str] = None
+
+    def resume_data(self) -> Optional[ResumeData]:
+        return ResumeData.model_validate_json(self.parse) if self.parse else None
+
+
+class NearDuplicateIndex:
+    """Persistent MinHash/LSH index of the resume texts already parsed"""
+
+    def __init__(self, path: Optional[str] = None, threshold: Optional[float] = None, num_perm: int = NUM_PERM,
+                 shingle_size: int = SHINGLE_SIZE):
+        self.path = path or os.environ.get('NEAR_DUPLICATE_PATH') or DEFAULT_PATH
+        self.threshold = threshold if threshold is not None else float(
+            os.environ.get('NEAR_DUPLICATE_THRESHOLD', DEFAULT_THRESHOLD))
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.bands, self.rows = lsh_bands(num_perm, self.threshold)
+        rng = np.random.RandomState(SEED)
+        self._a = rng.randint(1, 1 << 32, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, 1 << 32, size=num_perm, dtype=np.uint64)
+
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+            # Band buckets depend on these, so an index is only reopened with the settings it was built with
+            settings = f'{num_perm}/{shingle_size}/{self.bands}/{SEED}'
+            self._conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('settings', ?)", (settings,))
+            stored = self._conn.execute("SELECT value FROM meta WHERE key = 'settings'").fetchone()[0]
+        if stored != settings:
+            raise ValueError(f"{self.path} was built with num_perm/shingle_size/bands/seed {stored}, not {settings}")
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """MinHash signature of text, None when it has no words"""
+        hashes = shingles(text, self.shingle_size)
+        if not len(hashes):
+            return None
+        # Products stay below 2**64: both factors are under 2**32
+        return ((hashes[:, None] * self._a + self._b) % _PRIME).min(axis=0)
+
+    def find(self, text: str) -> Optional[DuplicateMatch]:
+        """Most similar indexed document at or above the threshold"""
+        signature = self.signature(text)
+        if signature is None:
+            return None
+        keys = self._band_keys(signature)
+        with self._lock:
+            candidates = self._conn.execute(
+                "SELECT d.document, d.resume_id, d.signature, d.parse FROM documents AS d WHERE d.document IN ("
+                "SELECT b.document FROM bands AS b JOIN (" + ' UNION ALL '.join(['SELECT ? AS band, ? AS bucket'] * len(keys))
+                + ") AS k ON b.band = k.band AND b.bucket = k.bucket)",
+                [value for key in keys for value in key]).fetchall()
+        best = None
+        for document, resume_id, stored, parse in candidates:
+            similarity = float(np.mean(np.frombuffer(stored, dtype=np.uint64) == signature))
+            if similarity >= self.threshold and (best is None or similarity > best.similarity):
+                best = DuplicateMatch(document, resume_id, similarity, parse)
+        return best
+
+    def add(self, text: str, resume_id: str, resume_data: Optional[ResumeData] = None) -> Optional[str]:
+        """Index text as the document of resume_id; returns its document key, None for empty text"""
+        signature = self.signature(text)
+        if signature is None:
+            return None
+        document = document_key(text)
+        parse = resume_data.model_dump_json() if resume_data is not None else None
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO documents (document, resume_id, signature, parse) VALUES (?, ?, ?, ?)",
+                    (document, resume_id, signature.tobytes(), parse))
+                self._conn.executemany("INSERT OR IGNORE INTO bands (band, bucket, document) VALUES (?, ?, ?)",
+                                       [key + (document,) for key in self._band_keys(signature)])
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return document
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT count(*) FROM documents").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _band_keys(self, signature: np.ndarray) -> List[Tuple[int, bytes]]:
+        """(band, bucket) pairs; a bucket is a short digest of the band's rows"""
+        return [(band, hashlib.blake2b(signature[band * self.rows:(band + 1) * self.rows].tobytes(),
+                                       digest_size=8).digest())
+                for band in range(self.bands)]
@@ -1,11 +1,409 @@
-from neo4j import GraphDatabase
-from typing import List, Dict, Any
-from resume_schema import ResumeData, Education, Experience, Skill, Project, Certification
+from collections import Counter
+from datetime import date, datetime, timezone
+from typing import List, Dict, Any, Optional, Tuple
+try:
+    from .resume_schema import ResumeData, Education, Experience, Skill, Project, Certification
+    from .metrics import registry, COUNT_BUCKETS
+    from .skill_canonicalizer import default_canonicalizer
+    from .candidate_profiles import CandidateProfile, build_profile, default_profile_cache
+    from .skill_demand import record_demand_counts, record_supply
+    from .skill_index import job_entry
+    from . import candidate_profiles, resume_search, skill_demand, temporal
+    from .resume_search import SearchFilters
+    from .invalidation import JOBS, RESUMES, default_generations
+    from .resume_diff import (STORED_RESUME_QUERY, diff_resume, education_properties, experience_properties,
+                              ingest_month, project_properties, skill_delta, used_skills)
+    from .query_registry import QueryProfiler, define
+    from .temporal import SET_SKILL_TENURE, date_range, skill_tenure
+except ImportError:
+    from resume_schema import ResumeData, Education, Experience, Skill, Project, Certification
+    from metrics import registry, COUNT_BUCKETS
+    from skill_canonicalizer import default_canonicalizer
+    from candidate_profiles import CandidateProfile, build_profile, default_profile_cache
+    from skill_demand import record_demand_counts, record_supply
+    from skill_index import job_entry
+    import candidate_profiles, resume_search, skill_demand, temporal
+    from resume_search import SearchFilters
+    from invalidation import JOBS, RESUMES, default_generations
+    from resume_diff import (STORED_RESUME_QUERY, diff_resume, education_properties, experience_properties,
+                             ingest_month, project_properties, skill_delta, used_skills)
+    from query_registry import QueryProfiler, define
+    from temporal import SET_SKILL_TENURE, date_range, skill_tenure
 import json
 
+# Relationship types that point at Skill nodes and must follow a merge
+SKILL_RELATIONSHIP_TYPES = ('HAS_SKILL', 'REQUIRES_SKILL', 'USES_SKILL', 'ALIAS_OF')
+
+# Resume relationships whose entries are diffed by element id on upsert
+OWNED_ENTRY_TYPES = ('HAS_EDUCATION', 'HAS_EXPERIENCE')
+
+# Resume relationships to shared nodes identified by name, with the node label
+NAMED_LINK_TYPES = {'HAS_SKILL': 'Skill', 'HAS_CERTIFICATION': 'Certification', 'SPEAKS_LANGUAGE': 'Language'}
+
+# Links between shared nodes that count the entries behind them, with the labels at either end
+COUNTED_LINK_TYPES = {
+    'OFFERS': ('Institute', 'Degree'),
+    'HAS_MAJOR': ('Institute', 'Major'),
+    'OFFERS_COURSE': ('Institute', 'Course'),
+    'HAS_POSITION': ('Company', 'Position'),
+    'REQUIRES_SKILL': ('Position', 'Skill'),
+    'USES_SKILL': ('Company', 'Skill'),
+}
+
+CREATE_RESUME = define('resume.create', """
+    CREATE (r:Resume {
+        id: $resume_id,
+        name: $name,
+        email: $email,
+        phone: $phone,
+        summary: $summary,
+        profile: $profile,
+        ingested_at: datetime()
+    })
+""")
+
+# Taking the write lock first serializes concurrent upserts of one resume
+LOCK_RESUME = define('resume.lock', """
+    MATCH (r:Resume {id: $resume_id})
+    SET r.updated_at = datetime()
+""")
+
+UPDATE_RESUME = define('resume.update_properties', """
+    MATCH (r:Resume {id: $resume_id})
+    SET r += $properties, r.profile = $profile
+""")
+
+DELETE_PROJECTS = define('resume.delete_projects', """
+    MATCH (r:Resume {id: $resume_id})-[:HAS_PROJECT]->(p:Project)
+    WHERE elementId(p) IN $refs
+    DETACH DELETE p
+""")
+
+UPDATE_PROJECTS = define('resume.update_projects', """
+    UNWIND $changes AS change
+    MATCH (r:Resume {id: $resume_id})-[:HAS_PROJECT]->(p:Project)
+    WHERE elementId(p) = change.ref
+    SET p.description = change.description, p.url = change.url
+    WITH p, change
+    OPTIONAL MATCH (p)-[u:USES_TECHNOLOGY]->(t:Technology)
+    WHERE NOT t.name IN change.technologies
+    DELETE u
+    WITH DISTINCT p, change
+    FOREACH (tech IN change.technologies |
+        MERGE (t:Technology {name: tech})
+        MERGE (p)-[:USES_TECHNOLOGY]->(t))
+""")
+
+# Cypher cannot take relationship types or labels as parameters, so statements
+# that differ only in those are registered once per type
+_DELETE_OWNED = """
+    MATCH (r:Resume {{id: $resume_id}})-[e:{rel_type}]->()
+    WHERE elementId(e) IN $refs
+    DELETE e
+"""
+DELETE_OWNED = {rel_type: define(f'resume.delete_{rel_type.lower()}', _DELETE_OWNED.format(rel_type=rel_type))
+                for rel_type in OWNED_ENTRY_TYPES}
+
+_UPDATE_OWNED = """
+    UNWIND $changes AS change
+    MATCH (r:Resume {{id: $resume_id}})-[e:{rel_type}]->()
+    WHERE elementId(e) = change.ref
+    SET e += change.properties
+"""
+UPDATE_OWNED = {rel_type: define(f'resume.update_{rel_type.lower()}', _UPDATE_OWNED.format(rel_type=rel_type))
+                for rel_type in OWNED_ENTRY_TYPES}
+
+_UNLINK_NAMED = """
+    MATCH (r:Resume {{id: $resume_id}})-[e:{rel_type}]->(n:{label})
+    WHERE n.name IN $names
+    DELETE e
+"""
+_RELEASE_COUNTED = """
+    UNWIND $links AS link
+    MATCH (:{source} {{name: link.source}})-[e:{rel_type}]->(:{target} {{name: link.target}})
+    SET e.count = coalesce(e.count, 1) - link.count
+    WITH e
+    WHERE e.count <= 0
+    DELETE e
+"""
+RELEASE_COUNTED = {rel_type: define(f'resume.release_{rel_type.lower()}',
+                                    _RELEASE_COUNTED.format(rel_type=rel_type, source=source, target=target))
+                   for rel_type, (source, target) in COUNTED_LINK_TYPES.items()}
+
+UNLINK_NAMED = {rel_type: define(f'resume.unlink_{rel_type.lower()}',
+                                 _UNLINK_NAMED.format(rel_type=rel_type, label=label))
+                for rel_type, label in NAMED_LINK_TYPES.items()}
+
+CREATE_EDUCATION = define('resume.create_education', """
+    MERGE (i:Institute {name: $institute_name})
+    ON CREATE SET i.type = 'Educational'
+    WITH i
+    MERGE (d:Degree {name: $degree_name})
+    WITH i, d
+    MATCH (r:Resume {id: $resume_id})
+    CREATE (r)-[:HAS_EDUCATION {
+        degree: $degree_name,
+        from_date: $from_date,
+        to_date: $to_date,
+        start_date: $start_date,
+        end_date: $end_date,
+        current: $current,
+        gpa: $gpa,
+        majors: $majors,
+        courses: $courses
+    }]->(i)
+    MERGE (i)-[o:OFFERS]->(d)
+    ON CREATE SET o.count = 1, o.last_seen = datetime()
+    ON MATCH SET o.count = coalesce(o.count, 1) + 1, o.last_seen = datetime()
+""")
+
+LINK_MAJOR = define('resume.link_major', """
+    MERGE (m:Major {name: $major_name})
+    WITH m
+    MATCH (i:Institute {name: $institute_name})
+    MERGE (i)-[h:HAS_MAJOR]->(m)
+    ON CREATE SET h.count = 1, h.last_seen = datetime()
+    ON MATCH SET h.count = coalesce(h.count, 1) + 1, h.last_seen = datetime()
+""")
+
+LINK_COURSE = define('resume.link_course', """
+    MERGE (c:Course {name: $course_name})
+    WITH c
+    MATCH (i:Institute {name: $institute_name})
+    MERGE (i)-[o:OFFERS_COURSE]->(c)
+    ON CREATE SET o.count = 1, o.last_seen = datetime()
+    ON MATCH SET o.count = coalesce(o.count, 1) + 1, o.last_seen = datetime()
+""")
+
+CREATE_EXPERIENCE = define('resume.create_experience', """
+    MERGE (c:Company {name: $company_name})
+    ON CREATE SET c.type = 'Organization'
+    WITH c
+    MERGE (p:Position {name: $position_name})
+    WITH c, p
+    MATCH (r:Resume {id: $resume_id})
+    CREATE (r)-[:HAS_EXPERIENCE {
+        position: $position_name,
+        from_date: $from_date,
+        to_date: $to_date,
+        start_date: $start_date,
+        end_date: $end_date,
+        current: $current,
+        description: $description,
+        location: $location,
+        skills_used: $skills_used
+    }]->(c)
+    MERGE (c)-[h:HAS_POSITION]->(p)
+    ON CREATE SET h.count = 1, h.last_seen = datetime()
+    ON MATCH SET h.count = coalesce(h.count, 1) + 1, h.last_seen = datetime()
+""")
+
+LINK_EXPERIENCE_SKILL = define('resume.link_experience_skill', """
+    MERGE (s:Skill {name: $skill_name})
+    FOREACH (alias IN $aliases |
+        MERGE (a:SkillAlias {name: alias})
+        MERGE (a)-[:ALIAS_OF]->(s))
+    WITH s
+    MATCH (c:Company {name: $company_name})
+    MATCH (p:Position {name: $position_name})
+    MERGE (p)-[rs:REQUIRES_SKILL]->(s)
+    ON CREATE SET rs.count = 1, rs.last_seen = datetime()
+    ON MATCH SET rs.count = coalesce(rs.count, 1) + 1, rs.last_seen = datetime()
+    MERGE (c)-[us:USES_SKILL]->(s)
+    ON CREATE SET us.count = 1, us.last_seen = datetime()
+    ON MATCH SET us.count = coalesce(us.count, 1) + 1, us.last_seen = datetime()
+""")
+
+LINK_SKILL = define('resume.link_skill', """
+    MERGE (s:Skill {name: $skill_name})
+    ON CREATE SET s.category = $category, s.proficiency = $proficiency
+    ON MATCH SET s.category = COALESCE(s.category, $category)
+    FOREACH (alias IN $aliases |
+        MERGE (a:SkillAlias {name: alias})
+        MERGE (a)-[:ALIAS_OF]->(s))
+    WITH s
+    MATCH (r:Resume {id: $resume_id})
+    MERGE (r)-[h:HAS_SKILL]->(s)
+    SET h.tenure_months = $tenure_months
+""")
+
+CREATE_PROJECT = define('resume.create_project', """
+    CREATE (p:Project {
+        name: $project_name,
+        description: $description,
+        url: $url
+    })
+    WITH p
+    MATCH (r:Resume {id: $resume_id})
+    CREATE (r)-[:HAS_PROJECT]->(p)
+""")
+
+LINK_PROJECT_TECHNOLOGY = define('resume.link_project_technology', """
+    MERGE (t:Technology {name: $tech_name})
+    WITH t
+    MATCH (:Resume {id: $resume_id})-[:HAS_PROJECT]->(p:Project {name: $project_name})
+    CREATE (p)-[:USES_TECHNOLOGY]->(t)
+""")
+
+LINK_CERTIFICATION = define('resume.link_certification', """
+    MERGE (c:Certification {name: $cert_name})
+    ON CREATE SET c.issuer = $issuer, c.date = $date, c.expiry = $expiry
+    WITH c
+    MATCH (r:Resume {id: $resume_id})
+    CREATE (r)-[:HAS_CERTIFICATION]->(c)
+""")
+
+LINK_LANGUAGE = define('resume.link_language', """
+    MERGE (l:Language {name: $language_name})
+    WITH l
+    MATCH (r:Resume {id: $resume_id})
+    CREATE (r)-[:SPEAKS_LANGUAGE]->(l)
+""")
+
+RESUME_SUMMARY = define('resume.summary', """
+    MATCH (r:Resume {id: $resume_id})
+    OPTIONAL MATCH (r)-[:HAS_EDUCATION]->(i:Institute)
+    OPTIONAL MATCH (r)-[:HAS_EXPERIENCE]->(c:Company)
+    OPTIONAL MATCH (r)-[:HAS_SKILL]->(s:Skill)
+    RETURN r, collect(DISTINCT i.name) as institutes, 
+           collect(DISTINCT c.name) as companies,
+           collect(DISTINCT s.name) as skills
+""")
+
+# A near-duplicate upload that reused an earlier parse is recorded against that resume
+LINK_DUPLICATE_DOCUMENT = define('resume.link_duplicate_document', """
+    MATCH (r:Resume {id: $resume_id})
+    MERGE (d:Document {id: $document})
+    SET d.filename = $filename, d.similarity = $similarity, d.received_at = datetime()
+    MERGE (d)-[:DUPLICATE_OF]->(r)
+    RETURN count(d) AS linked
+""")
+
+JOB_SKILLS = define('job.stored_skills', """
+    MATCH (j:Job) WHERE j.id IN $ids
+    RETURN j.id AS id, [(j)-[:REQUIRES_SKILL]->(s:Skill) | s.name] AS skills
+""")
+
+SAVE_JOBS = define('job.save', """
+    UNWIND $jobs AS job
+    MERGE (j:Job {id: job.id})
+    ON CREATE SET j.ingested_at = datetime()
+    SET j += job.properties
+    WITH j, job
+    UNWIND job.skills AS skill_name
+    MERGE (s:Skill {name: skill_name})
+    MERGE (j)-[:REQUIRES_SKILL]->(s)
+""")
+
+ALL_RESUMES = define('resume.list', """
+    MATCH (r:Resume)
+    RETURN r.id as id, r.name as name, r.email as email
+""")
+
+SKILL_DEGREES = define('skill.degrees', """
+    MATCH (s:Skill)
+    RETURN s.name AS name, size([(s)--() | 1]) AS degree
+    ORDER BY degree DESC, name
+""")
+
+MERGE_SKILL_ALIAS = define('skill.merge_alias', """
+    UNWIND $merges AS merge
+    MATCH (dup:Skill {name: merge.duplicate})
+    MERGE (canon:Skill {name: merge.canonical})
+    ON CREATE SET canon.category = dup.category, canon.proficiency = dup.proficiency
+    MERGE (a:SkillAlias {name: merge.duplicate})
+    MERGE (a)-[:ALIAS_OF]->(canon)
+""")
+
+_MOVE_SKILL_RELATIONSHIP = """
+    UNWIND $merges AS merge
+    MATCH (x)-[old:{rel_type}]->(dup:Skill {{name: merge.duplicate}})
+    MATCH (canon:Skill {{name: merge.canonical}})
+    MERGE (x)-[new:{rel_type}]->(canon)
+    ON CREATE SET new += properties(old)
+    // Two weighted edges now join the same pair: add up their occurrences
+    ON MATCH SET
+        new.count = CASE WHEN new.count IS NULL AND old.count IS NULL THEN null
+                         ELSE coalesce(new.count, 1) + coalesce(old.count, 1) END,
+        new.last_seen = CASE WHEN new.last_seen IS NULL OR old.last_seen > new.last_seen
+                             THEN old.last_seen ELSE new.last_seen END
+    DELETE old
+    RETURN count(old) AS moved
+"""
+MOVE_SKILL_RELATIONSHIP = {
+    rel_type: define(f'skill.move_{rel_type.lower()}', _MOVE_SKILL_RELATIONSHIP.format(rel_type=rel_type))
+    for rel_type in SKILL_RELATIONSHIP_TYPES
+}
+
+DELETE_MERGED_SKILLS = define('skill.delete_merged', """
+    UNWIND $merges AS merge
+    MATCH (dup:Skill {name: merge.duplicate})
+    WITH dup, dup.name AS name, size([(dup)--() | 1]) AS remaining
+    FOREACH (_ IN CASE WHEN remaining = 0 THEN [1] ELSE [] END | DELETE dup)
+    RETURN name, remaining
+""")
+
+# Each count is answered from the count store instead of a label scan
+DATABASE_STATS = define('graph.database_stats', """
+    CALL { MATCH (n:Resume) RETURN count(n) AS resumes }
+    CALL { MATCH (n:Job) RETURN count(n) AS jobs }
+    CALL { MATCH (n:Company) RETURN count(n) AS companies }
+    CALL { MATCH (n:Skill) RETURN count(n) AS skills }
+    CALL { MATCH (n:Position) RETURN count(n) AS positions }
+    CALL { MATCH (n:Location) RETURN count(n) AS locations }
+    RETURN resumes AS Resume, jobs AS Job, companies AS Company, skills AS Skill,
+           positions AS Position, locations AS Location
+""")
+
+
+def database_stats(driver) -> Dict[str, int]:
+    """Node counts per label for the dashboard"""
+    with driver.session() as session:
+        record = session.run(DATABASE_STATS).single()
+    return dict(record) if record else {}
+
+
+def _graph_properties(props: Dict[str, Any]) -> Dict[str, Any]:
+    """Properties Neo4j can store: scalars and lists of scalars, with dates as strings"""
+    stored = {}
+    for name, value in props.items():
+        if isinstance(value, (date, datetime)):
+            value = value.isoformat()
+        if isinstance(value, (str, int, float, bool)):
+            stored[name] = value
+        elif isinstance(value, (list, tuple)) and all(isinstance(item, (str, int, float, bool)) for item in value):
+            stored[name] = list(value)
+    return stored
+
+class _StatementCounter:
+    """Session proxy that counts the Cypher statements sent through it"""
+    
+    def __init__(self, session):
+        self._session = session
+        self.statements = 0
+    
+    def run(self, query, parameters=None, **kwargs):
+        self.statements += 1
+        return self._session.run(query, parameters, **kwargs)
+    
+    def __getattr__(self, name):
+        return getattr(self._session, name)
+
 class Neo4jManager:
-    def __init__(self, uri: str, user: str, password: str):
-        self.driver = GraphDatabase.driver(uri, auth=(user, password))
+    def __init__(self, uri: str, user: str, password: str, metrics=None, driver=None, canonicalizer=None,
+                 profile_cache=None, generations=None, profiler=None):
+        if driver is None:
+            # Imported here so processes that inject a driver (tests, benchmarks, load tests) never load it
+            from neo4j import GraphDatabase
+            driver = GraphDatabase.driver(uri, auth=(user, password))
+        self.uri = uri
+        # Every session opened below reports its queries by registered name
+        self.profiler = profiler or QueryProfiler.from_env()
+        self.driver = self.profiler.instrument(driver)
+        self.metrics = metrics or registry
+        self.canonicalizer = canonicalizer or default_canonicalizer
+        self.profile_cache = profile_cache if profile_cache is not None else default_profile_cache
+        self.generations = generations if generations is not None else default_generations
     
     def close(self):
         """Close the database connection"""
@@ -13,155 +411,296 @@ class Neo4jManager:
     
     def create_resume_node(self, resume_data: ResumeData, resume_id: str) -> None:
         """Create a resume node and all related nodes in Neo4j"""
-        with self.driver.session() as session:
-            # Create the main resume node
-            session.run("""
-                CREATE (r:Resume {
-                    id: $resume_id,
-                    name: $name,
-                    email: $email,
-                    phone: $phone,
-                    summary: $summary
-                })
-            """, 
+        profile = build_profile(resume_id, resume_data, self.canonicalizer)
+        with self.driver.session() as raw_session, self.metrics.stage("graph_write"), \
+                raw_session.begin_transaction() as tx:
+            # One transaction, so the demand counters never disagree with the graph
+            session = _StatementCounter(tx)
+            self._create_resume(session, resume_data, resume_id, profile)
+            tx.commit()
+            self._record_statements(session.statements)
+        
+        # Pages matching this resume see the new profile without a graph read,
+        # and cached resume queries are recomputed on their next read
+        self.profile_cache.put(profile)
+        self.generations.bump(RESUMES, resume_id)
+    
+    def _create_resume(self, session, resume_data: ResumeData, resume_id: str, profile: CandidateProfile):
+        """Write a new resume and everything it links to through the caller's transaction"""
+        # Create the main resume node, with the matching profile precomputed
+        session.run(CREATE_RESUME, 
             resume_id=resume_id,
             name=resume_data.personal_info.get('name', ''),
             email=resume_data.personal_info.get('email', ''),
             phone=resume_data.personal_info.get('phone', ''),
-            summary=resume_data.summary or ''
+            summary=resume_data.summary or '',
+            profile=profile.to_json()
             )
-            
-            # Create education nodes and relationships
-            self._create_education_nodes(session, resume_data.education, resume_id)
-            
-            # Create experience nodes and relationships
-            self._create_experience_nodes(session, resume_data.experience, resume_id)
-            
-            # Create skill nodes and relationships
-            self._create_skill_nodes(session, resume_data.skills, resume_id)
-            
-            # Create project nodes and relationships
-            self._create_project_nodes(session, resume_data.projects, resume_id)
-            
-            # Create certification nodes and relationships
-            self._create_certification_nodes(session, resume_data.certifications, resume_id)
-            
-            # Create language nodes and relationships
-            self._create_language_nodes(session, resume_data.languages, resume_id)
+        
+        # Create education nodes and relationships
+        self._create_education_nodes(session, resume_data.education, resume_id)
+        
+        # Create experience nodes and relationships
+        self._create_experience_nodes(session, resume_data.experience, resume_id)
+        
+        # Create skill nodes and relationships, with the months each skill was used
+        self._create_skill_nodes(session, resume_data.skills, resume_id, profile.tenure_months)
+        
+        # Create project nodes and relationships
+        self._create_project_nodes(session, resume_data.projects, resume_id)
+        
+        # Create certification nodes and relationships
+        self._create_certification_nodes(session, resume_data.certifications, resume_id)
+        
+        # Create language nodes and relationships
+        self._create_language_nodes(session, resume_data.languages, resume_id)
+        
+        # Count the resume towards the supply of each listed skill
+        record_supply(session, (self.canonicalizer.canonical_name(skill.name)
+                                for skill in resume_data.skills if skill.name and skill.name.strip()))
+    
+    def upsert_resume(self, resume_id: str, resume_data: ResumeData) -> Dict[str, Any]:
+        """
+        Bring a stored resume in line with a new parse of it, writing only the
+        relationships that were added, removed or changed, in one transaction.
+        A resume that is not stored yet is created. Returns the change summary
+        ({'resume': [fields], section: {'added', 'removed', 'changed'}}) with
+        'created' and 'statements' added.
+        """
+        return self.upsert_resumes([(resume_id, resume_data)])[0]
+    
+    def upsert_resumes(self, writes: List[Tuple[str, ResumeData]]) -> List[Dict[str, Any]]:
+        """Upsert (resume id, parse) pairs in one transaction; all of them commit or none does"""
+        summaries, refreshed = [], []
+        with self.driver.session() as raw_session, self.metrics.stage("graph_upsert"), \
+                raw_session.begin_transaction() as tx:
+            for resume_id, resume_data in writes:
+                summary, profile, profile_changed, changed = self._upsert_in(tx, resume_id, resume_data)
+                summaries.append(summary)
+                refreshed.append((resume_id, profile, profile_changed, changed))
+            tx.commit()
+        
+        for resume_id, profile, profile_changed, changed in refreshed:
+            if profile_changed:
+                self.profile_cache.put(profile)
+            if changed:
+                self.generations.bump(RESUMES, resume_id)
+        return summaries
+    
+    def _upsert_in(self, tx, resume_id: str, resume_data: ResumeData):
+        """One upsert inside tx: (summary, profile, whether the profile changed, whether anything changed)"""
+        canonical_name = self.canonicalizer.canonical_name
+        profile = build_profile(resume_id, resume_data, self.canonicalizer)
+        tx.run(LOCK_RESUME, resume_id=resume_id)
+        stored = tx.run(STORED_RESUME_QUERY, resume_id=resume_id).single()
+        session = _StatementCounter(tx)
+        if stored is None:
+            self._create_resume(session, resume_data, resume_id, profile)
+            self._record_statements(session.statements)
+            empty = {'resume': {}, 'education': [], 'experience': [], 'skills': [],
+                     'projects': [], 'certifications': [], 'languages': []}
+            summary = diff_resume(empty, resume_data, canonical_name).summary()
+            return dict(summary, created=True, statements=None), profile, True, True
+        
+        stored = dict(stored)
+        diff = diff_resume(stored, resume_data, canonical_name)
+        # Any edit the profile depends on (skills used, dates, proficiency) changes its JSON
+        profile_changed = stored['resume'].get('profile') != profile.to_json()
+        if diff.resume or profile_changed:
+            session.run(UPDATE_RESUME, resume_id=resume_id, properties=diff.resume, profile=profile.to_json())
+        # Tenure follows the (skill, dates) pairs of the roles, whichever edit moved them
+        stored_profile = stored['resume'].get('profile')
+        tenure_changed = (stored_profile is None
+                          or CandidateProfile.from_json(stored_profile).tenure_months != profile.tenure_months)
+        self._apply_resume_diff(session, resume_id, diff, profile, tenure_changed)
+        
+        added, removed = skill_delta(diff, canonical_name)
+        month = ingest_month(stored)
+        # The resume stays counted in the month it was first ingested
+        when = datetime.strptime(month, '%Y-%m').replace(tzinfo=timezone.utc) if month else None
+        record_supply(session, added, when)
+        record_supply(session, removed, when, delta=-1)
+        self._record_statements(session.statements)
+        
+        changed = profile_changed or bool(diff.changes() or diff.resume)
+        return dict(diff.summary(), created=False, statements=session.statements), profile, profile_changed, changed
+    
+    def _apply_resume_diff(self, session, resume_id: str, diff, profile: CandidateProfile, tenure_changed: bool):
+        """Write one ResumeDiff; additions reuse the create path for their sections"""
+        education = diff.sections['education']
+        self._release_education(session, education.removed)
+        self._delete_owned(session, resume_id, 'HAS_EDUCATION', [item['ref'] for item in education.removed])
+        self._update_owned(session, resume_id, 'HAS_EDUCATION', [
+            {'ref': old['ref'], 'properties': education_properties(new)} for old, new in education.changed])
+        self._create_education_nodes(session, education.added, resume_id)
+        
+        experience = diff.sections['experience']
+        self._release_experience(session, experience.removed, experience.changed)
+        self._delete_owned(session, resume_id, 'HAS_EXPERIENCE', [item['ref'] for item in experience.removed])
+        self._update_owned(session, resume_id, 'HAS_EXPERIENCE', [
+            {'ref': old['ref'], 'properties': experience_properties(new, self.canonicalizer.canonical_name)}
+            for old, new in experience.changed])
+        for old, new in experience.changed:
+            # Skills the role no longer uses were released above
+            self._link_experience_skills(session, new, {
+                name: aliases for name, aliases in self._canonical_skills(new.skills_used).items()
+                if name not in old['skills_used']})
+        self._create_experience_nodes(session, experience.added, resume_id)
+        
+        projects = diff.sections['projects']
+        if projects.removed:
+            session.run(DELETE_PROJECTS, resume_id=resume_id, refs=[item['ref'] for item in projects.removed])
+        if projects.changed:
+            session.run(UPDATE_PROJECTS, resume_id=resume_id, changes=[dict(project_properties(new), ref=old['ref'])
+                                               for old, new in projects.changed])
+        self._create_project_nodes(session, projects.added, resume_id)
+        
+        self._unlink_named(session, resume_id, 'HAS_SKILL', diff.sections['skills'].removed)
+        self._create_skill_nodes(session, diff.sections['skills'].added, resume_id, profile.tenure_months)
+        if tenure_changed:
+            # Skills linked before keep their old tenure otherwise
+            session.run(SET_SKILL_TENURE, resume_id=resume_id, tenure=skill_tenure(profile, profile.skills))
+        self._unlink_named(session, resume_id, 'HAS_CERTIFICATION', diff.sections['certifications'].removed)
+        self._create_certification_nodes(session, diff.sections['certifications'].added, resume_id)
+        self._unlink_named(session, resume_id, 'SPEAKS_LANGUAGE', diff.sections['languages'].removed)
+        self._create_language_nodes(session, diff.sections['languages'].added, resume_id)
+    
+    def _delete_owned(self, session, resume_id: str, rel_type: str, refs: List[str]):
+        """Delete the resume's rel_type relationships with the given element ids"""
+        if refs:
+            session.run(DELETE_OWNED[rel_type], resume_id=resume_id, refs=refs)
+    
+    def _update_owned(self, session, resume_id: str, rel_type: str, changes: List[Dict[str, Any]]):
+        """Set new properties on the resume's rel_type relationships, by element id"""
+        if changes:
+            session.run(UPDATE_OWNED[rel_type], resume_id=resume_id, changes=changes)
+    
+    def _release_education(self, session, removed: List[Dict[str, Any]]):
+        """Take removed education entries off the counts of the institute's shared links"""
+        links = {rel_type: Counter() for rel_type in ('OFFERS', 'HAS_MAJOR', 'OFFERS_COURSE')}
+        for item in removed:
+            links['OFFERS'][item['institute'], item['degree']] += 1
+            # Entries written before majors and courses were stored release only the degree
+            links['HAS_MAJOR'].update((item['institute'], name) for name in item.get('majors') or [])
+            links['OFFERS_COURSE'].update((item['institute'], name) for name in item.get('courses') or [])
+        for rel_type, counts in links.items():
+            self._release_counted(session, rel_type, counts)
+    
+    def _release_experience(self, session, removed: List[Dict[str, Any]], changed: List[Tuple[Dict[str, Any], Experience]]):
+        """Take removed roles, and skills dropped from changed roles, off the shared link counts"""
+        links = {rel_type: Counter() for rel_type in ('HAS_POSITION', 'REQUIRES_SKILL', 'USES_SKILL')}
+        dropped = [(item, item['skills_used'] or []) for item in removed]
+        for old, new in changed:
+            kept = set(used_skills(new, self.canonicalizer.canonical_name))
+            dropped.append((old, [name for name in old['skills_used'] or [] if name not in kept]))
+        for item in removed:
+            links['HAS_POSITION'][item['company'], item['position']] += 1
+        for item, skills in dropped:
+            links['REQUIRES_SKILL'].update((item['position'], name) for name in skills)
+            links['USES_SKILL'].update((item['company'], name) for name in skills)
+        for rel_type, counts in links.items():
+            self._release_counted(session, rel_type, counts)
+    
+    def _release_counted(self, session, rel_type: str, counts: Counter):
+        """Decrement rel_type links by (source, target) name; links that reach 0 are deleted"""
+        if counts:
+            session.run(RELEASE_COUNTED[rel_type], links=[
+                {'source': source, 'target': target, 'count': count} for (source, target), count in counts.items()])
+    
+    def _unlink_named(self, session, resume_id: str, rel_type: str, names: List[str]):
+        """Delete the resume's rel_type relationships to shared nodes with the given names"""
+        if names:
+            session.run(UNLINK_NAMED[rel_type], resume_id=resume_id, names=names)
+    
+    def _record_statements(self, statements: int):
+        """Record how many Cypher statements one resume ingest needed"""
+        self.metrics.counter("neo4j_statements_total", "Cypher statements sent to Neo4j").inc(statements)
+        self.metrics.histogram(
+            "neo4j_statements_per_resume", "Cypher statements per ingested resume", COUNT_BUCKETS
+        ).observe(statements)
     
     def _create_education_nodes(self, session, education_list: List[Education], resume_id: str):
         """Create education nodes and relationships"""
         for i, edu in enumerate(education_list):
             # Create institute and degree nodes, then create relationships
-            session.run("""
-                MERGE (i:Institute {name: $institute_name})
-                ON CREATE SET i.type = 'Educational'
-                WITH i
-                MERGE (d:Degree {name: $degree_name})
-                WITH i, d
-                MATCH (r:Resume {id: $resume_id})
-                CREATE (r)-[:HAS_EDUCATION {
-                    from_date: $from_date,
-                    to_date: $to_date,
-                    gpa: $gpa
-                }]->(i)
-                CREATE (i)-[:OFFERS]->(d)
-            """, 
+            session.run(CREATE_EDUCATION, 
             resume_id=resume_id,
             institute_name=edu.institute,
             degree_name=edu.degree,
             from_date=edu.dates.from_date,
             to_date=edu.dates.to_date,
-            gpa=edu.gpa
+            gpa=edu.gpa,
+            majors=edu.major,
+            courses=edu.courses,
+            **date_range(edu.dates)
             )
             
             # Create major nodes and relationships
             for major in edu.major:
-                session.run("""
-                    MERGE (m:Major {name: $major_name})
-                    WITH m
-                    MATCH (i:Institute {name: $institute_name})
-                    CREATE (i)-[:HAS_MAJOR]->(m)
-                """, major_name=major, institute_name=edu.institute)
+                session.run(LINK_MAJOR, major_name=major, institute_name=edu.institute)
             
             # Create course nodes and relationships
             for course in edu.courses:
-                session.run("""
-                    MERGE (c:Course {name: $course_name})
-                    WITH c
-                    MATCH (i:Institute {name: $institute_name})
-                    CREATE (i)-[:OFFERS_COURSE]->(c)
-                """, course_name=course, institute_name=edu.institute)
+                session.run(LINK_COURSE, course_name=course, institute_name=edu.institute)
     
     def _create_experience_nodes(self, session, experience_list: List[Experience], resume_id: str):
         """Create experience nodes and relationships"""
         for i, exp in enumerate(experience_list):
+            skills = self._canonical_skills(exp.skills_used)
             # Create company and position nodes, then create relationships
-            session.run("""
-                MERGE (c:Company {name: $company_name})
-                ON CREATE SET c.type = 'Organization'
-                WITH c
-                MERGE (p:Position {name: $position_name})
-                WITH c, p
-                MATCH (r:Resume {id: $resume_id})
-                CREATE (r)-[:HAS_EXPERIENCE {
-                    from_date: $from_date,
-                    to_date: $to_date,
-                    description: $description,
-                    location: $location
-                }]->(c)
-                CREATE (c)-[:HAS_POSITION]->(p)
-            """, 
+            session.run(CREATE_EXPERIENCE, 
             resume_id=resume_id,
             company_name=exp.company,
             position_name=exp.position,
             from_date=exp.dates.from_date,
             to_date=exp.dates.to_date,
             description=exp.description,
-            location=exp.location
+            location=exp.location,
+            skills_used=sorted(skills),
+            **date_range(exp.dates)
             )
             
             # Create skill relationships for this experience
-            for skill in exp.skills_used:
-                session.run("""
-                    MERGE (s:Skill {name: $skill_name})
-                    WITH s
-                    MATCH (c:Company {name: $company_name})
-                    MATCH (p:Position {name: $position_name})
-                    CREATE (p)-[:REQUIRES_SKILL]->(s)
-                    CREATE (c)-[:USES_SKILL]->(s)
-                """, skill_name=skill, company_name=exp.company, position_name=exp.position)
-    
-    def _create_skill_nodes(self, session, skill_list: List[Skill], resume_id: str):
-        """Create skill nodes and relationships"""
+            self._link_experience_skills(session, exp, skills)
+    
+    def _link_experience_skills(self, session, exp: Experience, skills: Dict[str, List[str]]):
+        """Link the role's company and position to skills, given as canonical name -> aliases"""
+        for skill_name, aliases in skills.items():
+            session.run(LINK_EXPERIENCE_SKILL, skill_name=skill_name, aliases=aliases, company_name=exp.company, position_name=exp.position)
+    
+    def _create_skill_nodes(self, session, skill_list: List[Skill], resume_id: str, tenure: Dict[str, int]):
+        """Create skill nodes and relationships; tenure maps canonical names to months used"""
+        skills_by_name = {}
         for skill in skill_list:
-            session.run("""
-                MERGE (s:Skill {name: $skill_name})
-                ON CREATE SET s.category = $category, s.proficiency = $proficiency
-                ON MATCH SET s.category = COALESCE(s.category, $category)
-                WITH s
-                MATCH (r:Resume {id: $resume_id})
-                MERGE (r)-[:HAS_SKILL]->(s)
-            """, 
+            skills_by_name.setdefault(self.canonicalizer.canonical_name(skill.name), skill)
+        aliases_by_name = self._canonical_skills(skill.name for skill in skill_list)
+        
+        for skill_name, skill in skills_by_name.items():
+            session.run(LINK_SKILL, 
             resume_id=resume_id,
-            skill_name=skill.name,
+            skill_name=skill_name,
+            aliases=aliases_by_name.get(skill_name, []),
             category=skill.category,
-            proficiency=skill.proficiency
+            proficiency=skill.proficiency,
+            tenure_months=tenure.get(skill_name, 0)
             )
     
+    def _canonical_skills(self, names) -> Dict[str, List[str]]:
+        """Group skill names by canonical name, keeping the other spellings as aliases"""
+        grouped = {}
+        for name in names:
+            if not name or not name.strip():
+                continue
+            skill = self.canonicalizer.canonicalize(name)
+            aliases = grouped.setdefault(skill.name, [])
+            if skill.original != skill.name and skill.original not in aliases:
+                aliases.append(skill.original)
+        return grouped
+    
     def _create_project_nodes(self, session, project_list: List[Project], resume_id: str):
         """Create project nodes and relationships"""
         for project in project_list:
-            session.run("""
-                CREATE (p:Project {
-                    name: $project_name,
-                    description: $description,
-                    url: $url
-                })
-                WITH p
-                MATCH (r:Resume {id: $resume_id})
-                CREATE (r)-[:HAS_PROJECT]->(p)
-            """, 
+            session.run(CREATE_PROJECT, 
             resume_id=resume_id,
             project_name=project.name,
             description=project.description,
@@ -170,23 +709,12 @@ class Neo4jManager:
             
             # Create technology relationships
             for tech in project.technologies:
-                session.run("""
-                    MERGE (t:Technology {name: $tech_name})
-                    WITH t
-                    MATCH (p:Project {name: $project_name})
-                    CREATE (p)-[:USES_TECHNOLOGY]->(t)
-                """, tech_name=tech, project_name=project.name)
+                session.run(LINK_PROJECT_TECHNOLOGY, tech_name=tech, project_name=project.name, resume_id=resume_id)
     
     def _create_certification_nodes(self, session, cert_list: List[Certification], resume_id: str):
         """Create certification nodes and relationships"""
         for cert in cert_list:
-            session.run("""
-                MERGE (c:Certification {name: $cert_name})
-                ON CREATE SET c.issuer = $issuer, c.date = $date, c.expiry = $expiry
-                WITH c
-                MATCH (r:Resume {id: $resume_id})
-                CREATE (r)-[:HAS_CERTIFICATION]->(c)
-            """, 
+            session.run(LINK_CERTIFICATION, 
             resume_id=resume_id,
             cert_name=cert.name,
             issuer=cert.issuer,
@@ -197,25 +725,12 @@ class Neo4jManager:
     def _create_language_nodes(self, session, language_list: List[str], resume_id: str):
         """Create language nodes and relationships"""
         for language in language_list:
-            session.run("""
-                MERGE (l:Language {name: $language_name})
-                WITH l
-                MATCH (r:Resume {id: $resume_id})
-                CREATE (r)-[:SPEAKS_LANGUAGE]->(l)
-            """, resume_id=resume_id, language_name=language)
+            session.run(LINK_LANGUAGE, resume_id=resume_id, language_name=language)
     
     def get_resume_summary(self, resume_id: str) -> Dict[str, Any]:
         """Get a summary of a resume from Neo4j"""
         with self.driver.session() as session:
-            result = session.run("""
-                MATCH (r:Resume {id: $resume_id})
-                OPTIONAL MATCH (r)-[:HAS_EDUCATION]->(i:Institute)
-                OPTIONAL MATCH (r)-[:HAS_EXPERIENCE]->(c:Company)
-                OPTIONAL MATCH (r)-[:HAS_SKILL]->(s:Skill)
-                RETURN r, collect(DISTINCT i.name) as institutes, 
-                       collect(DISTINCT c.name) as companies,
-                       collect(DISTINCT s.name) as skills
-            """, resume_id=resume_id)
+            result = session.run(RESUME_SUMMARY, resume_id=resume_id)
             
             record = result.single()
             if record:
@@ -227,12 +742,115 @@ class Neo4jManager:
                 }
             return {}
     
+    def link_duplicate_document(self, document: str, filename: str, resume_id: str, similarity: float) -> bool:
+        """Record an uploaded document as a near-duplicate of a stored resume; False if the resume is not stored"""
+        with self.driver.session() as session:
+            record = session.run(LINK_DUPLICATE_DOCUMENT, document=document, filename=filename,
+                                 resume_id=resume_id, similarity=similarity).single()
+        return bool(record and record['linked'])
+    
+    def save_jobs(self, jobs) -> int:
+        """
+        Write jobs (dicts, dataclasses or models with an id or url) and their
+        required skills by canonical name, counting each new job-skill link
+        towards skill demand in the same transaction. Returns the jobs written.
+        """
+        rows = {}
+        for job in jobs:
+            job_id, skills, props = job_entry(job)
+            if job_id is not None:
+                rows[job_id] = {'id': job_id, 'skills': sorted(self._canonical_skills(skills)),
+                                'properties': _graph_properties(props)}
+        if not rows:
+            return 0
+        with self.driver.session() as raw_session, self.metrics.stage("graph_write"), \
+                raw_session.begin_transaction() as tx:
+            stored = {record['id']: set(record['skills']) for record in tx.run(JOB_SKILLS, ids=list(rows))}
+            tx.run(SAVE_JOBS, jobs=list(rows.values()))
+            # Re-saving a job only counts the skills it did not require before
+            demand = Counter(name for row in rows.values() for name in row['skills']
+                             if name not in stored.get(row['id'], ()))
+            record_demand_counts(tx, demand)
+            tx.commit()
+        self.generations.bump(JOBS)
+        return len(rows)
+    
+    def get_candidate_profile(self, resume_id: str) -> Optional[CandidateProfile]:
+        """Matching profile of one resume, from the cache or a single lookup by id"""
+        return self.profile_cache.get(resume_id, self.driver, self.canonicalizer)
+    
+    def search_resumes(self, query: str, filters: Optional[SearchFilters] = None, page: int = 1,
+                       page_size: int = 20) -> Dict[str, Any]:
+        """Resumes ranked by full-text relevance to query, one page at a time, with highlights"""
+        with self.metrics.stage("resume_search"):
+            return resume_search.search_resumes(self.driver, query, filters, page, page_size, self.canonicalizer)
+    
+    def ensure_indexes(self) -> None:
+        """
+        Create the Resume id constraint and the ingest time, skill demand,
+        search and tenure indexes if missing, and load the stored skill names
+        """
+        candidate_profiles.ensure_indexes(self.driver)
+        skill_demand.ensure_indexes(self.driver)
+        resume_search.ensure_indexes(self.driver)
+        temporal.ensure_indexes(self.driver)
+        self.load_skill_names()
+    
+    def load_skill_names(self) -> List[str]:
+        """Seed the canonicalizer with the stored Skill names, most connected first, so new writes reuse them"""
+        with self.driver.session() as session:
+            names = [record['name'] for record in session.run(SKILL_DEGREES) if record['name']]
+        self.canonicalizer.add_stored_skills(names)
+        return names
+    
+    def resumes_with_tenure(self, skill: str, min_months: int, limit: int = 100) -> List[Dict[str, Any]]:
+        """Resumes with at least min_months of experience using skill, longest first"""
+        return temporal.resumes_with_tenure(self.driver, skill, min_months, limit, self.canonicalizer)
+    
+    def resumes_graduated_after(self, after: date, limit: int = 100) -> List[Dict[str, Any]]:
+        """Education entries that ended on or after a date, latest first"""
+        return temporal.resumes_graduated_after(self.driver, after, limit)
+    
     def get_all_resumes(self) -> List[Dict[str, Any]]:
         """Get all resumes in the database"""
         with self.driver.session() as session:
-            result = session.run("""
-                MATCH (r:Resume)
-                RETURN r.id as id, r.name as name, r.email as email
-            """)
+            result = session.run(ALL_RESUMES)
             
             return [dict(record) for record in result]
+    
+    def plan_skill_merges(self) -> List[Dict[str, str]]:
+        """List existing Skill nodes whose name is not canonical, with their merge target"""
+        # Most-connected spellings go first so they win for names the alias map does not know
+        names = self.load_skill_names()
+        
+        merges = []
+        for name in names:
+            canonical = self.canonicalizer.canonical_name(name)
+            if canonical != name:
+                merges.append({'duplicate': name, 'canonical': canonical})
+        return merges
+    
+    def merge_duplicate_skills(self, batch_size: int = 500, dry_run: bool = False) -> Dict[str, Any]:
+        """Merge duplicate Skill nodes into their canonical node, keeping alias edges"""
+        merges = self.plan_skill_merges()
+        summary = {'planned': merges, 'merged': 0, 'relationships_moved': 0, 'skipped': []}
+        if dry_run:
+            return summary
+        
+        with self.driver.session() as session:
+            for start in range(0, len(merges), batch_size):
+                batch = merges[start:start + batch_size]
+                session.run(MERGE_SKILL_ALIAS, merges=batch)
+                
+                for rel_type in SKILL_RELATIONSHIP_TYPES:
+                    record = session.run(MOVE_SKILL_RELATIONSHIP[rel_type], merges=batch).single()
+                    summary['relationships_moved'] += record['moved'] if record else 0
+                
+                # Anything still attached uses a relationship type this job does not know
+                result = session.run(DELETE_MERGED_SKILLS, merges=batch)
+                for record in result:
+                    if record['remaining']:
+                        summary['skipped'].append(record['name'])
+                    else:
+                        summary['merged'] += 1
+        return summary
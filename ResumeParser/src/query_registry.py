@@ -0,0 +1,255 @@
+"""
+Named Cypher statements and per-query instrumentation.
+
+Every statement the package sends is defined once with define(name, text)
+and takes its values as parameters only, so the server plans each text
+once and reuses the cached plan. A Query is a str, so it goes to the
+driver unchanged; its name labels latency metrics, PROFILE samples and the
+slow-query log.
+
+QueryProfiler.instrument(driver) wraps a driver so that every session and
+transaction opened from it is observed:
+
+- latency per query name goes to the metrics registry;
+- queries slower than slow_threshold seconds are appended to a JSON-lines log;
+- with sample_rate > 0, that fraction of queries runs under PROFILE, and the
+  db hits, rows and planner operators of the plan are recorded and logged.
+
+QueryProfiler.from_env() reads NEO4J_PROFILE_SAMPLE (0 to 1),
+NEO4J_SLOW_QUERY_MS and NEO4J_QUERY_LOG; both features are off by default.
+summarize_log() aggregates a log for scripts/top_queries.py.
+"""
+
+import json
+import os
+import random
+import threading
+import time
+from collections import Counter as TallyCounter
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+try:
+    from .metrics import registry
+except ImportError:
+    from metrics import registry
+
+QUERY_SECONDS = "neo4j_query_seconds"
+QUERY_DB_HITS = "neo4j_query_db_hits_total"
+SLOW_QUERIES = "neo4j_slow_queries_total"
+
+# Name reported for statements that were not defined through the registry
+ADHOC = 'adhoc'
+
+DEFAULT_LOG = 'neo4j-queries.jsonl'
+
+# Schema and administration commands cannot run under PROFILE, nor can batched CALL { } IN TRANSACTIONS
+_UNPROFILABLE = ('CREATE INDEX', 'CREATE CONSTRAINT', 'CREATE FULLTEXT', 'DROP ', 'SHOW ', 'PROFILE', 'EXPLAIN')
+
+
+class Query(str):
+    """Cypher text that carries its registry name"""
+
+    name: str
+
+    def __new__(cls, name: str, text: str) -> 'Query':
+        query = super().__new__(cls, text)
+        query.name = name
+        return query
+
+
+QUERIES: Dict[str, Query] = {}
+
+
+def define(name: str, text: str) -> Query:
+    """Register a statement under a unique name"""
+    existing = QUERIES.get(name)
+    if existing is not None and existing != text:
+        raise ValueError(f"Query {name!r} is already defined with different text")
+    query = Query(name, text)
+    QUERIES[name] = query
+    return query
+
+
+def query_name(query) -> str:
+    return getattr(query, 'name', ADHOC)
+
+
+def _plan_nodes(plan: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    yield plan
+    for child in plan.get('children') or []:
+        yield from _plan_nodes(child)
+
+
+def plan_stats(profile: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """db hits summed over a PROFILE plan, rows out of its root and its operator types"""
+    if not profile:
+        return {}
+    nodes = list(_plan_nodes(profile))
+    return {
+        'db_hits': sum(node.get('dbHits', 0) or 0 for node in nodes),
+        'rows': profile.get('rows', 0) or 0,
+        # The driver reports operators as e.g. 'NodeIndexSeek@neo4j'
+        'operators': [str(node.get('operatorType', '')).split('@')[0] for node in nodes],
+    }
+
+
+class BufferedResult:
+    """Records of a profiled query, already fetched so its plan could be read"""
+
+    def __init__(self, records: List[Any], summary: Any):
+        self._records = records
+        self._summary = summary
+
+    def __iter__(self):
+        return iter(self._records)
+
+    def single(self):
+        return self._records[0] if self._records else None
+
+    def data(self) -> List[Dict[str, Any]]:
+        return [dict(record) for record in self._records]
+
+    def consume(self):
+        return self._summary
+
+
+class _InstrumentedRunner:
+    """Session or transaction proxy that sends run() through a profiler"""
+
+    def __init__(self, target, profiler: 'QueryProfiler'):
+        self._target = target
+        self._profiler = profiler
+
+    def run(self, query, parameters=None, **kwargs):
+        return self._profiler.run(self._target, query, parameters, **kwargs)
+
+    def begin_transaction(self, *args, **kwargs):
+        return _InstrumentedRunner(self._target.begin_transaction(*args, **kwargs), self._profiler)
+
+    def __getattr__(self, name):
+        return getattr(self._target, name)
+
+    def __enter__(self):
+        self._target.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return self._target.__exit__(exc_type, exc_value, traceback)
+
+
+class InstrumentedDriver:
+    """Driver proxy whose sessions report to a QueryProfiler"""
+
+    def __init__(self, driver, profiler: 'QueryProfiler'):
+        self.wrapped = driver
+        self.profiler = profiler
+
+    def session(self, **kwargs):
+        return _InstrumentedRunner(self.wrapped.session(**kwargs), self.profiler)
+
+    def __getattr__(self, name):
+        return getattr(self.wrapped, name)
+
+
+class QueryProfiler:
+    """Latency metrics, sampled PROFILE plans and a slow-query log for named queries"""
+
+    def __init__(self, sample_rate: float = 0.0, slow_threshold: Optional[float] = None,
+                 log_path: Optional[str] = None, metrics=None, seed: Optional[int] = None):
+        self.sample_rate = sample_rate
+        self.slow_threshold = slow_threshold
+        self.log_path = log_path
+        self.metrics = metrics or registry
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, metrics=None) -> 'QueryProfiler':
+        sample_rate = float(os.environ.get('NEO4J_PROFILE_SAMPLE') or 0)
+        slow_ms = os.environ.get('NEO4J_SLOW_QUERY_MS')
+        log_path = os.environ.get('NEO4J_QUERY_LOG') or (DEFAULT_LOG if sample_rate or slow_ms else None)
+        return cls(sample_rate=sample_rate, slow_threshold=float(slow_ms) / 1000 if slow_ms else None,
+                   log_path=log_path, metrics=metrics)
+
+    def instrument(self, driver):
+        if isinstance(driver, InstrumentedDriver):
+            return driver
+        return InstrumentedDriver(driver, self)
+
+    def _sampled(self, query) -> bool:
+        if not self.sample_rate or query.lstrip().upper().startswith(_UNPROFILABLE) or 'IN TRANSACTIONS' in query:
+            return False
+        with self._lock:
+            return self._rng.random() < self.sample_rate
+
+    def run(self, target, query, parameters=None, **kwargs):
+        """Run query on a session or transaction, observing it"""
+        name = query_name(query)
+        started = time.perf_counter()
+        if not self._sampled(query):
+            result = target.run(query, parameters, **kwargs)
+            self._observe(name, time.perf_counter() - started, parameters, kwargs)
+            return result
+
+        result = target.run('PROFILE ' + query, parameters, **kwargs)
+        records = list(result)
+        summary = result.consume()
+        stats = plan_stats(getattr(summary, 'profile', None))
+        self._observe(name, time.perf_counter() - started, parameters, kwargs, stats)
+        return BufferedResult(records, summary)
+
+    def _observe(self, name: str, seconds: float, parameters, kwargs, stats: Optional[Dict[str, Any]] = None):
+        self.metrics.histogram(QUERY_SECONDS, "Cypher query latency by registered name").observe(seconds, query=name)
+        slow = self.slow_threshold is not None and seconds >= self.slow_threshold
+        if slow:
+            self.metrics.counter(SLOW_QUERIES, "Queries over the slow-query threshold").inc(query=name)
+        if stats:
+            self.metrics.counter(QUERY_DB_HITS, "db hits of profiled queries").inc(stats['db_hits'], query=name)
+        if self.log_path and (slow or stats is not None):
+            entry = {
+                'ts': time.time(),
+                'query': name,
+                'seconds': round(seconds, 6),
+                'slow': slow,
+                # Names only: values can hold personal data from resumes
+                'parameters': sorted(set(parameters or {}) | set(kwargs)),
+            }
+            entry.update(stats or {})
+            self._write(entry)
+
+    def _write(self, entry: Dict[str, Any]) -> None:
+        line = json.dumps(entry, sort_keys=True)
+        with self._lock, open(self.log_path, 'a', encoding='utf-8') as log:
+            log.write(line + '\n')
+
+
+def read_log(path: str) -> Iterator[Dict[str, Any]]:
+    with open(path, 'r', encoding='utf-8') as log:
+        for line in log:
+            if line.strip():
+                yield json.loads(line)
+
+
+def summarize_log(entries: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Per-query totals of a slow-query/PROFILE log, most total time first"""
+    totals: Dict[str, Dict[str, Any]] = {}
+    for entry in entries:
+        row = totals.setdefault(entry['query'], {
+            'query': entry['query'], 'count': 0, 'slow': 0, 'total_seconds': 0.0, 'max_seconds': 0.0,
+            'profiled': 0, 'db_hits': 0, 'rows': 0, 'operators': TallyCounter(),
+        })
+        row['count'] += 1
+        row['slow'] += 1 if entry.get('slow') else 0
+        row['total_seconds'] += entry['seconds']
+        row['max_seconds'] = max(row['max_seconds'], entry['seconds'])
+        if 'db_hits' in entry:
+            row['profiled'] += 1
+            row['db_hits'] += entry['db_hits']
+            row['rows'] += entry.get('rows', 0)
+            row['operators'].update(entry.get('operators', []))
+    rows = []
+    for row in totals.values():
+        row['mean_db_hits'] = row['db_hits'] / row['profiled'] if row['profiled'] else None
+        row['operators'] = [name for name, _ in row['operators'].most_common(5)]
+        rows.append(row)
+    return sorted(rows, key=lambda row: -row['total_seconds'])
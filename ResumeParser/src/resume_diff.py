@@ -0,0 +1,236 @@
+"""
+Diff a stored Resume subgraph against a new parse of the same resume.
+
+STORED_RESUME_QUERY reads everything a resume owns in one round trip;
+diff_resume() compares it with a ResumeData section by section, so an
+upsert only writes the relationships that were added, removed or changed.
+Education and experience entries are matched on (institute, degree) and
+(company, position), in order when a resume repeats a pair, and compared
+on the properties of their relationship; an experience relationship also
+keeps the canonical names of the skills used in the role. Projects are
+matched on name and compared on description, URL and technologies.
+Skills, certifications and languages are sets of names. Degrees, majors,
+courses, positions and the skills used in a role hang off nodes shared by
+every resume through links that count the entries behind them; removed
+and changed entries take themselves off those counts, and a link is
+deleted once nothing is left behind it.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+try:
+    from .resume_schema import Certification, Education, Experience, Project, ResumeData, Skill
+    from .query_registry import define
+    from .temporal import date_range
+except ImportError:
+    from resume_schema import Certification, Education, Experience, Project, ResumeData, Skill
+    from query_registry import define
+    from temporal import date_range
+
+STORED_RESUME_QUERY = define('resume.stored_subgraph', """
+    MATCH (r:Resume {id: $resume_id})
+    CALL {
+        WITH r
+        OPTIONAL MATCH (r)-[e:HAS_EDUCATION]->(i:Institute)
+        RETURN collect(e {ref: elementId(e), institute: i.name, .degree, .from_date, .to_date, .gpa,
+                          .majors, .courses}) AS education
+    }
+    CALL {
+        WITH r
+        OPTIONAL MATCH (r)-[e:HAS_EXPERIENCE]->(c:Company)
+        RETURN collect(e {ref: elementId(e), company: c.name, .position, .from_date, .to_date,
+                          .description, .location, .skills_used}) AS experience
+    }
+    CALL {
+        WITH r
+        OPTIONAL MATCH (r)-[:HAS_PROJECT]->(p:Project)
+        RETURN collect(p {ref: elementId(p), .name, .description, .url,
+                          technologies: [(p)-[:USES_TECHNOLOGY]->(t:Technology) | t.name]}) AS projects
+    }
+    RETURN r {.name, .email, .phone, .summary, .profile, ingested_at: toString(r.ingested_at)} AS resume,
+           education, experience, projects,
+           [(r)-[:HAS_SKILL]->(s:Skill) | s.name] AS skills,
+           [(r)-[:HAS_CERTIFICATION]->(c:Certification) | c.name] AS certifications,
+           [(r)-[:SPEAKS_LANGUAGE]->(l:Language) | l.name] AS languages
+""")
+
+# Relationship properties compared for entries that match on their key
+EDUCATION_PROPERTIES = ('from_date', 'to_date', 'gpa')
+EXPERIENCE_PROPERTIES = ('from_date', 'to_date', 'description', 'location', 'skills_used')
+PROJECT_PROPERTIES = ('description', 'url')
+RESUME_PROPERTIES = ('name', 'email', 'phone', 'summary')
+
+SECTIONS = ('education', 'experience', 'skills', 'projects', 'certifications', 'languages')
+
+
+@dataclass
+class SectionDiff:
+    # New schema items, or names for the name-only sections
+    added: List[Any] = field(default_factory=list)
+    # Stored items (dicts with a 'ref' where the section has one), or names
+    removed: List[Any] = field(default_factory=list)
+    # (stored item, new item) pairs whose properties differ
+    changed: List[Tuple[Dict[str, Any], Any]] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+
+@dataclass
+class ResumeDiff:
+    resume: Dict[str, Any] = field(default_factory=dict)
+    sections: Dict[str, SectionDiff] = field(default_factory=dict)
+
+    def summary(self) -> Dict[str, Any]:
+        """Readable change summary: changed resume fields and per-section labels"""
+        result: Dict[str, Any] = {'resume': sorted(self.resume)}
+        for name in SECTIONS:
+            section = self.sections.get(name, SectionDiff())
+            result[name] = {
+                'added': [_label(name, item) for item in section.added],
+                'removed': [_label(name, item) for item in section.removed],
+                'changed': [_label(name, new) for _, new in section.changed],
+            }
+        return result
+
+    def changes(self) -> int:
+        """Number of added, removed and changed entries across all sections"""
+        return sum(len(s.added) + len(s.removed) + len(s.changed) for s in self.sections.values())
+
+
+def _label(section: str, item: Any) -> str:
+    if isinstance(item, str):
+        return item
+    if isinstance(item, Education):
+        return f"{item.degree} at {item.institute}"
+    if isinstance(item, Experience):
+        return f"{item.position} at {item.company}"
+    if isinstance(item, (Project, Skill, Certification)):
+        return item.name
+    if section == 'education':
+        return f"{item.get('degree') or '?'} at {item.get('institute')}"
+    if section == 'experience':
+        return f"{item.get('position') or '?'} at {item.get('company')}"
+    return str(item.get('name', item))
+
+
+def _occurrences(items: List[Any], key: Callable[[Any], Hashable]) -> Dict[Tuple, Any]:
+    """Key items by (key, n) where n counts earlier items with the same key"""
+    seen: Dict[Hashable, int] = {}
+    keyed = {}
+    for item in items:
+        k = key(item)
+        keyed[(k, seen.get(k, 0))] = item
+        seen[k] = seen.get(k, 0) + 1
+    return keyed
+
+
+def _diff_entries(stored: List[Dict[str, Any]], new: List[Any], stored_key, new_key,
+                  properties: Tuple[str, ...], new_properties) -> SectionDiff:
+    diff = SectionDiff()
+    stored_by_key = _occurrences(stored, stored_key)
+    new_by_key = _occurrences(new, new_key)
+    for key, item in new_by_key.items():
+        if key not in stored_by_key:
+            diff.added.append(item)
+        else:
+            old = stored_by_key[key]
+            values = new_properties(item)
+            if any(old.get(name) != values[name] for name in properties):
+                diff.changed.append((old, item))
+    diff.removed = [item for key, item in stored_by_key.items() if key not in new_by_key]
+    return diff
+
+
+def _diff_names(stored: List[str], new: List[str]) -> SectionDiff:
+    stored_set, new_set = set(stored), set(new)
+    return SectionDiff(added=[name for name in dict.fromkeys(new) if name not in stored_set],
+                       removed=sorted(stored_set - new_set))
+
+
+def education_properties(edu: Education) -> Dict[str, Any]:
+    """Relationship properties; the native dates follow the strings and are not compared"""
+    return dict({'from_date': edu.dates.from_date, 'to_date': edu.dates.to_date, 'gpa': edu.gpa},
+                **date_range(edu.dates))
+
+
+def experience_properties(exp: Experience, canonical_name: Callable[[str], str]) -> Dict[str, Any]:
+    """Relationship properties, with the skills used as sorted canonical names"""
+    return dict({'from_date': exp.dates.from_date, 'to_date': exp.dates.to_date,
+                 'description': exp.description, 'location': exp.location,
+                 'skills_used': used_skills(exp, canonical_name)}, **date_range(exp.dates))
+
+
+def used_skills(exp: Experience, canonical_name: Callable[[str], str]) -> List[str]:
+    return sorted({canonical_name(name) for name in exp.skills_used if name and name.strip()})
+
+
+def project_properties(project: Project) -> Dict[str, Any]:
+    return {'description': project.description, 'url': project.url,
+            'technologies': sorted(set(project.technologies))}
+
+
+def resume_properties(resume_data: ResumeData) -> Dict[str, Any]:
+    return {
+        'name': resume_data.personal_info.get('name', ''),
+        'email': resume_data.personal_info.get('email', ''),
+        'phone': resume_data.personal_info.get('phone', ''),
+        'summary': resume_data.summary or '',
+    }
+
+
+def diff_resume(stored: Dict[str, Any], resume_data: ResumeData, canonical_name: Callable[[str], str]) -> ResumeDiff:
+    """
+    Changes that turn the stored record (a STORED_RESUME_QUERY row) into
+    resume_data. Skills, including those used in a role, are compared by
+    canonical name, so a respelling of a skill already stored is not a change.
+    """
+    values = resume_properties(resume_data)
+    diff = ResumeDiff(resume={name: values[name] for name in RESUME_PROPERTIES
+                              if (stored['resume'].get(name) or '') != (values[name] or '')})
+
+    diff.sections['education'] = _diff_entries(
+        stored['education'], resume_data.education,
+        lambda e: (e.get('institute'), e.get('degree')), lambda e: (e.institute, e.degree),
+        EDUCATION_PROPERTIES, education_properties)
+    # Roles stored before skills_used was kept compare as using none
+    stored_experience = [dict(e, skills_used=sorted(set(e.get('skills_used') or []))) for e in stored['experience']]
+    diff.sections['experience'] = _diff_entries(
+        stored_experience, resume_data.experience,
+        lambda e: (e.get('company'), e.get('position')), lambda e: (e.company, e.position),
+        EXPERIENCE_PROPERTIES, lambda e: experience_properties(e, canonical_name))
+
+    stored_projects = [dict(p, technologies=sorted(set(p.get('technologies') or []))) for p in stored['projects']]
+    diff.sections['projects'] = _diff_entries(
+        stored_projects, resume_data.projects, lambda p: p.get('name'), lambda p: p.name,
+        PROJECT_PROPERTIES + ('technologies',), project_properties)
+
+    new_skills: Dict[str, Skill] = {}
+    for skill in resume_data.skills:
+        if skill.name and skill.name.strip():
+            new_skills.setdefault(canonical_name(skill.name), skill)
+    stored_skills = {canonical_name(name): name for name in stored['skills'] if name}
+    skills = SectionDiff(added=[skill for name, skill in new_skills.items() if name not in stored_skills],
+                         removed=sorted(stored for name, stored in stored_skills.items() if name not in new_skills))
+    diff.sections['skills'] = skills
+
+    new_certifications = {cert.name: cert for cert in resume_data.certifications}
+    certifications = _diff_names(stored['certifications'], list(new_certifications))
+    certifications.added = [new_certifications[name] for name in certifications.added]
+    diff.sections['certifications'] = certifications
+    diff.sections['languages'] = _diff_names(stored['languages'], resume_data.languages)
+    return diff
+
+
+def skill_delta(diff: ResumeDiff, canonical_name: Callable[[str], str]) -> Tuple[List[str], List[str]]:
+    """Canonical skill names the upsert adds to and removes from the resume's supply"""
+    skills = diff.sections.get('skills', SectionDiff())
+    return ([canonical_name(skill.name) for skill in skills.added],
+            [canonical_name(name) for name in skills.removed])
+
+
+def ingest_month(stored: Dict[str, Any]) -> Optional[str]:
+    """'YYYY-MM' of the stored resume's ingest, the supply bucket it was counted in"""
+    value = stored['resume'].get('ingested_at')
+    return value[:7] if value else None
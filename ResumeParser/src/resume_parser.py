@@ -1,48 +1,106 @@
 import os
 import json
 import re
-import requests
-from typing import Optional, Dict, Any
-import PyPDF2
-from docx import Document
+import importlib
+import threading
+import time
+from typing import Optional, Dict, Any, Union, Callable, Tuple
+from pydantic import ValidationError
 try:
-    from .resume_schema import ResumeData
+    from .resume_schema import ResumeData, RESUME_ADAPTER, SECTION_ADAPTERS, ITEM_ADAPTERS
+    from .metrics import LLM_RETRIES_TOTAL, registry
+    from .llm_usage import (COST_BUCKETS, ERROR, INVALID, MODEL_TIERS, OK, ModelSpec, ParseUsage, RoutingPolicy,
+                            UsageRecord, document_key, estimate_tokens, output_budget)
 except ImportError:
-    from resume_schema import ResumeData
-import openai
-import google.generativeai as genai
+    from resume_schema import ResumeData, RESUME_ADAPTER, SECTION_ADAPTERS, ITEM_ADAPTERS
+    from metrics import LLM_RETRIES_TOTAL, registry
+    from llm_usage import (COST_BUCKETS, ERROR, INVALID, MODEL_TIERS, OK, ModelSpec, ParseUsage, RoutingPolicy,
+                           UsageRecord, document_key, estimate_tokens, output_budget)
+
+# Provider SDKs and document libraries are imported the first time a parser
+# needs them, so a process only pays for the provider and formats it uses.
+# Values are method names, resolved on the parser instance.
+PROVIDERS: Dict[str, str] = {
+    "OpenAI": "_call_openai",
+    "Anthropic": "_call_anthropic",
+    "Google": "_call_google",
+}
+EXTRACTORS: Dict[str, str] = {
+    ".pdf": "_extract_from_pdf",
+    ".doc": "_extract_from_docx",
+    ".docx": "_extract_from_docx",
+    ".txt": "_extract_from_txt",
+}
+
+_import_lock = threading.Lock()
+_configured: Dict[str, Any] = {}
+
+def register_provider(name: str, method_name: str) -> None:
+    """Route llm_provider == name to the parser method method_name(prompt) -> str"""
+    PROVIDERS[name] = method_name
+
+def register_extractor(extension: str, method_name: str) -> None:
+    """Route files ending in extension (with the dot) to the parser method method_name(file_path) -> str"""
+    EXTRACTORS[extension.lower()] = method_name
+
+def lazy_import(module_name: str, configure: Optional[Callable[[Any], None]] = None, key: Optional[str] = None):
+    """
+    Import module_name on first use. configure(module) runs once per key,
+    e.g. to set a provider's API key; later calls return the module as is.
+    """
+    module = importlib.import_module(module_name)
+    if configure is not None:
+        key = key or module_name
+        with _import_lock:
+            if _configured.get(module_name) != key:
+                configure(module)
+                _configured[module_name] = key
+    return module
 
 class ResumeParser:
-    def __init__(self, llm_provider: str, api_key: str):
+    def __init__(self, llm_provider: str, api_key: str, metrics=None, partial_recovery: bool = False,
+                 routing: Optional[RoutingPolicy] = None, ledger=None):
         self.llm_provider = llm_provider
         self.api_key = api_key
+        self.metrics = metrics or registry
+        # Keep the valid sections of a malformed response instead of failing the whole parse
+        self.partial_recovery = partial_recovery
+        # Which model tier each resume starts on, and whether failed parses escalate
+        self.routing = routing or RoutingPolicy.from_env()
+        # Optional UsageLedger persisting every call
+        self.ledger = ledger
+        # Model, max_tokens and token counts of the call in flight on this thread
+        self._call = threading.local()
         self._setup_llm()
     
     def _setup_llm(self):
         """Initialize the selected LLM provider"""
-        if self.llm_provider == "OpenAI":
+        # SDKs are imported and configured on the first call instead, see _openai and _genai
+        pass
+    
+    def _openai(self):
+        def configure(openai):
             openai.api_key = self.api_key
-        elif self.llm_provider == "Anthropic":
-            # Anthropic uses direct API calls, no setup needed
-            pass
-        elif self.llm_provider == "Google":
+        return lazy_import("openai", configure, key=self.api_key)
+    
+    def _genai(self):
+        def configure(genai):
             genai.configure(api_key=self.api_key)
+        return lazy_import("google.generativeai", configure, key=self.api_key)
     
     def extract_text_from_file(self, file_path: str) -> str:
         """Extract text from various file formats"""
         file_extension = os.path.splitext(file_path)[1].lower()
         
-        if file_extension == '.pdf':
-            return self._extract_from_pdf(file_path)
-        elif file_extension in ['.doc', '.docx']:
-            return self._extract_from_docx(file_path)
-        elif file_extension == '.txt':
-            return self._extract_from_txt(file_path)
-        else:
+        extractor = EXTRACTORS.get(file_extension)
+        if extractor is None:
             raise ValueError(f"Unsupported file format: {file_extension}")
+        with self.metrics.stage("extract", format=file_extension.lstrip('.')):
+            return getattr(self, extractor)(file_path)
     
     def _extract_from_pdf(self, file_path: str) -> str:
         """Extract text from PDF file"""
+        PyPDF2 = lazy_import("PyPDF2")
         text = ""
         with open(file_path, 'rb') as file:
             pdf_reader = PyPDF2.PdfReader(file)
@@ -52,7 +110,7 @@ class ResumeParser:
     
     def _extract_from_docx(self, file_path: str) -> str:
         """Extract text from DOCX file"""
-        doc = Document(file_path)
+        doc = lazy_import("docx").Document(file_path)
         text = ""
         for paragraph in doc.paragraphs:
             text += paragraph.text + "\n"
@@ -65,18 +123,89 @@ class ResumeParser:
     
     def parse_resume_with_llm(self, raw_text: str) -> ResumeData:
         """Parse resume text using the selected LLM"""
+        return self.parse_with_usage(raw_text)[0]
+    
+    def parse_with_usage(self, raw_text: str, source: str = '') -> Tuple[ResumeData, ParseUsage]:
+        """
+        Parse resume text, starting on the model tier the routing policy picks
+        and moving to the next tier when a response fails decoding or
+        validation. Returns the parse and the calls it took; source (e.g. the
+        file name) labels them in the usage ledger.
+        """
         prompt = self._create_parsing_prompt(raw_text)
+        input_tokens = estimate_tokens(raw_text)
+        usage = ParseUsage(document=document_key(raw_text))
+        # Providers without model tiers (Fake, registered ones) get a single call
+        route = self.routing.route(self.llm_provider, raw_text) or [None]
         
-        if self.llm_provider == "OpenAI":
-            response = self._call_openai(prompt)
-        elif self.llm_provider == "Anthropic":
-            response = self._call_anthropic(prompt)
-        elif self.llm_provider == "Google":
-            response = self._call_google(prompt)
-        else:
-            raise ValueError(f"Unsupported LLM provider: {self.llm_provider}")
+        try:
+            for attempt, spec in enumerate(route):
+                self._call.spec = spec
+                self._call.max_tokens = output_budget(spec, input_tokens) if spec else None
+                self._call.tokens_in = self._call.tokens_out = 0
+                started = time.perf_counter()
+                try:
+                    with self.metrics.stage("llm_call", provider=self.llm_provider):
+                        response = self._call_llm(prompt)
+                except Exception:
+                    self._account(usage, attempt, ERROR, time.perf_counter() - started, source)
+                    raise
+                seconds = time.perf_counter() - started
+                
+                try:
+                    result = self._parse_llm_response(response)
+                except Exception:
+                    self._account(usage, attempt, INVALID, seconds, source)
+                    if attempt == len(route) - 1:
+                        raise
+                    self.metrics.counter("resume_llm_escalations_total", "Parses retried on a larger model").inc(
+                        provider=self.llm_provider, model=spec.name)
+                    self.metrics.counter(LLM_RETRIES_TOTAL, "LLM calls repeated for one parse, by reason").inc(
+                        provider=self.llm_provider, reason=INVALID)
+                    continue
+                self._account(usage, attempt, OK, seconds, source)
+                break
+        finally:
+            self._call.spec = self._call.max_tokens = None
         
-        return self._parse_llm_response(response)
+        self.metrics.histogram("resume_llm_parse_cost_dollars", "LLM cost per parsed resume", COST_BUCKETS).observe(
+            usage.cost, provider=self.llm_provider)
+        self.metrics.histogram("resume_llm_parse_seconds", "LLM time per parsed resume, all attempts").observe(
+            usage.seconds, provider=self.llm_provider)
+        return result, usage
+    
+    def _model(self, prompt: str) -> Tuple[ModelSpec, int]:
+        """Model and max_tokens for the call in flight; outside a parse, the cheapest tier"""
+        spec = getattr(self._call, 'spec', None)
+        if spec is not None:
+            return spec, self._call.max_tokens
+        spec = MODEL_TIERS[self.llm_provider][0]
+        return spec, output_budget(spec, estimate_tokens(prompt))
+    
+    def _account(self, usage: ParseUsage, attempt: int, outcome: str, seconds: float, source: str) -> None:
+        """Turn the finished call into a UsageRecord, in metrics and the ledger"""
+        spec = self._call.spec
+        tokens_in, tokens_out = self._call.tokens_in, self._call.tokens_out
+        call = UsageRecord(provider=self.llm_provider, model=spec.name if spec else '', attempt=attempt,
+                           outcome=outcome, tokens_in=tokens_in, tokens_out=tokens_out, seconds=seconds,
+                           cost=spec.cost(tokens_in, tokens_out) if spec else 0.0,
+                           document=usage.document, source=source)
+        usage.calls.append(call)
+        self.metrics.counter("resume_llm_calls_total", "LLM calls by provider, model and outcome").inc(
+            provider=call.provider, model=call.model, outcome=outcome)
+        self.metrics.counter("resume_llm_cost_dollars_total", "LLM cost in US dollars by provider and model").inc(
+            call.cost, provider=call.provider, model=call.model)
+        self.metrics.histogram("resume_llm_call_seconds", "LLM call latency by provider and model").observe(
+            seconds, provider=call.provider, model=call.model)
+        if self.ledger is not None:
+            self.ledger.record(call)
+    
+    def _call_llm(self, prompt: str) -> str:
+        """Send the prompt to the selected provider and return the raw response text"""
+        method = PROVIDERS.get(self.llm_provider)
+        if method is None:
+            raise ValueError(f"Unsupported LLM provider: {self.llm_provider}")
+        return getattr(self, method)(prompt)
     
     def _create_parsing_prompt(self, raw_text: str) -> str:
         """Create a detailed prompt for resume parsing"""
@@ -169,11 +298,16 @@ Important instructions:
     def _call_openai(self, prompt: str) -> str:
         """Call OpenAI API"""
         try:
-            response = openai.chat.completions.create(
-                model="gpt-4",
+            model, max_tokens = self._model(prompt)
+            response = self._openai().chat.completions.create(
+                model=model.name,
                 messages=[{"role": "user", "content": prompt}],
+                max_tokens=max_tokens,
                 temperature=0.1
             )
+            usage = getattr(response, "usage", None)
+            if usage is not None:
+                self._record_usage(usage.prompt_tokens, usage.completion_tokens)
             return response.choices[0].message.content
         except Exception as e:
             raise Exception(f"OpenAI API error: {str(e)}")
@@ -186,9 +320,10 @@ Important instructions:
             "anthropic-version": "2023-06-01",
         }
 
+        model, max_tokens = self._model(prompt)
         data = {
-            "model": "claude-3-haiku-20240307",
-            "max_tokens": 4000,
+            "model": model.name,
+            "max_tokens": max_tokens,
             "temperature": 0,
             "system": (
                 "You are a resume parser. Return valid JSON only—no prose. "
@@ -202,11 +337,14 @@ Important instructions:
             ],
         }
 
+        requests = lazy_import("requests")
         try:
             resp = requests.post("https://api.anthropic.com/v1/messages", headers=headers, json=data)
             resp.raise_for_status()
             
             response_data = resp.json()
+            usage = response_data.get("usage") or {}
+            self._record_usage(usage.get("input_tokens", 0), usage.get("output_tokens", 0))
             text = response_data.get("content", [{"text": ""}])[0].get("text", "")
             
             # Attempt to isolate a JSON object/array
@@ -238,29 +376,150 @@ Important instructions:
     def _call_google(self, prompt: str) -> str:
         """Call Google Gemini API"""
         try:
-            model = genai.GenerativeModel('gemini-pro')
-            response = model.generate_content(prompt)
+            model, max_tokens = self._model(prompt)
+            response = self._genai().GenerativeModel(model.name).generate_content(
+                prompt, generation_config={"max_output_tokens": max_tokens})
+            usage = getattr(response, "usage_metadata", None)
+            if usage is not None:
+                self._record_usage(usage.prompt_token_count, usage.candidates_token_count)
             return response.text
         except Exception as e:
             raise Exception(f"Google API error: {str(e)}")
     
-    def _parse_llm_response(self, response: str) -> ResumeData:
+    def _record_usage(self, tokens_in: int, tokens_out: int):
+        """Record LLM token usage for the current provider, and for the call in flight"""
+        tokens = self.metrics.counter("resume_llm_tokens_total", "LLM tokens by provider and direction")
+        tokens.inc(tokens_in or 0, provider=self.llm_provider, direction="in")
+        tokens.inc(tokens_out or 0, provider=self.llm_provider, direction="out")
+        self._call.tokens_in = getattr(self._call, 'tokens_in', 0) + (tokens_in or 0)
+        self._call.tokens_out = getattr(self._call, 'tokens_out', 0) + (tokens_out or 0)
+    
+    def _parse_llm_response(self, response: Union[str, bytes]) -> ResumeData:
         """Parse LLM response and create ResumeData object"""
+        # Clean the response to extract JSON
+        fence, close = ('```json', '```') if isinstance(response, str) else (b'```json', b'```')
+        response = response.strip()
+        if response.startswith(fence):
+            response = response[len(fence):]
+        if response.endswith(close):
+            response = response[:-len(close)]
+        
         try:
-            # Clean the response to extract JSON
-            response = response.strip()
-            if response.startswith('```json'):
-                response = response[7:]
-            if response.endswith('```'):
-                response = response[:-3]
-            
-            # Parse JSON
-            data = json.loads(response)
+            with self.metrics.stage("json_decode"):
+                data = json.loads(response)
+        except json.JSONDecodeError as e:
+            if self.partial_recovery:
+                return self._recover_partial(self._decode_lenient(response))
+            raise Exception(f"Failed to parse JSON response: {str(e)}")
+        
+        try:
+            # The cached adapter validates the dict directly, without copying it into keyword arguments
+            with self.metrics.stage("validation"):
+                return RESUME_ADAPTER.validate_python(data)
+        except ValidationError as e:
+            if self.partial_recovery:
+                return self._recover_partial(data)
+            raise Exception(f"Failed to create ResumeData object: {str(e)}")
+    
+    def _recover_partial(self, data: Any) -> ResumeData:
+        """Keep the valid sections and list items of a response that failed validation"""
+        with self.metrics.stage("partial_recovery"):
+            if not isinstance(data, dict):
+                raise Exception("Failed to parse JSON response: no JSON object could be recovered")
             
-            # Create ResumeData object
-            return ResumeData(**data)
+            recovered = {}
+            dropped = self.metrics.counter(
+                "resume_recovery_dropped_total", "Sections or list items dropped during partial recovery"
+            )
+            for name, adapter in SECTION_ADAPTERS.items():
+                if name not in data:
+                    continue
+                try:
+                    recovered[name] = adapter.validate_python(data[name])
+                    continue
+                except ValidationError:
+                    pass
+                item_adapter = ITEM_ADAPTERS.get(name)
+                if item_adapter is None or not isinstance(data[name], list):
+                    dropped.inc(section=name)
+                    continue
+                items = []
+                for item in data[name]:
+                    try:
+                        items.append(item_adapter.validate_python(item))
+                    except ValidationError:
+                        dropped.inc(section=name)
+                recovered[name] = items
             
+            # Every value above is already validated, so skip a second validation pass
+            return ResumeData.model_construct(**recovered)
+    
+    @staticmethod
+    def _decode_lenient(response: Union[str, bytes]) -> Any:
+        """Decode JSON, repairing trailing commas and truncation if needed"""
+        text = response.decode('utf-8', 'replace') if isinstance(response, bytes) else response
+        start = text.find('{')
+        if start < 0:
+            return None
+        text = ResumeParser._strip_trailing_commas(text[start:])
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError:
+            pass
+        try:
+            return json.loads(ResumeParser._close_truncated_json(text))
         except json.JSONDecodeError as e:
             raise Exception(f"Failed to parse JSON response: {str(e)}")
-        except Exception as e:
-            raise Exception(f"Failed to create ResumeData object: {str(e)}")
+    
+    @staticmethod
+    def _strip_trailing_commas(text: str) -> str:
+        """Drop commas directly before a closing bracket, leaving string contents alone"""
+        kept = []
+        in_string = escaped = False
+        for i, char in enumerate(text):
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif char == '\\':
+                    escaped = True
+                elif char == '"':
+                    in_string = False
+            elif char == '"':
+                in_string = True
+            elif char == ',':
+                rest = text[i + 1:].lstrip()
+                if rest[:1] in ('}', ']'):
+                    continue
+            kept.append(char)
+        return ''.join(kept)
+    
+    @staticmethod
+    def _close_truncated_json(text: str) -> str:
+        """Cut truncated JSON back to its last complete member and close the open brackets"""
+        closers = {'{': '}', '[': ']'}
+        stack = []
+        checkpoint = (0, '')
+        in_string = escaped = False
+        for i, char in enumerate(text):
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif char == '\\':
+                    escaped = True
+                elif char == '"':
+                    in_string = False
+            elif char == '"':
+                in_string = True
+            elif char in closers:
+                stack.append(closers[char])
+                checkpoint = (i + 1, ''.join(reversed(stack)))
+            elif char in '}]':
+                if stack:
+                    stack.pop()
+                checkpoint = (i + 1, ''.join(reversed(stack)))
+                if not stack:
+                    break
+            elif char == ',':
+                checkpoint = (i, ''.join(reversed(stack)))
+        end, closing = checkpoint
+        return text[:end] + closing
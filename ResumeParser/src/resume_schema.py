@@ -1,7 +1,18 @@
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, TypeAdapter, BeforeValidator
 from typing import List, Optional, Dict, Any
+from typing_extensions import Annotated
 from datetime import datetime
 
+def clean_string_list(v: Any) -> List[str]:
+    """Drop null and blank items from a list of strings; anything but a list becomes []"""
+    if not v or not isinstance(v, list):
+        return []
+    return [item if isinstance(item, str) else str(item)
+            for item in v if item is not None and str(item).strip()]
+
+# List of strings that tolerates the nulls and blanks LLMs put in arrays
+CleanStringList = Annotated[List[str], BeforeValidator(clean_string_list)]
+
 class DateRange(BaseModel):
     from_date: Optional[str] = Field(None, description="Start date in YYYY-MM format")
     to_date: Optional[str] = Field(None, description="End date in YYYY-MM format or 'Present'")
@@ -48,25 +59,21 @@ class ResumeData(BaseModel):
     skills: List[Skill] = Field(default_factory=list, description="Skills and competencies")
     projects: List[Project] = Field(default_factory=list, description="Projects and portfolio")
     certifications: List[Certification] = Field(default_factory=list, description="Certifications and licenses")
-    languages: List[str] = Field(default_factory=list, description="Languages spoken")
-    achievements: List[str] = Field(default_factory=list, description="Notable achievements and awards")
-    
-    @field_validator('languages', mode='before')
-    @classmethod
-    def clean_languages(cls, v):
-        """Clean languages array to remove null values"""
-        if not v:
-            return []
-        if isinstance(v, list):
-            return [str(item) for item in v if item is not None and str(item).strip()]
-        return []
-    
-    @field_validator('achievements', mode='before')
-    @classmethod
-    def clean_achievements(cls, v):
-        """Clean achievements array to remove null values"""
-        if not v:
-            return []
-        if isinstance(v, list):
-            return [str(item) for item in v if item is not None and str(item).strip()]
-        return []
+    languages: CleanStringList = Field(default_factory=list, description="Languages spoken")
+    achievements: CleanStringList = Field(default_factory=list, description="Notable achievements and awards")
+
+def _field_adapter(field) -> TypeAdapter:
+    if field.metadata:
+        return TypeAdapter(Annotated[(field.annotation, *field.metadata)])
+    return TypeAdapter(field.annotation)
+
+# Validators are built once per process and reused for every response
+RESUME_ADAPTER = TypeAdapter(ResumeData)
+SECTION_ADAPTERS = {name: _field_adapter(field) for name, field in ResumeData.model_fields.items()}
+ITEM_ADAPTERS = {
+    'education': TypeAdapter(Education),
+    'experience': TypeAdapter(Experience),
+    'skills': TypeAdapter(Skill),
+    'projects': TypeAdapter(Project),
+    'certifications': TypeAdapter(Certification),
+}
@@ -0,0 +1,163 @@
+"""
+Full-text candidate search over resume summaries, experience and projects.
+
+Three Lucene full-text indexes cover the free text the graph stores:
+Resume.summary, the description of HAS_EXPERIENCE relationships and
+Project.description. SEARCH_QUERY asks each index for its best candidates,
+sums the scores per resume, applies the optional filters (skills, company,
+institute, ingest date) and returns one page in rank order, so keyword
+search never scans text with CONTAINS. Every input is a parameter, so the
+query is planned once.
+
+Neo4j does not return Lucene highlights, so highlight() cuts snippets
+around the query terms out of the matched texts the query returns.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+try:
+    from .query_registry import define
+    from .skill_canonicalizer import default_canonicalizer
+except ImportError:
+    from query_registry import define
+    from skill_canonicalizer import default_canonicalizer
+
+INDEX_STATEMENTS = (
+    define('search.index_resume_summary',
+           "CREATE FULLTEXT INDEX resume_summary IF NOT EXISTS FOR (r:Resume) ON EACH [r.summary]"),
+    define('search.index_experience_description',
+           "CREATE FULLTEXT INDEX experience_description IF NOT EXISTS "
+           "FOR ()-[e:HAS_EXPERIENCE]-() ON EACH [e.description]"),
+    define('search.index_project_description',
+           "CREATE FULLTEXT INDEX project_description IF NOT EXISTS FOR (p:Project) ON EACH [p.description]"),
+)
+
+SEARCH_QUERY = define('search.resumes', """
+    CALL {
+        CALL db.index.fulltext.queryNodes('resume_summary', $search, {limit: $candidates})
+        YIELD node, score
+        RETURN node AS r, score, 'summary' AS field, node.summary AS text
+        UNION ALL
+        CALL db.index.fulltext.queryRelationships('experience_description', $search, {limit: $candidates})
+        YIELD relationship, score
+        RETURN startNode(relationship) AS r, score, 'experience' AS field, relationship.description AS text
+        UNION ALL
+        CALL db.index.fulltext.queryNodes('project_description', $search, {limit: $candidates})
+        YIELD node, score
+        MATCH (r:Resume)-[:HAS_PROJECT]->(node)
+        RETURN r, score, 'project' AS field, node.description AS text
+    }
+    WITH r, score, field, text
+    ORDER BY score DESC
+    WITH r, sum(score) AS score, collect({field: field, text: text})[..$hits_per_resume] AS hits
+    WHERE (size($skills) = 0
+           OR size([(r)-[:HAS_SKILL]->(s:Skill) WHERE s.name IN $skills | s.name]) = size($skills))
+      AND ($company IS NULL OR EXISTS { (r)-[:HAS_EXPERIENCE]->(:Company {name: $company}) })
+      AND ($institute IS NULL OR EXISTS { (r)-[:HAS_EDUCATION]->(:Institute {name: $institute}) })
+      AND ($ingested_after IS NULL OR r.ingested_at >= datetime($ingested_after))
+    RETURN r.id AS resume_id, r.name AS name, score, hits
+    ORDER BY score DESC, resume_id
+    SKIP $skip
+    LIMIT $limit
+""")
+
+# Candidates fetched from each index per page of results, so filters rarely empty a page
+CANDIDATE_FACTOR = 10
+MIN_CANDIDATES = 200
+
+# Characters with a meaning in Lucene query syntax
+_LUCENE_SPECIAL = re.compile(r'([+\-!(){}\[\]^"~*?:\\/&|])')
+_TERM = re.compile(r'[\w+#.]+')
+_OPERATORS = {'AND', 'OR', 'NOT', 'TO'}
+
+
+@dataclass
+class SearchFilters:
+    # Every listed skill must be on the resume (compared by canonical name)
+    skills: List[str] = field(default_factory=list)
+    company: Optional[str] = None
+    institute: Optional[str] = None
+    # ISO date or datetime
+    ingested_after: Optional[str] = None
+
+
+def ensure_indexes(driver) -> None:
+    with driver.session() as session:
+        for statement in INDEX_STATEMENTS:
+            session.run(statement)
+
+
+def query_terms(query: str) -> List[str]:
+    """Lower-cased words of a search, without Lucene operators"""
+    return [term.lower().strip('.') for term in _TERM.findall(query)
+            if term not in _OPERATORS and term.strip('.')]
+
+
+def lucene_query(query: str) -> str:
+    """Keywords as a Lucene query matching any of them, with special characters escaped"""
+    return ' '.join(_LUCENE_SPECIAL.sub(r'\\\1', term) for term in query_terms(query))
+
+
+def highlight(text: str, terms: List[str], width: int = 60, max_snippets: int = 2) -> List[str]:
+    """Snippets of text around the first occurrences of terms, with matches in **bold**"""
+    if not text or not terms:
+        return []
+    pattern = re.compile(r'\b(' + '|'.join(re.escape(term) for term in sorted(terms, key=len, reverse=True))
+                         + r')\b', re.IGNORECASE)
+    snippets: List[str] = []
+    end_of_last = 0
+    for match in pattern.finditer(text):
+        if match.start() < end_of_last:
+            continue
+        start, end = max(0, match.start() - width), min(len(text), match.end() + width)
+        # Widen to whole words at both ends
+        if start:
+            start = text.rfind(' ', 0, start) + 1
+        if end < len(text):
+            space = text.find(' ', end)
+            end = space if space != -1 else len(text)
+        snippet = pattern.sub(r'**\1**', text[start:end].replace('\n', ' '))
+        snippets.append(('…' if start else '') + snippet + ('…' if end < len(text) else ''))
+        end_of_last = end
+        if len(snippets) == max_snippets:
+            break
+    return snippets
+
+
+def search_resumes(driver, query: str, filters: Optional[SearchFilters] = None, page: int = 1,
+                   page_size: int = 20, canonicalizer=None, raw: bool = False,
+                   hits_per_resume: int = 3) -> Dict[str, Any]:
+    """
+    One page of resumes ranked by full-text relevance to query. Plain
+    keywords match any term, ranked by how well they match; with raw=True
+    query is passed to Lucene unchanged (phrases, AND, fuzzy ~, ...).
+    Returns {'results': [{'resume_id', 'name', 'score', 'highlights'}],
+    'page', 'page_size', 'has_more'}.
+    """
+    filters = filters or SearchFilters()
+    canonicalizer = canonicalizer or default_canonicalizer
+    page = max(1, page)
+    lucene = query.strip() if raw else lucene_query(query)
+    empty = {'results': [], 'page': page, 'page_size': page_size, 'has_more': False}
+    if not lucene:
+        return empty
+
+    skills = sorted({canonicalizer.canonical_name(skill) for skill in filters.skills if skill and skill.strip()})
+    skip = (page - 1) * page_size
+    with driver.session() as session:
+        # One extra row tells whether another page exists without counting every match
+        records = [dict(record) for record in session.run(
+            SEARCH_QUERY, search=lucene, candidates=max(MIN_CANDIDATES, (skip + page_size) * CANDIDATE_FACTOR),
+            hits_per_resume=hits_per_resume, skills=skills, company=filters.company,
+            institute=filters.institute, ingested_after=filters.ingested_after, skip=skip, limit=page_size + 1)]
+
+    terms = query_terms(query)
+    results = []
+    for record in records[:page_size]:
+        highlights = [{'field': hit['field'], 'snippet': snippet}
+                      for hit in record['hits'] for snippet in highlight(hit['text'], terms)]
+        results.append({'resume_id': record['resume_id'], 'name': record['name'],
+                        'score': record['score'], 'highlights': highlights})
+    return dict(empty, results=results, has_more=len(records) > page_size)
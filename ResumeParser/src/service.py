@@ -0,0 +1,308 @@
+"""
+Headless HTTP service for parsing and ingesting resumes.
+
+A plain ASGI application, so it runs under any ASGI server, for example
+several workers behind a load balancer:
+
+    uvicorn service:app --app-dir src --workers 4
+
+Routes:
+    POST /parse             document bytes -> ResumeData JSON
+    POST /resumes           document bytes -> parsed and written to the graph, 201 {'id', 'resume'}
+    GET  /resumes/{id}      get_resume_summary of one resume
+    PUT  /resumes/{id}      document bytes -> revised resume diffed into the graph, change summary
+    GET  /healthz           liveness
+    GET  /readyz            Neo4j connectivity
+    GET  /metrics           Prometheus text, or JSON with ?format=json
+
+The document type comes from the `filename` query parameter, else from the
+Content-Type header. Parser and graph calls block, so each request runs
+them on a bounded thread pool: a request waits up to queue_timeout for a
+free slot and then gets 503, and one that outlives request_timeout gets
+504 while its worker finishes in the background and keeps its slot.
+"""
+
+import asyncio
+import json
+import os
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qs
+
+try:
+    from .ingest_pool import extract_upload
+    from .metrics import registry
+    from .neo4j_manager import Neo4jManager
+    from .resume_parser import ResumeParser
+except ImportError:
+    from ingest_pool import extract_upload
+    from metrics import registry
+    from neo4j_manager import Neo4jManager
+    from resume_parser import ResumeParser
+
+DEFAULT_CONCURRENCY = 8
+DEFAULT_TIMEOUT = 120.0
+MAX_BODY_BYTES = 10 * 1024 * 1024
+
+REQUEST_SECONDS = "resume_http_request_seconds"
+
+CONTENT_TYPE_SUFFIXES = {
+    'application/pdf': '.pdf',
+    'application/vnd.openxmlformats-officedocument.wordprocessingml.document': '.docx',
+    'application/msword': '.doc',
+    'text/plain': '.txt',
+}
+
+API_KEY_VARIABLES = {'OpenAI': 'OPENAI_API_KEY', 'Anthropic': 'ANTHROPIC_API_KEY', 'Google': 'GOOGLE_API_KEY'}
+
+JSON_TYPE = 'application/json'
+TEXT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def _json_body(payload: Any) -> bytes:
+    # Graph properties may hold neo4j temporal values, which render as ISO strings
+    return json.dumps(payload, default=str).encode('utf-8')
+
+
+def upload_filename(query: Dict[str, list], headers: Dict[str, str]) -> str:
+    """Name whose extension selects the extractor for an uploaded document"""
+    if query.get('filename'):
+        return query['filename'][0]
+    content_type = headers.get('content-type', '').split(';')[0].strip().lower()
+    return 'upload' + CONTENT_TYPE_SUFFIXES.get(content_type, '.txt')
+
+
+class ResumeService:
+    """ASGI application wrapping one ResumeParser and one Neo4jManager"""
+
+    def __init__(self, parser: Optional[ResumeParser] = None, manager: Optional[Neo4jManager] = None,
+                 max_concurrency: Optional[int] = None, request_timeout: Optional[float] = None,
+                 queue_timeout: float = 5.0, max_body_bytes: int = MAX_BODY_BYTES, metrics=None):
+        # Without a parser the service is configured from the environment at startup
+        self.parser = parser
+        self.manager = manager
+        self.max_concurrency = max_concurrency or int(os.environ.get('SERVICE_CONCURRENCY', DEFAULT_CONCURRENCY))
+        self.request_timeout = request_timeout or float(os.environ.get('SERVICE_TIMEOUT', DEFAULT_TIMEOUT))
+        self.queue_timeout = queue_timeout
+        self.max_body_bytes = max_body_bytes
+        self.metrics = metrics or registry
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix='service')
+        # asyncio primitives belong to one event loop; servers run one loop per worker process
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._slots_loop = None
+
+    def configure_from_env(self) -> None:
+        """Build the parser and graph manager from LLM_PROVIDER, the provider's API key and NEO4J_*"""
+        if self.parser is None:
+            provider = os.environ.get('LLM_PROVIDER', 'OpenAI')
+            api_key = os.environ.get('LLM_API_KEY') or os.environ.get(API_KEY_VARIABLES.get(provider, ''), '')
+            self.parser = ResumeParser(provider, api_key, metrics=self.metrics)
+        if self.manager is None and os.environ.get('NEO4J_URI'):
+            self.manager = Neo4jManager(os.environ['NEO4J_URI'], os.environ.get('NEO4J_USER', 'neo4j'),
+                                        os.environ.get('NEO4J_PASSWORD', ''), metrics=self.metrics)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
+        if self.manager is not None:
+            self.manager.close()
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+            return
+        if scope['type'] != 'http':
+            return
+
+        started = time.perf_counter()
+        deadline = time.monotonic() + self.request_timeout
+        route = 'unmatched'
+        try:
+            route, handler, args = self._route(scope['method'], scope['path'])
+            status, body, content_type = await handler(scope, receive, deadline, *args)
+        except HTTPError as e:
+            status, body, content_type = e.status, _json_body({'error': e.message}), JSON_TYPE
+        except Exception as e:
+            status, body, content_type = 500, _json_body({'error': f"Internal error: {e}"}), JSON_TYPE
+
+        await send({'type': 'http.response.start', 'status': status,
+                    'headers': [(b'content-type', content_type.encode('latin-1')),
+                                (b'content-length', str(len(body)).encode('latin-1'))]})
+        await send({'type': 'http.response.body', 'body': body})
+        self.metrics.histogram(REQUEST_SECONDS, "HTTP request latency by route and status").observe(
+            time.perf_counter() - started, route=route, status=str(status))
+
+    def _route(self, method: str, path: str):
+        path = path.rstrip('/') or '/'
+        routes = {
+            ('GET', '/healthz'): self._healthz,
+            ('GET', '/readyz'): self._readyz,
+            ('GET', '/metrics'): self._metrics,
+            ('POST', '/parse'): self._parse,
+            ('POST', '/resumes'): self._ingest,
+        }
+        if (method, path) in routes:
+            return path, routes[(method, path)], ()
+        if path.startswith('/resumes/') and path.count('/') == 2:
+            handlers = {'GET': self._summary, 'PUT': self._upsert}
+            if method not in handlers:
+                raise HTTPError(405, f"{method} not allowed on {path}")
+            return '/resumes/{id}', handlers[method], (path.rsplit('/', 1)[1],)
+        if any(route_path == path for _, route_path in routes):
+            raise HTTPError(405, f"{method} not allowed on {path}")
+        raise HTTPError(404, f"No route for {path}")
+
+    async def _lifespan(self, receive, send) -> None:
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                try:
+                    self.configure_from_env()
+                except Exception as e:
+                    await send({'type': 'lifespan.startup.failed', 'message': str(e)})
+                    return
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                self.close()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def _read_body(self, receive) -> bytes:
+        chunks, size = [], 0
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                raise HTTPError(400, "Client disconnected")
+            chunk = message.get('body', b'')
+            size += len(chunk)
+            if size > self.max_body_bytes:
+                raise HTTPError(413, f"Document larger than {self.max_body_bytes} bytes")
+            chunks.append(chunk)
+            if not message.get('more_body', False):
+                return b''.join(chunks)
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._slots_loop is not loop:
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+            self._slots_loop = loop
+        return self._slots
+
+    async def _run_blocking(self, deadline: float, fn, *args):
+        """Run fn on the worker pool once a slot is free, within the request deadline"""
+        slots = self._semaphore()
+        remaining = deadline - time.monotonic()
+        try:
+            await asyncio.wait_for(slots.acquire(), min(self.queue_timeout, max(remaining, 0)))
+        except asyncio.TimeoutError:
+            raise HTTPError(503, "Too many requests in flight, retry later")
+
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._executor, fn, *args)
+
+        def finished(done):
+            # The slot is held until the worker stops, even after the request timed out
+            slots.release()
+            if not done.cancelled():
+                done.exception()
+
+        future.add_done_callback(finished)
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), max(deadline - time.monotonic(), 0))
+        except asyncio.TimeoutError:
+            raise HTTPError(504, f"Request took longer than {self.request_timeout:g}s")
+
+    async def _document(self, scope, receive) -> Tuple[str, bytes]:
+        if self.parser is None:
+            raise HTTPError(503, "Parser is not configured")
+        data = await self._read_body(receive)
+        if not data:
+            raise HTTPError(400, "Empty document")
+        headers = {name.decode('latin-1').lower(): value.decode('latin-1') for name, value in scope['headers']}
+        return upload_filename(parse_qs(scope.get('query_string', b'').decode('latin-1')), headers), data
+
+    def _parse_document(self, filename: str, data: bytes):
+        try:
+            raw_text = extract_upload(self.parser, filename, data)
+        except ValueError as e:
+            raise HTTPError(415, str(e))
+        try:
+            return self.parser.parse_resume_with_llm(raw_text)
+        except Exception as e:
+            raise HTTPError(502, f"Error parsing resume: {e}")
+
+    def _parse_and_ingest(self, filename: str, data: bytes) -> Dict[str, Any]:
+        parsed = self._parse_document(filename, data)
+        resume_id = str(uuid.uuid4())
+        try:
+            self.manager.create_resume_node(parsed, resume_id)
+        except Exception as e:
+            raise HTTPError(503, f"Failed to add to Neo4j: {e}")
+        return {'id': resume_id, 'resume': parsed.model_dump()}
+
+    def _parse_and_upsert(self, resume_id: str, filename: str, data: bytes) -> Dict[str, Any]:
+        parsed = self._parse_document(filename, data)
+        try:
+            changes = self.manager.upsert_resume(resume_id, parsed)
+        except Exception as e:
+            raise HTTPError(503, f"Failed to update Neo4j: {e}")
+        return {'id': resume_id, 'changes': changes}
+
+    async def _parse(self, scope, receive, deadline):
+        filename, data = await self._document(scope, receive)
+        parsed = await self._run_blocking(deadline, self._parse_document, filename, data)
+        return 200, parsed.model_dump_json().encode('utf-8'), JSON_TYPE
+
+    async def _ingest(self, scope, receive, deadline):
+        if self.manager is None:
+            raise HTTPError(503, "Neo4j is not configured")
+        filename, data = await self._document(scope, receive)
+        result = await self._run_blocking(deadline, self._parse_and_ingest, filename, data)
+        return 201, _json_body(result), JSON_TYPE
+
+    async def _upsert(self, scope, receive, deadline, resume_id):
+        if self.manager is None:
+            raise HTTPError(503, "Neo4j is not configured")
+        filename, data = await self._document(scope, receive)
+        result = await self._run_blocking(deadline, self._parse_and_upsert, resume_id, filename, data)
+        return 200, _json_body(result), JSON_TYPE
+
+    async def _summary(self, scope, receive, deadline, resume_id):
+        if self.manager is None:
+            raise HTTPError(503, "Neo4j is not configured")
+        summary = await self._run_blocking(deadline, self.manager.get_resume_summary, resume_id)
+        if not summary:
+            raise HTTPError(404, f"No resume with id {resume_id}")
+        return 200, _json_body(summary), JSON_TYPE
+
+    async def _healthz(self, scope, receive, deadline):
+        return 200, _json_body({'status': 'ok'}), JSON_TYPE
+
+    async def _readyz(self, scope, receive, deadline):
+        if self.parser is None or self.manager is None:
+            raise HTTPError(503, "Service is not configured")
+        try:
+            await self._run_blocking(deadline, self.manager.driver.verify_connectivity)
+        except HTTPError:
+            raise
+        except Exception as e:
+            raise HTTPError(503, f"Neo4j unavailable: {e}")
+        return 200, _json_body({'status': 'ready'}), JSON_TYPE
+
+    async def _metrics(self, scope, receive, deadline):
+        query = parse_qs(scope.get('query_string', b'').decode('latin-1'))
+        if query.get('format') == ['json']:
+            return 200, self.metrics.to_json().encode('utf-8'), JSON_TYPE
+        return 200, self.metrics.to_prometheus().encode('utf-8'), TEXT_TYPE
+
+
+# Entry point for ASGI servers; configured from the environment on lifespan startup
+app = ResumeService()
@@ -0,0 +1,133 @@
+"""
+Bounded per-session store of parsed resumes for the UI.
+
+A session used to keep the full record of every parse in
+st.session_state and render all of them on each rerun, so memory and
+rerun time grew with the number of uploads. ResumeSessionStore keeps only
+a short summary (id, name, parse time) of each parse plus the full records
+of the most recently used few, in LRU order. Records pushed out of memory
+are spilled to a SpillCache: one SQLite file shared by all sessions of the
+server process, holding compressed record JSON and pruned after
+retain_seconds. The UI renders one page of summaries and loads a full
+record only when it is opened.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from itertools import islice
+from typing import Any, Dict, List, Optional
+
+DEFAULT_PATH = 'parsed-resumes.db'
+
+# Full records a session keeps in memory, and summaries it lists at all
+DEFAULT_CAPACITY = 20
+DEFAULT_MAX_ENTRIES = 1000
+
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS records (
+        resume_id TEXT PRIMARY KEY,
+        stored_at REAL NOT NULL,
+        payload BLOB NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS records_stored_at ON records (stored_at);
+"""
+
+
+class SpillCache:
+    """SQLite cache of parsed resume records evicted from session memory"""
+
+    def __init__(self, path: Optional[str] = None, retain_seconds: float = 7 * 24 * 3600):
+        self.path = path or os.environ.get('PARSE_CACHE_PATH') or DEFAULT_PATH
+        self.retain_seconds = retain_seconds
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+        self.prune()
+
+    def put(self, resume_id: str, record: Dict[str, Any]) -> None:
+        payload = zlib.compress(json.dumps(record, default=str).encode('utf-8'))
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO records (resume_id, stored_at, payload) VALUES (?, ?, ?)",
+                               (resume_id, time.time(), payload))
+
+    def get(self, resume_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute("SELECT payload FROM records WHERE resume_id = ?", (resume_id,)).fetchone()
+        return json.loads(zlib.decompress(row[0])) if row else None
+
+    def prune(self) -> int:
+        """Delete records spilled more than retain_seconds ago; returns how many"""
+        with self._lock:
+            return self._conn.execute("DELETE FROM records WHERE stored_at < ?",
+                                      (time.time() - self.retain_seconds,)).rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class ResumeSessionStore:
+    """Summaries of a session's parsed resumes, with an LRU of full records spilling to a SpillCache"""
+
+    def __init__(self, spill: Optional[SpillCache] = None, capacity: int = DEFAULT_CAPACITY,
+                 max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.spill = spill
+        self.capacity = capacity
+        self.max_entries = max_entries
+        # resume id -> summary, oldest first
+        self._summaries: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        # resume id -> full record, least recently used first
+        self._records: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+
+    def add(self, record: Dict[str, Any]) -> None:
+        """Keep a parsed resume record (resume_record() output); re-adding an id moves it to the front"""
+        resume_id = record['id']
+        self._summaries.pop(resume_id, None)
+        self._summaries[resume_id] = {'id': resume_id, 'name': record.get('name', 'Unknown'),
+                                      'parsed_at': record.get('parsed_at', '')}
+        while len(self._summaries) > self.max_entries:
+            forgotten, _ = self._summaries.popitem(last=False)
+            self._records.pop(forgotten, None)
+        self._keep(resume_id, record)
+
+    def get(self, resume_id: str) -> Optional[Dict[str, Any]]:
+        """Full record of a listed resume, from memory or the spill cache; None once it has expired"""
+        if resume_id not in self._summaries:
+            return None
+        record = self._records.get(resume_id)
+        if record is not None:
+            self._records.move_to_end(resume_id)
+            return record
+        record = self.spill.get(resume_id) if self.spill is not None else None
+        if record is not None:
+            self._keep(resume_id, record)
+        return record
+
+    def page(self, page: int, page_size: int = 10) -> List[Dict[str, Any]]:
+        """Summaries of one page, newest first"""
+        start = (max(1, page) - 1) * page_size
+        return [self._summaries[resume_id] for resume_id in islice(reversed(self._summaries), start, start + page_size)]
+
+    def pages(self, page_size: int = 10) -> int:
+        return max(1, -(-len(self._summaries) // page_size))
+
+    def in_memory(self) -> int:
+        return len(self._records)
+
+    def __len__(self) -> int:
+        return len(self._summaries)
+
+    def _keep(self, resume_id: str, record: Dict[str, Any]) -> None:
+        self._records.pop(resume_id, None)
+        self._records[resume_id] = record
+        while len(self._records) > self.capacity:
+            evicted, evicted_record = self._records.popitem(last=False)
+            if self.spill is not None:
+                self.spill.put(evicted, evicted_record)
@@ -0,0 +1,265 @@
+"""
+Skill canonicalization applied before any graph write.
+
+LLMs return skills as free text, so "JS", "Javascript", "JavaScript (ES6)"
+and "javascript" must collapse to one Skill node. Names are folded (case,
+punctuation, parenthesised qualifiers), looked up in a curated and
+extensible alias map, and finally fuzzy-matched against known skills
+through a prebuilt character-trigram index. Fuzzy matching only catches
+typos: a name that extends a known one at either end ("Preact", "Scalar")
+is a different skill, and short names must keep their first and last
+letters and length. Skill names already in the graph are loaded with
+add_stored_skills() when a manager starts, so every process keeps their
+spelling; a skill no process has seen is stored under display_name(), which
+does not depend on which of its spellings arrives first.
+"""
+
+import json
+import re
+import threading
+import unicodedata
+from difflib import SequenceMatcher
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set
+
+# Canonical name -> aliases. Aliases are folded before lookup, so only
+# spellings that differ after folding need to be listed.
+DEFAULT_ALIASES: Dict[str, List[str]] = {
+    'JavaScript': ['js', 'ecmascript', 'es6', 'es2015', 'vanilla js'],
+    'TypeScript': ['ts'],
+    'Python': ['python3', 'python 3', 'py'],
+    'Go': ['golang'],
+    'C++': ['cpp', 'cplusplus'],
+    'C#': ['csharp', 'c sharp'],
+    '.NET': ['dotnet', 'net core', 'dotnet core', 'asp.net'],
+    'Node.js': ['node', 'nodejs'],
+    'React': ['reactjs', 'react.js'],
+    'Vue.js': ['vue', 'vuejs'],
+    'Angular': ['angularjs', 'angular.js'],
+    'PostgreSQL': ['postgres', 'psql', 'postgre'],
+    'MySQL': ['my sql'],
+    'MongoDB': ['mongo'],
+    'Kubernetes': ['k8s', 'kube'],
+    'Docker': ['docker containers'],
+    'AWS': ['amazon web services', 'amazon aws'],
+    'GCP': ['google cloud platform', 'google cloud'],
+    'Azure': ['microsoft azure', 'ms azure'],
+    'Machine Learning': ['ml'],
+    'Deep Learning': ['dl'],
+    'NLP': ['natural language processing'],
+    'Artificial Intelligence': ['ai'],
+    'Computer Vision': [],
+    'scikit-learn': ['sklearn', 'scikit learn'],
+    'TensorFlow': ['tensor flow'],
+    'PyTorch': ['torch'],
+    'SQL': ['structured query language'],
+    'NoSQL': ['no sql'],
+    'REST APIs': ['rest', 'rest api', 'restful', 'restful apis', 'restful api'],
+    'GraphQL': ['graph ql'],
+    'CI/CD': ['cicd', 'continuous integration', 'continuous delivery'],
+    'Git': ['git scm'],
+    'Linux': ['unix/linux', 'gnu/linux'],
+    'Bash': ['bash scripting'],
+    'Excel': ['microsoft excel', 'ms excel'],
+    'Power BI': ['powerbi'],
+    'Spark': ['apache spark', 'pyspark'],
+    'Kafka': ['apache kafka'],
+    'Airflow': ['apache airflow'],
+    'Terraform': ['hashicorp terraform'],
+    'Spring Boot': ['springboot'],
+    'Ruby on Rails': ['rails', 'ror'],
+    'HTML': ['html5'],
+    'CSS': ['css3'],
+    'Objective-C': ['objc', 'objective c'],
+    'Agile': ['agile methodologies', 'agile methodology'],
+    'Scrum': ['scrum master'],
+    'Communication': ['communication skills'],
+    'Leadership': ['team leadership', 'leadership skills'],
+    'Project Management': [],
+}
+
+_PARENTHESISED = re.compile(r'\([^)]*\)|\[[^\]]*\]')
+# Keep the characters that distinguish C, C++ and C#
+_NOT_KEY_CHAR = re.compile(r'[^0-9a-z+#]+')
+_DIGITS = re.compile(r'[0-9]+')
+
+
+def fold(name: str) -> str:
+    """Case- and punctuation-insensitive lookup key for a skill name"""
+    name = unicodedata.normalize('NFKC', name).lower()
+    name = _PARENTHESISED.sub(' ', name)
+    return _NOT_KEY_CHAR.sub('', name)
+
+
+def display_name(name: str) -> str:
+    """
+    Spelling of a new skill: whitespace collapsed, and lower-case words and
+    all-caps words longer than an acronym capitalized, so "reactive
+    programming" and "REACTIVE PROGRAMMING" are both "Reactive Programming"
+    """
+    words = []
+    for word in name.split():
+        if word.islower() or (word.isupper() and len(word) > 4):
+            word = word[:1].upper() + word[1:].lower()
+        words.append(word)
+    return ' '.join(words)
+
+
+def _trigrams(key: str) -> Set[str]:
+    padded = f'  {key} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class CanonicalSkill(NamedTuple):
+    name: str
+    original: str
+    # 'exact', 'alias', 'fuzzy' or 'new'
+    matched_by: str
+
+
+class SkillCanonicalizer:
+    """Maps free-text skill names to canonical names"""
+
+    def __init__(self, aliases: Optional[Dict[str, List[str]]] = None,
+                 fuzzy_threshold: float = 0.9, min_fuzzy_length: int = 5, short_name_length: int = 8):
+        self.fuzzy_threshold = fuzzy_threshold
+        self.min_fuzzy_length = min_fuzzy_length
+        # Names shorter than this only match a candidate of about the same shape
+        self.short_name_length = short_name_length
+        self._canonical: Dict[str, str] = {}   # folded canonical name -> canonical name
+        self._aliases: Dict[str, str] = {}     # folded alias -> canonical name
+        self._trigram_index: Dict[str, Set[str]] = {}
+        self._cache: Dict[str, CanonicalSkill] = {}
+        self._lock = threading.Lock()
+        for canonical, names in (DEFAULT_ALIASES if aliases is None else aliases).items():
+            self.add_skill(canonical)
+            for alias in names:
+                self.add_alias(alias, canonical)
+
+    def add_skill(self, canonical: str) -> None:
+        """Register a canonical skill name and index it for fuzzy matching"""
+        key = fold(canonical)
+        if not key:
+            return
+        with self._lock:
+            self._canonical.setdefault(key, canonical)
+            for gram in _trigrams(key):
+                self._trigram_index.setdefault(gram, set()).add(key)
+            self._cache.clear()
+
+    def add_alias(self, alias: str, canonical: str) -> None:
+        """Map an alias to a canonical skill, registering the skill if needed"""
+        self.add_skill(canonical)
+        key = fold(alias)
+        if key and key != fold(canonical):
+            with self._lock:
+                self._aliases[key] = canonical
+                self._cache.clear()
+
+    def add_skills(self, names: Iterable[str]) -> None:
+        for name in names:
+            self.add_skill(name)
+
+    def add_stored_skills(self, names: Iterable[str]) -> None:
+        """
+        Register skill names already written to the graph under their stored
+        spelling, unless they resolve to a known skill; earlier names win
+        when several fold to the same key.
+        """
+        for name in names:
+            key = fold(name or '')
+            if key and key not in self._canonical and key not in self._aliases and self._fuzzy_match(key) is None:
+                self.add_skill(name.strip())
+
+    def load_aliases(self, path: str) -> None:
+        """Merge a JSON file of {"Canonical": ["alias", ...]} into the alias map"""
+        with open(path, 'r', encoding='utf-8') as f:
+            for canonical, names in json.load(f).items():
+                self.add_skill(canonical)
+                for alias in names:
+                    self.add_alias(alias, canonical)
+
+    def aliases(self) -> Dict[str, List[str]]:
+        """Canonical name -> folded aliases, for export or inspection"""
+        result: Dict[str, List[str]] = {}
+        for alias, canonical in self._aliases.items():
+            result.setdefault(canonical, []).append(alias)
+        return result
+
+    def canonicalize(self, name: str) -> CanonicalSkill:
+        """Resolve a skill name; unknown names become new canonical skills"""
+        original = name.strip()
+        cached = self._cache.get(original)
+        if cached is not None:
+            return cached
+        key = fold(original)
+        if key in self._canonical:
+            result = CanonicalSkill(self._canonical[key], original, 'exact')
+        elif key in self._aliases:
+            result = CanonicalSkill(self._aliases[key], original, 'alias')
+        else:
+            match = self._fuzzy_match(key)
+            if match is not None:
+                result = CanonicalSkill(match, original, 'fuzzy')
+            else:
+                # Later variants of this name fold onto the same spelling, whichever comes first
+                self.add_skill(display_name(original))
+                result = CanonicalSkill(self._canonical.get(key, display_name(original)), original, 'new')
+        with self._lock:
+            self._cache[original] = result
+        return result
+
+    def canonical_name(self, name: str) -> str:
+        return self.canonicalize(name).name
+
+    def canonicalize_all(self, names: Iterable[str]) -> List[CanonicalSkill]:
+        """Canonicalize a list, dropping blanks and later duplicates of the same skill"""
+        seen = set()
+        result = []
+        for name in names:
+            if not name or not name.strip():
+                continue
+            skill = self.canonicalize(name)
+            if skill.name not in seen:
+                seen.add(skill.name)
+                result.append(skill)
+        return result
+
+    def _fuzzy_match(self, key: str) -> Optional[str]:
+        """Best known skill whose folded name is similar enough to key"""
+        if len(key) < self.min_fuzzy_length:
+            return None
+        grams = _trigrams(key)
+        # Snapshot the postings: canonicalize() on other threads adds skills while we count
+        with self._lock:
+            postings = [tuple(self._trigram_index.get(gram, ())) for gram in grams]
+        overlap: Dict[str, int] = {}
+        for candidates in postings:
+            for candidate in candidates:
+                overlap[candidate] = overlap.get(candidate, 0) + 1
+        best, best_score = None, self.fuzzy_threshold
+        digits = _DIGITS.findall(key)
+        # Only score candidates that share a good fraction of trigrams; names that
+        # differ in a number ("Python 2", "Skill 12") are different skills
+        for candidate, shared in overlap.items():
+            if shared * 2 < len(grams) or _DIGITS.findall(candidate) != digits:
+                continue
+            if not self._typo_shaped(key, candidate):
+                continue
+            score = SequenceMatcher(None, key, candidate).ratio()
+            if score >= best_score:
+                best, best_score = candidate, score
+        return self._canonical[best] if best else None
+
+    def _typo_shaped(self, key: str, candidate: str) -> bool:
+        """Whether key could be a misspelling of candidate rather than another name built on it"""
+        shorter, longer = sorted((key, candidate), key=len)
+        if longer.startswith(shorter) or longer.endswith(shorter):
+            return False
+        if len(key) < self.short_name_length:
+            return (abs(len(key) - len(candidate)) <= 1
+                    and key[0] == candidate[0] and key[-1] == candidate[-1])
+        return True
+
+
+# Shared instance so every ingest in a process agrees on canonical names
+default_canonicalizer = SkillCanonicalizer()
@@ -0,0 +1,179 @@
+"""
+Materialized skill supply and demand counters.
+
+One SkillDemand node per (skill, bucket) holds how many resumes list the
+skill (supply) and how many jobs require it (demand). The bucket is
+'all' or an ingest month such as '2025-06'. Ingest increments the
+counters in its own write transaction, so the dashboard reads one bucket
+through an index instead of aggregating every job and skill. rebuild()
+recomputes all counters from the graph for backfill, or after duplicate
+skills have been merged, and marks the counters as initialised. Until
+then top_skills() aggregates from the Job and Resume nodes instead, since
+counters incremented only from the ingests made after they were added
+would leave out everything loaded before.
+"""
+
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+try:
+    from .query_registry import define
+except ImportError:
+    from query_registry import define
+
+ALL = 'all'
+
+INDEX_STATEMENTS = (
+    define('skill_demand.index_key',
+           "CREATE INDEX skill_demand_key IF NOT EXISTS FOR (d:SkillDemand) ON (d.skill, d.bucket)"),
+    define('skill_demand.index_bucket',
+           "CREATE INDEX skill_demand_bucket IF NOT EXISTS FOR (d:SkillDemand) ON (d.bucket, d.demand)"),
+)
+
+# $counter is not a parameter: property names cannot be, so it is one of two fixed queries
+_INCREMENT = """
+    UNWIND $skills AS skill
+    UNWIND $buckets AS bucket
+    MERGE (d:SkillDemand {{skill: skill, bucket: bucket}})
+    ON CREATE SET d.supply = 0, d.demand = 0
+    SET d.{counter} = d.{counter} + $delta
+"""
+SUPPLY_UPDATE = define('skill_demand.increment_supply', _INCREMENT.format(counter='supply'))
+DEMAND_UPDATE = define('skill_demand.increment_demand', _INCREMENT.format(counter='demand'))
+
+TOP_SKILLS_QUERY = define('skill_demand.top_skills', """
+    MATCH (d:SkillDemand {bucket: $bucket})
+    WHERE d.demand > 0 OR $include_supply_only
+    RETURN d.skill AS skill, d.demand AS demand, d.supply AS supply
+    ORDER BY d.demand DESC, d.supply DESC, d.skill
+    LIMIT $limit
+""")
+
+# Set by rebuild(): from then on ingest keeps the counters complete
+COUNTERS_STATE_QUERY = define('skill_demand.counters_state', """
+    MATCH (m:SkillDemandState {name: 'counters'})
+    RETURN m.rebuilt_at AS rebuilt_at
+""")
+CLEAR_COUNTERS_STATE = define('skill_demand.clear_counters_state', """
+    MATCH (m:SkillDemandState {name: 'counters'})
+    DELETE m
+""")
+MARK_COUNTERS_REBUILT = define('skill_demand.mark_counters_rebuilt', """
+    MERGE (m:SkillDemandState {name: 'counters'})
+    SET m.rebuilt_at = datetime()
+""")
+
+# Same rows as TOP_SKILLS_QUERY, counted from the graph
+LIVE_TOP_SKILLS_QUERY = define('skill_demand.top_skills_live', """
+    MATCH (j:Job)-[:REQUIRES_SKILL]->(s:Skill)
+    WHERE $bucket = $all_bucket OR substring(toString(j.ingested_at), 0, 7) = $bucket
+    WITH s, count(DISTINCT j) AS demand
+    RETURN s.name AS skill, demand,
+           size([(r:Resume)-[:HAS_SKILL]->(s)
+                 WHERE $bucket = $all_bucket OR substring(toString(r.ingested_at), 0, 7) = $bucket | r]) AS supply
+    ORDER BY demand DESC, supply DESC, skill
+    LIMIT $limit
+""")
+
+REBUILD_STATEMENTS = (
+    define('skill_demand.rebuild_clear', """
+        MATCH (d:SkillDemand)
+        CALL { WITH d DETACH DELETE d } IN TRANSACTIONS OF $batch_size ROWS
+    """),
+    define('skill_demand.rebuild_supply', """
+        MATCH (r:Resume)-[:HAS_SKILL]->(s:Skill)
+        WITH s.name AS skill, r, coalesce(substring(toString(r.ingested_at), 0, 7), '') AS month
+        WITH skill, [b IN [$all_bucket, month] WHERE b <> ''] AS buckets, count(DISTINCT r) AS resumes
+        UNWIND buckets AS bucket
+        WITH skill, bucket, sum(resumes) AS supply
+        CALL {
+            WITH skill, bucket, supply
+            MERGE (d:SkillDemand {skill: skill, bucket: bucket})
+            ON CREATE SET d.demand = 0
+            SET d.supply = supply
+        } IN TRANSACTIONS OF $batch_size ROWS
+    """),
+    define('skill_demand.rebuild_demand', """
+        MATCH (j:Job)-[:REQUIRES_SKILL]->(s:Skill)
+        WITH s.name AS skill, j, coalesce(substring(toString(j.ingested_at), 0, 7), '') AS month
+        WITH skill, [b IN [$all_bucket, month] WHERE b <> ''] AS buckets, count(DISTINCT j) AS jobs
+        UNWIND buckets AS bucket
+        WITH skill, bucket, sum(jobs) AS demand
+        CALL {
+            WITH skill, bucket, demand
+            MERGE (d:SkillDemand {skill: skill, bucket: bucket})
+            ON CREATE SET d.supply = 0
+            SET d.demand = demand
+        } IN TRANSACTIONS OF $batch_size ROWS
+    """),
+)
+
+
+def month_bucket(when: Optional[datetime] = None) -> str:
+    return (when or datetime.now(timezone.utc)).strftime('%Y-%m')
+
+
+def _buckets(when: Optional[datetime]) -> List[str]:
+    return [ALL, month_bucket(when)]
+
+
+def record_supply(tx, skills: Iterable[str], when: Optional[datetime] = None, delta: int = 1) -> None:
+    """Count one resume for each distinct canonical skill, inside the caller's transaction"""
+    skills = sorted(set(skills))
+    if skills:
+        tx.run(SUPPLY_UPDATE, skills=skills, buckets=_buckets(when), delta=delta)
+
+
+def record_demand(tx, skills: Iterable[str], when: Optional[datetime] = None, delta: int = 1) -> None:
+    """Count one job for each distinct canonical skill, inside the caller's transaction"""
+    skills = sorted(set(skills))
+    if skills:
+        tx.run(DEMAND_UPDATE, skills=skills, buckets=_buckets(when), delta=delta)
+
+
+def record_demand_counts(tx, counts: Mapping[str, int], when: Optional[datetime] = None) -> None:
+    """Count counts[skill] jobs for each skill, one statement per distinct count"""
+    by_count: Dict[int, List[str]] = defaultdict(list)
+    for skill, count in counts.items():
+        if count:
+            by_count[count].append(skill)
+    for count, skills in sorted(by_count.items()):
+        record_demand(tx, skills, when, delta=count)
+
+
+def counters_initialized(session) -> bool:
+    """Whether rebuild() has filled the counters, so they cover data loaded before they existed"""
+    return session.run(COUNTERS_STATE_QUERY).single() is not None
+
+
+def ensure_indexes(driver) -> None:
+    with driver.session() as session:
+        for statement in INDEX_STATEMENTS:
+            session.run(statement)
+
+
+def top_skills(driver, limit: int = 10, bucket: str = ALL, include_supply_only: bool = False) -> List[Dict[str, Any]]:
+    """
+    Most demanded skills in a bucket as {'skill', 'demand', 'supply'} dicts;
+    aggregated from Job and Resume nodes until the counters are initialised.
+    """
+    with driver.session() as session:
+        if not counters_initialized(session):
+            result = session.run(LIVE_TOP_SKILLS_QUERY, bucket=bucket, limit=limit, all_bucket=ALL)
+        else:
+            result = session.run(TOP_SKILLS_QUERY, bucket=bucket, limit=limit,
+                                 include_supply_only=include_supply_only)
+        return [dict(record) for record in result]
+
+
+def rebuild(driver, batch_size: int = 1000) -> None:
+    """Recompute every counter from Resume and Job skill relationships, then mark them initialised"""
+    ensure_indexes(driver)
+    with driver.session() as session:
+        # Reads aggregate from the graph while the counters are incomplete
+        session.run(CLEAR_COUNTERS_STATE).consume()
+        # CALL { } IN TRANSACTIONS needs an auto-commit query, which session.run is
+        for statement in REBUILD_STATEMENTS:
+            session.run(statement, batch_size=batch_size, all_bucket=ALL).consume()
+        session.run(MARK_COUNTERS_REBUILT).consume()
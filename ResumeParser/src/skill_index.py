@@ -0,0 +1,321 @@
+"""
+In-process inverted index from canonical skills to the jobs that require them.
+
+Job matching used to run a graph traversal per click. The index keeps, for
+every canonical skill id, a sorted posting list of job document numbers,
+delta-encoded in the narrowest unsigned dtype that fits. A query scores
+jobs by the number of resume skills they require: rare skills are
+scattered into a dense score array, while skills required by a large share
+of all jobs are added through a cached 0/1 mask, which costs a fraction of
+a scatter. The top k are then selected by counting down from the best
+score until k jobs are reached.
+
+The index is built from the graph at startup and updated incrementally as
+jobs are saved.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    from .metrics import registry
+    from .skill_canonicalizer import default_canonicalizer
+    from .query_registry import define
+except ImportError:
+    from metrics import registry
+    from skill_canonicalizer import default_canonicalizer
+    from query_registry import define
+
+# Jobs and their required skills, as written by the job parser
+JOB_SKILLS_QUERY = define('job.skills', """
+    MATCH (j:Job)
+    OPTIONAL MATCH (j)-[:REQUIRES_SKILL]->(s:Skill)
+    RETURN coalesce(j.id, j.url, elementId(j)) AS job_id,
+           properties(j) AS job,
+           collect(s.name) AS skills
+""")
+
+# Latency buckets in seconds for sub-millisecond lookups
+QUERY_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.05)
+
+QUERY_SECONDS = "skill_index_query_seconds"
+
+# Skills required by at least 1/DENSE_RATIO of all jobs are scored through a
+# dense mask instead of a scatter
+DENSE_RATIO = 64
+
+# Dense arrays are sized in whole chunks so appending jobs rarely invalidates them
+CHUNK = 1 << 16
+
+
+def encode_postings(doc_ids: np.ndarray) -> np.ndarray:
+    """Delta-encode sorted document numbers in the narrowest unsigned dtype"""
+    if not len(doc_ids):
+        return np.zeros(0, dtype=np.uint8)
+    deltas = np.diff(doc_ids, prepend=0)
+    largest = int(deltas.max())
+    for dtype in (np.uint8, np.uint16, np.uint32):
+        if largest <= np.iinfo(dtype).max:
+            return deltas.astype(dtype)
+    return deltas.astype(np.uint64)
+
+
+def decode_postings(deltas: np.ndarray) -> np.ndarray:
+    return np.cumsum(deltas, dtype=np.int64)
+
+
+def job_entry(job: Any) -> Tuple[Optional[str], List[str], Dict[str, Any]]:
+    """(job id, skills, properties) for a job dict, dataclass or pydantic model"""
+    if isinstance(job, dict):
+        props = dict(job)
+    elif hasattr(job, 'model_dump'):
+        props = job.model_dump()
+    else:
+        props = dict(vars(job))
+    job_id = props.get('id') or props.get('job_id') or props.get('url')
+    skills = props.pop('skills', None) or []
+    return (str(job_id) if job_id is not None else None), list(skills), props
+
+
+class SkillIndex:
+    """Inverted index of canonical skill -> jobs, with top-k match retrieval"""
+
+    def __init__(self, canonicalizer=None, metrics=None, tail_limit: int = 256,
+                 mask_budget: int = 64 * 1024 * 1024):
+        self.canonicalizer = canonicalizer or default_canonicalizer
+        self.metrics = metrics or registry
+        # Appended documents collect in a plain list until this many arrive
+        self.tail_limit = tail_limit
+        # Bytes available for cached dense masks of common skills
+        self.mask_budget = mask_budget
+
+        self._skill_ids: Dict[str, int] = {}
+        self._skill_names: List[str] = []
+        self._postings: List[np.ndarray] = []
+        self._tails: List[List[int]] = []
+
+        self._job_ids: List[Optional[str]] = []   # doc -> job id, None once removed
+        self._jobs: List[Optional[Dict[str, Any]]] = []
+        self._job_skills: List[Tuple[int, ...]] = []
+        self._doc_by_job: Dict[str, int] = {}
+        self._removed: List[int] = []
+        self._removed_array = np.zeros(0, dtype=np.int64)
+
+        self._masks: 'OrderedDict[int, np.ndarray]' = OrderedDict()
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._doc_by_job)
+
+    # Building and updating
+
+    @classmethod
+    def from_jobs(cls, jobs: Iterable[Tuple[str, Sequence[str], Optional[Dict[str, Any]]]], **kwargs) -> 'SkillIndex':
+        """Bulk-build from (job id, skills, properties) tuples"""
+        index = cls(**kwargs)
+        index.build(jobs)
+        return index
+
+    @classmethod
+    def from_graph(cls, driver, **kwargs) -> 'SkillIndex':
+        """Build from the Job and REQUIRES_SKILL data already in Neo4j"""
+        with driver.session() as session:
+            result = session.run(JOB_SKILLS_QUERY)
+            rows = [(record['job_id'], record['skills'], record['job']) for record in result]
+        return cls.from_jobs(rows, **kwargs)
+
+    def build(self, jobs: Iterable[Tuple[str, Sequence[str], Optional[Dict[str, Any]]]]) -> None:
+        """Replace the index contents with the given jobs"""
+        with self._lock:
+            self._reset()
+            doc_lists: List[List[int]] = [[] for _ in self._skill_names]
+            for job_id, skills, props in jobs:
+                doc = self._new_doc(str(job_id), skills, props)
+                for skill_id in self._job_skills[doc]:
+                    while skill_id >= len(doc_lists):
+                        doc_lists.append([])
+                    doc_lists[skill_id].append(doc)
+            self._postings = [encode_postings(np.asarray(docs, dtype=np.int64)) for docs in doc_lists]
+            self._tails = [[] for _ in doc_lists]
+
+    def add_job(self, job_id: str, skills: Sequence[str], job: Optional[Dict[str, Any]] = None) -> None:
+        """Index a saved job; saving an existing job id replaces its entry"""
+        with self._lock:
+            self.remove_job(job_id)
+            doc = self._new_doc(str(job_id), skills, job)
+            for skill_id in self._job_skills[doc]:
+                self._masks.pop(skill_id, None)
+                tail = self._tails[skill_id]
+                tail.append(doc)
+                if len(tail) >= self.tail_limit:
+                    self._flush_tail(skill_id)
+
+    def add_jobs(self, jobs: Iterable[Any]) -> int:
+        """Index job objects as saved by the job parser; returns how many were indexed"""
+        added = 0
+        for job in jobs:
+            job_id, skills, props = job_entry(job)
+            if job_id is None:
+                continue
+            self.add_job(job_id, skills, props)
+            added += 1
+        return added
+
+    def remove_job(self, job_id: str) -> bool:
+        with self._lock:
+            doc = self._doc_by_job.pop(str(job_id), None)
+            if doc is None:
+                return False
+            self._job_ids[doc] = None
+            self._jobs[doc] = None
+            self._removed.append(doc)
+            self._removed_array = np.asarray(self._removed, dtype=np.int64)
+            # Renumber once removed documents make up a quarter of the index
+            if len(self._removed) * 4 > len(self._job_ids):
+                self.compact()
+            return True
+
+    def compact(self) -> None:
+        """Drop removed jobs and fold every pending tail into its posting list"""
+        with self._lock:
+            live = [(self._job_ids[doc], [self._skill_names[s] for s in self._job_skills[doc]], self._jobs[doc])
+                    for doc in range(len(self._job_ids)) if self._job_ids[doc] is not None]
+            self.build(live)
+
+    def _reset(self) -> None:
+        self._postings = [np.zeros(0, dtype=np.uint8) for _ in self._skill_names]
+        self._tails = [[] for _ in self._skill_names]
+        self._job_ids, self._jobs, self._job_skills = [], [], []
+        self._doc_by_job = {}
+        self._removed = []
+        self._removed_array = np.zeros(0, dtype=np.int64)
+        self._masks.clear()
+
+    def _new_doc(self, job_id: str, skills: Sequence[str], props: Optional[Dict[str, Any]]) -> int:
+        doc = len(self._job_ids)
+        skill_ids = sorted({self._skill_id(skill.name) for skill in self.canonicalizer.canonicalize_all(skills)})
+        self._job_ids.append(job_id)
+        self._jobs.append(props)
+        self._job_skills.append(tuple(skill_ids))
+        self._doc_by_job[job_id] = doc
+        return doc
+
+    def _skill_id(self, canonical: str) -> int:
+        skill_id = self._skill_ids.get(canonical)
+        if skill_id is None:
+            skill_id = len(self._skill_names)
+            self._skill_ids[canonical] = skill_id
+            self._skill_names.append(canonical)
+            self._postings.append(np.zeros(0, dtype=np.uint8))
+            self._tails.append([])
+        return skill_id
+
+    def _flush_tail(self, skill_id: int) -> None:
+        self._postings[skill_id] = encode_postings(self._decode(skill_id))
+        self._tails[skill_id] = []
+
+    # Posting list access
+
+    def _length(self, skill_id: int) -> int:
+        return len(self._postings[skill_id]) + len(self._tails[skill_id])
+
+    def _decode(self, skill_id: int) -> np.ndarray:
+        docs = decode_postings(self._postings[skill_id])
+        tail = self._tails[skill_id]
+        if tail:
+            docs = np.concatenate([docs, np.asarray(tail, dtype=np.int64)])
+        return docs
+
+    def _capacity(self) -> int:
+        return max(CHUNK, -(-len(self._job_ids) // CHUNK) * CHUNK)
+
+    def _mask(self, skill_id: int, capacity: int) -> np.ndarray:
+        """0/1 membership of every document in a skill's posting list"""
+        mask = self._masks.get(skill_id)
+        if mask is None or len(mask) != capacity:
+            mask = np.zeros(capacity, dtype=np.int8)
+            mask[self._decode(skill_id)] = 1
+            self._masks[skill_id] = mask
+            while len(self._masks) > max(1, self.mask_budget // capacity):
+                self._masks.popitem(last=False)
+        else:
+            self._masks.move_to_end(skill_id)
+        return mask
+
+    def postings(self, skill: str) -> np.ndarray:
+        """Sorted live document numbers of the jobs requiring a skill"""
+        skill_id = self._skill_ids.get(self.canonicalizer.canonical_name(skill))
+        if skill_id is None:
+            return np.zeros(0, dtype=np.int64)
+        with self._lock:
+            docs = self._decode(skill_id)
+            if len(self._removed_array):
+                docs = docs[~np.isin(docs, self._removed_array)]
+            return docs
+
+    def nbytes(self) -> int:
+        """Bytes held by compressed posting lists"""
+        return sum(p.nbytes for p in self._postings) + 8 * sum(len(t) for t in self._tails)
+
+    # Retrieval
+
+    def search(self, skills: Sequence[str], k: int = 20) -> List[Tuple[int, int]]:
+        """Top-k (document, matching skill count), best first, ties by document order"""
+        start = time.perf_counter()
+        with self._lock:
+            query = {self._skill_ids.get(self.canonicalizer.canonical_name(s)) for s in skills if s and s.strip()}
+            query.discard(None)
+            result = self._top_k([skill_id for skill_id in query if self._length(skill_id)], k)
+        self.metrics.histogram(QUERY_SECONDS, "Latency of in-process job matching in seconds",
+                               buckets=QUERY_BUCKETS).observe(time.perf_counter() - start)
+        return result
+
+    def _top_k(self, skill_ids: List[int], k: int) -> List[Tuple[int, int]]:
+        if not skill_ids or k <= 0:
+            return []
+        capacity = self._capacity()
+        scores = np.zeros(capacity, dtype=np.int8 if len(skill_ids) < 127 else np.int16)
+        if len(self._removed_array):
+            scores[self._removed_array] = -len(skill_ids) - 1
+
+        dense_length = max(1, len(self._job_ids) // DENSE_RATIO)
+        for skill_id in skill_ids:
+            if self._length(skill_id) >= dense_length:
+                scores += self._mask(skill_id, capacity)
+            else:
+                scores[self._decode(skill_id)] += 1
+
+        threshold = self._kth(scores, k)
+        if not threshold:
+            return []
+        candidates = np.flatnonzero(scores >= threshold)
+        cand_scores = scores[candidates].astype(np.int16)
+        order = np.lexsort((candidates, -cand_scores))[:k]
+        return list(zip(candidates[order].tolist(), cand_scores[order].tolist()))
+
+    @staticmethod
+    def _kth(scores: np.ndarray, k: int) -> int:
+        """k-th largest positive score, or the lowest positive one when fewer than k jobs scored"""
+        # Scores are small integers, so counting down from the best score stops
+        # after a few passes, well before a full sort or heap over every job
+        best = int(scores.max(initial=0))
+        for score in range(best, 0, -1):
+            if np.count_nonzero(scores >= score) >= k:
+                return score
+        return 1 if best else 0
+
+    def match(self, skills: Sequence[str], k: int = 20) -> List[Dict[str, Any]]:
+        """Top-k job matches in the same shape as the graph's job match query"""
+        wanted = {self._skill_ids.get(self.canonicalizer.canonical_name(s)) for s in skills if s and s.strip()}
+        matches = []
+        with self._lock:
+            for doc, count in self.search(skills, k):
+                job = dict(self._jobs[doc] or {})
+                job.setdefault('id', self._job_ids[doc])
+                matching = [self._skill_names[s] for s in self._job_skills[doc] if s in wanted]
+                matches.append({'j': job, 'matching_skills': matching, 'skill_count': count})
+        return matches
@@ -0,0 +1,309 @@
+"""
+Synthetic resume corpus generator.
+
+Produces resumes as TXT, DOCX and PDF together with the ResumeData JSON
+they were rendered from, so the parse-and-ingest path can be load tested
+and its output checked against ground truth.
+"""
+
+import json
+import os
+import random
+import textwrap
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    from .resume_schema import ResumeData
+except ImportError:
+    from resume_schema import ResumeData
+
+FORMATS = ('txt', 'docx', 'pdf')
+
+SKILL_VOCABULARY = [
+    'Python', 'Java', 'JavaScript', 'TypeScript', 'Go', 'Rust', 'C++', 'C#', 'Ruby', 'Kotlin',
+    'Swift', 'Scala', 'SQL', 'PostgreSQL', 'MySQL', 'MongoDB', 'Redis', 'Cassandra', 'Elasticsearch',
+    'Kafka', 'Spark', 'Hadoop', 'Airflow', 'dbt', 'Snowflake', 'BigQuery', 'AWS', 'Azure', 'GCP',
+    'Docker', 'Kubernetes', 'Terraform', 'Ansible', 'Jenkins', 'GitHub Actions', 'Linux', 'Bash',
+    'React', 'Angular', 'Vue.js', 'Node.js', 'Django', 'Flask', 'FastAPI', 'Spring Boot', 'GraphQL',
+    'REST APIs', 'gRPC', 'Microservices', 'TensorFlow', 'PyTorch', 'scikit-learn', 'Pandas', 'NumPy',
+    'Machine Learning', 'Deep Learning', 'NLP', 'Computer Vision', 'Data Analysis', 'Tableau',
+    'Power BI', 'Excel', 'Statistics', 'A/B Testing', 'Neo4j', 'Cypher', 'Git', 'Agile', 'Scrum',
+    'Project Management', 'Leadership', 'Communication', 'Mentoring', 'System Design',
+    'Distributed Systems', 'Security', 'OAuth', 'Networking', 'CI/CD', 'Prometheus', 'Grafana',
+]
+
+FIRST_NAMES = ['Alex', 'Jordan', 'Taylor', 'Morgan', 'Casey', 'Riley', 'Avery', 'Quinn', 'Jamie',
+               'Priya', 'Wei', 'Fatima', 'Carlos', 'Aisha', 'Noah', 'Mei', 'Omar', 'Elena', 'Kenji', 'Sara']
+LAST_NAMES = ['Smith', 'Garcia', 'Chen', 'Patel', 'Kim', 'Nguyen', 'Johnson', 'Okafor', 'Silva',
+              'Muller', 'Rossi', 'Khan', 'Ivanova', 'Tanaka', 'Brown', 'Lopez', 'Cohen', 'Singh']
+COMPANIES = ['Acme Corp', 'Globex', 'Initech', 'Umbrella Labs', 'Stark Industries', 'Wayne Enterprises',
+             'Hooli', 'Pied Piper', 'Vandelay Industries', 'Soylent', 'Tyrell Systems', 'Cyberdyne',
+             'Wonka Analytics', 'Oscorp', 'Massive Dynamic', 'Aperture Science']
+POSITIONS = ['Software Engineer', 'Senior Software Engineer', 'Data Scientist', 'Data Engineer',
+             'Machine Learning Engineer', 'DevOps Engineer', 'Backend Developer', 'Frontend Developer',
+             'Full Stack Developer', 'Engineering Manager', 'Site Reliability Engineer', 'Data Analyst']
+INSTITUTES = ['State University', 'Institute of Technology', 'City College', 'Northern University',
+              'Polytechnic University', 'University of the Coast', 'Central University']
+DEGREES = ["Bachelor's", "Master's", 'PhD', 'Associate']
+MAJORS = ['Computer Science', 'Software Engineering', 'Statistics', 'Mathematics',
+          'Electrical Engineering', 'Information Systems', 'Physics']
+COURSES = ['Algorithms', 'Databases', 'Operating Systems', 'Machine Learning', 'Networks',
+           'Compilers', 'Distributed Systems', 'Linear Algebra', 'Probability']
+LANGUAGES = ['English', 'Spanish', 'Mandarin', 'Hindi', 'French', 'German', 'Japanese', 'Arabic']
+SENTENCES = [
+    'Designed and built {skill} services handling millions of requests per day.',
+    'Led the migration of legacy systems to {skill}, cutting costs by {pct}%.',
+    'Improved pipeline throughput by {pct}% using {skill}.',
+    'Mentored {n} engineers and ran design reviews for the {skill} platform.',
+    'Owned on-call for {skill} infrastructure and reduced incidents by {pct}%.',
+    'Partnered with product teams to ship features built on {skill}.',
+]
+
+
+@dataclass
+class CorpusConfig:
+    """Knobs controlling the shape of a synthetic corpus"""
+    count: int = 100
+    min_roles: int = 1
+    max_roles: int = 5
+    skills_per_resume: int = 12
+    vocabulary_size: int = len(SKILL_VOCABULARY)
+    # Fraction of each person's skills drawn from a small core shared by everyone
+    overlap: float = 0.5
+    core_size: int = 15
+    # Sentences per role description, the main driver of document length
+    description_sentences: int = 3
+    projects: int = 2
+    formats: Tuple[str, ...] = FORMATS
+    seed: int = 0
+
+
+def skill_vocabulary(size: int) -> List[str]:
+    """Real skill names, padded with numbered synthetic skills beyond the built-in list"""
+    vocabulary = SKILL_VOCABULARY[:size]
+    vocabulary += [f'Skill {i}' for i in range(len(vocabulary), size)]
+    return vocabulary
+
+
+def _pick_skills(rng: random.Random, config: CorpusConfig, vocabulary: List[str]) -> List[str]:
+    core = vocabulary[:min(config.core_size, len(vocabulary))]
+    wanted = min(config.skills_per_resume, len(vocabulary))
+    from_core = min(len(core), round(wanted * config.overlap))
+    skills = rng.sample(core, from_core)
+    tail = [s for s in vocabulary if s not in skills]
+    skills += rng.sample(tail, min(len(tail), wanted - from_core))
+    return skills
+
+
+def generate_resume(rng: random.Random, config: CorpusConfig, index: int,
+                    vocabulary: Optional[List[str]] = None) -> ResumeData:
+    """Generate one resume; the index makes the email unique within a corpus"""
+    vocabulary = vocabulary or skill_vocabulary(config.vocabulary_size)
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    skills = _pick_skills(rng, config, vocabulary)
+
+    year = 2024
+    experience = []
+    for _ in range(rng.randint(config.min_roles, max(config.min_roles, config.max_roles))):
+        length = rng.randint(1, 4)
+        used = rng.sample(skills, min(len(skills), rng.randint(2, 5)))
+        description = ' '.join(
+            rng.choice(SENTENCES).format(skill=rng.choice(used), pct=rng.randint(10, 60), n=rng.randint(2, 9))
+            for _ in range(config.description_sentences)
+        )
+        experience.append({
+            'position': rng.choice(POSITIONS),
+            'company': rng.choice(COMPANIES),
+            'dates': {
+                'from_date': f'{year - length}-{rng.randint(1, 12):02d}',
+                'to_date': 'Present' if not experience else f'{year}-{rng.randint(1, 12):02d}',
+            },
+            'description': description,
+            'skills_used': used,
+            'location': 'Remote',
+        })
+        year -= length
+
+    grad_year = year - rng.randint(0, 2)
+    return ResumeData(
+        personal_info={
+            'name': f'{first} {last}',
+            'email': f'{first.lower()}.{last.lower()}.{index}@example.com',
+            'phone': f'(555) {rng.randint(100, 999)}-{rng.randint(1000, 9999)}',
+            'address': 'Springfield, USA',
+        },
+        summary=f'{experience[0]["position"] if experience else "Engineer"} experienced in '
+                f'{", ".join(skills[:3])}.',
+        education=[{
+            'institute': rng.choice(INSTITUTES),
+            'degree': rng.choice(DEGREES),
+            'major': [rng.choice(MAJORS)],
+            'dates': {'from_date': f'{grad_year - 4}-09', 'to_date': f'{grad_year}-05'},
+            'courses': rng.sample(COURSES, 3),
+            'gpa': f'{rng.uniform(3.0, 4.0):.1f}',
+        }],
+        experience=experience,
+        skills=[{'name': s, 'category': 'Technical', 'proficiency': rng.choice(['Intermediate', 'Advanced'])}
+                for s in skills],
+        projects=[{
+            'name': f'{rng.choice(skills)} Toolkit {p + 1}',
+            'description': f'Open source project built with {", ".join(rng.sample(skills, 2))}.',
+            'technologies': rng.sample(skills, 2),
+        } for p in range(config.projects)],
+        certifications=[],
+        languages=rng.sample(LANGUAGES, rng.randint(1, 2)),
+        achievements=[],
+    )
+
+
+def generate_jobs(count: int, skills_per_job: int = 10, vocabulary_size: int = 2000,
+                  skew: float = 1.0, seed: int = 0) -> List[Dict]:
+    """
+    Generate job postings as dicts with id, title, company, location and skills.
+
+    Skills follow a Zipf distribution with exponent skew, so a few skills
+    appear in a large share of jobs and most are rare, as in real postings.
+    """
+    rng = random.Random(seed)
+    vocabulary = skill_vocabulary(vocabulary_size)
+    cum_weights, total = [], 0.0
+    for rank in range(1, len(vocabulary) + 1):
+        total += 1 / rank ** skew
+        cum_weights.append(total)
+    wanted = min(skills_per_job, len(vocabulary))
+    jobs = []
+    for index in range(count):
+        skills = []
+        while len(skills) < wanted:
+            for skill in rng.choices(vocabulary, cum_weights=cum_weights, k=wanted):
+                if skill not in skills and len(skills) < wanted:
+                    skills.append(skill)
+        jobs.append({
+            'id': f'job-{index:06d}',
+            'title': rng.choice(POSITIONS),
+            'company': rng.choice(COMPANIES),
+            'location': rng.choice(['Remote', 'New York', 'London', 'Berlin', 'Toronto']),
+            'skills': skills,
+        })
+    return jobs
+
+
+def render_lines(resume: ResumeData, width: int = 95) -> List[str]:
+    """Render a resume as the plain-text lines shared by every output format"""
+    info = resume.personal_info
+    lines = [info.get('name', ''), f"{info.get('email', '')} | {info.get('phone', '')} | {info.get('address', '')}", '']
+    if resume.summary:
+        lines += ['SUMMARY'] + textwrap.wrap(resume.summary, width) + ['']
+    lines.append('EXPERIENCE')
+    for exp in resume.experience:
+        lines.append(f'{exp.position}, {exp.company} ({exp.dates.from_date} - {exp.dates.to_date})')
+        lines += textwrap.wrap(exp.description, width)
+        lines += [f"Skills: {', '.join(exp.skills_used)}", '']
+    lines.append('EDUCATION')
+    for edu in resume.education:
+        lines.append(f"{edu.degree} in {', '.join(edu.major)}, {edu.institute} "
+                     f"({edu.dates.from_date} - {edu.dates.to_date}), GPA {edu.gpa}")
+        lines.append(f"Courses: {', '.join(edu.courses)}")
+    lines += ['', 'SKILLS'] + textwrap.wrap(', '.join(s.name for s in resume.skills), width)
+    if resume.projects:
+        lines += ['', 'PROJECTS']
+        for project in resume.projects:
+            lines.append(f'{project.name}: {project.description}')
+    lines += ['', 'LANGUAGES', ', '.join(resume.languages)]
+    return lines
+
+
+def write_txt(path: str, lines: Sequence[str]) -> str:
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines))
+    return path
+
+
+def write_docx(path: str, lines: Sequence[str]) -> str:
+    from docx import Document
+
+    doc = Document()
+    for line in lines:
+        doc.add_paragraph(line)
+    doc.save(path)
+    return path
+
+
+def _pdf_escape(text: str) -> str:
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def write_pdf(path: str, lines: Sequence[str], lines_per_page: int = 60) -> str:
+    """Write a minimal text-only PDF that PyPDF2 can extract"""
+    lines = list(lines)
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+    font_id = 3
+    # Objects 1 and 2 (catalog and page tree) are filled in once the pages are known
+    objects = [None, None, b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>']
+    page_ids = []
+    for page_lines in pages:
+        body = ['BT', '/F1 10 Tf', '12 TL', '50 780 Td']
+        body += [f'({_pdf_escape(line)}) Tj T*' for line in page_lines]
+        body.append('ET')
+        stream = '\n'.join(body).encode('latin-1', 'replace')
+        objects.append(b'<< /Length %d >>\nstream\n' % len(stream) + stream + b'\nendstream')
+        content_id = len(objects)
+        objects.append(
+            b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] '
+            b'/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>' % (font_id, content_id)
+        )
+        page_ids.append(len(objects))
+    objects[0] = b'<< /Type /Catalog /Pages 2 0 R >>'
+    kids = ' '.join(f'{pid} 0 R' for pid in page_ids).encode()
+    objects[1] = b'<< /Type /Pages /Kids [%s] /Count %d >>' % (kids, len(page_ids))
+
+    out = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b'%d 0 obj\n' % number + obj + b'\nendobj\n'
+    xref = len(out)
+    out += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    for offset in offsets:
+        out += b'%010d 00000 n \n' % offset
+    out += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref)
+    with open(path, 'wb') as f:
+        f.write(bytes(out))
+    return path
+
+
+WRITERS = {'txt': write_txt, 'docx': write_docx, 'pdf': write_pdf}
+
+
+def generate_corpus(output_dir: str, config: CorpusConfig) -> List[Dict[str, str]]:
+    """
+    Write config.count resumes to output_dir.
+
+    Each resume is written once per requested format, next to <id>.json
+    holding the ground-truth ResumeData. A manifest.json lists every entry.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    rng = random.Random(config.seed)
+    vocabulary = skill_vocabulary(config.vocabulary_size)
+    manifest = []
+    for index in range(config.count):
+        resume = generate_resume(rng, config, index, vocabulary)
+        resume_id = f'resume-{index:06d}'
+        entry = {'id': resume_id, 'email': resume.personal_info['email'], 'ground_truth': f'{resume_id}.json'}
+        with open(os.path.join(output_dir, entry['ground_truth']), 'w', encoding='utf-8') as f:
+            f.write(resume.model_dump_json())
+        lines = render_lines(resume)
+        entry['documents'] = {}
+        for fmt in config.formats:
+            entry['documents'][fmt] = f'{resume_id}.{fmt}'
+            WRITERS[fmt](os.path.join(output_dir, entry['documents'][fmt]), lines)
+        manifest.append(entry)
+    with open(os.path.join(output_dir, 'manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump({'config': asdict(config), 'resumes': manifest}, f, indent=2)
+    return manifest
+
+
+def load_manifest(corpus_dir: str) -> Dict:
+    with open(os.path.join(corpus_dir, 'manifest.json'), 'r', encoding='utf-8') as f:
+        return json.load(f)
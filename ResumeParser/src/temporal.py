@@ -0,0 +1,232 @@
+"""
+Native dates on resume relationships and per-skill tenure.
+
+The LLM returns dates as free strings ('2021-03', 'Mar 2021', 'Present',
+...), which are kept as from_date/to_date for display. At ingest each
+HAS_EXPERIENCE and HAS_EDUCATION relationship also gets native Neo4j
+dates: start_date and end_date (the first day of the month), with
+current = true and no end_date for ongoing entries. Each HAS_SKILL gets
+tenure_months, the months of experience in roles that used the skill, as
+computed for the candidate profile (ongoing roles count up to the ingest).
+Range indexes on these properties turn "5+ years of Python" or "graduated
+after 2020" into index seeks instead of parsing strings in Python.
+
+An ongoing role keeps adding months after ingest, so
+refresh_ongoing_tenure() recomputes tenure and the stored profile of
+resumes with a current role from the dates on their relationships, up to
+the current month. backfill() adds the properties to relationships
+written before they existed and then runs the refresh; run it
+periodically (monthly is enough) to keep tenure current.
+"""
+
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+try:
+    from .candidate_profiles import CandidateProfile, is_ongoing, merged_months, month_index
+    from .query_registry import define
+    from .resume_schema import DateRange
+    from .skill_canonicalizer import default_canonicalizer
+except ImportError:
+    from candidate_profiles import CandidateProfile, is_ongoing, merged_months, month_index
+    from query_registry import define
+    from resume_schema import DateRange
+    from skill_canonicalizer import default_canonicalizer
+
+INDEX_STATEMENTS = (
+    define('temporal.index_skill_tenure',
+           "CREATE INDEX has_skill_tenure IF NOT EXISTS FOR ()-[h:HAS_SKILL]-() ON (h.tenure_months)"),
+    define('temporal.index_experience_start',
+           "CREATE INDEX experience_start IF NOT EXISTS FOR ()-[e:HAS_EXPERIENCE]-() ON (e.start_date)"),
+    define('temporal.index_experience_end',
+           "CREATE INDEX experience_end IF NOT EXISTS FOR ()-[e:HAS_EXPERIENCE]-() ON (e.end_date)"),
+    define('temporal.index_education_end',
+           "CREATE INDEX education_end IF NOT EXISTS FOR ()-[e:HAS_EDUCATION]-() ON (e.end_date)"),
+)
+
+SET_SKILL_TENURE = define('resume.set_skill_tenure', """
+    UNWIND $tenure AS t
+    MATCH (r:Resume {id: $resume_id})-[h:HAS_SKILL]->(:Skill {name: t.skill})
+    SET h.tenure_months = t.months
+""")
+
+SKILL_TENURE_QUERY = define('temporal.skill_tenure', """
+    MATCH (r:Resume)-[h:HAS_SKILL]->(:Skill {name: $skill})
+    WHERE h.tenure_months >= $min_months
+    RETURN r.id AS resume_id, r.name AS name, h.tenure_months AS months
+    ORDER BY months DESC, resume_id
+    LIMIT $limit
+""")
+
+GRADUATED_AFTER_QUERY = define('temporal.graduated_after', """
+    MATCH (r:Resume)-[e:HAS_EDUCATION]->(i:Institute)
+    WHERE e.end_date >= $after
+    RETURN r.id AS resume_id, r.name AS name, i.name AS institute, e.degree AS degree, e.end_date AS end_date
+    ORDER BY end_date DESC, resume_id
+    LIMIT $limit
+""")
+
+STORED_RANGES = define('temporal.stored_ranges', """
+    MATCH (:Resume)-[e:HAS_EXPERIENCE|HAS_EDUCATION]->()
+    WHERE e.start_date IS NULL AND e.current IS NULL
+    RETURN elementId(e) AS ref, e.from_date AS from_date, e.to_date AS to_date
+""")
+
+SET_RANGES = define('temporal.set_ranges', """
+    UNWIND $rows AS row
+    MATCH ()-[e]->()
+    WHERE elementId(e) = row.ref
+    SET e.start_date = row.start_date, e.end_date = row.end_date, e.current = row.current
+""")
+
+STORED_PROFILES = define('temporal.stored_profiles', """
+    MATCH (r:Resume)
+    WHERE r.profile IS NOT NULL
+    RETURN r.id AS resume_id, r.profile AS profile
+""")
+
+SET_TENURE_BATCH = define('temporal.set_tenure_batch', """
+    UNWIND $rows AS row
+    MATCH (r:Resume {id: row.resume_id})-[h:HAS_SKILL]->(s:Skill)
+    SET h.tenure_months = coalesce(row.tenure[s.name], 0)
+""")
+
+ONGOING_ROLES = define('temporal.ongoing_roles', """
+    MATCH (r:Resume)-[:HAS_EXPERIENCE {current: true}]->()
+    WITH DISTINCT r
+    WHERE r.profile IS NOT NULL
+    MATCH (r)-[e:HAS_EXPERIENCE]->()
+    RETURN r.id AS resume_id, r.profile AS profile,
+           collect(e {.start_date, .end_date, .current, .skills_used}) AS roles
+""")
+
+SET_ONGOING_BATCH = define('temporal.set_ongoing_batch', """
+    UNWIND $rows AS row
+    MATCH (r:Resume {id: row.resume_id})
+    SET r.profile = row.profile
+    WITH r, row
+    MATCH (r)-[h:HAS_SKILL]->(s:Skill)
+    SET h.tenure_months = coalesce(row.tenure[s.name], 0)
+""")
+
+
+def month_start(index: int) -> date:
+    """First day of the month with the given month_index"""
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def month_of(value) -> int:
+    """month_index of a native date, a datetime.date or a neo4j.time.Date"""
+    return value.year * 12 + value.month - 1
+
+
+def date_range(dates: Optional[DateRange]) -> Dict[str, Any]:
+    """start_date, end_date and current relationship properties of a parsed date range"""
+    from_date = dates.from_date if dates else None
+    to_date = dates.to_date if dates else None
+    start = month_index(from_date)
+    current = is_ongoing(to_date)
+    end = None if current else month_index(to_date)
+    return {
+        'start_date': month_start(start) if start is not None else None,
+        'end_date': month_start(end) if end is not None else None,
+        'current': current,
+    }
+
+
+def role_tenure(roles: Iterable[Dict[str, Any]], today: Optional[date] = None) -> Tuple[Dict[str, int], int]:
+    """Months per skill and in total from stored HAS_EXPERIENCE dates, ongoing roles up to today"""
+    now = month_of(today or date.today())
+    spans_by_skill: Dict[str, List[Tuple[int, int]]] = {}
+    all_spans = []
+    for role in roles:
+        if role.get('start_date') is None:
+            continue
+        start = month_of(role['start_date'])
+        if role.get('current'):
+            end = now
+        else:
+            end = month_of(role['end_date']) if role.get('end_date') is not None else start
+        if end < start:
+            continue
+        all_spans.append((start, end))
+        for name in role.get('skills_used') or []:
+            spans_by_skill.setdefault(name, []).append((start, end))
+    return {name: merged_months(spans) for name, spans in spans_by_skill.items()}, merged_months(all_spans)
+
+
+def skill_tenure(profile: CandidateProfile, skills: Iterable[str]) -> List[Dict[str, Any]]:
+    """SET_SKILL_TENURE rows for canonical skill names; skills never used in a role get 0"""
+    return [{'skill': name, 'months': profile.tenure_months.get(name, 0)} for name in sorted(set(skills))]
+
+
+def ensure_indexes(driver) -> None:
+    with driver.session() as session:
+        for statement in INDEX_STATEMENTS:
+            session.run(statement)
+
+
+def resumes_with_tenure(driver, skill: str, min_months: int, limit: int = 100,
+                        canonicalizer=None) -> List[Dict[str, Any]]:
+    """Resumes listing skill with at least min_months of experience using it, longest first"""
+    canonicalizer = canonicalizer or default_canonicalizer
+    with driver.session() as session:
+        return [dict(record) for record in session.run(
+            SKILL_TENURE_QUERY, skill=canonicalizer.canonical_name(skill), min_months=min_months, limit=limit)]
+
+
+def resumes_graduated_after(driver, after: date, limit: int = 100) -> List[Dict[str, Any]]:
+    """Education entries that ended on or after a date, latest first"""
+    with driver.session() as session:
+        return [dict(record) for record in session.run(GRADUATED_AFTER_QUERY, after=after, limit=limit)]
+
+
+def backfill(driver, batch_size: int = 1000) -> Dict[str, int]:
+    """Add dates and tenure to relationships stored before ingest wrote them"""
+    ranges = tenures = 0
+    with driver.session() as reader, driver.session() as writer:
+        rows: List[Dict[str, Any]] = []
+        for record in reader.run(STORED_RANGES):
+            rows.append(dict(date_range(DateRange(from_date=record['from_date'], to_date=record['to_date'])),
+                             ref=record['ref']))
+            if len(rows) == batch_size:
+                writer.run(SET_RANGES, rows=rows).consume()
+                ranges, rows = ranges + len(rows), []
+        if rows:
+            writer.run(SET_RANGES, rows=rows).consume()
+            ranges += len(rows)
+
+        # Tenure comes from the profile stored on each resume, computed from the same ranges
+        rows = []
+        for record in reader.run(STORED_PROFILES):
+            profile = CandidateProfile.from_json(record['profile'])
+            rows.append({'resume_id': record['resume_id'], 'tenure': profile.tenure_months})
+            if len(rows) == batch_size:
+                writer.run(SET_TENURE_BATCH, rows=rows).consume()
+                tenures, rows = tenures + len(rows), []
+        if rows:
+            writer.run(SET_TENURE_BATCH, rows=rows).consume()
+            tenures += len(rows)
+    return {'relationships': ranges, 'resumes': tenures,
+            'ongoing': refresh_ongoing_tenure(driver, batch_size=batch_size)}
+
+
+def refresh_ongoing_tenure(driver, today: Optional[date] = None, batch_size: int = 1000) -> int:
+    """Bring tenure and profiles of resumes with an ongoing role up to today; returns resumes changed"""
+    refreshed = 0
+    with driver.session() as reader, driver.session() as writer:
+        rows: List[Dict[str, Any]] = []
+        for record in reader.run(ONGOING_ROLES):
+            profile = CandidateProfile.from_json(record['profile'])
+            tenure, total = role_tenure(record['roles'], today)
+            if tenure == profile.tenure_months and total == profile.total_months:
+                continue
+            profile = profile.with_tenure(tenure, total)
+            rows.append({'resume_id': record['resume_id'], 'profile': profile.to_json(), 'tenure': tenure})
+            if len(rows) == batch_size:
+                writer.run(SET_ONGOING_BATCH, rows=rows).consume()
+                refreshed, rows = refreshed + len(rows), []
+        if rows:
+            writer.run(SET_ONGOING_BATCH, rows=rows).consume()
+            refreshed += len(rows)
+    return refreshed
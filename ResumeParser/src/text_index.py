@@ -0,0 +1,389 @@
+"""
+Approximate nearest-neighbour search over resume and job text.
+
+Text is turned into vectors locally, without model downloads: word
+unigrams, bigrams and in-word character 4-grams are hashed into a fixed
+number of buckets, weighted by sublinear TF and folded into a small dense
+vector by a sparse random projection. Document frequencies are counted per
+bucket as documents arrive, and IDF is applied on the query side only, so
+stored vectors never go stale as the corpus grows. Vectors are unit length.
+
+Search goes through an inverted-file (IVF) index: documents are assigned
+to the nearest of a few hundred k-means centroids and a query only scans
+the lists of its nprobe closest centroids. Everything lives in one
+directory of flat files; vectors and list assignments are memory-mapped
+and grow in place as documents are added.
+"""
+
+import json
+import math
+import os
+import re
+import threading
+import zlib
+from array import array
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    from .resume_schema import ResumeData
+    from .skill_index import JOB_SKILLS_QUERY
+    from .query_registry import define
+except ImportError:
+    from resume_schema import ResumeData
+    from skill_index import JOB_SKILLS_QUERY
+    from query_registry import define
+
+FORMAT_VERSION = 1
+
+# Hashed feature buckets; document frequencies are kept per bucket
+N_BUCKETS = 1 << 20
+# Dense dimensions each bucket is projected onto, with random signs
+PROJECTIONS = 3
+UNASSIGNED = -1
+REMOVED = -2
+
+_TOKEN = re.compile(r'[a-z0-9+#]+(?:[.\-][a-z0-9+#]+)*')
+RESUME_TEXT_QUERY = define('resume.text', """
+    MATCH (r:Resume)
+    OPTIONAL MATCH (r)-[e:HAS_EXPERIENCE]->(:Company)
+    WITH r, collect(e.description) AS descriptions
+    OPTIONAL MATCH (r)-[:HAS_SKILL]->(s:Skill)
+    RETURN r.id AS resume_id, r.summary AS summary, descriptions, collect(s.name) AS skills
+""")
+
+STOPWORDS = frozenset(
+    'a an and are as at be by for from has have in into is it its of on or our over that the their '
+    'to was we were which while with within'.split()
+)
+
+
+@lru_cache(maxsize=1 << 18)
+def _hash(feature: str) -> int:
+    # crc32 rather than hash(): string hashes are salted per process
+    return zlib.crc32(feature.encode('utf-8'))
+
+
+def text_features(text: str) -> List[int]:
+    """Hashes of the word unigrams, bigrams and character 4-grams of text"""
+    words = [word for word in _TOKEN.findall(text.lower()) if word not in STOPWORDS]
+    hashes = [_hash(word) for word in words]
+    hashes += [_hash(f'{a} {b}') for a, b in zip(words, words[1:])]
+    for word in words:
+        if len(word) > 4:
+            padded = f'<{word}>'
+            hashes += [_hash(padded[i:i + 4]) for i in range(len(padded) - 3)]
+    return hashes
+
+
+def resume_text(resume: ResumeData) -> str:
+    """Free text of a resume: summary, roles, descriptions, skills and projects"""
+    parts = [resume.summary or '']
+    for exp in resume.experience:
+        parts += [exp.position, exp.description, ' '.join(exp.skills_used)]
+    parts.append(' '.join(skill.name for skill in resume.skills))
+    for project in resume.projects:
+        parts += [project.name, project.description, ' '.join(project.technologies)]
+    return '\n'.join(part for part in parts if part)
+
+
+def job_text(job: Dict[str, Any]) -> str:
+    """Free text of a job posting dict: title, description and required skills"""
+    parts = [job.get('title') or '', job.get('description') or '', ' '.join(job.get('skills') or [])]
+    return '\n'.join(part for part in parts if part)
+
+
+def graph_documents(driver, kind: str) -> Iterator[Tuple[str, str]]:
+    """(id, text) for every Resume ('resumes') or Job ('jobs') in the graph"""
+    with driver.session() as session:
+        if kind == 'resumes':
+            for record in session.run(RESUME_TEXT_QUERY):
+                parts = [record['summary'] or ''] + list(record['descriptions']) + [' '.join(record['skills'])]
+                yield record['resume_id'], '\n'.join(part for part in parts if part)
+        elif kind == 'jobs':
+            for record in session.run(JOB_SKILLS_QUERY):
+                yield record['job_id'], job_text(dict(record['job'], skills=record['skills']))
+        else:
+            raise ValueError(f"Unknown document kind {kind!r}, expected 'resumes' or 'jobs'")
+
+
+class _GrowableMap:
+    """A memory-mapped 2-D array file whose row capacity doubles as rows are appended"""
+
+    def __init__(self, path: str, dtype, width: int, rows: int, fill=0):
+        self.path = path
+        self.dtype = np.dtype(dtype)
+        self.width = width
+        self.fill = fill
+        if not os.path.exists(path):
+            open(path, 'wb').close()
+        self.capacity = os.path.getsize(path) // (self.dtype.itemsize * width)
+        self._map = None
+        self.reserve(max(rows, 1))
+
+    def reserve(self, rows: int) -> None:
+        if rows <= self.capacity and self._map is not None:
+            return
+        old = self.capacity
+        capacity = max(self.capacity, 1024)
+        while capacity < rows:
+            capacity *= 2
+        if self._map is not None:
+            self._map.flush()
+        with open(self.path, 'r+b') as f:
+            f.truncate(capacity * self.width * self.dtype.itemsize)
+        self._map = np.memmap(self.path, dtype=self.dtype, mode='r+', shape=(capacity, self.width))
+        if self.fill and capacity > old:
+            self._map[old:] = self.fill
+        self.capacity = capacity
+
+    @property
+    def array(self) -> np.ndarray:
+        return self._map
+
+    def flush(self) -> None:
+        self._map.flush()
+
+
+class TextIndex:
+    """Persistent IVF index of hashed TF-IDF vectors keyed by document id"""
+
+    def __init__(self, directory: str, dim: int = 256, nlist: Optional[int] = None,
+                 nprobe: int = 16, train_size: int = 2000, seed: int = 0):
+        """
+        Open the index stored in directory, creating it if needed. dim, nlist
+        and seed only apply to a new index; an existing one keeps its own.
+        Until train_size documents are indexed, search is an exact scan.
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.nprobe = nprobe
+        self.train_size = train_size
+        self._lock = threading.RLock()
+        meta_path = os.path.join(directory, 'meta.json')
+        if os.path.exists(meta_path):
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            if meta.get('version') != FORMAT_VERSION:
+                raise ValueError(f'{directory} holds text index version {meta.get("version")}, '
+                                 f'expected {FORMAT_VERSION}')
+        else:
+            meta = {'version': FORMAT_VERSION, 'dim': dim, 'seed': seed, 'nlist': nlist,
+                    'count': 0, 'documents': 0, 'trained': 0}
+        self.dim = meta['dim']
+        self.seed = meta['seed']
+        self.nlist = meta['nlist']
+        self._count = meta['count']          # rows written, including replaced ones
+        self._documents = meta['documents']  # documents counted in the IDF
+        self._trained = meta['trained']      # number of centroids, 0 before training
+
+        self._vectors = _GrowableMap(self._path('vectors.f32'), np.float32, self.dim, self._count)
+        self._assign = _GrowableMap(self._path('lists.i32'), np.int32, 1, self._count, fill=UNASSIGNED)
+        self._df = _GrowableMap(self._path('df.u32'), np.uint32, 1, N_BUCKETS)
+        self._centroids = (np.fromfile(self._path('centroids.f32'), dtype=np.float32).reshape(-1, self.dim)
+                           if self._trained else None)
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        if os.path.exists(self._path('ids.txt')):
+            with open(self._path('ids.txt'), 'r', encoding='utf-8') as f:
+                self._ids = [line.rstrip('\n') for line in f]
+            if len(self._ids) > self._count:
+                # Ids appended after the last metadata write belong to unsaved rows
+                self._ids = self._ids[:self._count]
+                with open(self._path('ids.txt'), 'w', encoding='utf-8') as f:
+                    f.writelines(doc_id + '\n' for doc_id in self._ids)
+        for row, doc_id in enumerate(self._ids):
+            if self._assign.array[row, 0] != REMOVED:
+                self._rows[doc_id] = row
+        self._build_lists()
+
+        rng = np.random.default_rng(self.seed)
+        self._multipliers = rng.integers(1, 1 << 31, size=PROJECTIONS, dtype=np.uint64) | np.uint64(1)
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._rows
+
+    def _build_lists(self) -> None:
+        self._lists: List[array] = [array('q') for _ in range(self._trained)]
+        if self._trained:
+            assign = np.asarray(self._assign.array[:self._count, 0])
+            order = np.argsort(assign, kind='stable')
+            bounds = np.searchsorted(assign[order], np.arange(self._trained + 1))
+            for c in range(self._trained):
+                self._lists[c] = array('q', order[bounds[c]:bounds[c + 1]].tolist())
+
+    # --- vectors -----------------------------------------------------------
+
+    def _buckets(self, text: str) -> Tuple[np.ndarray, np.ndarray]:
+        hashes = np.array(text_features(text), dtype=np.uint64)
+        return np.unique(hashes % N_BUCKETS, return_counts=True)
+
+    def _vector(self, buckets: np.ndarray, counts: np.ndarray, query: bool) -> np.ndarray:
+        vector = np.zeros(self.dim, dtype=np.float32)
+        if not len(buckets):
+            return vector
+        weights = 1 + np.log(counts)
+        if query:
+            df = self._df.array[buckets, 0].astype(np.float64)
+            weights *= (np.log((1 + self._documents) / (1 + df)) + 1)
+        mixed = (buckets[:, None] * self._multipliers[None, :]) & np.uint64(0xFFFFFFFF)
+        dims = (mixed >> np.uint64(8)) % np.uint64(self.dim)
+        signs = np.where(mixed & np.uint64(1), 1.0, -1.0)
+        np.add.at(vector, dims.ravel().astype(np.int64), (weights[:, None] * signs).ravel())
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def embed(self, text: str, query: bool = True) -> np.ndarray:
+        """Unit vector for text, IDF-weighted as a query or plain as a stored document"""
+        return self._vector(*self._buckets(text), query)
+
+    # --- updates -----------------------------------------------------------
+
+    def add(self, doc_id: str, text: str) -> None:
+        self.add_many([(doc_id, text)])
+
+    def add_many(self, documents: Iterable[Tuple[str, str]]) -> int:
+        """Index (id, text) pairs, replacing documents whose id is already indexed"""
+        added = 0
+        with self._lock, open(self._path('ids.txt'), 'a', encoding='utf-8') as ids_file:
+            for doc_id, text in documents:
+                doc_id = str(doc_id).replace('\n', ' ')
+                buckets, counts = self._buckets(text)
+                # IDF counts every version of a document; replacements are rare
+                self._df.array[buckets, 0] += 1
+                self._documents += 1
+                vector = self._vector(buckets, counts, query=False)
+
+                if doc_id in self._rows:
+                    self._remove_row(self._rows.pop(doc_id))
+                row = self._count
+                self._vectors.reserve(row + 1)
+                self._assign.reserve(row + 1)
+                self._vectors.array[row] = vector
+                self._assign.array[row, 0] = UNASSIGNED
+                if self._trained:
+                    cluster = int(np.argmax(self._centroids @ vector))
+                    self._assign.array[row, 0] = cluster
+                    self._lists[cluster].append(row)
+                self._ids.append(doc_id)
+                self._rows[doc_id] = row
+                self._count += 1
+                ids_file.write(doc_id + '\n')
+                added += 1
+        if not self._trained and len(self._rows) >= self.train_size:
+            self.train()
+        else:
+            self._save_meta()
+        return added
+
+    def remove(self, doc_id: str) -> bool:
+        with self._lock:
+            row = self._rows.pop(doc_id, None)
+            if row is None:
+                return False
+            self._remove_row(row)
+            self._save_meta()
+        return True
+
+    def _remove_row(self, row: int) -> None:
+        cluster = int(self._assign.array[row, 0])
+        if cluster >= 0:
+            self._lists[cluster].remove(row)
+        self._assign.array[row, 0] = REMOVED
+
+    def train(self, iterations: int = 10, sample_size: int = 50_000) -> None:
+        """
+        Cluster the indexed vectors with spherical k-means and reassign every
+        document. Runs automatically once train_size documents are indexed;
+        call it again after the corpus has grown many times over.
+        """
+        with self._lock:
+            live = np.array(sorted(self._rows.values()), dtype=np.int64)
+            if not len(live):
+                return
+            nlist = self.nlist or int(min(4096, max(1, round(math.sqrt(len(live))))))
+            nlist = min(nlist, len(live))
+            rng = np.random.default_rng(self.seed)
+            sample = self._vectors.array[np.sort(rng.choice(live, min(sample_size, len(live)), replace=False))]
+            centroids = sample[rng.choice(len(sample), nlist, replace=False)].copy()
+            for _ in range(iterations):
+                labels = np.argmax(sample @ centroids.T, axis=1)
+                sums = np.zeros_like(centroids)
+                np.add.at(sums, labels, sample)
+                norms = np.linalg.norm(sums, axis=1)
+                # Empty clusters keep their previous centroid
+                filled = norms > 0
+                centroids[filled] = sums[filled] / norms[filled, None]
+
+            assign = np.full(self._count, REMOVED, dtype=np.int32)
+            for start in range(0, len(live), 65536):
+                rows = live[start:start + 65536]
+                assign[rows] = np.argmax(self._vectors.array[rows] @ centroids.T, axis=1)
+            self._assign.array[:self._count, 0] = assign
+            self._centroids = centroids.astype(np.float32)
+            self._centroids.tofile(self._path('centroids.f32'))
+            self._trained = nlist
+            self._build_lists()
+        self.flush()
+
+    def flush(self) -> None:
+        """Force memory-mapped data and metadata to disk"""
+        with self._lock:
+            for mapped in (self._vectors, self._assign, self._df):
+                mapped.flush()
+            self._save_meta()
+
+    def _save_meta(self) -> None:
+        # Mapped pages outlive a crashed process in the page cache, so updates
+        # only rewrite the metadata; flush() also syncs the data files
+        with self._lock:
+            meta = {'version': FORMAT_VERSION, 'dim': self.dim, 'seed': self.seed, 'nlist': self.nlist,
+                    'count': self._count, 'documents': self._documents, 'trained': self._trained}
+            temp = self._path('meta.json.tmp')
+            with open(temp, 'w', encoding='utf-8') as f:
+                json.dump(meta, f)
+            os.replace(temp, self._path('meta.json'))
+
+    # --- queries -----------------------------------------------------------
+
+    def search(self, text: str, k: int = 10, nprobe: Optional[int] = None) -> List[Tuple[str, float]]:
+        """The k indexed documents most similar to text, as (id, cosine) pairs"""
+        return self.search_vector(self.embed(text), k, nprobe)
+
+    def search_vector(self, vector: np.ndarray, k: int = 10, nprobe: Optional[int] = None) -> List[Tuple[str, float]]:
+        with self._lock:
+            if not self._rows or not vector.any():
+                return []
+            if self._trained:
+                probes = min(nprobe or self.nprobe, self._trained)
+                closest = np.argpartition(-(self._centroids @ vector), probes - 1)[:probes]
+                rows = np.concatenate([np.frombuffer(self._lists[c], dtype=np.int64) for c in closest])
+                rows.sort()
+            else:
+                rows = np.array(sorted(self._rows.values()), dtype=np.int64)
+            if not len(rows):
+                return []
+            scores = self._vectors.array[rows] @ vector
+            if len(rows) > k:
+                best = np.argpartition(-scores, k - 1)[:k]
+            else:
+                best = np.arange(len(rows))
+            best = best[np.lexsort((rows[best], -scores[best]))]
+            return [(self._ids[rows[i]], float(scores[i])) for i in best if scores[i] > 0]
+
+    def similar(self, doc_id: str, k: int = 10, nprobe: Optional[int] = None) -> List[Tuple[str, float]]:
+        """Documents most similar to an indexed one, excluding itself"""
+        row = self._rows[doc_id]
+        return [hit for hit in self.search_vector(np.array(self._vectors.array[row]), k + 1, nprobe)
+                if hit[0] != doc_id][:k]
+
+    def nbytes(self) -> int:
+        return self._count * self.dim * 4 + self._count * 4 + N_BUCKETS * 4
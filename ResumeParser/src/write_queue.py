@@ -0,0 +1,263 @@
+"""
+Durable write-behind queue between parsing and the graph.
+
+A parsed resume is the product of an expensive LLM call, so it is
+committed to a local SQLite database (WAL mode, fsync on commit) before
+anything is written to Neo4j. A WriteFlusher thread drains the queue in
+batches, each written in one graph transaction by
+Neo4jManager.upsert_resumes, which is idempotent: an entry is only deleted
+after its graph transaction committed, and redelivering one that was
+written before a crash finds nothing to change. Delivery is therefore
+at-least-once and parsing never waits on, or fails with, the graph.
+
+When a batch fails, its entries are written one at a time so a single bad
+entry cannot hold back the others. A failed single write leaves its entry
+queued with an exponential backoff and ends the batch, so an unreachable
+database is retried at a bounded rate instead of once per entry. Entries
+that keep failing are marked dead after max_attempts and kept for
+inspection. Queue depth and the age of the oldest pending entry are
+exported as gauges, refreshed once per flush.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+try:
+    from .metrics import registry
+    from .resume_schema import ResumeData
+except ImportError:
+    from metrics import registry
+    from resume_schema import ResumeData
+
+DEFAULT_PATH = 'resume-writes.db'
+
+QUEUE_DEPTH = "resume_write_queue_depth"
+QUEUE_LAG = "resume_write_queue_lag_seconds"
+WRITES_TOTAL = "resume_write_queue_writes_total"
+DELIVERY_SECONDS = "resume_write_queue_delivery_seconds"
+
+PENDING = 'pending'
+DEAD = 'dead'
+
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS writes (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        target TEXT NOT NULL,
+        resume_id TEXT NOT NULL,
+        payload TEXT NOT NULL,
+        enqueued_at REAL NOT NULL,
+        next_attempt REAL NOT NULL,
+        attempts INTEGER NOT NULL DEFAULT 0,
+        state TEXT NOT NULL DEFAULT 'pending',
+        last_error TEXT
+    );
+    CREATE INDEX IF NOT EXISTS writes_due ON writes (target, state, next_attempt, seq);
+"""
+
+
+@dataclass
+class QueuedWrite:
+    seq: int
+    target: str
+    resume_id: str
+    payload: str
+    enqueued_at: float
+    attempts: int
+
+    def resume_data(self) -> ResumeData:
+        return ResumeData.model_validate_json(self.payload)
+
+
+class WriteBehindQueue:
+    """SQLite-backed queue of parsed resumes waiting for their graph write"""
+
+    def __init__(self, path: Optional[str] = None, metrics=None):
+        self.path = path or os.environ.get('WRITE_QUEUE_PATH') or DEFAULT_PATH
+        self.metrics = metrics or registry
+        # One connection serialized by a lock; every call is a short transaction
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+        # Set on every put so an idle flusher wakes up at once
+        self.wakeup = threading.Event()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            # FULL syncs the WAL on each commit, so an acknowledged put survives power loss
+            self._conn.execute("PRAGMA synchronous=FULL")
+            self._conn.executescript(_SCHEMA)
+        self.update_gauges()
+
+    def put(self, resume_id: str, resume_data: ResumeData, target: str = '') -> int:
+        """Durably queue one write for the database target; returns its sequence number"""
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO writes (target, resume_id, payload, enqueued_at, next_attempt) VALUES (?, ?, ?, ?, ?)",
+                (target, resume_id, resume_data.model_dump_json(), now, now))
+        self.wakeup.set()
+        return cursor.lastrowid
+
+    def due(self, target: str = '', limit: int = 100) -> List[QueuedWrite]:
+        """Oldest pending entries for target whose next attempt is due"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT seq, target, resume_id, payload, enqueued_at, attempts FROM writes "
+                "WHERE target = ? AND state = ? AND next_attempt <= ? ORDER BY seq LIMIT ?",
+                (target, PENDING, time.time(), limit)).fetchall()
+        return [QueuedWrite(*row) for row in rows]
+
+    def ack(self, seqs: List[int]) -> None:
+        """Delete entries whose graph write committed"""
+        if not seqs:
+            return
+        with self._lock:
+            self._conn.executemany("DELETE FROM writes WHERE seq = ?", [(seq,) for seq in seqs])
+
+    def retry(self, entry: QueuedWrite, error: str, delay: float, max_attempts: int) -> bool:
+        """Record a failed attempt; returns False once the entry is marked dead"""
+        attempts = entry.attempts + 1
+        state = DEAD if attempts >= max_attempts else PENDING
+        with self._lock:
+            self._conn.execute(
+                "UPDATE writes SET attempts = ?, next_attempt = ?, state = ?, last_error = ? WHERE seq = ?",
+                (attempts, time.time() + delay, state, error[:1000], entry.seq))
+        return state == PENDING
+
+    def depth(self, target: Optional[str] = None, state: str = PENDING) -> int:
+        query, params = "SELECT count(*) FROM writes WHERE state = ?", [state]
+        if target is not None:
+            query, params = query + " AND target = ?", params + [target]
+        with self._lock:
+            return self._conn.execute(query, params).fetchone()[0]
+
+    def lag(self) -> float:
+        """Seconds the oldest pending entry has been waiting, 0 when empty"""
+        with self._lock:
+            oldest = self._conn.execute("SELECT min(enqueued_at) FROM writes WHERE state = ?",
+                                        (PENDING,)).fetchone()[0]
+        return max(0.0, time.time() - oldest) if oldest is not None else 0.0
+
+    def dead(self) -> List[Dict[str, Any]]:
+        """Entries that exhausted their attempts, with their last error"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT seq, target, resume_id, enqueued_at, attempts, last_error FROM writes "
+                "WHERE state = ? ORDER BY seq", (DEAD,)).fetchall()
+        return [dict(zip(('seq', 'target', 'resume_id', 'enqueued_at', 'attempts', 'last_error'), row))
+                for row in rows]
+
+    def requeue_dead(self) -> int:
+        """Give dead entries a fresh set of attempts"""
+        with self._lock:
+            cursor = self._conn.execute("UPDATE writes SET state = ?, attempts = 0, next_attempt = ? WHERE state = ?",
+                                        (PENDING, time.time(), DEAD))
+        self.wakeup.set()
+        return cursor.rowcount
+
+    def update_gauges(self) -> None:
+        """Export depth and lag; the flusher calls this once per flush rather than on every change"""
+        depth = self.metrics.gauge(QUEUE_DEPTH, "Resume graph writes waiting in the write-behind queue")
+        depth.set(self.depth(), state=PENDING)
+        depth.set(self.depth(state=DEAD), state=DEAD)
+        self.metrics.gauge(QUEUE_LAG, "Age of the oldest queued resume graph write in seconds").set(self.lag())
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class WriteFlusher:
+    """Background thread that drains one target's queued writes into Neo4j"""
+
+    def __init__(self, queue: WriteBehindQueue, manager, target: str = '', batch_size: int = 100,
+                 interval: float = 1.0, base_backoff: float = 0.5, max_backoff: float = 60.0,
+                 max_attempts: int = 20):
+        self.queue = queue
+        self.manager = manager
+        self.target = target
+        self.batch_size = batch_size
+        self.interval = interval
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.max_attempts = max_attempts
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> 'WriteFlusher':
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name='write-flusher', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        self.queue.wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def backoff(self, attempts: int) -> float:
+        return min(self.max_backoff, self.base_backoff * 2 ** max(0, attempts - 1))
+
+    def flush(self) -> Dict[str, int]:
+        """Write one batch of due entries in one transaction, falling back to single writes that stop at a failure"""
+        written: List[QueuedWrite] = []
+        failed = 0
+        entries = self.queue.due(self.target, self.batch_size)
+        writes = self.queue.metrics.counter(WRITES_TOTAL, "Write-behind graph writes by outcome")
+        if len(entries) > 1:
+            try:
+                self.manager.upsert_resumes([(entry.resume_id, entry.resume_data()) for entry in entries])
+                written = entries
+            except Exception:
+                # One bad entry fails the whole transaction; single writes below find it
+                pass
+        if not written:
+            for entry in entries:
+                try:
+                    self.manager.upsert_resume(entry.resume_id, entry.resume_data())
+                except Exception as e:
+                    failed += 1
+                    alive = self.queue.retry(entry, f"{type(e).__name__}: {e}", self.backoff(entry.attempts + 1),
+                                             self.max_attempts)
+                    writes.inc(outcome='retry' if alive else DEAD)
+                    break
+                written.append(entry)
+        delivery = self.queue.metrics.histogram(DELIVERY_SECONDS, "Seconds from queueing a resume to its graph write")
+        for entry in written:
+            writes.inc(outcome='written')
+            delivery.observe(time.time() - entry.enqueued_at)
+        self.queue.ack([entry.seq for entry in written])
+        self.queue.update_gauges()
+        return {'written': len(written), 'failed': failed, 'due': len(entries)}
+
+    def drain(self, timeout: float = 30.0) -> bool:
+        """Flush until nothing is due for this target; False if entries remain at the timeout"""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            result = self.flush()
+            if result['due'] == 0:
+                return True
+            if result['failed']:
+                time.sleep(min(self.interval, max(0.0, deadline - time.monotonic())))
+        return False
+
+    def _loop(self) -> None:
+        failures = 0
+        while not self._stop.is_set():
+            self.queue.wakeup.clear()
+            try:
+                result = self.flush()
+            except Exception:
+                # The queue itself failed (e.g. disk full); keep the thread alive and retry
+                result = {'written': 0, 'failed': 1, 'due': 0}
+            if result['failed']:
+                failures += 1
+                self._stop.wait(self.backoff(failures))
+                continue
+            failures = 0
+            if result['due'] < self.batch_size:
+                self.queue.wakeup.wait(self.interval)
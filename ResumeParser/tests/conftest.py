@@ -0,0 +1,8 @@
+"""
+Pytest configuration: make the src modules importable the same way main.py does
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'src'))
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Test batch resume x job scoring against brute-force scoring
+"""
+
+import random
+
+import numpy as np
+
+from batch_matching import BatchMatcher, PROFICIENCY_WEIGHTS
+from fakes import RecordingDriver
+from resume_schema import ResumeData
+from skill_canonicalizer import SkillCanonicalizer
+from synthetic_corpus import generate_jobs
+
+def brute_force(resumes, jobs, weights, metric):
+    """Dense score matrix from {skill: weight} rows"""
+    scores = np.zeros((len(resumes), len(jobs)))
+    for r, resume in enumerate(resumes):
+        for j, job in enumerate(jobs):
+            shared = sum(resume[s] * weights[s] for s in resume.keys() & job)
+            if metric == 'overlap':
+                scores[r, j] = shared
+            elif metric == 'jaccard':
+                union = sum(resume[s] * weights[s] for s in resume) + sum(weights[s] for s in job) - shared
+                scores[r, j] = shared / union if union else 0
+            else:
+                # Both sides are IDF-weighted for cosine
+                dot = sum(resume[s] * weights[s] ** 2 for s in resume.keys() & job)
+                norm = np.sqrt(sum((resume[s] * weights[s]) ** 2 for s in resume) * sum(weights[s] ** 2 for s in job))
+                scores[r, j] = dot / norm if norm else 0
+    return scores
+
+def test_score_all_matches_brute_force():
+    """Top k in both directions agrees with exhaustive scoring for every metric"""
+    jobs = generate_jobs(400, skills_per_job=8, vocabulary_size=120)
+    resumes = generate_jobs(60, skills_per_job=12, vocabulary_size=120, seed=7)
+    rng = random.Random(2)
+    levels = list(PROFICIENCY_WEIGHTS) + [None]
+    resume_levels = [{s: rng.choice(levels) for s in r['skills']} for r in resumes]
+
+    matcher = BatchMatcher(canonicalizer=SkillCanonicalizer())
+    matcher.add_jobs((job['id'], job['skills']) for job in jobs)
+    matcher.add_resumes((f'r{i}', skills) for i, skills in enumerate(resume_levels))
+    _, _, idf = matcher.matrices()
+    weights = {name: idf[column] for name, column in matcher.skill_ids.items()}
+    canonical = matcher.canonicalizer.canonical_name
+    resume_rows = [{canonical(s): PROFICIENCY_WEIGHTS.get(level, 1.0) for s, level in skills.items()}
+                   for skills in resume_levels]
+    job_rows = [{canonical(s) for s in job['skills']} for job in jobs]
+
+    for metric in ('overlap', 'jaccard', 'cosine'):
+        expected = brute_force(resume_rows, job_rows, weights, metric)
+        result = matcher.score_all(metric, k=5, job_k=3)
+        for r in range(len(resumes)):
+            assert np.allclose(result.by_resume.scores[r], np.sort(expected[r])[::-1][:5], atol=1e-4)
+            top = result.by_resume.indices[r, 0]
+            assert np.isclose(expected[r, top], expected[r].max(), atol=1e-4)
+        for j in range(len(jobs)):
+            assert np.allclose(result.by_job.scores[j], np.sort(expected[:, j])[::-1][:3], atol=1e-4)
+
+def test_resume_data_and_padding():
+    """ResumeData rows use listed proficiency; rows with few matches are padded"""
+    resume = ResumeData(**{
+        'personal_info': {'name': 'Ada'},
+        'skills': [{'name': 'Python', 'category': 'Programming Languages', 'proficiency': 'Beginner'},
+                   {'name': 'postgres', 'category': 'Databases'}],
+        'experience': [{'company': 'Acme', 'position': 'Engineer', 'dates': {'from_date': '2020-01', 'to_date': '2022-06'},
+                        'description': 'Built services', 'skills_used': ['Docker', 'Python']}],
+    })
+    matcher = BatchMatcher(canonicalizer=SkillCanonicalizer(), idf=False)
+    matcher.add_resume('ada', resume)
+    matcher.add_resume('nobody', [])
+    matcher.add_job('db', ['PostgreSQL', 'Docker'])
+    matcher.add_job('py', ['Python 3'])
+    matcher.add_job('go', ['Golang'])
+
+    result = matcher.score_all('overlap', k=3)
+    assert result.jobs_for('ada') == [('db', 2.0), ('py', 0.5)]
+    assert result.jobs_for('nobody') == []
+    assert result.resumes_for('py') == [('ada', 0.5)]
+    assert result.resumes_for('go') == []
+    assert dict(result.iter_recommendations())['ada'][0] == ('db', 2.0)
+    assert dict(result.iter_candidates())['db'] == [('ada', 2.0)]
+
+def test_load_graph():
+    """Resumes and jobs load from the graph with their skills"""
+    driver = RecordingDriver()
+    driver.respond("MATCH (r:Resume)", [{'resume_id': 'r1', 'skills': ['Python', 'AWS']}])
+    driver.respond("MATCH (j:Job)", [{'job_id': 'j1', 'job': {}, 'skills': ['python', 'Amazon Web Services']},
+                                     {'job_id': 'j2', 'job': {}, 'skills': ['React']}])
+    matcher = BatchMatcher(canonicalizer=SkillCanonicalizer())
+    matcher.load_graph(driver)
+    result = matcher.score_all('jaccard')
+    assert result.jobs_for('r1') == [('j1', 1.0)]
+
+if __name__ == "__main__":
+    test_score_all_matches_brute_force()
+    test_resume_data_and_padding()
+    test_load_graph()
+    print("✅ Batch matching tests passed!")
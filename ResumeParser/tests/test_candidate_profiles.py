@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Test candidate profiles, their cache and invalidation at ingest
+"""
+
+import time
+from datetime import date
+
+from candidate_profiles import (CandidateProfile, ProfileCache, build_profile, load_profile,
+                                month_index, rank_matches)
+from fakes import RecordingDriver
+from metrics import CACHE_LOOKUPS_TOTAL, MetricsRegistry
+from neo4j_manager import Neo4jManager
+from resume_schema import ResumeData
+from skill_canonicalizer import SkillCanonicalizer
+
+TODAY = date(2025, 6, 15)
+
+def build_resume(name="Ada Lovelace") -> ResumeData:
+    return ResumeData(
+        personal_info={"name": name, "email": "ada@example.com"},
+        experience=[
+            {"position": "Engineer", "company": "Acme", "dates": {"from_date": "2019-01", "to_date": "2020-12"},
+             "description": "Built services", "skills_used": ["Python", "postgres"]},
+            # Overlaps the previous role for Python; months are not counted twice
+            {"position": "Lead", "company": "Initech", "dates": {"from_date": "Jul 2020", "to_date": "Present"},
+             "description": "Led a team", "skills_used": ["python3", "Kubernetes"]},
+        ],
+        skills=[{"name": "Python", "category": "Technical", "proficiency": "Expert"},
+                {"name": "Go", "category": "Technical", "proficiency": "Beginner"}],
+    )
+
+def test_month_index():
+    assert month_index("2021-03") == 2021 * 12 + 2
+    assert month_index("March 2021") == month_index("03/2021") == 2021 * 12 + 2
+    assert month_index("2021") == 2021 * 12
+    assert month_index("Present", TODAY) == 2025 * 12 + 5
+    assert month_index("unknown") is None
+
+def test_build_profile():
+    """Skills are canonical, tenure merges overlapping roles, weights combine both"""
+    profile = build_profile("r1", build_resume(), SkillCanonicalizer(), today=TODAY)
+    assert profile.name == "Ada Lovelace"
+    assert profile.tenure_months == {"Python": 78, "PostgreSQL": 24, "Kubernetes": 60}
+    assert profile.total_months == 78
+    assert profile.skills["Python"] == 1.0
+    assert profile.skills["PostgreSQL"] == 0.7
+    assert profile.skills["Go"] == 0.25
+    assert profile.skill_names()[:2] == ["Kubernetes", "Python"]
+    assert CandidateProfile.from_json(profile.to_json()) == profile
+
+def test_cache_refreshed_at_ingest():
+    """Ingest stores the profile on the node and replaces the cached copy"""
+    driver = RecordingDriver()
+    cache = ProfileCache(capacity=2)
+    manager = Neo4jManager("bolt://unused", "neo4j", "unused", driver=driver,
+                           canonicalizer=SkillCanonicalizer(), profile_cache=cache)
+    manager.create_resume_node(build_resume(), "r1")
+    stored = driver.statements[0][1]["profile"]
+    assert CandidateProfile.from_json(stored).resume_id == "r1"
+
+    driver.reset()
+    assert manager.get_candidate_profile("r1").name == "Ada Lovelace"
+    assert driver.statements == [] and cache.hits == 1
+
+    manager.create_resume_node(build_resume("Ada King"), "r1")
+    assert manager.get_candidate_profile("r1").name == "Ada King"
+
+    # Misses read one node by id; older resumes without a stored profile still match
+    driver.respond("MATCH (r:Resume {id: $resume_id})",
+                   lambda params: [{"name": "Old", "profile": None, "skills": ["JS", "React"]}])
+    old = manager.get_candidate_profile("old")
+    assert old.skills == {"JavaScript": 0.5, "React": 0.5}
+    assert driver.statements[-1][1] == {"resume_id": "old"}
+    manager.create_resume_node(build_resume(), "r2")
+    assert len(cache) == 2 and cache.get("r1") is None
+
+def test_cached_profiles_expire_for_other_processes_ingests():
+    """A re-ingest this process did not make is picked up once the entry expires"""
+    driver = RecordingDriver()
+    stored = {"profile": CandidateProfile("r1", name="Ada Lovelace").to_json()}
+    driver.respond("MATCH (r:Resume {id: $resume_id})", lambda params: [dict(stored, name="", skills=[])])
+    metrics = MetricsRegistry()
+    cache = ProfileCache(ttl_seconds=0.05, metrics=metrics)
+    assert cache.get("r1", driver).name == "Ada Lovelace"
+
+    stored["profile"] = CandidateProfile("r1", name="Ada King").to_json()
+    assert cache.get("r1", driver).name == "Ada Lovelace" and cache.hits == 1
+    time.sleep(0.1)
+    assert cache.get("r1", driver).name == "Ada King" and cache.misses == 2
+    lookups = metrics.counter(CACHE_LOOKUPS_TOTAL)
+    assert lookups.value(cache="candidate_profiles", result="hit") == 1
+    assert lookups.value(cache="candidate_profiles", result="miss") == 2
+
+def test_load_missing_and_rank():
+    driver = RecordingDriver()
+    assert load_profile(driver, "nobody") is None
+    profile = CandidateProfile("r1", skills={"Python": 1.0, "SQL": 0.5, "Go": 0.25})
+    matches = [{"j": {"id": "a"}, "matching_skills": ["SQL", "Go"], "skill_count": 2},
+               {"j": {"id": "b"}, "matching_skills": ["Python"], "skill_count": 1},
+               {"j": {"id": "c"}, "matching_skills": ["Go"], "skill_count": 1}]
+    ranked = rank_matches(profile, matches, 2)
+    assert [(m["j"]["id"], m["score"]) for m in ranked] == [("b", 1.0), ("a", 0.75)]
+
+if __name__ == "__main__":
+    test_month_index()
+    test_build_profile()
+    test_cache_refreshed_at_ingest()
+    test_cached_profiles_expire_for_other_processes_ingests()
+    test_load_missing_and_rank()
+    print("✅ Candidate profile tests passed!")
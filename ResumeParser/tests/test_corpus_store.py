@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Test the columnar corpus store
+"""
+
+import os
+import random
+import tempfile
+
+import pytest
+
+from corpus_store import CorpusStore
+from resume_schema import DateRange
+from synthetic_corpus import CorpusConfig, generate_resume
+
+def build_resumes(count=50):
+    rng = random.Random(3)
+    resumes = [(f'resume-{i}', generate_resume(rng, CorpusConfig(), i)) for i in range(count)]
+    # Cover optional values that must survive the round trip
+    resumes[0][1].projects[0].dates = None
+    resumes[1][1].projects[0].dates = DateRange(from_date='2020-01')
+    resumes[2][1].summary = None
+    resumes[3][1].certifications = []
+    return resumes
+
+def expected_rows(resumes, skill, company):
+    return [
+        i for i, (_, r) in enumerate(resumes)
+        if company in {e.company for e in r.experience}
+        and skill in ({s.name for s in r.skills} | {x for e in r.experience for x in e.skills_used})
+    ]
+
+def test_round_trip_is_lossless():
+    """Every stored resume converts back to an identical ResumeData"""
+    resumes = build_resumes()
+    store = CorpusStore.from_resumes(resumes)
+    assert len(store) == len(resumes)
+    for row, (resume_id, resume) in enumerate(resumes):
+        assert store.get(row) == resume
+        assert store.find(resume_id) == row
+    assert store.find('missing') == -1
+
+def test_filter_and_group_count():
+    """Filters intersect per-entity matches and group counts count resumes once"""
+    resumes = build_resumes()
+    store = CorpusStore.from_resumes(resumes)
+    
+    rows = store.filter(skill='Python', company='Acme Corp')
+    assert list(rows) == expected_rows(resumes, 'Python', 'Acme Corp')
+    assert len(store.filter(skill='Unknown Skill')) == 0
+    assert len(store.filter()) == len(resumes)
+    with pytest.raises(ValueError):
+        store.filter(hobby='chess')
+    
+    counts = dict(store.group_count('skill'))
+    python_resumes = sum(
+        1 for _, r in resumes
+        if 'Python' in ({s.name for s in r.skills} | {x for e in r.experience for x in e.skills_used})
+    )
+    assert counts.get('Python', 0) == python_resumes
+    top_companies = store.group_count('company', rows=rows, top=1)
+    assert top_companies[0] == ('Acme Corp', len(rows))
+
+def test_save_and_memory_map():
+    """A saved store reopens memory-mapped and read-only, or in memory and writable"""
+    resumes = build_resumes()
+    store = CorpusStore.from_resumes(resumes[:-1])
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'corpus.rcs')
+        store.save(path)
+        
+        mapped = CorpusStore.load(path)
+        assert mapped.read_only
+        assert mapped.get(5) == resumes[5][1]
+        assert list(mapped.filter(skill='Python', company='Acme Corp')) == \
+            expected_rows(resumes[:-1], 'Python', 'Acme Corp')
+        with pytest.raises(RuntimeError):
+            mapped.add('new', resumes[-1][1])
+        del mapped
+        
+        writable = CorpusStore.load(path, mmap=False)
+        writable.add(*resumes[-1])
+        assert writable.get(len(writable) - 1) == resumes[-1][1]
+        assert writable.find(resumes[-1][0]) == len(resumes) - 1
+
+if __name__ == "__main__":
+    test_round_trip_is_lossless()
+    test_filter_and_group_count()
+    test_save_and_memory_map()
+    print("✅ Corpus store tests passed!")
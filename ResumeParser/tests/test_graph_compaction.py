@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Test merged shared relationships and the compaction job
+"""
+
+import re
+
+import graph_compaction
+from fakes import RecordingDriver
+from neo4j_manager import Neo4jManager
+from resume_schema import ResumeData
+
+def test_ingest_merges_shared_relationships():
+    """Edges between shared nodes are merged and weighted instead of created per resume"""
+    driver = RecordingDriver()
+    manager = Neo4jManager("bolt://unused", "neo4j", "unused", driver=driver)
+    manager.create_resume_node(ResumeData(
+        education=[{"institute": "MIT", "degree": "BSc", "major": ["Physics"], "courses": ["Optics"],
+                    "dates": {"from_date": "2010", "to_date": "2014"}}],
+        experience=[{"position": "Engineer", "company": "Acme", "dates": {"from_date": "2014", "to_date": "2016"},
+                     "description": "Lasers", "skills_used": ["Python"]}],
+    ), "resume-1")
+    
+    text = "\n".join(query for query, _ in driver.statements)
+    for _, rel_type, _ in graph_compaction.SHARED_RELATIONSHIPS:
+        assert not re.search(rf"CREATE \(\w+\)-\[:{rel_type}\]", text)
+        assert re.search(rf"MERGE \(\w+\)-\[\w+:{rel_type}\]", text)
+    assert text.count(".count = coalesce(") == len(graph_compaction.SHARED_RELATIONSHIPS)
+
+def test_compaction_reports_reclaimed_edges():
+    """Each shared relationship type is compacted in batches and the savings are summed"""
+    driver = RecordingDriver()
+    driver.respond("RETURN count(rel) AS edges", lambda params: [{"edges": 100}])
+    driver.respond("IN TRANSACTIONS", lambda params: [{"deleted": 40}])
+    report = graph_compaction.compact(driver, batch_size=25)
+    
+    kinds = len(graph_compaction.SHARED_RELATIONSHIPS)
+    assert len(driver.statements) == 2 * kinds
+    assert all(params == {"batch_size": 25} for query, params in driver.statements if "IN TRANSACTIONS" in query)
+    assert report["relationships"][0] == {
+        "relationship": "(Institute)-[:OFFERS]->(Degree)", "edges_before": 100, "edges_after": 60,
+        "edges_deleted": 40, "bytes_reclaimed": 40 * graph_compaction.RELATIONSHIP_RECORD_BYTES,
+    }
+    assert report["edges_deleted"] == 40 * kinds
+    assert report["bytes_reclaimed"] == report["edges_deleted"] * graph_compaction.RELATIONSHIP_RECORD_BYTES
+
+if __name__ == "__main__":
+    test_ingest_merges_shared_relationships()
+    test_compaction_reports_reclaimed_edges()
+    print("✅ Graph compaction tests passed!")
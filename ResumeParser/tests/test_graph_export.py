@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Test the streaming graph export
+"""
+
+import glob
+import json
+import os
+import tempfile
+
+import pandas as pd
+import pytest
+
+import graph_export
+from fakes import RecordingDriver
+
+def build_driver(resumes):
+    """Recording driver answering each export query with generated rows"""
+    driver = RecordingDriver()
+    driver.respond("RETURN r.id AS id", [
+        {"id": f"r{i}", "name": f"Person {i}", "email": f"p{i}@example.com", "phone": None,
+         "summary": "Engineer, \"quoted\"\nmultiline", "ingested_at": "2025-06-01T00:00:00Z"}
+        for i in range(resumes)])
+    driver.respond("RETURN r.id AS resume_id, s.name AS skill", [
+        {"resume_id": f"r{i}", "skill": skill} for i in range(resumes) for skill in ("Python", "SQL")])
+    driver.respond("RETURN s.name AS name", [{"name": "Python", "category": "Programming", "proficiency": 3}])
+    return driver
+
+def test_export_streams_batches_into_part_files():
+    """Rows are cut into bounded batches, one part file each, and listed in the manifest"""
+    with tempfile.TemporaryDirectory() as out:
+        driver = build_driver(7)
+        manifest = graph_export.export_graph(driver, out, fmt=graph_export.CSV, batch_rows=3, workers=3)
+
+        tables = manifest["tables"]
+        assert set(tables) == set(graph_export.TABLES)
+        assert tables["resumes"]["rows"] == 7 and len(tables["resumes"]["files"]) == 3
+        assert tables["resume_skills"]["rows"] == 14 and len(tables["resume_skills"]["files"]) == 5
+        assert tables["companies"] == dict(tables["companies"], rows=0, files=[])
+        with open(os.path.join(out, "manifest.json")) as f:
+            assert json.load(f)["tables"]["resumes"]["rows"] == 7
+
+        resumes = pd.concat(pd.read_csv(os.path.join(out, path), dtype=str, keep_default_na=False)
+                            for path in tables["resumes"]["files"])
+        assert list(resumes.columns) == list(graph_export.TABLES["resumes"][1])
+        assert list(resumes["id"]) == [f"r{i}" for i in range(7)]
+        assert resumes["summary"].iloc[0] == "Engineer, \"quoted\"\nmultiline"
+        skills = pd.read_csv(os.path.join(out, tables["skills"]["files"][0]), dtype=str)
+        assert skills["proficiency"].tolist() == ["3"]
+
+        # Re-exporting replaces the previous parts instead of adding to them
+        graph_export.export_graph(build_driver(2), out, tables=["resumes"], fmt=graph_export.CSV, batch_rows=3)
+        assert len(glob.glob(os.path.join(out, "resumes", "part-*"))) == 1
+
+def test_export_rejects_unknown_tables_and_formats():
+    with tempfile.TemporaryDirectory() as out:
+        with pytest.raises(ValueError):
+            graph_export.export_graph(RecordingDriver(), out, tables=["jobs"])
+        with pytest.raises(ValueError):
+            graph_export.export_graph(RecordingDriver(), out, fmt="xlsx")
+
+def test_parquet_export_when_an_engine_is_installed():
+    """Parquet output round-trips through Arrow when pyarrow is usable"""
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        return
+    with tempfile.TemporaryDirectory() as out:
+        manifest = graph_export.export_graph(build_driver(5), out, tables=["resumes"], batch_rows=2,
+                                             rows_per_file=4)
+        files = manifest["tables"]["resumes"]["files"]
+        assert len(files) == 2
+        ids = [row for path in files for row in pq.read_table(os.path.join(out, path)).column("id").to_pylist()]
+        assert ids == [f"r{i}" for i in range(5)]
+
+if __name__ == "__main__":
+    test_export_streams_batches_into_part_files()
+    test_export_rejects_unknown_tables_and_formats()
+    test_parquet_export_when_an_engine_is_installed()
+    print("✅ Graph export tests passed!")
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Test the background ingest pool used by the upload UI
+"""
+
+import os
+import tempfile
+import threading
+
+from fakes import GroundTruthParser, RecordingDriver
+from ingest_pool import DONE, FAILED, IngestPool
+from load_driver import load_ground_truth
+from metrics import MetricsRegistry
+from neo4j_manager import Neo4jManager
+from synthetic_corpus import CorpusConfig, generate_corpus, load_manifest
+
+def build_uploads(corpus_dir, count):
+    generate_corpus(corpus_dir, CorpusConfig(count=count, formats=('txt',), seed=3))
+    uploads = []
+    for entry in load_manifest(corpus_dir)['resumes']:
+        with open(os.path.join(corpus_dir, entry['documents']['txt']), 'rb') as f:
+            uploads.append((entry['documents']['txt'], f.read()))
+    return uploads
+
+def test_jobs_parse_and_write_to_graph():
+    """Every uploaded file is parsed in the background and lands in the graph"""
+    with tempfile.TemporaryDirectory() as corpus_dir:
+        uploads = build_uploads(corpus_dir, 4)
+        parser = GroundTruthParser(load_ground_truth(corpus_dir), metrics=MetricsRegistry())
+        driver = RecordingDriver()
+        manager = Neo4jManager("bolt://unused", "neo4j", "unused", driver=driver, metrics=MetricsRegistry())
+        pool = IngestPool(max_workers=2, metrics=MetricsRegistry())
+        try:
+            job_ids = [pool.submit(name, data, parser, manager, session_id="s1") for name, data in uploads]
+            assert pool.wait(job_ids, timeout=30)
+            assert pool.pending() == 0
+            
+            jobs = pool.collect(job_ids)
+            assert [job.filename for job in jobs] == [name for name, _ in uploads]
+            assert all(job.status == DONE and job.in_graph for job in jobs)
+            assert all(job.resume['name'] and job.resume['id'] for job in jobs)
+            assert pool.collect(job_ids) == []
+            assert sum(1 for query, _ in driver.statements if 'CREATE (r:Resume' in query) == 4
+        finally:
+            pool.shutdown()
+
+def test_failures_and_concurrency_bound():
+    """A failed parse is reported on its job and concurrency never exceeds max_workers"""
+    class ProbeParser(GroundTruthParser):
+        active = 0
+        peak = 0
+        lock = threading.Lock()
+        
+        def _call_llm(self, prompt):
+            with self.lock:
+                ProbeParser.active += 1
+                ProbeParser.peak = max(ProbeParser.peak, ProbeParser.active)
+            try:
+                return super()._call_llm(prompt)
+            finally:
+                with self.lock:
+                    ProbeParser.active -= 1
+    
+    with tempfile.TemporaryDirectory() as corpus_dir:
+        uploads = build_uploads(corpus_dir, 6)
+        truth = load_ground_truth(corpus_dir)
+        parser = ProbeParser(truth, latency=0.05, metrics=MetricsRegistry())
+        pool = IngestPool(max_workers=2, metrics=MetricsRegistry())
+        try:
+            job_ids = [pool.submit(name, data, parser) for name, data in uploads]
+            job_ids.append(pool.submit("unknown.txt", b"No email here", parser))
+            assert pool.wait(job_ids, timeout=30)
+            jobs = pool.collect(job_ids)
+            assert [job.status for job in jobs] == [DONE] * 6 + [FAILED]
+            assert "no ground truth" in jobs[-1].error
+            assert not any(job.in_graph for job in jobs)
+            assert ProbeParser.peak <= 2
+        finally:
+            pool.shutdown()
+
+if __name__ == "__main__":
+    test_jobs_parse_and_write_to_graph()
+    test_failures_and_concurrency_bound()
+    print("✅ Ingest pool tests passed!")
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Test ingest-driven cache invalidation
+"""
+
+from fakes import RecordingDriver
+from invalidation import JOBS, RESUMES, IngestGenerations
+from neo4j_manager import Neo4jManager
+from resume_schema import ResumeData
+
+def test_generations_and_listeners():
+    generations = IngestGenerations()
+    events = []
+    generations.subscribe(lambda topic, key: events.append((topic, key)))
+    assert generations.current(RESUMES, JOBS) == (0, 0)
+    generations.bump(JOBS)
+    generations.bump(RESUMES, "r1")
+    assert generations.current(RESUMES, JOBS) == (1, 1)
+    assert events == [(JOBS, None), (RESUMES, "r1")]
+
+def test_ingest_bumps_resume_generation():
+    """A cache key built from the generation changes after each resume ingest"""
+    generations = IngestGenerations()
+    keys = []
+    generations.subscribe(lambda topic, key: keys.append(key))
+    manager = Neo4jManager("bolt://unused", "neo4j", "unused", driver=RecordingDriver(), generations=generations)
+    before = generations.current(RESUMES)
+    manager.create_resume_node(ResumeData(personal_info={"name": "Ada"}), "r1")
+    assert generations.current(RESUMES) != before
+    assert generations.current(JOBS) == (0,)
+    assert keys == ["r1"]
+
+if __name__ == "__main__":
+    test_generations_and_listeners()
+    test_ingest_bumps_resume_generation()
+    print("✅ Invalidation tests passed!")
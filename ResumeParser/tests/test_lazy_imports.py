@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Test that provider SDKs and document libraries load only when needed
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+
+import pytest
+
+import resume_parser
+from resume_parser import ResumeParser
+
+SRC_DIR = os.path.dirname(os.path.abspath(resume_parser.__file__))
+
+def loaded_after(code):
+    """Heavy optional modules present in a fresh interpreter after running code"""
+    probe = code + "\nimport sys\nprint(','.join(m for m in ('openai', 'google.generativeai', 'PyPDF2', 'docx', 'requests', 'neo4j') if m in sys.modules))"
+    result = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, check=True,
+                            env=dict(os.environ, PYTHONPATH=SRC_DIR))
+    return [name for name in result.stdout.strip().split(",") if name]
+
+def test_import_and_txt_extraction_stay_lazy():
+    """Importing the parser and extracting a TXT file loads no SDK or document library"""
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+        f.write("Jane Smith\n")
+    try:
+        code = ("import neo4j_manager, service\n"
+                "from resume_parser import ResumeParser\n"
+                f"assert ResumeParser('Google', 'key').extract_text_from_file({f.name!r}) == 'Jane Smith\\n'")
+        assert loaded_after(code) == []
+    finally:
+        os.unlink(f.name)
+
+def test_registries_route_providers_and_formats():
+    """Unknown providers and formats fail clearly; registered ones are dispatched"""
+    parser = ResumeParser("Nobody", "")
+    with pytest.raises(ValueError, match="Unsupported LLM provider"):
+        parser._call_llm("prompt")
+    with pytest.raises(ValueError, match="Unsupported file format"):
+        parser.extract_text_from_file("resume.xls")
+    
+    class EchoParser(ResumeParser):
+        def _call_echo(self, prompt):
+            return prompt
+    
+    resume_parser.register_provider("Echo", "_call_echo")
+    try:
+        assert EchoParser("Echo", "")._call_llm("hello") == "hello"
+    finally:
+        del resume_parser.PROVIDERS["Echo"]
+
+if __name__ == "__main__":
+    test_import_and_txt_extraction_stay_lazy()
+    test_registries_route_providers_and_formats()
+    print("✅ Lazy import tests passed!")
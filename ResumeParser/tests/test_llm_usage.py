@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Test LLM usage accounting and model routing
+"""
+
+import json
+import os
+import tempfile
+
+from llm_usage import INVALID, MODEL_TIERS, OK, RoutingPolicy, UsageLedger, estimate_tokens, output_budget
+from metrics import MetricsRegistry
+from resume_parser import ResumeParser
+
+VALID = json.dumps({"personal_info": {"name": "Jane Smith"}, "skills": [{"name": "Python", "category": "Technical"}]})
+
+class TieredParser(ResumeParser):
+    """Anthropic parser whose cheapest model returns invalid JSON"""
+
+    def __init__(self, **kwargs):
+        super().__init__("Anthropic", "unused", metrics=MetricsRegistry(), **kwargs)
+        self.requests = []
+
+    def _call_anthropic(self, prompt):
+        model, max_tokens = self._model(prompt)
+        self.requests.append((model.name, max_tokens))
+        self._record_usage(1000, 500)
+        return '{"personal_info": ' if model is MODEL_TIERS["Anthropic"][0] else VALID
+
+def test_routing_starts_long_or_dense_resumes_on_a_larger_model():
+    haiku, sonnet = MODEL_TIERS["Anthropic"]
+    policy = RoutingPolicy(long_document_tokens=100, dense_year_mentions=3)
+    assert policy.route("Anthropic", "Engineer at Acme, 2019 - 2021") == [haiku, sonnet]
+    assert policy.route("Anthropic", "x" * 800) == [sonnet]
+    assert policy.route("Anthropic", "2001 2005 2009 2014 2020") == [sonnet]
+    assert RoutingPolicy(escalate=False).route("Anthropic", "short") == [haiku]
+    assert policy.route("Fake", "short") == []
+
+    # max_tokens follows the input instead of a fixed ceiling
+    assert output_budget(haiku, estimate_tokens("x" * 400)) == 1024
+    assert output_budget(haiku, 2000) == 2912
+    assert output_budget(haiku, 10_000) == haiku.max_output_tokens
+
+def test_invalid_parses_escalate_and_every_call_is_accounted():
+    with tempfile.TemporaryDirectory() as tmp:
+        ledger = UsageLedger(os.path.join(tmp, "usage.db"))
+        parser = TieredParser(routing=RoutingPolicy(), ledger=ledger)
+        resume, usage = parser.parse_with_usage("Jane Smith, Python engineer", source="jane.pdf")
+
+        assert resume.personal_info["name"] == "Jane Smith"
+        haiku, sonnet = MODEL_TIERS["Anthropic"]
+        assert parser.requests == [(haiku.name, 1024), (sonnet.name, 1024)]
+        assert [(call.model, call.outcome) for call in usage.calls] == [(haiku.name, INVALID), (sonnet.name, OK)]
+        assert usage.model == sonnet.name
+        assert usage.cost == haiku.cost(1000, 500) + sonnet.cost(1000, 500)
+        assert parser.metrics.counter("resume_llm_escalations_total").total() == 1
+        assert parser.metrics.counter("resume_llm_retries_total").value(provider="Anthropic", reason=INVALID) == 1
+
+        totals = {row["model"]: row for row in ledger.totals()}
+        assert totals[haiku.name]["failed"] == 1 and totals[sonnet.name]["tokens_out"] == 500
+        [row] = ledger.per_resume()
+        assert row["source"] == "jane.pdf" and row["calls"] == 2 and row["model"] == sonnet.name
+        assert abs(row["cost"] - usage.cost) < 1e-12
+        ledger.close()
+
+def test_last_tier_failure_raises_after_recording_it():
+    parser = TieredParser(routing=RoutingPolicy(escalate=False))
+    try:
+        parser.parse_resume_with_llm("short resume")
+    except Exception as e:
+        assert "Failed to parse JSON response" in str(e)
+    else:
+        raise AssertionError("an invalid response on the last tier must fail the parse")
+    assert parser.metrics.counter("resume_llm_calls_total").total() == 1
+
+if __name__ == "__main__":
+    test_routing_starts_long_or_dense_resumes_on_a_larger_model()
+    test_invalid_parses_escalate_and_every_call_is_accounted()
+    test_last_tier_failure_raises_after_recording_it()
+    print("✅ LLM usage tests passed!")
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Test pipeline metrics collection and export
+"""
+
+import json
+import os
+import tempfile
+from functools import lru_cache
+
+import pytest
+
+from metrics import CACHE_LOOKUPS_TOTAL, ERRORS_TOTAL, MetricsRegistry, STAGE_SECONDS, counted_cache
+from resume_parser import ResumeParser
+
+def test_counter_and_histogram_export():
+    """Counters and histograms render as Prometheus text and JSON"""
+    metrics = MetricsRegistry()
+    metrics.counter("resume_llm_tokens_total", "LLM tokens").inc(120, provider="OpenAI", direction="in")
+    histogram = metrics.histogram("resume_stage_seconds", "Stage latency", buckets=(0.1, 1.0))
+    histogram.observe(0.05, stage="extract")
+    histogram.observe(0.5, stage="extract")
+    histogram.observe(5.0, stage="extract")
+    
+    text = metrics.to_prometheus()
+    assert '# TYPE resume_llm_tokens_total counter' in text
+    assert 'resume_llm_tokens_total{direction="in",provider="OpenAI"} 120' in text
+    assert 'resume_stage_seconds_bucket{stage="extract",le="0.1"} 1' in text
+    assert 'resume_stage_seconds_bucket{stage="extract",le="1.0"} 2' in text
+    assert 'resume_stage_seconds_bucket{stage="extract",le="+Inf"} 3' in text
+    assert 'resume_stage_seconds_count{stage="extract"} 3' in text
+    
+    snapshot = json.loads(metrics.to_json())
+    sample = snapshot['metrics']['resume_stage_seconds']['samples'][0]
+    assert sample['count'] == 3
+    assert 0.1 <= sample['p50'] <= 1.0
+
+def test_stage_records_errors_by_type():
+    """A failing stage is timed and counted by exception type"""
+    metrics = MetricsRegistry()
+    with pytest.raises(ValueError):
+        with metrics.stage("validation"):
+            raise ValueError("bad")
+    
+    assert metrics.counter(ERRORS_TOTAL).value(stage="validation", type="ValueError") == 1
+    assert metrics.histogram(STAGE_SECONDS).count(stage="validation") == 1
+
+def test_parser_stages_are_timed():
+    """Extraction, JSON decoding and validation each record a latency sample"""
+    metrics = MetricsRegistry()
+    parser = ResumeParser("Anthropic", "test-key", metrics=metrics)
+    
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as f:
+        f.write("John Doe\nPython, SQL\n")
+        temp_file = f.name
+    try:
+        parser.extract_text_from_file(temp_file)
+    finally:
+        os.unlink(temp_file)
+    
+    parser._parse_llm_response('{"personal_info": {"name": "John Doe"}, "languages": ["English", null]}')
+    with pytest.raises(Exception):
+        parser._parse_llm_response('{"personal_info": ')
+    
+    stages = metrics.histogram(STAGE_SECONDS)
+    assert stages.count(stage="extract", format="txt") == 1
+    assert stages.count(stage="json_decode") == 2
+    assert stages.count(stage="validation") == 1
+    assert metrics.counter(ERRORS_TOTAL).value(stage="json_decode", type="JSONDecodeError") == 1
+
+def test_counted_cache_records_hits_and_misses():
+    """A wrapped memoiser counts a call as a miss only when the body runs"""
+    metrics = MetricsRegistry()
+    
+    @counted_cache('squares', lru_cache(maxsize=None), metrics)
+    def square(n):
+        return n * n
+    
+    assert [square(2), square(2), square(3)] == [4, 4, 9]
+    lookups = metrics.counter(CACHE_LOOKUPS_TOTAL)
+    assert lookups.value(cache='squares', result='hit') == 1
+    assert lookups.value(cache='squares', result='miss') == 2
+    assert square.__name__ == 'square'
+
+if __name__ == "__main__":
+    test_counter_and_histogram_export()
+    test_stage_records_errors_by_type()
+    test_parser_stages_are_timed()
+    test_counted_cache_records_hits_and_misses()
+    print("✅ Metrics tests passed!")
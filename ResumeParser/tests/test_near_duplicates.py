@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Test near-duplicate detection before the LLM call
+"""
+
+import os
+import tempfile
+
+from fakes import GroundTruthParser, RecordingDriver
+from ingest_pool import DONE, IngestPool
+from load_driver import load_ground_truth
+from metrics import MetricsRegistry
+from near_duplicates import NearDuplicateIndex, lsh_bands, normalize
+from neo4j_manager import Neo4jManager
+from synthetic_corpus import CorpusConfig, generate_corpus, load_manifest
+
+def edited(text: str) -> str:
+    """A re-export: different layout and case, one changed word and the first section moved last"""
+    lines = text.upper().replace("\n", "\r\n\r\n").split("\r\n\r\n")
+    lines[-1] = lines[-1] + " (updated)"
+    return "\n".join(lines[1:] + lines[:1])
+
+def test_bands_and_normalization():
+    assert normalize("Senior  Engineer,\tACME Inc.") == ["senior", "engineer", "acme", "inc"]
+    bands, rows = lsh_bands(128, 0.9)
+    assert bands * rows == 128 and 1 - (1 - 0.9 ** rows) ** bands >= 0.95
+
+def test_near_duplicates_match_and_the_index_persists():
+    with tempfile.TemporaryDirectory() as tmp:
+        generate_corpus(tmp, CorpusConfig(count=20, formats=("txt",), seed=5))
+        texts = []
+        for entry in load_manifest(tmp)["resumes"]:
+            with open(os.path.join(tmp, entry["documents"]["txt"]), encoding="utf-8") as f:
+                texts.append(f.read())
+        path = os.path.join(tmp, "dups.db")
+        index = NearDuplicateIndex(path, threshold=0.8)
+        for i, text in enumerate(texts[:10]):
+            index.add(text, f"r{i}")
+        index.close()
+
+        index = NearDuplicateIndex(path, threshold=0.8)
+        assert len(index) == 10
+        match = index.find(edited(texts[3]))
+        assert match.resume_id == "r3" and 0.8 <= match.similarity < 1.0 and match.resume_data() is None
+        assert index.find(texts[3]).similarity == 1.0
+        assert all(index.find(text) is None for text in texts[10:])
+        assert index.find("   ") is None
+        index.close()
+        try:
+            NearDuplicateIndex(path, threshold=0.8, num_perm=64)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("an index must not be reopened with different MinHash settings")
+
+def test_pool_reuses_the_earlier_parse_of_a_near_duplicate():
+    with tempfile.TemporaryDirectory() as tmp:
+        generate_corpus(tmp, CorpusConfig(count=1, formats=("txt",), seed=7))
+        entry = load_manifest(tmp)["resumes"][0]
+        with open(os.path.join(tmp, entry["documents"]["txt"]), "rb") as f:
+            original = f.read()
+        parser = GroundTruthParser(load_ground_truth(tmp), metrics=MetricsRegistry())
+        driver = RecordingDriver()
+        driver.respond("MERGE (d:Document", [{"linked": 1}])
+        manager = Neo4jManager("bolt://unused", "neo4j", "unused", driver=driver, metrics=MetricsRegistry())
+        metrics = MetricsRegistry()
+        pool = IngestPool(max_workers=1, metrics=metrics, reuse_duplicates=True,
+                          duplicates=NearDuplicateIndex(os.path.join(tmp, "dups.db")))
+        try:
+            job_id = pool.submit("cv.txt", original, parser, manager)
+            assert pool.wait([job_id], timeout=30)
+            [first] = pool.collect([job_id])
+            assert first.status == DONE and first.duplicate_of is None
+
+            copy = edited(original.decode("utf-8")).encode("utf-8")
+            job_id = pool.submit("cv (1).txt", copy, parser, manager)
+            assert pool.wait([job_id], timeout=30)
+            [second] = pool.collect([job_id])
+            assert second.status == DONE and second.in_graph
+            assert second.duplicate_of == second.resume["id"] == first.resume["id"]
+            assert second.resume["name"] == first.resume["name"] and second.llm_model == ""
+            assert sum(1 for query, _ in driver.statements if "CREATE (r:Resume" in query) == 1
+            [link] = [params for query, params in driver.statements if "MERGE (d:Document" in query]
+            assert link["resume_id"] == first.resume["id"] and link["filename"] == "cv (1).txt"
+            assert metrics.counter("resume_near_duplicates_total").total() == 1
+        finally:
+            pool.shutdown()
+
+class BrokenIndex:
+    """Near-duplicate index whose database is unavailable"""
+
+    def find(self, text):
+        raise OSError("disk I/O error")
+
+    def add(self, text, resume_id, resume_data=None):
+        raise OSError("disk I/O error")
+
+def test_index_failures_do_not_fail_the_job():
+    with tempfile.TemporaryDirectory() as tmp:
+        generate_corpus(tmp, CorpusConfig(count=1, formats=("txt",), seed=7))
+        entry = load_manifest(tmp)["resumes"][0]
+        with open(os.path.join(tmp, entry["documents"]["txt"]), "rb") as f:
+            original = f.read()
+        parser = GroundTruthParser(load_ground_truth(tmp), metrics=MetricsRegistry())
+        manager = Neo4jManager("bolt://unused", "neo4j", "unused", driver=RecordingDriver(), metrics=MetricsRegistry())
+        pool = IngestPool(max_workers=1, metrics=MetricsRegistry(), duplicates=BrokenIndex())
+        try:
+            job_id = pool.submit("cv.txt", original, parser, manager)
+            assert pool.wait([job_id], timeout=30)
+            [job] = pool.collect([job_id])
+            assert job.status == DONE and job.in_graph and job.resume["name"]
+            assert job.duplicate_error == "Failed to add to the near-duplicate index: disk I/O error"
+            assert job.row()["error"] == job.duplicate_error
+        finally:
+            pool.shutdown()
+
+if __name__ == "__main__":
+    test_bands_and_normalization()
+    test_near_duplicates_match_and_the_index_persists()
+    test_pool_reuses_the_earlier_parse_of_a_near_duplicate()
+    test_index_failures_do_not_fail_the_job()
+    print("✅ Near-duplicate tests passed!")
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Test the Cypher query registry, PROFILE sampling and the slow-query log
+"""
+
+import json
+import os
+import tempfile
+
+import pytest
+
+from fakes import RecordingDriver
+from metrics import MetricsRegistry
+from neo4j_manager import CREATE_RESUME, Neo4jManager
+from query_registry import QUERIES, QueryProfiler, define, query_name, read_log, summarize_log
+from resume_schema import ResumeData
+
+PLAN = {
+    "operatorType": "ProduceResults@neo4j", "dbHits": 0, "rows": 1,
+    "children": [{"operatorType": "NodeIndexSeek@neo4j", "dbHits": 12, "rows": 1, "children": []}],
+}
+
+def test_define_registers_unique_names():
+    """A name maps to one text; redefining it identically is allowed, differently is not"""
+    query = define("test.lookup", "MATCH (n:Test {id: $id}) RETURN n")
+    assert query == "MATCH (n:Test {id: $id}) RETURN n" and query_name(query) == "test.lookup"
+    assert QUERIES["test.lookup"] is not None
+    assert define("test.lookup", "MATCH (n:Test {id: $id}) RETURN n") == query
+    with pytest.raises(ValueError):
+        define("test.lookup", "MATCH (n:Test) RETURN n")
+    assert query_name("MATCH (n) RETURN n") == "adhoc"
+    assert CREATE_RESUME.name == "resume.create"
+
+def test_manager_queries_are_named_and_parameterized():
+    """Every statement an ingest sends is registered, so each plans once"""
+    driver = RecordingDriver()
+    manager = Neo4jManager("bolt://unused", "neo4j", "unused", driver=driver,
+                           profiler=QueryProfiler(metrics=MetricsRegistry()))
+    manager.create_resume_node(ResumeData(
+        personal_info={"name": "Ada", "email": "ada@example.com"},
+        skills=[{"name": "Python", "category": "Programming"}], languages=["English"],
+    ), "resume-1")
+    registered = set(QUERIES.values())
+    assert driver.statements and all(query in registered for query, _ in driver.statements)
+
+def test_sampled_queries_are_profiled_and_logged():
+    """Sampled queries run under PROFILE; their plan stats and slow queries reach the log"""
+    with tempfile.TemporaryDirectory() as tmp:
+        log_path = os.path.join(tmp, "queries.jsonl")
+        metrics = MetricsRegistry()
+        driver = RecordingDriver()
+        driver.plan = PLAN
+        profiler = QueryProfiler(sample_rate=1.0, slow_threshold=0.0, log_path=log_path, metrics=metrics)
+        query = define("test.profiled", "MATCH (r:Resume {id: $resume_id}) RETURN r.name AS name")
+
+        with profiler.instrument(driver).session() as session:
+            assert session.run(query, resume_id="r1").single() is None
+            tx = session.begin_transaction()
+            tx.run("CREATE INDEX test IF NOT EXISTS FOR (n:Test) ON (n.id)")
+            tx.commit()
+
+        assert driver.statements[0] == ("PROFILE " + query, {"resume_id": "r1"})
+        assert driver.statements[1][0].startswith("CREATE INDEX")
+        entries = list(read_log(log_path))
+        assert [entry["query"] for entry in entries] == ["test.profiled", "adhoc"]
+        assert entries[0]["db_hits"] == 12 and entries[0]["operators"] == ["ProduceResults", "NodeIndexSeek"]
+        # Parameter values can be personal data and are never logged
+        assert entries[0]["parameters"] == ["resume_id"] and "r1" not in json.dumps(entries)
+
+        samples = json.loads(metrics.to_json())["metrics"]["neo4j_query_db_hits_total"]["samples"]
+        assert samples == [{"labels": {"query": "test.profiled"}, "value": 12}]
+
+def test_summarize_log_ranks_queries():
+    """Entries aggregate per query name, most total time first"""
+    rows = summarize_log([
+        {"query": "a", "seconds": 0.1, "slow": True},
+        {"query": "b", "seconds": 0.3, "slow": True, "db_hits": 10, "rows": 1, "operators": ["AllNodesScan"]},
+        {"query": "a", "seconds": 0.05, "slow": False, "db_hits": 4, "rows": 2, "operators": ["NodeIndexSeek"]},
+    ])
+    assert [row["query"] for row in rows] == ["b", "a"]
+    assert rows[1]["count"] == 2 and rows[1]["slow"] == 1 and rows[1]["max_seconds"] == 0.1
+    assert rows[1]["mean_db_hits"] == 4 and rows[1]["operators"] == ["NodeIndexSeek"]
+
+if __name__ == "__main__":
+    test_define_registers_unique_names()
+    test_manager_queries_are_named_and_parameterized()
+    test_sampled_queries_are_profiled_and_logged()
+    test_summarize_log_ranks_queries()
+    print("✅ Query registry tests passed!")
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Test Cypher statement generation against the recording fake driver
+"""
+
+from fakes import RecordingDriver
+from neo4j_manager import Neo4jManager
+from resume_schema import ResumeData
+
+def build_resume() -> ResumeData:
+    return ResumeData(
+        personal_info={"name": "John Doe", "email": "john.doe@email.com"},
+        education=[{
+            "institute": "University of Technology",
+            "degree": "Bachelor's",
+            "major": ["Computer Science"],
+            "dates": {"from_date": "2020-09", "to_date": "2024-05"},
+            "courses": ["Algorithms", "Databases"],
+        }],
+        experience=[{
+            "position": "Software Engineer",
+            "company": "Tech Company Inc.",
+            "dates": {"from_date": "2022-06", "to_date": "Present"},
+            "description": "Developed web applications",
+            "skills_used": ["Python", "JavaScript"],
+        }],
+        skills=[{"name": "Python", "category": "Technical"}, {"name": "SQL", "category": "Technical"}],
+        languages=["English"],
+    )
+
+def test_create_resume_node_statements():
+    """One resume produces the expected statements without a live database"""
+    driver = RecordingDriver()
+    manager = Neo4jManager("bolt://unused", "neo4j", "unused", driver=driver)
+    manager.create_resume_node(build_resume(), "resume-1")
+    
+    queries = [query for query, _ in driver.statements]
+    params = [p for _, p in driver.statements]
+    # resume + education(1 + 1 major + 2 courses) + experience(1 + 2 skills) + 2 skills + 1 language
+    # + skill supply counters
+    assert len(queries) == 12
+    assert "CREATE (r:Resume" in queries[0]
+    assert params[0]["resume_id"] == "resume-1"
+    assert all(p.get("resume_id", "resume-1") == "resume-1" for p in params)
+    assert manager.metrics.histogram("neo4j_statements_per_resume").count() >= 1
+
+if __name__ == "__main__":
+    test_create_resume_node_statements()
+    print("✅ Recording driver test passed!")
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Test single-pass JSON validation and partial recovery of LLM responses
+"""
+
+import json
+
+import pytest
+
+from metrics import MetricsRegistry
+from resume_parser import ResumeParser
+from resume_schema import ResumeData, clean_string_list
+
+RESPONSE = {
+    "personal_info": {"name": "John Doe", "email": "john.doe@email.com"},
+    "summary": "Software engineer",
+    "experience": [
+        {
+            "position": "Software Engineer",
+            "company": "Tech Company Inc.",
+            "dates": {"from_date": "2022-06", "to_date": "Present"},
+            "description": "Developed web applications",
+            "skills_used": ["Python"],
+        },
+        {
+            "position": "Intern",
+            "dates": {"from_date": "2021-06", "to_date": "2021-09"},
+            "description": "Missing its company",
+        },
+    ],
+    "skills": [{"name": "Python", "category": "Technical"}],
+    "languages": ["English", None, "", 5],
+}
+
+def test_clean_string_list():
+    """Nulls and blanks are dropped and other values become strings"""
+    assert clean_string_list(["English", None, " ", 5]) == ["English", "5"]
+    assert clean_string_list(None) == []
+    assert clean_string_list("English") == []
+    assert ResumeData(languages=["English", None]).languages == ["English"]
+
+def test_validates_str_and_bytes():
+    """A valid response decodes from text, bytes and fenced text"""
+    valid = dict(RESPONSE, experience=RESPONSE["experience"][:1])
+    parser = ResumeParser("Anthropic", "test-key", metrics=MetricsRegistry())
+    raw = json.dumps(valid)
+    
+    for response in (raw, raw.encode(), "```json\n" + raw + "\n```"):
+        resume = parser._parse_llm_response(response)
+        assert resume.personal_info["name"] == "John Doe"
+        assert resume.languages == ["English", "5"]
+    assert parser._parse_llm_response(raw) == ResumeData(**json.loads(raw))
+
+def test_strict_mode_rejects_invalid_sections():
+    """Without recovery one bad experience fails the whole parse"""
+    parser = ResumeParser("Anthropic", "test-key", metrics=MetricsRegistry())
+    with pytest.raises(Exception, match="Failed to create ResumeData object"):
+        parser._parse_llm_response(json.dumps(RESPONSE))
+    with pytest.raises(Exception, match="Failed to parse JSON response"):
+        parser._parse_llm_response(json.dumps(RESPONSE)[:-10])
+
+def test_partial_recovery_keeps_valid_items():
+    """Recovery drops only the invalid experience entry"""
+    metrics = MetricsRegistry()
+    parser = ResumeParser("Anthropic", "test-key", metrics=metrics, partial_recovery=True)
+    resume = parser._parse_llm_response(json.dumps(RESPONSE))
+    
+    assert [exp.company for exp in resume.experience] == ["Tech Company Inc."]
+    assert resume.skills[0].name == "Python"
+    assert resume.summary == "Software engineer"
+    assert metrics.counter("resume_recovery_dropped_total").value(section="experience") == 1
+
+def test_partial_recovery_repairs_truncated_and_trailing_commas():
+    """Truncated output keeps every section that finished before the cut"""
+    parser = ResumeParser("Anthropic", "test-key", metrics=MetricsRegistry(), partial_recovery=True)
+    raw = json.dumps(RESPONSE)
+    truncated = raw[:raw.index('"skills"') + 20]
+    resume = parser._parse_llm_response(truncated)
+    assert resume.personal_info["email"] == "john.doe@email.com"
+    assert len(resume.experience) == 1
+    assert resume.languages == []
+    
+    trailing = '{"summary": "Engineer", "languages": ["English",], }'
+    assert parser._parse_llm_response(trailing).languages == ["English"]
+    assert ResumeParser._close_truncated_json('{"a": [1, 2, {"b": "x, y') == '{"a": [1, 2, {}]}'
+
+def test_partial_recovery_leaves_strings_alone():
+    """Commas inside strings survive the repair, and unrepairable JSON fails like strict mode"""
+    parser = ResumeParser("Anthropic", "test-key", metrics=MetricsRegistry(), partial_recovery=True)
+    resume = parser._parse_llm_response('{"summary": "Lists like [a, ] and {b, }", "languages": ["English",],')
+    assert resume.summary == "Lists like [a, ] and {b, }"
+    assert resume.languages == ["English"]
+    assert ResumeParser._strip_trailing_commas('{"a": "x\\", ]", "b": [1, ],}') == '{"a": "x\\", ]", "b": [1 ]}'
+    with pytest.raises(Exception, match="Failed to parse JSON response"):
+        parser._parse_llm_response('{"summary": nope}')
+
+if __name__ == "__main__":
+    test_clean_string_list()
+    test_validates_str_and_bytes()
+    test_strict_mode_rejects_invalid_sections()
+    test_partial_recovery_keeps_valid_items()
+    test_partial_recovery_repairs_truncated_and_trailing_commas()
+    test_partial_recovery_leaves_strings_alone()
+    print("✅ Decoding tests passed!")
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Test diff-based re-ingest of an updated resume
+"""
+
+from candidate_profiles import ProfileCache, build_profile
+from fakes import RecordingDriver
+from invalidation import RESUMES, IngestGenerations
+from metrics import MetricsRegistry
+from neo4j_manager import Neo4jManager
+from resume_diff import STORED_RESUME_QUERY, diff_resume
+from resume_schema import ResumeData
+from skill_canonicalizer import SkillCanonicalizer
+from skill_demand import SUPPLY_UPDATE
+
+def build_resume(**changes) -> ResumeData:
+    data = {
+        "personal_info": {"name": "Jane Smith", "email": "jane@example.com"},
+        "education": [{"institute": "MIT", "degree": "BSc", "dates": {"from_date": "2012", "to_date": "2016"}}],
+        "experience": [
+            {"position": "Engineer", "company": "Acme", "dates": {"from_date": "2016-06", "to_date": "2019-01"},
+             "description": "Built APIs", "skills_used": ["Python"]},
+            {"position": "Lead", "company": "Globex", "dates": {"from_date": "2019-02", "to_date": "Present"},
+             "description": "Led a team", "skills_used": ["Go"]},
+        ],
+        "skills": [{"name": "Python", "category": "Technical"}, {"name": "Go", "category": "Technical"}],
+        "projects": [{"name": "Indexer", "description": "Search", "technologies": ["Rust"]}],
+        "languages": ["English"],
+    }
+    data.update(changes)
+    return ResumeData(**data)
+
+def stored_record(resume: ResumeData, canonicalizer, resume_id: str = "r1") -> dict:
+    """What STORED_RESUME_QUERY returns for a resume ingested by create_resume_node"""
+    return {
+        "resume": {"name": resume.personal_info["name"], "email": resume.personal_info["email"],
+                   "phone": None, "summary": "", "profile": build_profile(resume_id, resume, canonicalizer).to_json(),
+                   "ingested_at": "2024-03-05T10:00:00Z"},
+        "education": [{"ref": f"edu-{i}", "institute": e.institute, "degree": e.degree, "from_date": e.dates.from_date,
+                       "to_date": e.dates.to_date, "gpa": e.gpa, "majors": e.major, "courses": e.courses}
+                      for i, e in enumerate(resume.education)],
+        "experience": [{"ref": f"exp-{i}", "company": e.company, "position": e.position,
+                        "from_date": e.dates.from_date, "to_date": e.dates.to_date,
+                        "description": e.description, "location": e.location,
+                        "skills_used": sorted({canonicalizer.canonical_name(n) for n in e.skills_used})}
+                       for i, e in enumerate(resume.experience)],
+        "projects": [{"ref": f"proj-{i}", "name": p.name, "description": p.description, "url": p.url,
+                      "technologies": p.technologies} for i, p in enumerate(resume.projects)],
+        "skills": [canonicalizer.canonical_name(s.name) for s in resume.skills],
+        "certifications": [c.name for c in resume.certifications],
+        "languages": list(resume.languages),
+    }
+
+def test_diff_detects_section_changes():
+    """Added, removed and changed entries are found per section; respellings are not changes"""
+    canonicalizer = SkillCanonicalizer()
+    stored = stored_record(build_resume(), canonicalizer)
+    assert diff_resume(stored, build_resume(), canonicalizer.canonical_name).changes() == 0
+    
+    updated = build_resume(
+        experience=[
+            {"position": "Engineer", "company": "Acme", "dates": {"from_date": "2016-06", "to_date": "2019-01"},
+             "description": "Built APIs", "skills_used": ["Python"]},
+            {"position": "Lead", "company": "Globex", "dates": {"from_date": "2019-02", "to_date": "2024-01"},
+             "description": "Led a team", "skills_used": ["Go"]},
+            {"position": "CTO", "company": "Initech", "dates": {"from_date": "2024-02", "to_date": "Present"},
+             "description": "Everything", "skills_used": ["Rust"]},
+        ],
+        skills=[{"name": "python", "category": "Technical"}, {"name": "Rust", "category": "Technical"}],
+        languages=["English", "French"],
+    )
+    diff = diff_resume(stored, updated, canonicalizer.canonical_name)
+    summary = diff.summary()
+    assert summary["experience"] == {"added": ["CTO at Initech"], "removed": [], "changed": ["Lead at Globex"]}
+    assert summary["skills"] == {"added": ["Rust"], "removed": ["Go"], "changed": []}
+    assert summary["languages"]["added"] == ["French"]
+    assert summary["education"] == {"added": [], "removed": [], "changed": []}
+    assert summary["resume"] == []
+    assert diff.changes() == 5
+
+def test_upsert_writes_only_changes():
+    """A small edit costs a few statements in one transaction and adjusts skill supply"""
+    canonicalizer = SkillCanonicalizer()
+    original = build_resume()
+    driver = RecordingDriver()
+    driver.respond("CALL {", [stored_record(original, canonicalizer)])
+    generations = IngestGenerations()
+    manager = Neo4jManager("bolt://unused", "neo4j", "unused", driver=driver, metrics=MetricsRegistry(),
+                           canonicalizer=canonicalizer, generations=generations, profile_cache=ProfileCache())
+    
+    updated = build_resume(skills=[{"name": "Python", "category": "Technical"},
+                                   {"name": "Rust", "category": "Technical"}])
+    summary = manager.upsert_resume("r1", updated)
+    
+    assert summary["created"] is False
+    assert summary["skills"] == {"added": ["Rust"], "removed": ["Go"], "changed": []}
+    queries = [query for query, _ in driver.statements]
+    assert not any("CREATE (r:Resume" in query for query in queries)
+    assert any(query == STORED_RESUME_QUERY for query in queries)
+    # profile, unlink Go, link Rust, supply +1, supply -1
+    assert summary["statements"] == 5
+    supply = [params for query, params in driver.statements if query == SUPPLY_UPDATE]
+    assert [(p["skills"], p["delta"], p["buckets"]) for p in supply] == [
+        (["Rust"], 1, ["all", "2024-03"]), (["Go"], -1, ["all", "2024-03"])]
+    assert generations.current(RESUMES) == (1,)
+    # Go is still used in a role, so only its listing went away
+    assert set(manager.get_candidate_profile("r1").skills) == {"Python", "Go", "Rust"}
+
+def test_upsert_detects_skills_used_edits():
+    """Adding a skill to one role is a change: it is linked, and tenure, profile and caches are refreshed"""
+    canonicalizer = SkillCanonicalizer()
+    original = build_resume()
+    driver = RecordingDriver()
+    driver.respond("CALL {", [stored_record(original, canonicalizer)])
+    generations = IngestGenerations()
+    cache = ProfileCache()
+    manager = Neo4jManager("bolt://unused", "neo4j", "unused", driver=driver, metrics=MetricsRegistry(),
+                           canonicalizer=canonicalizer, generations=generations, profile_cache=cache)
+    
+    experience = [e.model_dump() for e in original.experience]
+    experience[0]["skills_used"].append("golang")
+    summary = manager.upsert_resume("r1", build_resume(experience=experience))
+    
+    assert summary["experience"] == {"added": [], "removed": [], "changed": ["Engineer at Acme"]}
+    params = {query.name: p for query, p in driver.statements if hasattr(query, "name")}
+    assert params["resume.update_has_experience"]["changes"][0]["properties"]["skills_used"] == ["Go", "Python"]
+    assert params["resume.link_experience_skill"] == {"skill_name": "Go", "aliases": ["golang"],
+                                                      "company_name": "Acme", "position_name": "Engineer"}
+    tenure = {t["skill"]: t["months"] for t in params["resume.set_skill_tenure"]["tenure"]}
+    assert tenure["Go"] > build_profile("r1", original, canonicalizer).tenure_months["Go"]
+    assert "resume.update_properties" in params
+    assert generations.current(RESUMES) == (1,)
+    assert cache.get("r1", driver).tenure_months["Go"] == tenure["Go"]
+
+def test_upsert_releases_shared_link_counts():
+    """Dropped roles, degrees and role skills come off the shared counts in the upsert's transaction"""
+    canonicalizer = SkillCanonicalizer()
+    original = build_resume(education=[{"institute": "MIT", "degree": "BSc", "major": ["Physics"],
+                                        "courses": ["Optics"], "dates": {"from_date": "2012", "to_date": "2016"}}])
+    driver = RecordingDriver()
+    driver.respond("CALL {", [stored_record(original, canonicalizer)])
+    manager = Neo4jManager("bolt://unused", "neo4j", "unused", driver=driver, metrics=MetricsRegistry(),
+                           canonicalizer=canonicalizer, generations=IngestGenerations(), profile_cache=ProfileCache())
+    
+    experience = [e.model_dump() for e in original.experience]
+    experience[0]["skills_used"] = ["Rust"]
+    manager.upsert_resume("r1", build_resume(education=[], experience=experience[:1]))
+    
+    released = {query.name: params["links"] for query, params in driver.statements
+                if getattr(query, "name", "").startswith("resume.release_")}
+    assert released == {
+        "resume.release_offers": [{"source": "MIT", "target": "BSc", "count": 1}],
+        "resume.release_has_major": [{"source": "MIT", "target": "Physics", "count": 1}],
+        "resume.release_offers_course": [{"source": "MIT", "target": "Optics", "count": 1}],
+        "resume.release_has_position": [{"source": "Globex", "target": "Lead", "count": 1}],
+        "resume.release_requires_skill": [{"source": "Lead", "target": "Go", "count": 1},
+                                          {"source": "Engineer", "target": "Python", "count": 1}],
+        "resume.release_uses_skill": [{"source": "Globex", "target": "Go", "count": 1},
+                                      {"source": "Acme", "target": "Python", "count": 1}],
+    }
+    names = [getattr(query, "name", "") for query, _ in driver.statements]
+    # Counts come off before the resume's own relationships go
+    assert names.index("resume.release_has_position") < names.index("resume.delete_has_experience")
+    assert all("DELETE e" in query and "e.count <= 0" in query
+               for query, _ in driver.statements if getattr(query, "name", "").startswith("resume.release_"))
+
+def test_upsert_creates_missing_resume():
+    """Upserting an unknown id falls back to a full create"""
+    driver = RecordingDriver()
+    manager = Neo4jManager("bolt://unused", "neo4j", "unused", driver=driver, metrics=MetricsRegistry(),
+                           generations=IngestGenerations(), profile_cache=ProfileCache())
+    summary = manager.upsert_resume("r2", build_resume())
+    assert summary["created"] is True
+    assert summary["experience"]["added"] == ["Engineer at Acme", "Lead at Globex"]
+    assert sum(1 for query, _ in driver.statements if "CREATE (r:Resume" in query) == 1
+
+if __name__ == "__main__":
+    test_diff_detects_section_changes()
+    test_upsert_writes_only_changes()
+    test_upsert_detects_skills_used_edits()
+    test_upsert_releases_shared_link_counts()
+    test_upsert_creates_missing_resume()
+    print("✅ Resume diff tests passed!")
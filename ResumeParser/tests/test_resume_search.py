@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Test full-text candidate search
+"""
+
+from fakes import RecordingDriver
+from neo4j_manager import Neo4jManager
+from resume_search import SearchFilters, highlight, lucene_query, query_terms
+
+def ranked_rows(params):
+    """Search results as the graph would page them: 5 matches in score order"""
+    rows = [{"resume_id": f"r{i}", "name": f"Person {i}", "score": 5.0 - i,
+             "hits": [{"field": "experience", "text": f"Led a Kubernetes migration at fintech {i}"}]}
+            for i in range(5)]
+    return rows[params["skip"]:params["skip"] + params["limit"]]
+
+def test_keywords_become_an_escaped_lucene_query():
+    """Plain searches match any keyword and cannot inject Lucene syntax"""
+    assert query_terms("Kubernetes AND migration, fintech.") == ["kubernetes", "migration", "fintech"]
+    assert lucene_query('c++ "node.js" (fintech)') == r"c\+\+ node.js fintech"
+    assert lucene_query("  AND OR ") == ""
+
+def test_highlights_mark_terms_in_whole_word_snippets():
+    text = "Led the Kubernetes migration for a fintech startup. Later, more kubernetes work."
+    snippets = highlight(text, query_terms("kubernetes fintech"), width=15)
+    assert snippets == ["Led the **Kubernetes** migration for a…", "…migration for a **fintech** startup. Later,…"]
+    assert highlight("", ["x"]) == [] and highlight("no match here", ["kubernetes"]) == []
+
+def test_search_pages_ranked_results_with_filters():
+    """The manager creates the indexes and pages through one parameterized search query"""
+    driver = RecordingDriver()
+    driver.respond("db.index.fulltext", ranked_rows)
+    manager = Neo4jManager("bolt://unused", "neo4j", "unused", driver=driver)
+    manager.ensure_indexes()
+    assert sum(1 for query, _ in driver.statements if query.startswith("CREATE FULLTEXT INDEX")) == 3
+    assert any("REQUIRE r.id IS UNIQUE" in query for query, _ in driver.statements)
+    assert any("ON (r.ingested_at)" in query for query, _ in driver.statements)
+    driver.reset()
+
+    first = manager.search_resumes("kubernetes migration fintech",
+                                   SearchFilters(skills=["k8s", "python"], company="Acme"), page=1, page_size=2)
+    assert [result["resume_id"] for result in first["results"]] == ["r0", "r1"] and first["has_more"]
+    assert first["results"][0]["highlights"] == [
+        {"field": "experience", "snippet": "Led a **Kubernetes** **migration** at **fintech** 0"}]
+    query, params = driver.statements[0]
+    assert params["search"] == "kubernetes migration fintech"
+    assert params["skills"] == ["Kubernetes", "Python"] and params["company"] == "Acme"
+    assert params["institute"] is None and params["skip"] == 0 and params["limit"] == 3
+
+    last = manager.search_resumes("kubernetes", page=3, page_size=2)
+    assert [result["resume_id"] for result in last["results"]] == ["r4"] and not last["has_more"]
+    # Every page and filter combination reuses one query text, and so one cached plan
+    assert len({query for query, _ in driver.statements}) == 1
+
+    assert manager.search_resumes("  ")["results"] == []
+    assert len(driver.statements) == 2
+
+if __name__ == "__main__":
+    test_keywords_become_an_escaped_lucene_query()
+    test_highlights_mark_terms_in_whole_word_snippets()
+    test_search_pages_ranked_results_with_filters()
+    print("✅ Resume search tests passed!")
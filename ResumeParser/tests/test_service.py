@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Test the headless ASGI service against the Fake provider and the recording driver
+"""
+
+import asyncio
+import json
+
+import httpx
+
+from fakes import GroundTruthParser, RecordingDriver
+from metrics import MetricsRegistry
+from neo4j_manager import Neo4jManager
+from resume_schema import ResumeData
+from service import ResumeService
+
+RESUME_TEXT = b"Jane Smith\njane.smith@example.com\nBackend engineer, Python and SQL\n"
+GROUND_TRUTH = {"jane.smith@example.com": ResumeData(
+    personal_info={"name": "Jane Smith", "email": "jane.smith@example.com"},
+    skills=[{"name": "Python", "category": "Technical"}, {"name": "SQL", "category": "Technical"}],
+).model_dump_json()}
+
+def build_service(latency=0.0, **kwargs):
+    metrics = MetricsRegistry()
+    driver = RecordingDriver()
+    parser = GroundTruthParser(GROUND_TRUTH, latency=latency, metrics=metrics)
+    manager = Neo4jManager("bolt://unused", "neo4j", "unused", driver=driver, metrics=metrics)
+    return ResumeService(parser, manager, metrics=metrics, **kwargs), driver
+
+async def call(service, *requests):
+    """Send (method, path, body) requests concurrently and return the responses"""
+    transport = httpx.ASGITransport(app=service)
+    async with httpx.AsyncClient(transport=transport, base_url="http://service") as client:
+        return await asyncio.gather(*(client.request(method, path, content=body) for method, path, body in requests))
+
+def test_parse_ingest_and_summary():
+    """A document is parsed, written to the graph and summarized"""
+    service, driver = build_service()
+    parsed, = asyncio.run(call(service, ("POST", "/parse?filename=jane.txt", RESUME_TEXT)))
+    assert parsed.status_code == 200
+    assert parsed.json()["personal_info"]["name"] == "Jane Smith"
+    assert not driver.statements
+    
+    ingested, = asyncio.run(call(service, ("POST", "/resumes", RESUME_TEXT)))
+    assert ingested.status_code == 201
+    resume_id = ingested.json()["id"]
+    assert any("CREATE (r:Resume" in query and params.get("resume_id") == resume_id
+               for query, params in driver.statements)
+    
+    driver.respond("collect(DISTINCT i.name)", lambda params: [{
+        "r": {"id": params["resume_id"], "name": "Jane Smith"},
+        "institutes": [], "companies": [], "skills": ["Python", "SQL"],
+    }] if params["resume_id"] == resume_id else [])
+    summary, missing = asyncio.run(call(service, ("GET", f"/resumes/{resume_id}", None),
+                                        ("GET", "/resumes/unknown", None)))
+    assert summary.status_code == 200
+    assert summary.json()["skills"] == ["Python", "SQL"]
+    assert missing.status_code == 404
+    
+    updated, = asyncio.run(call(service, ("PUT", f"/resumes/{resume_id}", RESUME_TEXT)))
+    assert updated.status_code == 200
+    assert updated.json()["changes"]["created"] is True
+
+def test_errors_health_and_metrics():
+    """Bad input maps to 4xx/5xx codes and health and metrics endpoints respond"""
+    service, _ = build_service()
+    unsupported, unparseable, empty, health, ready, unknown, wrong_method = asyncio.run(call(
+        service,
+        ("POST", "/parse?filename=resume.xls", RESUME_TEXT),
+        ("POST", "/parse", b"No email in this document"),
+        ("POST", "/parse", b""),
+        ("GET", "/healthz", None),
+        ("GET", "/readyz", None),
+        ("GET", "/nowhere", None),
+        ("GET", "/parse", None),
+    ))
+    assert unsupported.status_code == 415
+    assert unparseable.status_code == 502
+    assert empty.status_code == 400
+    assert health.json() == {"status": "ok"}
+    assert ready.status_code == 200
+    assert unknown.status_code == 404
+    assert wrong_method.status_code == 405
+    
+    prometheus, as_json = asyncio.run(call(service, ("GET", "/metrics", None), ("GET", "/metrics?format=json", None)))
+    assert 'resume_http_request_seconds_count{route="/parse",status="415"} 1' in prometheus.text
+    assert "resume_http_request_seconds" in json.loads(as_json.text)["metrics"]
+
+def test_timeout_and_bounded_concurrency():
+    """Slow requests time out with 504 and requests beyond the bound are shed with 503"""
+    service, _ = build_service(latency=0.3, request_timeout=0.1)
+    timed_out, = asyncio.run(call(service, ("POST", "/parse", RESUME_TEXT)))
+    assert timed_out.status_code == 504
+    
+    service, _ = build_service(latency=0.3, max_concurrency=1, queue_timeout=0.05)
+    responses = asyncio.run(call(service, ("POST", "/parse", RESUME_TEXT), ("POST", "/parse", RESUME_TEXT)))
+    assert sorted(response.status_code for response in responses) == [200, 503]
+
+if __name__ == "__main__":
+    test_parse_ingest_and_summary()
+    test_errors_health_and_metrics()
+    test_timeout_and_bounded_concurrency()
+    print("✅ Service tests passed!")
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Test the bounded store of a UI session's parsed resumes
+"""
+
+import os
+import tempfile
+
+from session_store import ResumeSessionStore, SpillCache
+
+def record(i: int) -> dict:
+    return {"id": f"r{i}", "name": f"Person {i}", "parsed_at": f"2024-01-01T00:00:{i:02d}",
+            "skills": [{"name": "Python", "category": "Technical"}], "summary": "x" * 100}
+
+def test_store_keeps_recent_records_and_spills_the_rest():
+    with tempfile.TemporaryDirectory() as tmp:
+        spill = SpillCache(os.path.join(tmp, "spill.db"))
+        store = ResumeSessionStore(spill, capacity=3, max_entries=50)
+        for i in range(10):
+            store.add(record(i))
+        assert len(store) == 10 and store.in_memory() == 3
+
+        # Pages list summaries newest first without loading records
+        assert [s["id"] for s in store.page(1, page_size=4)] == ["r9", "r8", "r7", "r6"]
+        assert [s["id"] for s in store.page(3, page_size=4)] == ["r1", "r0"]
+        assert store.pages(page_size=4) == 3 and store.page(4, page_size=4) == []
+
+        # An evicted record comes back from the spill cache and becomes recent again
+        assert store.get("r0") == record(0)
+        assert store.in_memory() == 3 and store.get("r9") == record(9)
+        assert store.get("unknown") is None
+        spill.close()
+
+def test_summaries_are_bounded_and_expired_spills_are_reported():
+    with tempfile.TemporaryDirectory() as tmp:
+        spill = SpillCache(os.path.join(tmp, "spill.db"), retain_seconds=-1)
+        store = ResumeSessionStore(spill, capacity=1, max_entries=5)
+        for i in range(8):
+            store.add(record(i))
+        assert len(store) == 5 and store.get("r0") is None
+        assert spill.prune() == 7
+        assert store.get("r3") is None and store.get("r7") == record(7)
+        spill.close()
+
+if __name__ == "__main__":
+    test_store_keeps_recent_records_and_spills_the_rest()
+    test_summaries_are_bounded_and_expired_spills_are_reported()
+    print("✅ Session store tests passed!")
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Test skill canonicalization and the duplicate Skill merge job
+"""
+
+import threading
+
+from fakes import RecordingDriver
+from neo4j_manager import Neo4jManager
+from resume_schema import ResumeData
+from skill_canonicalizer import SkillCanonicalizer, fold
+
+def test_fold_and_alias_lookup():
+    """Case, punctuation and qualifiers fold away; aliases resolve to one name"""
+    canonicalizer = SkillCanonicalizer()
+    assert fold("JavaScript (ES6)") == fold("javascript") == "javascript"
+    assert fold("C++") != fold("C#") != fold("C")
+    
+    for name in ["JS", "Javascript", "JavaScript (ES6)", "javascript"]:
+        assert canonicalizer.canonical_name(name) == "JavaScript"
+    assert canonicalizer.canonicalize("k8s").matched_by == "alias"
+    assert canonicalizer.canonicalize("Javscript").matched_by == "fuzzy"
+    
+    # Unknown skills get one spelling whichever variant arrives first
+    assert canonicalizer.canonicalize("ELIXIR").matched_by == "new"
+    assert canonicalizer.canonical_name("Elixir") == "Elixir"
+    first, second = SkillCanonicalizer(), SkillCanonicalizer()
+    assert first.canonical_name("reactive programming") == first.canonical_name("Reactive Programming")
+    assert second.canonical_name("Reactive Programming") == first.canonical_name("reactive programming")
+    # Short names are never fuzzy-matched onto a different skill
+    assert canonicalizer.canonical_name("Go") == "Go"
+    assert canonicalizer.canonical_name("C") == "C"
+
+def test_fuzzy_matching_keeps_distinct_skills_apart():
+    """Names built on a known skill, or short look-alikes, are new skills, not typos"""
+    canonicalizer = SkillCanonicalizer()
+    canonicalizer.add_skills(["Scala"])
+    for name, other in [("Preact", "React"), ("Trust", "Rust"), ("Scalar", "Scala"), ("Reactor", "React")]:
+        assert canonicalizer.canonical_name(other) == other
+        skill = canonicalizer.canonicalize(name)
+        assert skill.name == name and skill.matched_by == "new", name
+    assert canonicalizer.canonical_name("Kuberntes") == "Kubernetes"
+    # Categories and ambiguous abbreviations are not aliases of one skill
+    for name in ["CV", "Shell", "Version Control", "TF", "PM"]:
+        assert canonicalizer.canonicalize(name).matched_by == "new", name
+
+def test_stored_skill_names_seed_every_process():
+    """Names already in the graph keep their spelling; typos of known skills still resolve to them"""
+    driver = RecordingDriver()
+    driver.respond("MATCH (s:Skill)", [{"name": "pandas", "degree": 9}, {"name": "Pandas", "degree": 2},
+                                       {"name": "Javscript", "degree": 1}])
+    manager = Neo4jManager("bolt://unused", "neo4j", "unused", driver=driver, canonicalizer=SkillCanonicalizer())
+    manager.ensure_indexes()
+    assert manager.canonicalizer.canonical_name("PANDAS") == "pandas"
+    assert manager.canonicalizer.canonical_name("Javscript") == "JavaScript"
+    assert manager.plan_skill_merges() == [{"duplicate": "Pandas", "canonical": "pandas"},
+                                           {"duplicate": "Javscript", "canonical": "JavaScript"}]
+
+def test_concurrent_canonicalize():
+    """Worker threads adding unknown skills never break each other's fuzzy lookups"""
+    canonicalizer = SkillCanonicalizer()
+    errors = []
+    
+    def work(worker):
+        try:
+            for i in range(300):
+                canonicalizer.canonicalize(f"Framework{worker}x{i}")
+                canonicalizer.canonicalize(f"Javscript{i}")
+        except Exception as e:
+            errors.append(e)
+    
+    threads = [threading.Thread(target=work, args=(worker,)) for worker in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+
+def test_ingest_writes_canonical_skills_with_aliases():
+    """Spelling variants in one resume share a Skill node and become SkillAliases"""
+    driver = RecordingDriver()
+    manager = Neo4jManager("bolt://unused", "neo4j", "unused", driver=driver, canonicalizer=SkillCanonicalizer())
+    resume = ResumeData(
+        personal_info={"name": "Jane Roe"},
+        experience=[{
+            "position": "Engineer",
+            "company": "Acme",
+            "dates": {"from_date": "2021-01", "to_date": "Present"},
+            "description": "Built services",
+            "skills_used": ["JS", "JavaScript", "postgres"],
+        }],
+        skills=[{"name": "Javascript", "category": "Technical"}, {"name": "JS", "category": "Technical"}, {"name": "K8s", "category": "Tools"}],
+    )
+    manager.create_resume_node(resume, "resume-1")
+    
+    skill_params = [p for q, p in driver.statements if "MERGE (s:Skill" in q]
+    assert [p["skill_name"] for p in skill_params] == ["JavaScript", "PostgreSQL", "JavaScript", "Kubernetes"]
+    assert skill_params[0]["aliases"] == ["JS"]
+    assert skill_params[2]["aliases"] == ["Javascript", "JS"]
+    assert skill_params[2]["category"] == "Technical"
+    assert all("SkillAlias" in q for q, _ in driver.statements if "MERGE (s:Skill" in q)
+
+def test_merge_duplicate_skills():
+    """Non-canonical Skill nodes are planned, batched and moved onto the canonical node"""
+    driver = RecordingDriver()
+    driver.respond("RETURN s.name AS name", [
+        {"name": "Python", "degree": 9},
+        {"name": "python", "degree": 3},
+        {"name": "JS", "degree": 2},
+        {"name": "Rust", "degree": 1},
+    ])
+    driver.respond("RETURN count(old) AS moved", lambda params: [{"moved": len(params["merges"])}])
+    driver.respond("RETURN name, remaining", lambda params: [
+        {"name": m["duplicate"], "remaining": 0} for m in params["merges"]
+    ])
+    manager = Neo4jManager("bolt://unused", "neo4j", "unused", driver=driver, canonicalizer=SkillCanonicalizer())
+    
+    planned = manager.merge_duplicate_skills(dry_run=True)["planned"]
+    assert planned == [{"duplicate": "python", "canonical": "Python"}, {"duplicate": "JS", "canonical": "JavaScript"}]
+    assert len(driver.statements) == 1
+    
+    driver.reset()
+    summary = manager.merge_duplicate_skills(batch_size=1)
+    assert summary["merged"] == 2
+    # One moved relationship per type per batch
+    assert summary["relationships_moved"] == 2 * 4
+    assert summary["skipped"] == []
+    assert sum("DELETE old" in q for q, _ in driver.statements) == 2 * 4
+
+if __name__ == "__main__":
+    test_fold_and_alias_lookup()
+    test_fuzzy_matching_keeps_distinct_skills_apart()
+    test_stored_skill_names_seed_every_process()
+    test_concurrent_canonicalize()
+    test_ingest_writes_canonical_skills_with_aliases()
+    test_merge_duplicate_skills()
+    print("✅ Skill canonicalizer tests passed!")
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Test the materialized skill supply and demand counters
+"""
+
+from datetime import datetime
+
+import pytest
+
+import skill_demand
+from fakes import RecordingDriver
+from invalidation import JOBS, IngestGenerations
+from neo4j_manager import SAVE_JOBS, Neo4jManager
+from resume_schema import ResumeData
+from skill_canonicalizer import SkillCanonicalizer
+
+def build_resume() -> ResumeData:
+    return ResumeData(
+        personal_info={"name": "John Doe"},
+        skills=[{"name": "Python", "category": "Technical"}, {"name": "SQL", "category": "Technical"}],
+        languages=["English"],
+    )
+
+def test_ingest_counts_supply_in_its_transaction():
+    """Listed skills are counted once, canonically, in the ingest transaction"""
+    driver = RecordingDriver()
+    manager = Neo4jManager("bolt://unused", "neo4j", "unused", driver=driver, canonicalizer=SkillCanonicalizer())
+    resume = build_resume()
+    resume.skills.append(resume.skills[0].model_copy(update={"name": "python3"}))
+    manager.create_resume_node(resume, "resume-1")
+
+    updates = [params for query, params in driver.statements if query == skill_demand.SUPPLY_UPDATE]
+    assert len(updates) == 1
+    assert updates[0]["skills"] == ["Python", "SQL"]
+    assert updates[0]["buckets"] == ["all", skill_demand.month_bucket()]
+    assert updates[0]["delta"] == 1
+
+def test_failed_ingest_rolls_back_counters():
+    """Nothing, counters included, is written when a statement fails"""
+    driver = RecordingDriver()
+    def fail(params):
+        raise RuntimeError("connection lost")
+    driver.respond("SPEAKS_LANGUAGE", fail)
+    manager = Neo4jManager("bolt://unused", "neo4j", "unused", driver=driver)
+    with pytest.raises(RuntimeError):
+        manager.create_resume_node(build_resume(), "resume-1")
+    assert driver.statements == []
+
+def test_demand_and_reads():
+    driver = RecordingDriver()
+    with driver.session() as session:
+        skill_demand.record_demand(session, ["Python", "Go", "Python"], when=datetime(2025, 3, 9))
+        skill_demand.record_demand(session, [])
+    assert driver.statements == [(skill_demand.DEMAND_UPDATE,
+                                  {"skills": ["Go", "Python"], "buckets": ["all", "2025-03"], "delta": 1})]
+
+    driver.respond("SkillDemandState", [{"rebuilt_at": "2025-03-01T00:00:00Z"}])
+    driver.respond("MATCH (d:SkillDemand {bucket: $bucket})",
+                   [{"skill": "Python", "demand": 40, "supply": 12}, {"skill": "Go", "demand": 9, "supply": 3}])
+    assert skill_demand.top_skills(driver, 2, bucket="2025-03")[0] == {"skill": "Python", "demand": 40, "supply": 12}
+    assert driver.statements[-1][1] == {"bucket": "2025-03", "limit": 2, "include_supply_only": False}
+
+def test_reads_aggregate_the_graph_until_counters_are_rebuilt():
+    """Counters only hold what was ingested after they were added, so they are not read before rebuild()"""
+    driver = RecordingDriver()
+    driver.respond("MATCH (d:SkillDemand {bucket: $bucket})", [{"skill": "Go", "demand": 1, "supply": 0}])
+    driver.respond("MATCH (j:Job)-[:REQUIRES_SKILL]->(s:Skill)", [{"skill": "Go", "demand": 3, "supply": 1}])
+    assert skill_demand.top_skills(driver, 5) == [{"skill": "Go", "demand": 3, "supply": 1}]
+    assert [query for query, _ in driver.statements] == [skill_demand.COUNTERS_STATE_QUERY,
+                                                         skill_demand.LIVE_TOP_SKILLS_QUERY]
+
+def test_saving_jobs_counts_new_demand_in_its_transaction():
+    """Each job-skill link is counted once, when it is first written"""
+    driver = RecordingDriver()
+    driver.respond("MATCH (j:Job) WHERE j.id IN $ids", [{"id": "j1", "skills": ["Python"]}])
+    generations = IngestGenerations()
+    manager = Neo4jManager("bolt://unused", "neo4j", "unused", driver=driver, canonicalizer=SkillCanonicalizer(),
+                           generations=generations)
+    jobs = [{"id": "j1", "title": "Backend", "skills": ["python3", "Go"], "salary": {"min": 1}},
+            {"url": "https://jobs.example/2", "title": "Data", "skills": ["Python"]},
+            {"title": "No id", "skills": ["Rust"]}]
+    assert manager.save_jobs(jobs) == 2
+
+    [saved] = [params["jobs"] for query, params in driver.statements if query == SAVE_JOBS]
+    assert saved[0] == {"id": "j1", "skills": ["Go", "Python"], "properties": {"id": "j1", "title": "Backend"}}
+    demand = [params for query, params in driver.statements if query == skill_demand.DEMAND_UPDATE]
+    assert [(p["skills"], p["delta"]) for p in demand] == [(["Go", "Python"], 1)]
+    assert generations.current(JOBS) == (1,)
+
+def test_rebuild():
+    """Backfill creates the indexes, then clears and recomputes both counters"""
+    driver = RecordingDriver()
+    skill_demand.rebuild(driver, batch_size=50)
+    queries = [query for query, _ in driver.statements]
+    assert queries[:2] == list(skill_demand.INDEX_STATEMENTS)
+    assert queries[2:] == ([skill_demand.CLEAR_COUNTERS_STATE] + list(skill_demand.REBUILD_STATEMENTS)
+                           + [skill_demand.MARK_COUNTERS_REBUILT])
+    assert all(params == {"batch_size": 50, "all_bucket": "all"} for _, params in driver.statements[3:-1])
+
+if __name__ == "__main__":
+    test_ingest_counts_supply_in_its_transaction()
+    test_failed_ingest_rolls_back_counters()
+    test_demand_and_reads()
+    test_reads_aggregate_the_graph_until_counters_are_rebuilt()
+    test_saving_jobs_counts_new_demand_in_its_transaction()
+    test_rebuild()
+    print("✅ Skill demand tests passed!")
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Test the in-process job skill index against brute-force ranking
+"""
+
+import random
+
+import numpy as np
+
+from fakes import RecordingDriver
+from metrics import MetricsRegistry
+from skill_canonicalizer import SkillCanonicalizer
+from skill_index import SkillIndex, decode_postings, encode_postings
+from synthetic_corpus import generate_jobs
+
+def build(jobs, **kwargs) -> SkillIndex:
+    return SkillIndex.from_jobs(((job['id'], job['skills'], job) for job in jobs),
+                                canonicalizer=SkillCanonicalizer(), metrics=MetricsRegistry(), **kwargs)
+
+def brute_force(index, jobs, skills, k):
+    wanted = {index.canonicalizer.canonical_name(s) for s in skills}
+    scored = [(-len(wanted & {index.canonicalizer.canonical_name(s) for s in job['skills']}), doc)
+              for doc, job in enumerate(jobs)]
+    return [(doc, -score) for score, doc in sorted(scored) if score][:k]
+
+def test_postings_round_trip():
+    """Delta encoding picks the narrowest dtype and decodes losslessly"""
+    docs = [0, 3, 200, 70000]
+    deltas = encode_postings(np.array(docs))
+    assert deltas.dtype.name == 'uint32'
+    assert decode_postings(deltas).tolist() == docs
+    assert encode_postings(np.array([1, 2, 250])).dtype.name == 'uint8'
+
+def test_search_matches_brute_force():
+    """Top-k agrees with exhaustive scoring, for both sparse and dense skills"""
+    jobs = generate_jobs(3000, skills_per_job=8, vocabulary_size=300)
+    index = build(jobs)
+    rng = random.Random(3)
+    vocabulary = sorted({s for job in jobs for s in job['skills']})
+    for _ in range(25):
+        skills = rng.sample(vocabulary, 12)
+        assert index.search(skills, 10) == brute_force(index, jobs, skills, 10)
+
+def test_incremental_updates():
+    """Saved jobs are searchable at once, and re-saving a job replaces it"""
+    jobs = generate_jobs(500, vocabulary_size=100)
+    index = build(jobs, tail_limit=4)
+    index.add_jobs([{'id': 'new-1', 'title': 'Rust Dev', 'skills': ['rust', 'Elixir', 'JS']}])
+    top = index.match(['Rust', 'Elixir', 'JavaScript'], 1)[0]
+    assert top['j']['title'] == 'Rust Dev'
+    assert top['skill_count'] == 3
+    assert sorted(top['matching_skills']) == ['Elixir', 'JavaScript', 'Rust']
+    
+    index.add_job('new-1', ['Cobol'], {'title': 'Mainframe Dev'})
+    assert len(index) == 501
+    assert all(m['j'].get('title') != 'Rust Dev' for m in index.match(['Rust', 'Elixir'], 50))
+    assert index.match(['COBOL'], 1)[0]['j']['title'] == 'Mainframe Dev'
+    
+    # Removing enough jobs renumbers documents without changing results
+    for job in jobs[:200]:
+        index.remove_job(job['id'])
+    live = jobs[200:]
+    skills = ['Python', 'SQL', 'AWS', 'Docker']
+    expected = [live[doc]['id'] for doc, _ in brute_force(index, live, skills, 5)]
+    assert [m['j']['id'] for m in index.match(skills, 5)] == expected
+
+def test_from_graph():
+    """The index loads jobs and their skills from the graph"""
+    driver = RecordingDriver()
+    driver.respond("MATCH (j:Job)", [
+        {'job_id': 'j1', 'job': {'title': 'Backend'}, 'skills': ['Python', 'postgres']},
+        {'job_id': 'j2', 'job': {'title': 'Frontend'}, 'skills': ['React', 'JS']},
+    ])
+    index = SkillIndex.from_graph(driver, canonicalizer=SkillCanonicalizer(), metrics=MetricsRegistry())
+    matches = index.match(['PostgreSQL', 'Python'])
+    assert [m['j']['title'] for m in matches] == ['Backend']
+    assert index.metrics.histogram('skill_index_query_seconds').count() == 1
+
+if __name__ == "__main__":
+    test_postings_round_trip()
+    test_search_matches_brute_force()
+    test_incremental_updates()
+    test_from_graph()
+    print("✅ Skill index tests passed!")
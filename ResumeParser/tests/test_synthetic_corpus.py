@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Test the synthetic corpus generator and the load driver
+"""
+
+import json
+import os
+import tempfile
+
+from fakes import GroundTruthParser, RecordingDriver
+from load_driver import build_work, load_ground_truth, percentiles, run_load_test
+from neo4j_manager import Neo4jManager
+from resume_schema import ResumeData
+from synthetic_corpus import CorpusConfig, generate_corpus, load_manifest
+
+def test_generate_corpus_writes_documents_and_ground_truth():
+    """Every resume is written in each format next to valid ground truth"""
+    with tempfile.TemporaryDirectory() as corpus_dir:
+        config = CorpusConfig(count=6, min_roles=2, max_roles=4, skills_per_resume=8, overlap=1.0, core_size=8)
+        manifest = generate_corpus(corpus_dir, config)
+        
+        assert len(manifest) == 6
+        assert len({entry['email'] for entry in manifest}) == 6
+        for entry in manifest:
+            with open(os.path.join(corpus_dir, entry['ground_truth'])) as f:
+                resume = ResumeData(**json.load(f))
+            assert 2 <= len(resume.experience) <= 4
+            assert len(resume.skills) == 8
+            for fmt in ('txt', 'docx', 'pdf'):
+                assert os.path.exists(os.path.join(corpus_dir, entry['documents'][fmt]))
+        
+        # Full overlap with a core as large as the skill list gives everyone the same skills
+        skill_sets = set()
+        for entry in manifest:
+            with open(os.path.join(corpus_dir, entry['ground_truth'])) as f:
+                skill_sets.add(frozenset(s['name'] for s in json.load(f)['skills']))
+        assert len(skill_sets) == 1
+        assert load_manifest(corpus_dir)['config']['count'] == 6
+
+def test_generation_is_deterministic():
+    """The same seed produces the same corpus"""
+    with tempfile.TemporaryDirectory() as first, tempfile.TemporaryDirectory() as second:
+        config = CorpusConfig(count=3, formats=('txt',), seed=7)
+        generate_corpus(first, config)
+        generate_corpus(second, config)
+        for name in ('resume-000000.json', 'resume-000002.txt'):
+            with open(os.path.join(first, name)) as a, open(os.path.join(second, name)) as b:
+                assert a.read() == b.read()
+
+def test_load_test_round_trips_ground_truth():
+    """The Fake provider parses each format back to its ground truth"""
+    with tempfile.TemporaryDirectory() as corpus_dir:
+        generate_corpus(corpus_dir, CorpusConfig(count=3, seed=1))
+        parser = GroundTruthParser(load_ground_truth(corpus_dir))
+        driver = RecordingDriver()
+        manager = Neo4jManager("bolt://unused", "neo4j", "unused", driver=driver)
+        
+        report = run_load_test(build_work(corpus_dir, count=9), parser, manager, concurrency=3)
+        
+        assert report['completed'] == 9
+        assert report['error_rate'] == 0.0
+        assert report['ground_truth_match_rate'] == 1.0
+        assert set(report['latency_seconds']) == {'p50', 'p90', 'p95', 'p99', 'mean', 'max'}
+        assert sum(1 for query, _ in driver.statements if 'CREATE (r:Resume' in query) == 9
+
+def test_percentiles_nearest_rank():
+    """Percentiles use the nearest-rank definition"""
+    summary = percentiles(list(range(1, 101)))
+    assert summary['p50'] == 50
+    assert summary['p99'] == 99
+    assert summary['max'] == 100
+
+if __name__ == "__main__":
+    test_generate_corpus_writes_documents_and_ground_truth()
+    test_generation_is_deterministic()
+    test_load_test_round_trips_ground_truth()
+    test_percentiles_nearest_rank()
+    print("✅ Synthetic corpus tests passed!")
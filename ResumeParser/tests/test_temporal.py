@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Test native dates and per-skill tenure on resume relationships
+"""
+
+from datetime import date
+
+from candidate_profiles import CandidateProfile, ProfileCache, build_profile
+from fakes import RecordingDriver
+from invalidation import IngestGenerations
+from metrics import MetricsRegistry
+from neo4j_manager import Neo4jManager
+from resume_schema import DateRange, ResumeData
+from skill_canonicalizer import SkillCanonicalizer
+from temporal import (SET_ONGOING_BATCH, SET_RANGES, SET_SKILL_TENURE, SET_TENURE_BATCH, backfill, date_range,
+                      refresh_ongoing_tenure, role_tenure)
+
+def build_resume(experience) -> ResumeData:
+    return ResumeData(
+        personal_info={"name": "Jane Smith"},
+        education=[{"institute": "MIT", "degree": "BSc", "dates": {"from_date": "2012", "to_date": "Jun 2016"}}],
+        experience=experience,
+        skills=[{"name": "python", "category": "Technical"}, {"name": "Go", "category": "Technical"}],
+    )
+
+EXPERIENCE = [{"position": "Engineer", "company": "Acme", "dates": {"from_date": "2016-07", "to_date": "2019-06"},
+               "description": "Built APIs", "skills_used": ["Python"]}]
+
+def manager_for(driver) -> Neo4jManager:
+    return Neo4jManager("bolt://unused", "neo4j", "unused", driver=driver, metrics=MetricsRegistry(),
+                        canonicalizer=SkillCanonicalizer(), generations=IngestGenerations(),
+                        profile_cache=ProfileCache())
+
+def test_date_strings_become_month_dates():
+    assert date_range(DateRange(from_date="Mar 2021", to_date="Present")) == {
+        "start_date": date(2021, 3, 1), "end_date": None, "current": True}
+    assert date_range(DateRange(from_date="2012", to_date="2016-06")) == {
+        "start_date": date(2012, 1, 1), "end_date": date(2016, 6, 1), "current": False}
+    assert date_range(DateRange(from_date="someday")) == {"start_date": None, "end_date": None, "current": False}
+    assert date_range(None)["current"] is False
+
+def test_ingest_writes_dates_and_skill_tenure():
+    """Relationships carry native dates and HAS_SKILL the months each skill was used"""
+    driver = RecordingDriver()
+    manager = manager_for(driver)
+    manager.create_resume_node(build_resume(EXPERIENCE), "r1")
+    params = {query.name: p for query, p in driver.statements if hasattr(query, "name")}
+    assert params["resume.create_experience"]["start_date"] == date(2016, 7, 1)
+    assert params["resume.create_experience"]["end_date"] == date(2019, 6, 1)
+    assert params["resume.create_education"]["end_date"] == date(2016, 6, 1)
+    tenure = {p["skill_name"]: p["tenure_months"] for query, p in driver.statements if "HAS_SKILL" in query
+              and "tenure_months" in p}
+    assert tenure == {"Python": 36, "Go": 0}
+
+    manager.ensure_indexes()
+    assert sum(1 for query, _ in driver.statements if "ON (h.tenure_months)" in query) == 1
+
+def test_upsert_refreshes_tenure_when_roles_change():
+    canonicalizer = SkillCanonicalizer()
+    resume = build_resume(EXPERIENCE)
+    driver = RecordingDriver()
+    driver.respond("CALL {", [{
+        "resume": {"name": "Jane Smith", "email": None, "phone": None, "summary": "", "profile": None,
+                   "ingested_at": "2024-03-05T10:00:00Z"},
+        "education": [{"ref": "edu-0", "institute": "MIT", "degree": "BSc", "from_date": "2012",
+                       "to_date": "Jun 2016", "gpa": None}],
+        "experience": [], "projects": [], "certifications": [], "languages": [],
+        "skills": [canonicalizer.canonical_name(s.name) for s in resume.skills],
+    }])
+    manager_for(driver).upsert_resume("r1", resume)
+    rows = [p["tenure"] for query, p in driver.statements if query == SET_SKILL_TENURE]
+    assert rows == [[{"skill": "Go", "months": 0}, {"skill": "Python", "months": 36}]]
+
+def test_upsert_refreshes_tenure_only_when_it_moves():
+    """The stored profile's tenure decides, not which section changed"""
+    canonicalizer = SkillCanonicalizer()
+    resume = build_resume(EXPERIENCE)
+    stored = {
+        "resume": {"name": "Jane Smith", "email": None, "phone": None, "summary": "",
+                   "profile": build_profile("r1", resume, canonicalizer).to_json(),
+                   "ingested_at": "2024-03-05T10:00:00Z"},
+        "education": [{"ref": "edu-0", "institute": "MIT", "degree": "BSc", "from_date": "2012",
+                       "to_date": "Jun 2016", "gpa": None}],
+        "experience": [{"ref": "exp-0", "company": "Acme", "position": "Engineer", "from_date": "2016-07",
+                        "to_date": "2019-06", "description": "Built APIs", "location": None,
+                        "skills_used": ["Python"]}],
+        "projects": [], "certifications": [], "languages": [],
+        "skills": [canonicalizer.canonical_name(s.name) for s in resume.skills],
+    }
+    driver = RecordingDriver()
+    driver.respond("CALL {", [stored])
+    
+    # A new role description leaves every skill's months as they were
+    edited = [dict(EXPERIENCE[0], description="Built and ran APIs")]
+    manager_for(driver).upsert_resume("r1", build_resume(edited))
+    assert not any(query == SET_SKILL_TENURE for query, _ in driver.statements)
+    
+    # A stored profile older than the roles' dates is brought up to date even with no section change
+    stale = CandidateProfile.from_json(stored["resume"]["profile"])
+    stale.tenure_months["Python"] = 12
+    stored["resume"]["profile"] = stale.to_json()
+    driver.reset()
+    manager_for(driver).upsert_resume("r1", resume)
+    rows = [p["tenure"] for query, p in driver.statements if query == SET_SKILL_TENURE]
+    assert rows == [[{"skill": "Go", "months": 0}, {"skill": "Python", "months": 36}]]
+
+def test_backfill_dates_stored_relationships_and_tenure():
+    driver = RecordingDriver()
+    driver.respond("HAS_EXPERIENCE {current: true}", [])
+    driver.respond("e.start_date IS NULL", [{"ref": f"e{i}", "from_date": "2020-01", "to_date": "current"}
+                                            for i in range(3)])
+    profile = CandidateProfile("r1", skills={"Python": 1.0}, tenure_months={"Python": 48})
+    driver.respond("r.profile IS NOT NULL", [{"resume_id": "r1", "profile": profile.to_json()}])
+    assert backfill(driver, batch_size=2) == {"relationships": 3, "resumes": 1, "ongoing": 0}
+    batches = [p["rows"] for query, p in driver.statements if query == SET_RANGES]
+    assert [len(rows) for rows in batches] == [2, 1]
+    assert batches[1] == [{"ref": "e2", "start_date": date(2020, 1, 1), "end_date": None, "current": True}]
+    assert [p["rows"] for query, p in driver.statements if query == SET_TENURE_BATCH] == [
+        [{"resume_id": "r1", "tenure": {"Python": 48}}]]
+
+def test_refresh_brings_ongoing_tenure_up_to_date():
+    """Ongoing roles keep counting after ingest; the refresh matches a profile built today"""
+    experience = EXPERIENCE + [{"position": "Lead", "company": "Globex", "description": "Leads",
+                                "dates": {"from_date": "2023-01", "to_date": "Present"}, "skills_used": ["Go", "python"]}]
+    resume = build_resume(experience)
+    canonicalizer = SkillCanonicalizer()
+    ingested = build_profile("r1", resume, canonicalizer, today=date(2024, 3, 1))
+    roles = [{"start_date": date(2016, 7, 1), "end_date": date(2019, 6, 1), "current": False, "skills_used": ["Python"]},
+             {"start_date": date(2023, 1, 1), "end_date": None, "current": True, "skills_used": ["Go", "Python"]}]
+    assert role_tenure(roles, date(2024, 3, 1)) == (ingested.tenure_months, ingested.total_months)
+    
+    driver = RecordingDriver()
+    driver.respond("HAS_EXPERIENCE {current: true}", [{"resume_id": "r1", "profile": ingested.to_json(), "roles": roles}])
+    assert refresh_ongoing_tenure(driver, today=date(2025, 3, 1)) == 1
+    [[row]] = [p["rows"] for query, p in driver.statements if query == SET_ONGOING_BATCH]
+    assert row["tenure"] == {"Python": 63, "Go": 27}
+    assert CandidateProfile.from_json(row["profile"]) == build_profile("r1", resume, canonicalizer, today=date(2025, 3, 1))
+    
+    driver.reset()
+    assert refresh_ongoing_tenure(driver, today=date(2024, 3, 1)) == 0
+    assert not any(query == SET_ONGOING_BATCH for query, _ in driver.statements)
+
+if __name__ == "__main__":
+    test_date_strings_become_month_dates()
+    test_ingest_writes_dates_and_skill_tenure()
+    test_upsert_refreshes_tenure_when_roles_change()
+    test_upsert_refreshes_tenure_only_when_it_moves()
+    test_backfill_dates_stored_relationships_and_tenure()
+    test_refresh_brings_ongoing_tenure_up_to_date()
+    print("✅ Temporal property tests passed!")
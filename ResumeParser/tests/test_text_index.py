@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Test the hashed TF-IDF text index and its IVF search
+"""
+
+import random
+import tempfile
+
+import numpy as np
+
+from synthetic_corpus import CorpusConfig, generate_resume
+from text_index import TextIndex, job_text, resume_text, text_features
+
+def build_texts(count):
+    rng = random.Random(4)
+    return [(f'resume-{i}', resume_text(generate_resume(rng, CorpusConfig(), i))) for i in range(count)]
+
+def test_features_are_stable():
+    """Feature hashes do not depend on the process, and stopwords are dropped"""
+    assert text_features('Built data pipelines') == text_features('built DATA pipelines')
+    assert len(text_features('the')) == 0
+    assert len(set(text_features('kubernetes'))) == 1 + 9
+
+def test_exact_search_before_training():
+    """Small indexes scan every vector and rank text-only matches"""
+    with tempfile.TemporaryDirectory() as directory:
+        index = TextIndex(directory, train_size=1000)
+        index.add_many([
+            ('a', 'Designed streaming data pipelines on Kafka and Spark'),
+            ('b', 'Managed a retail store and trained cashiers'),
+            ('c', 'Built batch data pipelines and dashboards'),
+        ])
+        hits = index.search(job_text({'title': 'Data Engineer', 'description': 'Own our data pipelines'}), 2)
+        assert [doc_id for doc_id, _ in hits] == ['c', 'a']
+        assert index.similar('a', 1)[0][0] == 'c'
+
+def test_ivf_recall_persistence_and_updates():
+    """IVF search finds most exact neighbours, survives reopening and accepts inserts"""
+    texts = build_texts(1200)
+    with tempfile.TemporaryDirectory() as directory:
+        index = TextIndex(directory, train_size=1000, nlist=20, nprobe=6)
+        index.add_many(texts)
+        assert index._trained == 20
+
+        vectors = np.array(index._vectors.array[:len(texts)])
+        recall = 0.0
+        for _, text in texts[:50]:
+            query = index.embed(text)
+            exact = {texts[i][0] for i in np.argsort(-(vectors @ query))[:10]}
+            recall += len(exact & {doc_id for doc_id, _ in index.search_vector(query, 10)}) / 10
+        assert recall / 50 > 0.7
+
+        expected = index.search(texts[7][1], 5)
+        reopened = TextIndex(directory)
+        assert len(reopened) == 1200 and reopened.nprobe == 16
+        assert reopened.search(texts[7][1], 5, nprobe=6) == expected
+
+        reopened.add('new', 'Quantum annealing researcher with cryogenics background')
+        reopened.add('resume-7', 'Pastry chef specialising in laminated dough')
+        assert reopened.search('cryogenics quantum annealing', 1)[0][0] == 'new'
+        assert reopened.search('laminated dough pastry', 1)[0][0] == 'resume-7'
+        assert all(doc_id != 'resume-7' for doc_id, _ in reopened.search(texts[7][1], 5))
+        assert reopened.remove('new') and 'new' not in TextIndex(directory)
+        assert len(TextIndex(directory)) == 1200
+
+if __name__ == "__main__":
+    test_features_are_stable()
+    test_exact_search_before_training()
+    test_ivf_recall_persistence_and_updates()
+    print("✅ Text index tests passed!")
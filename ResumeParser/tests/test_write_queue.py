@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Test the durable write-behind queue between parsing and Neo4j
+"""
+
+import json
+import os
+import tempfile
+
+from fakes import GroundTruthParser, RecordingDriver
+from ingest_pool import DONE, IngestPool
+from load_driver import load_ground_truth
+from metrics import MetricsRegistry
+from neo4j_manager import Neo4jManager
+from resume_schema import ResumeData
+from synthetic_corpus import CorpusConfig, generate_corpus, load_manifest
+from write_queue import DEAD, QUEUE_DEPTH, WriteBehindQueue, WriteFlusher
+
+class FlakyManager:
+    """Neo4jManager stand-in whose writes fail while the database is down"""
+
+    def __init__(self, manager):
+        self.manager = manager
+        self.uri = manager.uri
+        self.down = False
+        self.attempts = 0
+
+    def upsert_resume(self, resume_id, resume_data):
+        self.attempts += 1
+        if self.down:
+            raise ConnectionError("Neo4j unavailable")
+        return self.manager.upsert_resume(resume_id, resume_data)
+
+    def upsert_resumes(self, writes):
+        self.attempts += 1
+        if self.down:
+            raise ConnectionError("Neo4j unavailable")
+        return self.manager.upsert_resumes(writes)
+
+def test_parsing_continues_through_graph_outage():
+    """Parses are queued while Neo4j is down and written once it is back"""
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus_dir = os.path.join(tmp, "corpus")
+        generate_corpus(corpus_dir, CorpusConfig(count=5, formats=('txt',), seed=5))
+        uploads = []
+        for entry in load_manifest(corpus_dir)['resumes']:
+            with open(os.path.join(corpus_dir, entry['documents']['txt']), 'rb') as f:
+                uploads.append((entry['documents']['txt'], f.read()))
+
+        metrics = MetricsRegistry()
+        driver = RecordingDriver()
+        graph = FlakyManager(Neo4jManager("bolt://graph", "neo4j", "unused", driver=driver, metrics=metrics))
+        graph.down = True
+        queue = WriteBehindQueue(os.path.join(tmp, "writes.db"), metrics=metrics)
+        pool = IngestPool(max_workers=2, metrics=metrics, write_queue=queue)
+        parser = GroundTruthParser(load_ground_truth(corpus_dir), metrics=MetricsRegistry())
+        try:
+            job_ids = [pool.submit(name, data, parser, graph) for name, data in uploads]
+            assert pool.wait(job_ids, timeout=30)
+            jobs = pool.collect(job_ids)
+            assert all(job.status == DONE and job.graph_queued and not job.in_graph for job in jobs)
+            assert all(job.row()['in graph'] == 'queued' for job in jobs)
+        finally:
+            pool.shutdown()
+
+        flusher = WriteFlusher(queue, graph, target="bolt://graph", batch_size=2, base_backoff=0.0)
+        # A failed batch is retried one entry at a time, and the first failure ends the flush,
+        # so an outage costs two attempts per flush
+        assert flusher.flush() == {'written': 0, 'failed': 1, 'due': 2}
+        assert graph.attempts == 2 and queue.depth() == 5
+        assert not driver.statements
+        gauge = json.loads(metrics.to_json())['metrics'][QUEUE_DEPTH]
+        assert {"labels": {"state": "pending"}, "value": 5} in gauge['samples']
+
+        graph.down = False
+        assert flusher.drain(timeout=10)
+        assert queue.depth() == 0 and queue.lag() == 0.0
+        created = {params['resume_id'] for query, params in driver.statements if 'CREATE (r:Resume' in query}
+        assert created == {job.resume['id'] for job in jobs}
+        queue.close()
+
+def test_entries_survive_restart_and_dead_letters():
+    """Queued writes are durable, and entries that keep failing are set aside"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "writes.db")
+        queue = WriteBehindQueue(path, metrics=MetricsRegistry())
+        queue.put("resume-1", ResumeData(personal_info={"name": "Ada"}), target="bolt://a")
+        queue.put("resume-2", ResumeData(personal_info={"name": "Grace"}), target="bolt://b")
+        queue.close()
+
+        queue = WriteBehindQueue(path, metrics=MetricsRegistry())
+        assert queue.depth() == 2 and queue.depth("bolt://a") == 1
+        graph = FlakyManager(Neo4jManager("bolt://a", "neo4j", "unused", driver=RecordingDriver()))
+        graph.down = True
+        flusher = WriteFlusher(queue, graph, target="bolt://a", base_backoff=0.0, max_attempts=2)
+        flusher.flush()
+        flusher.flush()
+        assert [entry['resume_id'] for entry in queue.dead()] == ["resume-1"]
+        assert "Neo4j unavailable" in queue.dead()[0]['last_error']
+        assert queue.depth("bolt://a") == 0 and queue.depth(state=DEAD) == 1
+
+        graph.down = False
+        assert queue.requeue_dead() == 1
+        assert flusher.flush()['written'] == 1
+        # Writes for another database are left for that database's flusher
+        assert queue.depth() == 1 and queue.due("bolt://b")[0].resume_data().personal_info["name"] == "Grace"
+        queue.close()
+
+def test_batches_share_one_transaction_and_isolate_bad_entries():
+    """A batch is one upsert_resumes call; when it fails, the entries before the bad one still land"""
+    with tempfile.TemporaryDirectory() as tmp:
+        queue = WriteBehindQueue(os.path.join(tmp, "writes.db"), metrics=MetricsRegistry())
+        for name in ["Ada", "Grace", "Linus"]:
+            queue.put(f"resume-{name}", ResumeData(personal_info={"name": name}))
+        driver = RecordingDriver()
+        graph = FlakyManager(Neo4jManager("bolt://unused", "neo4j", "unused", driver=driver,
+                                          metrics=MetricsRegistry()))
+        flusher = WriteFlusher(queue, graph, base_backoff=60.0)
+        assert flusher.flush() == {'written': 3, 'failed': 0, 'due': 3}
+        assert graph.attempts == 1
+        assert sum(1 for query, _ in driver.statements if 'CREATE (r:Resume' in query) == 3
+
+        def fail(params):
+            if params["resume_id"] == "resume-Bad":
+                raise ValueError("constraint violated")
+        driver.respond("CREATE (r:Resume", fail)
+        for name in ["Edsger", "Bad", "Barbara"]:
+            queue.put(f"resume-{name}", ResumeData(personal_info={"name": name}))
+        assert flusher.flush() == {'written': 1, 'failed': 1, 'due': 3}
+        # The bad entry backs off; the one after it is written by the next flush
+        assert [entry.resume_id for entry in queue.due(limit=10)] == ["resume-Barbara"]
+        assert flusher.flush()['written'] == 1 and queue.depth() == 1
+        queue.close()
+
+if __name__ == "__main__":
+    test_parsing_continues_through_graph_outage()
+    test_entries_survive_restart_and_dead_letters()
+    test_batches_share_one_transaction_and_isolate_bad_entries()
+    print("✅ Write-behind queue tests passed!")
@@ -5,18 +5,53 @@ Integrates Resume Parser and Job Parser for intelligent job matching
 
 import streamlit as st
 import os
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 import sys
 
 # Add both modules to path
 sys.path.append('ResumeParser')
 sys.path.append('JobParser')
 
-from ResumeParser.src.app import ResumeParserApp
+from ResumeParser.src.app import ResumeParserApp, display_metrics_panel, get_neo4j_manager
+from ResumeParser.src.skill_index import SkillIndex
+from ResumeParser.src.candidate_profiles import CandidateProfile, default_profile_cache, rank_matches, recent_resumes
+from ResumeParser.src import skill_demand
+from ResumeParser.src.invalidation import JOBS, RESUMES, default_generations
+from ResumeParser.src.metrics import counted_cache
+from ResumeParser.src.neo4j_manager import database_stats
 from JobParser.job_parser import JobParser
 from JobParser.job_apis import create_job_manager
 from config import NEO4J_URI, NEO4J_USER, NEO4J_PASSWORD
 
+# Cached query results also expire after this many seconds, for ingests made by other processes
+QUERY_TTL = 300
+
+@st.cache_resource(show_spinner="Indexing job skills...")
+def load_skill_index(_driver) -> SkillIndex:
+    """Build the job skill index once per server process; a build that raises is not cached"""
+    return SkillIndex.from_graph(_driver)
+
+@st.cache_resource(show_spinner="Connecting...")
+def load_app() -> 'ConvAgentApp':
+    """One app, with its drivers and API clients, shared by every rerun and session"""
+    return ConvAgentApp()
+
+# The generation arguments change whenever this process ingests a resume or job,
+# which is what invalidates these entries; the underscored driver is not hashed
+
+@counted_cache('recent_resumes', st.cache_data(ttl=QUERY_TTL, show_spinner=False))
+def cached_recent_resumes(_driver, limit: int, generation) -> List[Dict[str, Any]]:
+    return recent_resumes(_driver, limit)
+
+@counted_cache('skill_demand', st.cache_data(ttl=QUERY_TTL, show_spinner=False))
+def cached_skill_demand(_driver, limit: int, generation) -> List[Dict[str, Any]]:
+    return skill_demand.top_skills(_driver, limit)
+
+@counted_cache('database_stats', st.cache_data(ttl=QUERY_TTL, show_spinner=False))
+def cached_database_stats(_driver, generation) -> Dict[str, int]:
+    # One round trip for all labels, with a single cached plan
+    return database_stats(_driver)
+
 class ConvAgentApp:
     """Main application combining resume and job parsing"""
     
@@ -24,15 +59,18 @@ class ConvAgentApp:
         self.resume_parser = ResumeParserApp()
         self.job_parser = JobParser(NEO4J_URI, NEO4J_USER, NEO4J_PASSWORD)
         self.job_api_manager = create_job_manager()
+        self.profile_cache = default_profile_cache
+    
+    def get_skill_index(self) -> Tuple[Optional[SkillIndex], Optional[str]]:
+        """The job skill index, or None and the reason it could not be built"""
+        # The app outlives any one run, so the index is looked up per run and a failed build is retried
+        try:
+            return load_skill_index(self.job_parser.neo4j_manager.driver), None
+        except Exception as e:
+            return None, str(e)
     
     def run(self):
         """Run the main application"""
-        st.set_page_config(
-            page_title="ConvAgent - Intelligent Job Matching",
-            page_icon="🤖",
-            layout="wide"
-        )
-        
         st.title("🤖 ConvAgent - Intelligent Job Matching")
         st.markdown("**AI-powered resume analysis and job matching platform**")
         
@@ -87,7 +125,11 @@ class ConvAgentApp:
                     
                     # Save to database option
                     if st.button("Save Jobs to Database"):
-                        self.job_parser.save_jobs_to_neo4j(jobs)
+                        # Jobs, their skills and the demand counters are written in one transaction
+                        get_neo4j_manager(NEO4J_URI, NEO4J_USER, NEO4J_PASSWORD).save_jobs(jobs)
+                        skill_index, _ = self.get_skill_index()
+                        if skill_index is not None:
+                            skill_index.add_jobs(jobs)
                         st.success("Jobs saved to database!")
                     
                     # Display jobs
@@ -98,20 +140,33 @@ class ConvAgentApp:
                 st.error("Please enter a job query")
     
     def job_matching_page(self):
-        """Job matching based on resume skills"""
+        """Job matching based on one resume's skills"""
         st.header("🎯 Job Matching")
         st.markdown("Find the best job matches based on your resume skills")
+        # Matching falls back to Neo4j without the index
+        skill_index, skill_index_error = self.get_skill_index()
+        if skill_index_error:
+            st.warning(f"Job skill index unavailable, matching through Neo4j: {skill_index_error}")
+        
+        resumes = self.get_recent_resumes()
+        if not resumes:
+            st.warning("No resumes found. Please upload and analyze resumes first.")
+            return
+        labels = {r['id']: f"{r.get('name') or 'Unknown'} ({r['id'][:8]})" for r in resumes}
+        resume_id = st.selectbox("Resume", list(labels), format_func=labels.get)
         
-        # Get resume skills from database
-        resume_skills = self.get_resume_skills()
+        profile = self.get_candidate_profile(resume_id)
+        resume_skills = profile.skill_names() if profile else []
         
         if resume_skills:
-            st.markdown(f"**Found {len(resume_skills)} skills in your resume:**")
+            st.markdown(f"**Found {len(resume_skills)} skills in this resume:**")
             st.markdown(", ".join(resume_skills[:10]) + ("..." if len(resume_skills) > 10 else ""))
+            if profile.total_months:
+                st.markdown(f"**Experience:** {profile.total_months // 12} years {profile.total_months % 12} months")
             
             if st.button("Find Job Matches", type="primary"):
                 with st.spinner("Finding job matches..."):
-                    matches = self.job_parser.get_job_matches_for_resume(resume_skills, 20)
+                    matches = self.match_jobs(profile, 20, skill_index)
                 
                 if matches:
                     st.success(f"Found {len(matches)} job matches!")
@@ -119,7 +174,7 @@ class ConvAgentApp:
                 else:
                     st.warning("No job matches found. Try uploading more resumes or searching for jobs first.")
         else:
-            st.warning("No resume skills found. Please upload and analyze resumes first.")
+            st.warning("No skills found in this resume.")
     
     def analytics_dashboard_page(self):
         """Analytics dashboard"""
@@ -130,12 +185,12 @@ class ConvAgentApp:
         
         with col1:
             st.subheader("Skill Demand")
-            skill_demand = self.get_skill_demand()
-            if skill_demand:
-                # Create a simple bar chart
+            top_skills = self.get_skill_demand()
+            if top_skills:
+                # Demand from jobs next to supply from resumes
                 import pandas as pd
-                df = pd.DataFrame(skill_demand[:10])
-                st.bar_chart(df.set_index('skill')['demand'])
+                df = pd.DataFrame(top_skills[:10])
+                st.bar_chart(df.set_index('skill')[['demand', 'supply']])
             else:
                 st.info("No skill demand data available. Fetch some jobs first.")
         
@@ -144,6 +199,8 @@ class ConvAgentApp:
             stats = self.get_database_stats()
             for key, value in stats.items():
                 st.metric(key, value)
+        
+        display_metrics_panel()
     
     def display_jobs(self, jobs: List[Dict[str, Any]]):
         """Display job listings"""
@@ -188,7 +245,7 @@ class ConvAgentApp:
                     st.markdown(f"**Experience Level:** {job.get('experience_level', 'Unknown')}")
                 
                 with col2:
-                    st.markdown(f"**Match Score:** {skill_count} skills")
+                    st.markdown(f"**Match Score:** {match.get('score', skill_count)} ({skill_count} skills)")
                     if job.get('url'):
                         st.markdown(f"[View Job]({job['url']})")
                 
@@ -198,24 +255,39 @@ class ConvAgentApp:
                     st.markdown("**Description:**")
                     st.text(job['description'][:300] + "..." if len(job['description']) > 300 else job['description'])
     
-    def get_resume_skills(self) -> List[str]:
-        """Get all skills from resumes in the database"""
+    def match_jobs(self, profile: CandidateProfile, limit: int = 20,
+                   skill_index: Optional[SkillIndex] = None) -> List[Dict[str, Any]]:
+        """Rank jobs for one candidate, in memory when the skill index is available"""
+        # Overlap finds the candidates; profile weights and tenure decide the order
+        skills = profile.skill_names()
+        if skill_index is not None:
+            matches = skill_index.match(skills, limit * 3)
+        else:
+            matches = self.job_parser.get_job_matches_for_resume(skills, limit * 3)
+        return rank_matches(profile, matches, limit)
+    
+    def get_recent_resumes(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """Most recently ingested resumes to choose from"""
         try:
-            with self.job_parser.neo4j_manager.driver.session() as session:
-                result = session.run("""
-                    MATCH (r:Resume)-[:HAS_SKILL]->(s:Skill)
-                    RETURN collect(DISTINCT s.name) as skills
-                """)
-                record = result.single()
-                return record['skills'] if record else []
+            return cached_recent_resumes(self.job_parser.neo4j_manager.driver, limit,
+                                         default_generations.current(RESUMES))
         except Exception as e:
-            st.error(f"Error fetching resume skills: {e}")
+            st.error(f"Error fetching resumes: {e}")
             return []
     
-    def get_skill_demand(self) -> List[Dict[str, Any]]:
-        """Get skill demand statistics"""
+    def get_candidate_profile(self, resume_id: str) -> Optional[CandidateProfile]:
+        """Cached matching profile of one resume; refreshed whenever it is re-ingested"""
         try:
-            return self.job_parser.neo4j_manager.get_skill_demand()
+            return self.profile_cache.get(resume_id, self.job_parser.neo4j_manager.driver)
+        except Exception as e:
+            st.error(f"Error fetching resume profile: {e}")
+            return None
+    
+    def get_skill_demand(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Top skills from the materialized demand counters, one indexed read"""
+        try:
+            return cached_skill_demand(self.job_parser.neo4j_manager.driver, limit,
+                                       default_generations.current(RESUMES, JOBS))
         except Exception as e:
             st.error(f"Error fetching skill demand: {e}")
             return []
@@ -223,24 +295,20 @@ class ConvAgentApp:
     def get_database_stats(self) -> Dict[str, int]:
         """Get database statistics"""
         try:
-            with self.job_parser.neo4j_manager.driver.session() as session:
-                # Get counts for different node types
-                stats = {}
-                
-                node_types = ['Resume', 'Job', 'Company', 'Skill', 'Position', 'Location']
-                for node_type in node_types:
-                    result = session.run(f"MATCH (n:{node_type}) RETURN count(n) as count")
-                    count = result.single()['count']
-                    stats[node_type] = count
-                
-                return stats
+            return cached_database_stats(self.job_parser.neo4j_manager.driver,
+                                         default_generations.current(RESUMES, JOBS))
         except Exception as e:
             st.error(f"Error fetching database stats: {e}")
             return {}
 
 def main():
     """Main entry point"""
-    app = ConvAgentApp()
+    st.set_page_config(
+        page_title="ConvAgent - Intelligent Job Matching",
+        page_icon="🤖",
+        layout="wide"
+    )
+    app = load_app()
     app.run()
 
 if __name__ == "__main__":